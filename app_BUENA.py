@@ -10,53 +10,37 @@ Punto de entrada único que ejecuta TODOS los procesos del sistema:
 - Monitoreo en tiempo real
 - Alertas automáticas
 
+Los subsistemas (orquestadores, servicios de IA, BERT, dashboards, CCTV,
+satélite, ETL, deduplicación...) se importan y construyen en su primer uso o
+al calentarlos en segundo plano una vez que el servidor HTTP está levantado.
+``python app_BUENA.py --profile-startup`` imprime el desglose de tiempos de
+importación e inicialización.
+
 NOTA: Patch de compatibilidad para ml_dtypes aplicado automáticamente
 """
 
 # ===== PATCH DE COMPATIBILIDAD ML_DTYPES =====
 import sys
+import time
 import warnings
 
-# Fix TensorFlow warnings - manejo ULTRA robusto de errores
-try:
-    # Configurar variables de entorno ANTES de cualquier importación TF
-    import os
-    
-    # Variables de entorno críticas para TensorFlow
-    os.environ['TF_CPP_MIN_LOG_LEVEL'] = '3'
-    os.environ['TF_ENABLE_ONEDNN_OPTS'] = '0'
-    os.environ['CUDA_VISIBLE_DEVICES'] = '-1'  # Forzar CPU para evitar problemas GPU
-    
-    # Suprimir warnings del sistema antes de importar
-    warnings.filterwarnings('ignore', category=DeprecationWarning)
-    warnings.filterwarnings('ignore', category=FutureWarning)
-    warnings.filterwarnings('ignore', category=UserWarning)
-    
-    # Intentar importar fix_tf_warnings con manejo robusto
-    print("🔧 Cargando optimizaciones TensorFlow...")
-    from fix_tf_warnings import *
-    print("✅ fix_tf_warnings cargado correctamente")
-    
-except (ImportError, ModuleNotFoundError) as e:
-    print(f"⚠️  fix_tf_warnings no disponible: {e}")
-    print("Continuando sin optimizaciones TensorFlow...")
-    pass
-except (AttributeError, RuntimeError, TypeError, ValueError) as e:
-    print(f"⚠️  Error de compatibilidad TensorFlow/Keras: {type(e).__name__}")
-    print("Problema común con versiones de TF/Keras. Continuando...")
-    pass
-except (RecursionError, MemoryError) as e:
-    print(f"⚠️  Error de recursos durante carga TF: {type(e).__name__}")
-    print("TensorFlow requiere más memoria. Continuando sin TF...")
-    pass
-except KeyboardInterrupt:
-    print("⚠️  Carga de TensorFlow interrumpida por usuario")
-    raise  # Re-raise para mantener control del usuario
-except Exception as e:
-    print(f"⚠️  Error inesperado importando fix_tf_warnings:")
-    print(f"     {type(e).__name__}: {str(e)[:100]}...")
-    print("Continuando sin optimizaciones TensorFlow...")
-    pass
+_PROCESS_STARTED = time.perf_counter()
+_MODULES_AT_START = len(sys.modules)
+
+# Configurar variables de entorno ANTES de cualquier importación TF. Las
+# optimizaciones de fix_tf_warnings (que importan TensorFlow) se cargan con
+# el primer subsistema que puede usar TF (grupo TF_OPTIMIZATIONS más abajo).
+import os
+
+# Variables de entorno críticas para TensorFlow
+os.environ['TF_CPP_MIN_LOG_LEVEL'] = '3'
+os.environ['TF_ENABLE_ONEDNN_OPTS'] = '0'
+os.environ['CUDA_VISIBLE_DEVICES'] = '-1'  # Forzar CPU para evitar problemas GPU
+
+# Suprimir warnings del sistema antes de importar
+warnings.filterwarnings('ignore', category=DeprecationWarning)
+warnings.filterwarnings('ignore', category=FutureWarning)
+warnings.filterwarnings('ignore', category=UserWarning)
 
 def patch_ml_dtypes():
     """Patch para compatibilidad con ml_dtypes"""
@@ -89,12 +73,14 @@ patch_ml_dtypes()
 import logging
 import asyncio
 import threading
-import time
+import socket
+import argparse
 import sys
 import os
 from datetime import datetime, timedelta
 from pathlib import Path
 import json
+from dataclasses import asdict
 from typing import Dict, List, Optional, Any
 import signal
 import atexit
@@ -104,14 +90,6 @@ from urllib.parse import urljoin, urlparse
 from bs4 import BeautifulSoup
 import hashlib
 
-# Advanced image extraction for original images
-try:
-    from advanced_image_extractor import extract_original_image_for_article, ImageExtractor
-    IMAGE_EXTRACTOR_AVAILABLE = True
-except ImportError:
-    IMAGE_EXTRACTOR_AVAILABLE = False
-    print("[WARNING] Advanced image extractor not available")
-
 # Load environment variables
 try:
     from dotenv import load_dotenv
@@ -124,6 +102,23 @@ except ImportError:
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
+# Registro de subsistemas con carga diferida y perfil del arranque
+from src.utils.service_registry import (LazyImport, LazyMounts, LazyService, ServiceProxy, ServiceRegistry,
+                                        StartupProfiler)
+
+startup_profiler = StartupProfiler(started=_PROCESS_STARTED)
+startup_profiler.record('stdlib, ml_dtypes, requests, bs4, paquete src', 'import',
+                        time.perf_counter() - _PROCESS_STARTED, len(sys.modules) - _MODULES_AT_START)
+
+with startup_profiler.phase('db_pool, cache, image_store, config'):
+    # Conexiones SQLite compartidas (WAL, pragmas, reutilización por hilo)
+    from src.utils.db_pool import connect as db_connect, get_all_metrics as get_db_pool_metrics
+    from src.cache.intelligent_cache import get_cache, memoize
+    from src.utils.image_store import get_image_store
+    
+    # Utilities
+    from src.utils.config import logger
+
 # Database configuration
 def get_database_path():
     """Obtener la ruta de la base de datos desde variables de entorno"""
@@ -131,227 +126,261 @@ def get_database_path():
     return db_path
 
 # Flask and web framework imports
-from flask import Flask, render_template, jsonify, request, redirect, url_for, send_from_directory
-from flask_cors import CORS
-from flask_socketio import SocketIO, emit
-import dash
-from dash import dcc, html
-import dash_bootstrap_components as dbc
-
-# CCTV System imports
-try:
-    from cams import CCTVSystem
-    from cams.routes import register_cctv_routes
-    CCTV_AVAILABLE = True
-    print("✅ Sistema CCTV cargado correctamente")
-except ImportError as e:
-    CCTV_AVAILABLE = False
-    print(f"⚠️  Sistema CCTV no disponible: {e}")
-    print("Continuando sin funcionalidad CCTV...")
-
-# Import all system components
-try:
-    # Core orchestration
-    from src.orchestration.main_orchestrator import GeopoliticalIntelligenceOrchestrator
-    from src.orchestration.task_scheduler import TaskScheduler
-    
-    # Enhanced historical analysis
-    from src.analytics.enhanced_historical_orchestrator import EnhancedHistoricalOrchestrator
-    
-    # AI Services - Unified Ollama + Groq integration
-    from src.ai.unified_ai_service import unified_ai_service, analyze_with_ai, generate_summary_ai
-    
-    # Ultra HD Satellite Analysis System
-    from ultra_hd_satellite_system import ultra_hd_system
-    from src.ai.ollama_service import ollama_service, setup_ollama_models
-    
-    # BERT Risk Analysis - NEW PRIMARY SYSTEM
-    from src.ai.bert_simple_analyzer import SimpleBertRiskAnalyzer, analyze_article_risk
-    
-    # Dashboards
-    from src.visualization.historical_dashboard import HistoricalDashboard
-    from src.visualization.multivariate_dashboard import MultivariateRelationshipDashboard
-    
-    # API components
-    from src.api.rest_status import create_api_blueprint
-    
-    # Utilities
-    from src.utils.config import logger
+with startup_profiler.phase('flask, flask_cors, flask_socketio'):
+    from flask import Flask, render_template, jsonify, request, redirect, url_for, send_from_directory
+    from flask_cors import CORS
+    from flask_socketio import SocketIO, emit
 
-except ImportError as e:
-    print(f"[ERROR] Error importando módulos principales: {e}")
-    print("[INFO] Verificando instalación de dependencias...")
-    sys.exit(1)
+import hmac
+from functools import wraps
 
-# Computer Vision import
-try:
-    from src.vision.image_analysis import ImageInterestAnalyzer, analyze_article_image
-    CV_AVAILABLE = True
-    logger.info("✅ Computer Vision module loaded successfully")
-except ImportError as e:
-    CV_AVAILABLE = False
-    logger.warning(f"⚠️ Computer Vision module not available: {e}")
-    # Mock classes for when CV is not available
-    class ImageInterestAnalyzer:
-        def analyze_image_interest_areas(self, image_url, title=""):
-            return {'error': 'Computer Vision not available'}
-    
-    def analyze_article_image(image_url, title=""):
+LOOPBACK_ADDRESSES = ('127.0.0.1', '::1')
+
+def require_admin(f):
+    """
+    Decorador para endpoints de administración/mantenimiento.
+
+    Si ADMIN_TOKEN está definido, exige la cabecera X-Admin-Token con ese
+    valor; si no, solo acepta peticiones desde la propia máquina.
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        admin_token = os.getenv('ADMIN_TOKEN')
+        if admin_token:
+            allowed = hmac.compare_digest(request.headers.get('X-Admin-Token', ''), admin_token)
+        else:
+            allowed = request.remote_addr in LOOPBACK_ADDRESSES
+        if not allowed:
+            logger.warning(f"Acceso denegado a {request.path} desde {request.remote_addr}")
+            return jsonify({'success': False, 'error': 'No autorizado'}), 403
+        return f(*args, **kwargs)
+    return decorated_function
+
+# =====================================================
+# SUBSISTEMAS CON CARGA DIFERIDA
+# =====================================================
+# Cada grupo se importa la primera vez que se usa uno de sus símbolos o se
+# evalúa como booleano (los antiguos flags *_AVAILABLE son ahora los propios
+# grupos). Las clases "mock" se usan como alternativa si el grupo no se
+# puede importar.
+
+def _lazy(name, modules, requires=()):
+    return LazyImport(name, modules, requires=requires, profiler=startup_profiler)
+
+# Optimizaciones TensorFlow (importa TF); antes que cualquier módulo que pueda usarlo
+TF_OPTIMIZATIONS = _lazy('fix_tf_warnings', ['fix_tf_warnings'])
+
+# Core orchestration, análisis histórico, servicios de IA, BERT, dashboards y API
+ORCHESTRATION = _lazy('orchestration', ['src.orchestration.main_orchestrator',
+                                        'src.orchestration.task_scheduler'], [TF_OPTIMIZATIONS])
+HISTORICAL_ANALYSIS = _lazy('historical_analysis', ['src.analytics.enhanced_historical_orchestrator'],
+                            [TF_OPTIMIZATIONS])
+AI_SERVICES = _lazy('ai_services', ['src.ai.unified_ai_service', 'src.ai.ollama_service'], [TF_OPTIMIZATIONS])
+ULTRA_HD_SATELLITE = _lazy('ultra_hd_satellite_system', ['ultra_hd_satellite_system'], [TF_OPTIMIZATIONS])
+BERT_ANALYZER = _lazy('bert_simple_analyzer', ['src.ai.bert_simple_analyzer'], [TF_OPTIMIZATIONS])
+DASHBOARDS = _lazy('dashboards', ['src.visualization.historical_dashboard',
+                                  'src.visualization.multivariate_dashboard'])
+REST_API = _lazy('rest_api', ['src.api.rest_status'])
+
+GeopoliticalIntelligenceOrchestrator = ORCHESTRATION.symbol('GeopoliticalIntelligenceOrchestrator')
+TaskScheduler = ORCHESTRATION.symbol('TaskScheduler', 'src.orchestration.task_scheduler')
+EnhancedHistoricalOrchestrator = HISTORICAL_ANALYSIS.symbol('EnhancedHistoricalOrchestrator')
+
+# AI Services - Unified Ollama + Groq integration
+unified_ai_service = AI_SERVICES.symbol('unified_ai_service')
+analyze_with_ai = AI_SERVICES.symbol('analyze_with_ai')
+generate_summary_ai = AI_SERVICES.symbol('generate_summary_ai')
+ollama_service = AI_SERVICES.symbol('ollama_service', 'src.ai.ollama_service')
+setup_ollama_models = AI_SERVICES.symbol('setup_ollama_models', 'src.ai.ollama_service')
+
+# Ultra HD Satellite Analysis System
+ultra_hd_system = ULTRA_HD_SATELLITE.symbol('ultra_hd_system')
+
+# BERT Risk Analysis - NEW PRIMARY SYSTEM
+SimpleBertRiskAnalyzer = BERT_ANALYZER.symbol('SimpleBertRiskAnalyzer')
+analyze_article_risk = BERT_ANALYZER.symbol('analyze_article_risk')
+
+# Dashboards
+HistoricalDashboard = DASHBOARDS.symbol('HistoricalDashboard')
+MultivariateRelationshipDashboard = DASHBOARDS.symbol('MultivariateRelationshipDashboard',
+                                                      'src.visualization.multivariate_dashboard')
+
+# API components
+create_api_blueprint = REST_API.symbol('create_api_blueprint')
+
+# Advanced image extraction for original images
+IMAGE_EXTRACTOR_AVAILABLE = _lazy('advanced_image_extractor', ['advanced_image_extractor'])
+extract_original_image_for_article = IMAGE_EXTRACTOR_AVAILABLE.symbol('extract_original_image_for_article')
+ImageExtractor = IMAGE_EXTRACTOR_AVAILABLE.symbol('ImageExtractor')
+
+# CCTV System
+CCTV_AVAILABLE = _lazy('cctv', ['cams', 'cams.routes'], [TF_OPTIMIZATIONS])
+CCTVSystem = CCTV_AVAILABLE.symbol('CCTVSystem')
+register_cctv_routes = CCTV_AVAILABLE.symbol('register_cctv_routes', 'cams.routes')
+
+# Computer Vision
+class _MockImageInterestAnalyzer:
+    def analyze_image_interest_areas(self, image_url, title=""):
         return {'error': 'Computer Vision not available'}
 
-# External Intelligence Feeds import
-try:
-    from src.intelligence.external_feeds import ExternalIntelligenceFeeds
-    from src.intelligence.integrated_analyzer import IntegratedGeopoliticalAnalyzer
-    INTELLIGENCE_AVAILABLE = True
-    logger.info("✅ External Intelligence Feeds module loaded successfully")
-except ImportError as e:
-    INTELLIGENCE_AVAILABLE = False
-    logger.warning(f"⚠️ External Intelligence module not available: {e}")
-    # Mock classes for when intelligence feeds are not available
-    class ExternalIntelligenceFeeds:
-        def __init__(self, db_path):
-            pass
-        def update_all_feeds(self, **kwargs):
-            return {'acled': False, 'gdelt': False, 'gpr': False}
-        def get_feed_statistics(self):
-            return {'error': 'External intelligence not available'}
-    
-    class IntegratedGeopoliticalAnalyzer:
-        def __init__(self, db_path, groq_client=None):
-            pass
-        def generate_comprehensive_geojson(self, **kwargs):
-            return {'error': 'Integrated analyzer not available'}
+def _mock_analyze_article_image(image_url, title=""):
+    return {'error': 'Computer Vision not available'}
 
-# Satellite Integration import
-try:
-    from satellite_integration import (
-        SatelliteIntegrationManager, 
-        SentinelHubAPI, 
-        PlanetAPI,
-        SatelliteQueryParams,
-        SatelliteImage
-    )
-    from dataclasses import asdict
-    SATELLITE_AVAILABLE = True
-    logger.info("✅ Satellite Integration module loaded successfully")
-except ImportError as e:
-    SATELLITE_AVAILABLE = False
-    logger.warning(f"⚠️ Satellite Integration module not available: {e}")
-    # Mock classes for when satellite integration is not available
-
-# Automated Satellite Monitor import
-try:
-    from src.satellite.automated_satellite_monitor import (
-        AutomatedSatelliteMonitor,
-        ConflictZone,
-        SatelliteImage as AutoSatelliteImage
-    )
-    AUTOMATED_SATELLITE_AVAILABLE = True
-    logger.info("✅ Automated Satellite Monitor module loaded successfully")
-except ImportError as e:
-    AUTOMATED_SATELLITE_AVAILABLE = False
-    logger.warning(f"⚠️ Automated Satellite Monitor not available: {e}")
-    # Mock class for when automated satellite monitor is not available
-    class AutomatedSatelliteMonitor:
-        def __init__(self, db_path=None, config=None):
-            pass
-        def start_monitoring(self):
-            logger.warning("Automated satellite monitoring not available")
-        def stop_monitoring(self):
-            pass
-        def update_all_zones(self, priority_only=False):
-            return {'processed': 0, 'updated': 0, 'errors': 1, 'skipped': 0}
-        def get_monitoring_statistics(self):
-            return {'error': 'Automated satellite monitoring not available'}
-        def populate_zones_from_geojson_endpoint(self):
-            return 0
-    
-    class ConflictZone:
-        def __init__(self, *args, **kwargs):
-            pass
-    
-    class AutoSatelliteImage:
-        def __init__(self, *args, **kwargs):
-            pass
-    
-    # Estas clases deberían estar en el bloque anterior de SATELLITE_AVAILABLE
-    if not SATELLITE_AVAILABLE:
-        class SatelliteIntegrationManager:
-            def __init__(self):
-                pass
-            def search_images_for_geojson(self, geojson_data, **kwargs):
-                return {'error': 'Satellite integration not available'}
-            def get_satellite_statistics(self):
-                return {'error': 'Satellite integration not available'}
-        
-        class SentinelHubAPI:
-            def __init__(self, client_id=None, client_secret=None):
-                pass
-            def search_images(self, query_params):
-                return []
-        
-        class PlanetAPI:
-            def __init__(self, api_key=None):
-                pass
-            def search_images(self, query_params):
-                return []
-        
-        def asdict(obj):
-            return {'error': 'Satellite integration not available'}
+CV_AVAILABLE = _lazy('computer_vision', ['src.vision.image_analysis'], [TF_OPTIMIZATIONS])
+ImageInterestAnalyzer = CV_AVAILABLE.symbol('ImageInterestAnalyzer', fallback=_MockImageInterestAnalyzer)
+analyze_article_image = CV_AVAILABLE.symbol('analyze_article_image', fallback=_mock_analyze_article_image)
 
-# ETL System for Geopolitical Conflicts import
-try:
-    from src.etl.flask_controller import create_etl_routes, get_etl_controller, ETLController
-    from src.etl.conflict_data_etl import ConflictDataETL, ETLConfig
-    ETL_AVAILABLE = True
-    logger.info("✅ ETL Conflicts System loaded successfully")
-except ImportError as e:
-    ETL_AVAILABLE = False
-    logger.warning(f"⚠️ ETL Conflicts System not available: {e}")
-    # Mock classes for when ETL is not available
-    class ETLController:
-        def __init__(self, db_path=None):
-            pass
-        def get_datasets_catalog(self):
-            return {'error': 'ETL system not available'}
-        def execute_etl_pipeline(self, **kwargs):
-            return {'error': 'ETL system not available'}
-        def get_etl_status(self, job_id=None):
-            return {'error': 'ETL system not available'}
-        def get_critical_events(self, **kwargs):
-            return []
-        def get_analytics_data(self, **kwargs):
-            return {'error': 'ETL system not available'}
-    
-    def create_etl_routes(app, etl_controller=None):
-        logger.warning("ETL routes not configured - system not available")
-    
-    def get_etl_controller():
-        return ETLController()
+# External Intelligence Feeds
+class _MockExternalIntelligenceFeeds:
+    def __init__(self, db_path):
+        pass
+    def update_all_feeds(self, **kwargs):
+        return {'acled': False, 'gdelt': False, 'gpr': False}
+    def get_feed_statistics(self):
+        return {'error': 'External intelligence not available'}
 
-# News Deduplication import
-try:
-    from src.ai.news_deduplication import NewsDeduplicator
-    NEWS_DEDUPLICATION_AVAILABLE = True
-    logger.info("✅ News Deduplication module loaded successfully")
-except ImportError as e:
-    NEWS_DEDUPLICATION_AVAILABLE = False
-    logger.warning(f"⚠️ News Deduplication module not available: {e}")
-    # Mock class for when deduplication is not available
-    class NewsDeduplicator:
-        def __init__(self, db_path, ollama_base_url="http://localhost:11434"):
-            pass
-        def process_articles_for_display(self, hours=24):
-            return {'hero': None, 'mosaic': [], 'duplicates_removed': 0}
+class _MockIntegratedGeopoliticalAnalyzer:
+    def __init__(self, db_path, groq_client=None):
+        pass
+    def generate_comprehensive_geojson(self, **kwargs):
+        return {'error': 'Integrated analyzer not available'}
+
+INTELLIGENCE_AVAILABLE = _lazy('external_intelligence', ['src.intelligence.external_feeds',
+                                                         'src.intelligence.integrated_analyzer'])
+ExternalIntelligenceFeeds = INTELLIGENCE_AVAILABLE.symbol('ExternalIntelligenceFeeds',
+                                                          fallback=_MockExternalIntelligenceFeeds)
+IntegratedGeopoliticalAnalyzer = INTELLIGENCE_AVAILABLE.symbol('IntegratedGeopoliticalAnalyzer',
+                                                               'src.intelligence.integrated_analyzer',
+                                                               fallback=_MockIntegratedGeopoliticalAnalyzer)
+
+# Satellite Integration
+class _MockSatelliteIntegrationManager:
+    def __init__(self):
+        pass
+    def search_images_for_geojson(self, geojson_data, **kwargs):
+        return {'error': 'Satellite integration not available'}
+    def get_satellite_statistics(self):
+        return {'error': 'Satellite integration not available'}
+
+class _MockSentinelHubAPI:
+    def __init__(self, client_id=None, client_secret=None):
+        pass
+    def search_images(self, query_params):
+        return []
+
+class _MockPlanetAPI:
+    def __init__(self, api_key=None):
+        pass
+    def search_images(self, query_params):
+        return []
+
+SATELLITE_AVAILABLE = _lazy('satellite_integration', ['satellite_integration'])
+SatelliteIntegrationManager = SATELLITE_AVAILABLE.symbol('SatelliteIntegrationManager',
+                                                         fallback=_MockSatelliteIntegrationManager)
+SentinelHubAPI = SATELLITE_AVAILABLE.symbol('SentinelHubAPI', fallback=_MockSentinelHubAPI)
+PlanetAPI = SATELLITE_AVAILABLE.symbol('PlanetAPI', fallback=_MockPlanetAPI)
+SatelliteQueryParams = SATELLITE_AVAILABLE.symbol('SatelliteQueryParams')
+SatelliteImage = SATELLITE_AVAILABLE.symbol('SatelliteImage')
+
+# Automated Satellite Monitor
+class _MockAutomatedSatelliteMonitor:
+    def __init__(self, db_path=None, config=None):
+        pass
+    def start_monitoring(self):
+        logger.warning("Automated satellite monitoring not available")
+    def stop_monitoring(self):
+        pass
+    def update_all_zones(self, priority_only=False):
+        return {'processed': 0, 'updated': 0, 'errors': 1, 'skipped': 0}
+    def get_monitoring_statistics(self):
+        return {'error': 'Automated satellite monitoring not available'}
+    def populate_zones_from_geojson_endpoint(self):
+        return 0
+
+class _MockSatelliteRecord:
+    def __init__(self, *args, **kwargs):
+        pass
+
+AUTOMATED_SATELLITE_AVAILABLE = _lazy('automated_satellite_monitor',
+                                      ['src.satellite.automated_satellite_monitor'])
+AutomatedSatelliteMonitor = AUTOMATED_SATELLITE_AVAILABLE.symbol('AutomatedSatelliteMonitor',
+                                                                 fallback=_MockAutomatedSatelliteMonitor)
+ConflictZone = AUTOMATED_SATELLITE_AVAILABLE.symbol('ConflictZone', fallback=_MockSatelliteRecord)
+AutoSatelliteImage = AUTOMATED_SATELLITE_AVAILABLE.symbol('SatelliteImage', fallback=_MockSatelliteRecord)
+
+# ETL System for Geopolitical Conflicts
+class _MockETLController:
+    def __init__(self, db_path=None):
+        pass
+    def get_datasets_catalog(self):
+        return {'error': 'ETL system not available'}
+    def execute_etl_pipeline(self, **kwargs):
+        return {'error': 'ETL system not available'}
+    def get_etl_status(self, job_id=None):
+        return {'error': 'ETL system not available'}
+    def get_critical_events(self, **kwargs):
+        return []
+    def get_analytics_data(self, **kwargs):
+        return {'error': 'ETL system not available'}
+
+def _mock_create_etl_routes(app, etl_controller=None):
+    logger.warning("ETL routes not configured - system not available")
+
+def _mock_get_etl_controller():
+    return _MockETLController()
+
+ETL_AVAILABLE = _lazy('etl_conflicts', ['src.etl.flask_controller', 'src.etl.conflict_data_etl'])
+create_etl_routes = ETL_AVAILABLE.symbol('create_etl_routes', fallback=_mock_create_etl_routes)
+get_etl_controller = ETL_AVAILABLE.symbol('get_etl_controller', fallback=_mock_get_etl_controller)
+ETLController = ETL_AVAILABLE.symbol('ETLController', fallback=_MockETLController)
+ConflictDataETL = ETL_AVAILABLE.symbol('ConflictDataETL', 'src.etl.conflict_data_etl')
+ETLConfig = ETL_AVAILABLE.symbol('ETLConfig', 'src.etl.conflict_data_etl')
+
+# News Deduplication
+class _MockNewsDeduplicator:
+    def __init__(self, db_path, ollama_base_url="http://localhost:11434", embedding_deduplicator=None):
+        pass
+    def process_articles_for_display(self, hours=24):
+        return {'hero': None, 'mosaic': [], 'duplicates_removed': 0}
+
+NEWS_DEDUPLICATION_AVAILABLE = _lazy('news_deduplication', ['src.ai.news_deduplication'])
+NewsDeduplicator = NEWS_DEDUPLICATION_AVAILABLE.symbol('NewsDeduplicator', fallback=_MockNewsDeduplicator)
+
+# Clusters de deduplicación por embeddings (MiniLM del analizador BERT de la ingesta)
+EMBEDDING_DEDUP_AVAILABLE = _lazy('embedding_dedup', ['src.ai.embedding_dedup', 'src.ai.bert_risk_analyzer'],
+                                  [TF_OPTIMIZATIONS])
+ArticleEmbedder = EMBEDDING_DEDUP_AVAILABLE.symbol('ArticleEmbedder')
+get_embedding_deduplicator = EMBEDDING_DEDUP_AVAILABLE.symbol('get_embedding_deduplicator')
+bert_risk_analyzer = EMBEDDING_DEDUP_AVAILABLE.symbol('bert_risk_analyzer', 'src.ai.bert_risk_analyzer')
+
+LAZY_IMPORT_GROUPS = [
+    TF_OPTIMIZATIONS, ORCHESTRATION, HISTORICAL_ANALYSIS, AI_SERVICES, ULTRA_HD_SATELLITE,
+    BERT_ANALYZER, DASHBOARDS, REST_API, IMAGE_EXTRACTOR_AVAILABLE, CCTV_AVAILABLE, CV_AVAILABLE,
+    INTELLIGENCE_AVAILABLE, SATELLITE_AVAILABLE, AUTOMATED_SATELLITE_AVAILABLE, ETL_AVAILABLE,
+    NEWS_DEDUPLICATION_AVAILABLE, EMBEDDING_DEDUP_AVAILABLE,
+]
 
 class RiskMapUnifiedApplication:
     """
     Aplicación web unificada que ejecuta todos los componentes del sistema RiskMap
     """
     
+    # Subsistemas construidos en su primer uso (o al calentarlos) por self.services
+    core_orchestrator = LazyService()
+    historical_orchestrator = LazyService()
+    external_feeds = LazyService()
+    integrated_analyzer = LazyService()
+    satellite_manager = LazyService()
+    automated_satellite_monitor = LazyService()
+    enrichment_system = LazyService()
+    etl_controller = LazyService()
+    cctv_system = LazyService()
+    news_deduplicator = LazyService()
+    task_scheduler = LazyService()
+    
     def __init__(self, config: Dict[str, Any] = None):
         self.config = config or self._get_default_config()
+        self.services = ServiceRegistry(startup_profiler)
         
         # Initialize Flask app
         self.flask_app = Flask(__name__, 
@@ -370,36 +399,19 @@ class RiskMapUnifiedApplication:
             SOCKETIO_AVAILABLE = False
             print("⚠️  Flask-SocketIO no disponible - funciones en tiempo real limitadas")
         
+        # Flask no admite registrar rutas tras servir la primera petición: los
+        # subsistemas pesados (CCTV, dashboards Dash) se montan ya y la
+        # aplicación que los sirve se construye en su primera petición
+        self.lazy_mounts = LazyMounts(self.flask_app.wsgi_app, self.services)
+        self.flask_app.wsgi_app = self.lazy_mounts
+        
         # System components
-        self.core_orchestrator = None
-        self.historical_orchestrator = None
-        self.task_scheduler = None
         self.dash_apps = {}
         
-        # CCTV System
-        self.cctv_system = None
-        
-        # Intelligence modules
-        self.external_feeds = None
-        self.integrated_analyzer = None
-        
-        # Satellite integration
-        self.satellite_manager = None
+        # Satellite integration (creadas junto con satellite_manager)
         self.sentinelhub_api = None
         self.planet_api = None
         
-        # Automated satellite monitoring
-        self.automated_satellite_monitor = None
-        
-        # Intelligent data enrichment system
-        self.enrichment_system = None
-        
-        # ETL System for Geopolitical Conflicts
-        self.etl_controller = None
-        
-        # News deduplication system
-        self.news_deduplicator = None
-        
         # System state
         self.system_state = {
             'core_system_initialized': False,
@@ -456,7 +468,10 @@ class RiskMapUnifiedApplication:
         # Setup application
         self._setup_logging()
         self._create_directories()
+        self._register_services()
         self._setup_flask_routes()
+        with startup_profiler.phase('api_endpoints', 'init'):
+            self._setup_api_endpoints()
         self._setup_signal_handlers()
         
     def _get_default_config(self) -> Dict[str, Any]:
@@ -712,29 +727,33 @@ class RiskMapUnifiedApplication:
         def api_system_status():
             """API: Estado completo del sistema"""
             try:
-                # Get detailed status from all components
+                # Get detailed status from all components (solo de los ya
+                # construidos: consultar el estado no debe inicializarlos)
                 detailed_status = {}
+                core_orchestrator = self.services.peek('core_orchestrator')
+                historical_orchestrator = self.services.peek('historical_orchestrator')
+                external_feeds = self.services.peek('external_feeds')
                 
-                if self.core_orchestrator:
+                if core_orchestrator:
                     try:
-                        core_status = self.core_orchestrator.health_check()
+                        core_status = core_orchestrator.health_check()
                         detailed_status['core_system'] = core_status
                     except Exception as e:
                         detailed_status['core_system'] = {'error': str(e)}
                 
-                if self.historical_orchestrator:
+                if historical_orchestrator:
                     try:
                         historical_status = asyncio.run(
-                            self.historical_orchestrator.get_enhanced_system_status()
+                            historical_orchestrator.get_enhanced_system_status()
                         )
                         detailed_status['historical_system'] = historical_status
                     except Exception as e:
                         detailed_status['historical_system'] = {'error': str(e)}
                 
                 # Add external intelligence status
-                if INTELLIGENCE_AVAILABLE and self.external_feeds:
+                if external_feeds:
                     try:
-                        feeds_stats = self.external_feeds.get_feed_statistics()
+                        feeds_stats = external_feeds.get_feed_statistics()
                         detailed_status['external_intelligence'] = {
                             'available': True,
                             'statistics': feeds_stats,
@@ -744,7 +763,13 @@ class RiskMapUnifiedApplication:
                         detailed_status['external_intelligence'] = {'available': True, 'error': str(e)}
                 else:
                     detailed_status['external_intelligence'] = {'available': False}
-                
+
+                # Métricas del pool SQLite (espera de conexión, bloqueos, cola de escritura)
+                detailed_status['database_pool'] = get_db_pool_metrics()
+
+                # Estado de cada subsistema con carga diferida
+                detailed_status['services'] = self.services.status()
+
                 return jsonify({
                     'success': True,
                     'system_state': self.system_state,
@@ -762,6 +787,49 @@ class RiskMapUnifiedApplication:
                     'error': str(e)
                 })
         
+        @self.flask_app.route('/api/system/services')
+        def api_system_services():
+            """API: Estado de cada subsistema (pending/loading/ready/unavailable/failed) y de sus importaciones"""
+            try:
+                services = self.services.status()
+                return jsonify({
+                    'success': True,
+                    'services': services,
+                    'ready': [name for name, state in services.items() if state['state'] == 'ready'],
+                    'imports': {group.name: group.status() for group in LAZY_IMPORT_GROUPS},
+                    'uptime_seconds': round(time.perf_counter() - startup_profiler.started, 3),
+                    'timestamp': datetime.now().isoformat()
+                })
+            except Exception as e:
+                logger.error(f"Error obteniendo estado de los servicios: {e}")
+                return jsonify({'success': False, 'error': str(e)}), 500
+        
+        @self.flask_app.route('/api/cache/stats')
+        def api_cache_stats():
+            """API: Contadores del cache de dos niveles y del almacén de imágenes"""
+            try:
+                return jsonify({
+                    'success': True,
+                    'cache': get_cache().get_stats(),
+                    'image_store': get_image_store().get_stats(),
+                    'timestamp': datetime.now().isoformat()
+                })
+            except Exception as e:
+                logger.error(f"Error obteniendo estadísticas del cache: {e}")
+                return jsonify({'success': False, 'error': str(e)}), 500
+        
+        @self.flask_app.route('/api/cache/clear', methods=['POST'])
+        @require_admin
+        def api_cache_clear():
+            """API: Vaciar el cache (todo o un namespace)"""
+            try:
+                namespace = request.args.get('namespace')
+                get_cache().clear(namespace)
+                return jsonify({'success': True, 'namespace': namespace or 'all'})
+            except Exception as e:
+                logger.error(f"Error limpiando cache: {e}")
+                return jsonify({'success': False, 'error': str(e)}), 500
+        
         @self.flask_app.route('/api/system/initialize', methods=['POST'])
         def api_initialize_system():
             """API: Inicializar todo el sistema"""
@@ -1128,7 +1196,7 @@ class RiskMapUnifiedApplication:
         def api_article_summary(article_id):
             """API: Obtener resumen de un artículo específico"""
             try:
-                db = sqlite3.connect(self.config_db_path)
+                db = db_connect(self.config_db_path)
                 cursor = db.cursor()
                 
                 # Buscar el artículo por ID
@@ -1261,7 +1329,6 @@ class RiskMapUnifiedApplication:
             """API: Estado del sistema de fallback inteligente"""
             try:
                 from src.ai.intelligent_fallback import get_fallback_stats
-                import sqlite3
                 from datetime import datetime, timedelta
                 
                 # Obtener estadísticas de fallback
@@ -1270,7 +1337,7 @@ class RiskMapUnifiedApplication:
                 # Verificar actividad reciente de enriquecimiento
                 try:
                     db_path = get_database_path()
-                    conn = sqlite3.connect(db_path)
+                    conn = db_connect(db_path)
                     cursor = conn.cursor()
                     
                     # Artículos procesados en los últimos 10 minutos
@@ -1904,12 +1971,8 @@ class RiskMapUnifiedApplication:
                 limit = request.args.get('limit', 20, type=int)
                 offset = request.args.get('offset', 0, type=int)
                 
-                # Primero obtener el artículo héroe para excluirlo
-                hero_articles = self.get_top_articles_from_db(1)
-                hero_id = hero_articles[0]['id'] if hero_articles else None
-                
-                # Obtener artículos del mosaico directamente excluyendo el héroe en la consulta SQL
-                articles = self.get_top_articles_from_db(limit + offset, exclude_hero_id=hero_id)
+                # Una sola lectura del feed: el primer artículo es el héroe y se excluye del mosaico
+                articles = self.get_top_articles_from_db(limit + offset + 1)[1:]
                 
                 # Aplicar offset si es necesario
                 if offset > 0 and len(articles) > offset:
@@ -2141,7 +2204,7 @@ class RiskMapUnifiedApplication:
             """API: Estado de las imágenes en la base de datos"""
             try:
                 db_path = get_database_path()
-                with sqlite3.connect(db_path) as conn:
+                with db_connect(db_path) as conn:
                     cursor = conn.cursor()
                     
                     # Total de artículos
@@ -2197,7 +2260,7 @@ class RiskMapUnifiedApplication:
                 
                 # Obtener datos del artículo
                 db_path = get_database_path()
-                with sqlite3.connect(db_path) as conn:
+                with db_connect(db_path) as conn:
                     cursor = conn.cursor()
                     cursor.execute("SELECT id, title, url FROM articles WHERE id = ?", (article_id,))
                     article_data = cursor.fetchone()
@@ -2277,7 +2340,7 @@ class RiskMapUnifiedApplication:
                 
                 # Obtener artículos con imágenes que podrían necesitar mejora
                 db_path = get_database_path()
-                with sqlite3.connect(db_path) as conn:
+                with db_connect(db_path) as conn:
                     cursor = conn.cursor()
                     cursor.execute("""
                         SELECT id, title, url, image_url
@@ -2340,21 +2403,15 @@ class RiskMapUnifiedApplication:
                 
                 # Importar el servicio de traducción
                 try:
-                    from translation_service import TranslationService, get_database_connection
+                    from translation_service import get_translation_service
                     
-                    # Crear servicio de traducción
-                    db_conn = get_database_connection()
-                    translator = TranslationService(db_conn)
+                    # Servicio compartido: traductores y cache se crean una sola vez
+                    translator = get_translation_service()
                     
                     # Realizar traducción
-                    import asyncio
-                    translated_text, detected_lang = asyncio.run(
-                        translator.translate_text(text_to_translate, target_language)
-                    )
-                    
-                    # Cerrar conexión
-                    if db_conn:
-                        db_conn.close()
+                    translated_text, detected_lang = translator.translate_texts(
+                        [text_to_translate], target_language
+                    )[0]
                     
                     return jsonify({
                         'success': True,
@@ -2440,6 +2497,23 @@ class RiskMapUnifiedApplication:
                     'error': str(e)
                 }), 500
         
+        @self.flask_app.route('/api/translate/stats')
+        def api_translate_stats():
+            """API: Aciertos del cache de traducciones y peticiones al traductor"""
+            try:
+                from translation_service import get_translation_service
+                
+                translator = get_translation_service()
+                return jsonify({
+                    'success': True,
+                    'stats': translator.get_stats(),
+                    'cached_translations': translator.cache.entry_count(),
+                    'timestamp': datetime.now().isoformat()
+                })
+            except Exception as e:
+                logger.error(f"Error obteniendo estadísticas de traducción: {e}")
+                return jsonify({'success': False, 'error': str(e)}), 500
+        
         @self.flask_app.route('/api/translate-articles', methods=['POST'])
         def api_translate_articles():
             """API: Traducir artículos en inglés a español"""
@@ -3093,7 +3167,7 @@ class RiskMapUnifiedApplication:
                 cutoff_date = datetime.now() - timedelta(days=timeframe_days)
                 
                 db_path = get_database_path()
-                with sqlite3.connect(db_path) as conn:
+                with db_connect(db_path) as conn:
                     cursor = conn.cursor()
                     
                     # SOLO artículos con coordenadas REALES - NO GENERAMOS COORDENADAS FALSAS
@@ -3818,7 +3892,7 @@ class RiskMapUnifiedApplication:
                 
                 # Guardar metadatos en base de datos
                 db_path = get_database_path()
-                with sqlite3.connect(db_path) as conn:
+                with db_connect(db_path) as conn:
                     cursor = conn.cursor()
                     
                     # Crear tabla si no existe
@@ -3870,7 +3944,7 @@ class RiskMapUnifiedApplication:
                 db_path = get_database_path()
                 trends = []
                 
-                with sqlite3.connect(db_path) as conn:
+                with db_connect(db_path) as conn:
                     cursor = conn.cursor()
                     
                     # Obtener datos por día para los últimos N días
@@ -3948,62 +4022,65 @@ class RiskMapUnifiedApplication:
                     'error': str(e)
                 }), 500
 
+        @memoize('dashboard', ttl=60)
+        def build_dashboard_stats(db_path):
+            """Estadísticas del dashboard (cacheadas 60s, un solo cálculo concurrente)"""
+            with db_connect(db_path) as conn:
+                cursor = conn.cursor()
+                
+                # Estadísticas básicas
+                cursor.execute("SELECT COUNT(*) FROM articles WHERE is_excluded IS NULL OR is_excluded != 1")
+                total_articles = cursor.fetchone()[0]
+                
+                cursor.execute("SELECT COUNT(*) FROM articles WHERE risk_level = 'high' AND (is_excluded IS NULL OR is_excluded != 1)")
+                high_risk_articles = cursor.fetchone()[0]
+                
+                cursor.execute("SELECT COUNT(DISTINCT country) FROM articles WHERE country IS NOT NULL AND (is_excluded IS NULL OR is_excluded != 1)")
+                countries_affected = cursor.fetchone()[0]
+                
+                # Artículos por nivel de riesgo
+                cursor.execute("""
+                    SELECT risk_level, COUNT(*) 
+                    FROM articles 
+                    WHERE risk_level IS NOT NULL AND (is_excluded IS NULL OR is_excluded != 1)
+                    GROUP BY risk_level
+                """)
+                risk_distribution = dict(cursor.fetchall())
+                
+                # Últimas 24 horas
+                cursor.execute("""
+                    SELECT COUNT(*) 
+                    FROM articles 
+                    WHERE datetime(published_at) > datetime('now', '-1 day')
+                    AND (is_excluded IS NULL OR is_excluded != 1)
+                """)
+                articles_24h = cursor.fetchone()[0]
+                
+                # Zonas de conflicto activas
+                try:
+                    cursor.execute("SELECT COUNT(*) FROM conflict_zones")
+                    active_zones = cursor.fetchone()[0]
+                except:
+                    active_zones = 0
+                
+                return {
+                    'total_articles': total_articles,
+                    'high_risk_articles': high_risk_articles,
+                    'countries_affected': countries_affected,
+                    'articles_last_24h': articles_24h,
+                    'active_conflict_zones': active_zones,
+                    'risk_distribution': risk_distribution,
+                    'last_updated': datetime.now().isoformat()
+                }
+
         @self.flask_app.route('/api/dashboard/stats')
         def api_dashboard_stats():
             """API: Estadísticas principales para el dashboard"""
             try:
-                db_path = get_database_path()
-                
-                with sqlite3.connect(db_path) as conn:
-                    cursor = conn.cursor()
-                    
-                    # Estadísticas básicas
-                    cursor.execute("SELECT COUNT(*) FROM articles WHERE is_excluded IS NULL OR is_excluded != 1")
-                    total_articles = cursor.fetchone()[0]
-                    
-                    cursor.execute("SELECT COUNT(*) FROM articles WHERE risk_level = 'high' AND (is_excluded IS NULL OR is_excluded != 1)")
-                    high_risk_articles = cursor.fetchone()[0]
-                    
-                    cursor.execute("SELECT COUNT(DISTINCT country) FROM articles WHERE country IS NOT NULL AND (is_excluded IS NULL OR is_excluded != 1)")
-                    countries_affected = cursor.fetchone()[0]
-                    
-                    # Artículos por nivel de riesgo
-                    cursor.execute("""
-                        SELECT risk_level, COUNT(*) 
-                        FROM articles 
-                        WHERE risk_level IS NOT NULL AND (is_excluded IS NULL OR is_excluded != 1)
-                        GROUP BY risk_level
-                    """)
-                    risk_distribution = dict(cursor.fetchall())
-                    
-                    # Últimas 24 horas
-                    cursor.execute("""
-                        SELECT COUNT(*) 
-                        FROM articles 
-                        WHERE datetime(published_at) > datetime('now', '-1 day')
-                        AND (is_excluded IS NULL OR is_excluded != 1)
-                    """)
-                    articles_24h = cursor.fetchone()[0]
-                    
-                    # Zonas de conflicto activas
-                    try:
-                        cursor.execute("SELECT COUNT(*) FROM conflict_zones")
-                        active_zones = cursor.fetchone()[0]
-                    except:
-                        active_zones = 0
-                    
-                    return jsonify({
-                        'success': True,
-                        'stats': {
-                            'total_articles': total_articles,
-                            'high_risk_articles': high_risk_articles,
-                            'countries_affected': countries_affected,
-                            'articles_last_24h': articles_24h,
-                            'active_conflict_zones': active_zones,
-                            'risk_distribution': risk_distribution,
-                            'last_updated': datetime.now().isoformat()
-                        }
-                    })
+                return jsonify({
+                    'success': True,
+                    'stats': build_dashboard_stats(get_database_path())
+                })
                     
             except Exception as e:
                 logger.error(f"Error obteniendo estadísticas del dashboard: {e}")
@@ -4039,7 +4116,7 @@ class RiskMapUnifiedApplication:
                 
                 db_path = get_database_path()
                 
-                with sqlite3.connect(db_path) as conn:
+                with db_connect(db_path) as conn:
                     cursor = conn.cursor()
                     
                     # VERIFICAR si existe la tabla conflict_zones
@@ -4184,7 +4261,7 @@ class RiskMapUnifiedApplication:
                 
                 db_path = get_database_path()
                 
-                with sqlite3.connect(db_path) as conn:
+                with db_connect(db_path) as conn:
                     cursor = conn.cursor()
                     
                     # Verificar si existe la tabla conflict_zones
@@ -4302,7 +4379,7 @@ class RiskMapUnifiedApplication:
                 status_filter = request.args.get('status', 'all')  # 'completed', 'processing', 'all'
                 
                 db_path = get_database_path()
-                with sqlite3.connect(db_path) as conn:
+                with db_connect(db_path) as conn:
                     cursor = conn.cursor()
                     
                     # Usar la tabla satellite_detections_new que tiene las coordenadas
@@ -4964,7 +5041,7 @@ class RiskMapUnifiedApplication:
                 
                 # Obtener zonas de la base de datos
                 db_path = get_database_path()
-                with sqlite3.connect(db_path) as conn:
+                with db_connect(db_path) as conn:
                     cursor = conn.cursor()
                     
                     cursor.execute("""
@@ -5049,7 +5126,7 @@ class RiskMapUnifiedApplication:
             try:
                 # Obtener estadísticas reales de la base de datos
                 db_path = get_database_path()
-                with sqlite3.connect(db_path) as conn:
+                with db_connect(db_path) as conn:
                     cursor = conn.cursor()
                     
                     # Imágenes procesadas hoy
@@ -5120,52 +5197,52 @@ class RiskMapUnifiedApplication:
             """API: Obtener detecciones satelitales recientes con imágenes"""
             try:
                 db_path = get_database_path()
-                with sqlite3.connect(db_path) as conn:
+                with db_connect(db_path) as conn:
                     cursor = conn.cursor()
-                
-                # Buscar detecciones recientes con alta confianza
-                cursor.execute("""
-                    SELECT 
-                        sd.id,
-                        sd.detection_type,
-                        sd.confidence,
-                        sd.detection_time,
-                        sd.latitude,
-                        sd.longitude,
-                        sd.model_name,
-                        sd.description,
-                        si.image_url,
-                        si.image_metadata
-                    FROM satellite_detections sd
-                    LEFT JOIN satellite_images si ON sd.image_id = si.id
-                    WHERE sd.confidence > 0.6
-                    ORDER BY sd.detection_time DESC
-                    LIMIT 15
-                """)
-                
-                detections = []
-                for row in cursor.fetchall():
-                    detection_id, detection_type, confidence, detection_time, lat, lon, model, description, image_url, metadata = row
-                    
-                    # Determinar ubicación legible
-                    location = self._get_location_name(lat, lon) if lat and lon else "Ubicación desconocida"
-                    
-                    # Construir objeto de detección
-                    detection = {
-                        'id': detection_id,
-                        'title': f"Detección {detection_type.title()}" if detection_type else "Detección Satelital",
-                        'type': detection_type or 'unknown',
-                        'confidence': int(confidence * 100) if confidence else 0,
-                        'timestamp': detection_time,
-                        'latitude': lat,
-                        'longitude': lon,
-                        'coordinates': f"{lat:.4f}, {lon:.4f}" if lat and lon else "N/A",
-                        'location': location,
-                        'model': model or "Modelo IA",
-                        'details': description or "Análisis automático de imagen satelital",
-                        'image_url': image_url or "/static/images/satellite-placeholder.jpg"
-                    }
-                    detections.append(detection)
+
+                    # Buscar detecciones recientes con alta confianza
+                    cursor.execute("""
+                        SELECT 
+                            sd.id,
+                            sd.detection_type,
+                            sd.confidence,
+                            sd.detection_time,
+                            sd.latitude,
+                            sd.longitude,
+                            sd.model_name,
+                            sd.description,
+                            si.image_url,
+                            si.image_metadata
+                        FROM satellite_detections sd
+                        LEFT JOIN satellite_images si ON sd.image_id = si.id
+                        WHERE sd.confidence > 0.6
+                        ORDER BY sd.detection_time DESC
+                        LIMIT 15
+                    """)
+
+                    detections = []
+                    for row in cursor.fetchall():
+                        detection_id, detection_type, confidence, detection_time, lat, lon, model, description, image_url, metadata = row
+
+                        # Determinar ubicación legible
+                        location = self._get_location_name(lat, lon) if lat and lon else "Ubicación desconocida"
+
+                        # Construir objeto de detección
+                        detection = {
+                            'id': detection_id,
+                            'title': f"Detección {detection_type.title()}" if detection_type else "Detección Satelital",
+                            'type': detection_type or 'unknown',
+                            'confidence': int(confidence * 100) if confidence else 0,
+                            'timestamp': detection_time,
+                            'latitude': lat,
+                            'longitude': lon,
+                            'coordinates': f"{lat:.4f}, {lon:.4f}" if lat and lon else "N/A",
+                            'location': location,
+                            'model': model or "Modelo IA",
+                            'details': description or "Análisis automático de imagen satelital",
+                            'image_url': image_url or "/static/images/satellite-placeholder.jpg"
+                        }
+                        detections.append(detection)
                 
                 return jsonify({
                     'success': True,
@@ -5188,54 +5265,54 @@ class RiskMapUnifiedApplication:
             """API: Feed en tiempo real de actividades satelitales"""
             try:
                 db_path = get_database_path()
-                with sqlite3.connect(db_path) as conn:
+                with db_connect(db_path) as conn:
                     cursor = conn.cursor()
-                
-                # Obtener actividades recientes (últimas 2 horas)
-                cursor.execute("""
-                    SELECT 
-                        'detection' as type,
-                        detection_type as activity,
-                        detection_time as timestamp,
-                        confidence,
-                        latitude,
-                        longitude,
-                        model_name as source
-                    FROM satellite_detections 
-                    WHERE datetime(detection_time) > datetime('now', '-2 hours')
-                    
-                    UNION ALL
-                    
-                    SELECT 
-                        'processing' as type,
-                        'image_processed' as activity,
-                        processed_at as timestamp,
-                        NULL as confidence,
-                        latitude,
-                        longitude,
-                        'Sistema' as source
-                    FROM satellite_images 
-                    WHERE datetime(processed_at) > datetime('now', '-2 hours')
-                    
-                    ORDER BY timestamp DESC
-                    LIMIT 50
-                """)
-                
-                activities = []
-                for row in cursor.fetchall():
-                    activity_type, activity, timestamp, confidence, lat, lon, source = row
-                    
-                    if activity_type == 'detection':
-                        message = f"Nueva detección: {activity} (Confianza: {int(confidence*100) if confidence else 0}%)"
-                    else:
-                        message = f"Imagen procesada en {self._get_location_name(lat, lon) if lat and lon else 'zona monitoreada'}"
-                    
-                    activities.append({
-                        'type': activity_type,
-                        'message': message,
-                        'timestamp': timestamp,
-                        'source': source
-                    })
+
+                    # Obtener actividades recientes (últimas 2 horas)
+                    cursor.execute("""
+                        SELECT 
+                            'detection' as type,
+                            detection_type as activity,
+                            detection_time as timestamp,
+                            confidence,
+                            latitude,
+                            longitude,
+                            model_name as source
+                        FROM satellite_detections 
+                        WHERE datetime(detection_time) > datetime('now', '-2 hours')
+
+                        UNION ALL
+
+                        SELECT 
+                            'processing' as type,
+                            'image_processed' as activity,
+                            processed_at as timestamp,
+                            NULL as confidence,
+                            latitude,
+                            longitude,
+                            'Sistema' as source
+                        FROM satellite_images 
+                        WHERE datetime(processed_at) > datetime('now', '-2 hours')
+
+                        ORDER BY timestamp DESC
+                        LIMIT 50
+                    """)
+
+                    activities = []
+                    for row in cursor.fetchall():
+                        activity_type, activity, timestamp, confidence, lat, lon, source = row
+
+                        if activity_type == 'detection':
+                            message = f"Nueva detección: {activity} (Confianza: {int(confidence*100) if confidence else 0}%)"
+                        else:
+                            message = f"Imagen procesada en {self._get_location_name(lat, lon) if lat and lon else 'zona monitoreada'}"
+
+                        activities.append({
+                            'type': activity_type,
+                            'message': message,
+                            'timestamp': timestamp,
+                            'source': source
+                        })
                 
                 return jsonify({
                     'success': True,
@@ -5807,7 +5884,7 @@ class RiskMapUnifiedApplication:
                 logger.info("Obteniendo imágenes de la galería satelital")
                 
                 db_path = get_database_path()
-                with sqlite3.connect(db_path) as conn:
+                with db_connect(db_path) as conn:
                     cursor = conn.cursor()
                     
                     # Obtener imágenes satelitales reales de las zonas de conflicto
@@ -5929,7 +6006,7 @@ class RiskMapUnifiedApplication:
                 logger.info("Obteniendo alertas críticas satelitales")
                 
                 db_path = get_database_path()
-                with sqlite3.connect(db_path) as conn:
+                with db_connect(db_path) as conn:
                     cursor = conn.cursor()
                     
                     # Obtener alertas críticas (detecciones con alta confianza)
@@ -6013,7 +6090,7 @@ class RiskMapUnifiedApplication:
                 logger.info("Obteniendo línea de tiempo de análisis")
                 
                 db_path = get_database_path()
-                with sqlite3.connect(db_path) as conn:
+                with db_connect(db_path) as conn:
                     cursor = conn.cursor()
                     
                     # Obtener análisis recientes
@@ -6094,7 +6171,7 @@ class RiskMapUnifiedApplication:
                 logger.info("Obteniendo predicciones de evolución")
                 
                 db_path = get_database_path()
-                with sqlite3.connect(db_path) as conn:
+                with db_connect(db_path) as conn:
                     cursor = conn.cursor()
                     
                     # Obtener datos históricos para predicciones
@@ -6267,7 +6344,7 @@ class RiskMapUnifiedApplication:
                 logger.info("📸 Obteniendo galería Ultra HD completa")
                 
                 # Obtener todas las imágenes analizadas
-                conn = sqlite3.connect(ultra_hd_system.db_path)
+                conn = db_connect(ultra_hd_system.db_path)
                 cursor = conn.cursor()
                 
                 cursor.execute('''
@@ -6686,7 +6763,7 @@ class RiskMapUnifiedApplication:
             try:
                 logger.info("🚨 Obteniendo alertas Ultra HD")
                 
-                conn = sqlite3.connect(ultra_hd_system.db_path)
+                conn = db_connect(ultra_hd_system.db_path)
                 cursor = conn.cursor()
                 
                 # Obtener alertas críticas (detecciones militares y de alta confianza)
@@ -7132,7 +7209,7 @@ class RiskMapUnifiedApplication:
                 cutoff_date = datetime.now() - timedelta(days=timeframe_days)
                 
                 db_path = get_database_path()
-                with sqlite3.connect(db_path) as conn:
+                with db_connect(db_path) as conn:
                     cursor = conn.cursor()
                     
                     # Obtener conflictos REALES de la base de datos
@@ -7256,7 +7333,7 @@ class RiskMapUnifiedApplication:
                 real_alerts = []
                 threat_level = "LOW"
                 
-                with sqlite3.connect(db_path) as conn:
+                with db_connect(db_path) as conn:
                     cursor = conn.cursor()
                     
                     # Alertas de últimas 24 horas con criterios REALES
@@ -7396,7 +7473,7 @@ class RiskMapUnifiedApplication:
                 cutoff_date = datetime.now() - timedelta(days=days_back)
                 
                 db_path = get_database_path()
-                with sqlite3.connect(db_path) as conn:
+                with db_connect(db_path) as conn:
                     cursor = conn.cursor()
                     
                     # Análisis ejecutivo basado en datos REALES
@@ -7454,10 +7531,7 @@ class RiskMapUnifiedApplication:
                     """, (cutoff_date.strftime('%Y-%m-%d %H:%M:%S'),))
                     
                     daily_trends = cursor.fetchall()
-                
-                # Usar AI para generar análisis narrativo si está disponible
-                narrative_analysis = ""
-                try:
+
                     # Obtener algunos artículos relevantes para el análisis
                     cursor.execute("""
                         SELECT title, content, country, risk_level 
@@ -7469,7 +7543,10 @@ class RiskMapUnifiedApplication:
                     """, (cutoff_date.strftime('%Y-%m-%d %H:%M:%S'),))
                     
                     relevant_articles = cursor.fetchall()
-                    
+                
+                # Usar AI para generar análisis narrativo si está disponible
+                narrative_analysis = ""
+                try:
                     # Generar análisis con IA
                     articles_text = "\n".join([f"- {art[0]}: {art[1][:200]}..." for art in relevant_articles])
                     analysis_prompt = f"""Basándote en estos eventos geopolíticos de los últimos {days_back} días, genera un análisis ejecutivo profesional:
@@ -7544,28 +7621,31 @@ Proporciona un análisis conciso de las tendencias principales, riesgos identifi
                 
                 # Guardar reporte en base de datos
                 try:
-                    cursor.execute("""
-                        CREATE TABLE IF NOT EXISTS executive_reports (
-                            id TEXT PRIMARY KEY,
-                            report_type TEXT,
-                            content_json TEXT,
-                            generated_at DATETIME,
-                            period_days INTEGER
-                        )
-                    """)
-                    
-                    cursor.execute("""
-                        INSERT INTO executive_reports (id, report_type, content_json, generated_at, period_days)
-                        VALUES (?, ?, ?, ?, ?)
-                    """, (
-                        executive_report['id'],
-                        report_type,
-                        json.dumps(executive_report, ensure_ascii=False),
-                        datetime.now().isoformat(),
-                        days_back
-                    ))
+                    with db_connect(db_path) as conn:
+                        cursor = conn.cursor()
+
+                        cursor.execute("""
+                            CREATE TABLE IF NOT EXISTS executive_reports (
+                                id TEXT PRIMARY KEY,
+                                report_type TEXT,
+                                content_json TEXT,
+                                generated_at DATETIME,
+                                period_days INTEGER
+                            )
+                        """)
                     
-                    conn.commit()
+                        cursor.execute("""
+                            INSERT INTO executive_reports (id, report_type, content_json, generated_at, period_days)
+                            VALUES (?, ?, ?, ?, ?)
+                        """, (
+                            executive_report['id'],
+                            report_type,
+                            json.dumps(executive_report, ensure_ascii=False),
+                            datetime.now().isoformat(),
+                            days_back
+                        ))
+                    
+                        conn.commit()
                     logger.info(f"✅ Reporte ejecutivo {report_type} generado y guardado")
                     
                 except Exception as db_error:
@@ -7591,7 +7671,7 @@ Proporciona un análisis conciso de las tendencias principales, riesgos identifi
                 limit = request.args.get('limit', 20, type=int)
                 
                 db_path = get_database_path()
-                with sqlite3.connect(db_path) as conn:
+                with db_connect(db_path) as conn:
                     cursor = conn.cursor()
                     
                     # Verificar si la tabla existe
@@ -7641,7 +7721,7 @@ Proporciona un análisis conciso de las tendencias principales, riesgos identifi
             """API: Obtener reporte ejecutivo específico"""
             try:
                 db_path = get_database_path()
-                with sqlite3.connect(db_path) as conn:
+                with db_connect(db_path) as conn:
                     cursor = conn.cursor()
                     
                     cursor.execute("""
@@ -7701,7 +7781,7 @@ Proporciona un análisis conciso de las tendencias principales, riesgos identifi
                 if article_id and not analysis.get('error'):
                     try:
                         db_path = get_database_path()
-                        with sqlite3.connect(db_path) as conn:
+                        with db_connect(db_path) as conn:
                             cursor = conn.cursor()
                             
                             # Crear tabla para análisis de CV si no existe
@@ -7766,7 +7846,7 @@ Proporciona un análisis conciso de las tendencias principales, riesgos identifi
                 
                 # Obtener artículos con imágenes para analizar
                 db_path = get_database_path()
-                with sqlite3.connect(db_path) as conn:
+                with db_connect(db_path) as conn:
                     cursor = conn.cursor()
                     
                     # Obtener artículos que tienen imagen pero no análisis CV
@@ -7817,7 +7897,7 @@ Proporciona un análisis conciso de las tendencias principales, riesgos identifi
             """API: Obtener análisis CV de un artículo específico"""
             try:
                 db_path = get_database_path()
-                with sqlite3.connect(db_path) as conn:
+                with db_connect(db_path) as conn:
                     cursor = conn.cursor()
                     
                     # First, ensure the table exists
@@ -7844,34 +7924,34 @@ Proporciona un análisis conciso de las tendencias principales, riesgos identifi
                     
                     result = cursor.fetchone()
                 
-                if not result:
-                    # Check if article exists at all
-                    cursor.execute("SELECT title, image_url FROM articles WHERE id = ?", (article_id,))
-                    article = cursor.fetchone()
-                    
-                    if not article:
+                    if not result:
+                        # Check if article exists at all
+                        cursor.execute("SELECT title, image_url FROM articles WHERE id = ?", (article_id,))
+                        article = cursor.fetchone()
+
+                        if not article:
+                            return jsonify({
+                                'success': False,
+                                'error': f'Article {article_id} not found'
+                            }), 404
+
+                        # Article exists but no analysis - generate fallback
+                        title, image_url = article
+                        fallback_analysis = {
+                            'objects': [],
+                            'scene_analysis': 'No detailed analysis available',
+                            'interest_score': 0.5,
+                            'positioning_type': 'standard'
+                        }
+
                         return jsonify({
-                            'success': False,
-                            'error': f'Article {article_id} not found'
-                        }), 404
-                    
-                    # Article exists but no analysis - generate fallback
-                    title, image_url = article
-                    fallback_analysis = {
-                        'objects': [],
-                        'scene_analysis': 'No detailed analysis available',
-                        'interest_score': 0.5,
-                        'positioning_type': 'standard'
-                    }
-                    
-                    return jsonify({
-                        'success': True,
-                        'analysis': fallback_analysis,
-                        'quality_score': 0.5,
-                        'positioning_recommendation': 'center',
-                        'created_at': None,
-                        'is_fallback': True
-                    })
+                            'success': True,
+                            'analysis': fallback_analysis,
+                            'quality_score': 0.5,
+                            'positioning_recommendation': 'center',
+                            'created_at': None,
+                            'is_fallback': True
+                        })
                 
                 analysis_json, quality_score, positioning, created_at = result
                 
@@ -7909,7 +7989,7 @@ Proporciona un análisis conciso de las tendencias principales, riesgos identifi
             """API: Analizar imagen de un artículo específico en tiempo real"""
             try:
                 db_path = get_database_path()
-                with sqlite3.connect(db_path) as conn:
+                with db_connect(db_path) as conn:
                     cursor = conn.cursor()
                     
                     # Get article info
@@ -8013,7 +8093,7 @@ Proporciona un análisis conciso de las tendencias principales, riesgos identifi
                 limit = request.args.get('limit', 20, type=int)
                 
                 db_path = get_database_path()
-                with sqlite3.connect(db_path) as conn:
+                with db_connect(db_path) as conn:
                     cursor = conn.cursor()
                     
                     # Obtener artículos con análisis CV para posicionamiento
@@ -8071,7 +8151,7 @@ Proporciona un análisis conciso de las tendencias principales, riesgos identifi
             """API: Obtener información básica de un artículo para debugging"""
             try:
                 db_path = get_database_path()
-                with sqlite3.connect(db_path) as conn:
+                with db_connect(db_path) as conn:
                     cursor = conn.cursor()
                     
                     cursor.execute("""
@@ -8126,7 +8206,7 @@ Proporciona un análisis conciso de las tendencias principales, riesgos identifi
             """API: Obtener detalles completos de un artículo incluyendo resumen auto-generado"""
             try:
                 db_path = get_database_path()
-                with sqlite3.connect(db_path) as conn:
+                with db_connect(db_path) as conn:
                     cursor = conn.cursor()
                     
                     cursor.execute("""
@@ -8207,7 +8287,7 @@ Proporciona un análisis conciso de las tendencias principales, riesgos identifi
                 cutoff_date = datetime.now() - timedelta(days=timeframe_days)
                 
                 db_path = get_database_path()
-                with sqlite3.connect(db_path) as conn:
+                with db_connect(db_path) as conn:
                     cursor = conn.cursor()
                     
                     cursor.execute("""
@@ -8275,7 +8355,7 @@ Proporciona un análisis conciso de las tendencias principales, riesgos identifi
                 
                 db_path = get_database_path()
                 
-                with sqlite3.connect(db_path) as conn:
+                with db_connect(db_path) as conn:
                     cursor = conn.cursor()
                     
                     # Verificar si existe la tabla acled_events
@@ -8384,27 +8464,28 @@ Proporciona un análisis conciso de las tendencias principales, riesgos identifi
         def data_images(filename):
             return send_from_directory('data/images', filename)
         
-        # CCTV System Integration
-        if CCTV_AVAILABLE:
-            try:
-                register_cctv_routes(self.flask_app, self.socketio)
-                logger.info("✅ Rutas del sistema CCTV registradas correctamente")
-            except Exception as e:
-                logger.error(f"⚠️  Error registrando rutas CCTV: {e}")
-        else:
-            # Mock CCTV routes when system is not available
-            @self.flask_app.route('/cctv')
-            def cctv_main():
-                return render_template('cctv_unavailable.html',
-                                     system_state=self.system_state,
-                                     config=self.config)
-            
-            @self.flask_app.route('/api/cams/<path:endpoint>')
-            def cctv_api_mock(endpoint):
-                return jsonify({
-                    'error': 'Sistema CCTV no disponible',
-                    'message': 'Las dependencias del sistema CCTV no están instaladas'
-                }), 503
+        # CCTV System Integration: la aplicación CCTV (cams, TensorFlow) se
+        # construye en la primera petición a estos prefijos o al calentar
+        for prefix in ('/cams', '/cctv', '/api/cams'):
+            self.lazy_mounts.mount(prefix, 'cctv_app', strip_prefix=False)
+        
+        # Rutas servidas cuando el sistema CCTV no está disponible
+        @self.flask_app.route('/cctv')
+        def cctv_main():
+            return render_template('cctv_unavailable.html',
+                                 system_state=self.system_state,
+                                 config=self.config)
+        
+        @self.flask_app.route('/api/cams/<path:endpoint>')
+        def cctv_api_mock(endpoint):
+            return jsonify({
+                'error': 'Sistema CCTV no disponible',
+                'message': 'Las dependencias del sistema CCTV no están instaladas'
+            }), 503
+        
+        # Dashboards Dash integrados, construidos en su primera petición o al calentar
+        self.lazy_mounts.mount('/dash/historical', 'historical_dashboard')
+        self.lazy_mounts.mount('/dash/multivariate', 'multivariate_dashboard')
     
     def _is_publisher_location(self, location: str) -> bool:
         """Verificar si una ubicación es la sede de un medio de comunicación"""
@@ -8420,65 +8501,44 @@ Proporciona un análisis conciso de las tendencias principales, riesgos identifi
         
         return any(pub_loc in location_lower for pub_loc in publisher_locations)
     
-    def _initialize_dash_apps(self):
-        """Inicializar y integrar aplicaciones Dash"""
-        try:
-            logger.info("Initializing integrated Dash applications...")
-            
-            # Historical Dashboard
-            if self.config['historical_dashboard_integrated']:
-                self.dash_apps['historical'] = HistoricalDashboard(
-                    data_source=self.historical_orchestrator.data_integrator if self.historical_orchestrator else None,
-                    port=None
-                )
-                self._integrate_dash_app(self.dash_apps['historical'].app, '/dash/historical/')
-            
-            # Multivariate Dashboard
-            if self.config['multivariate_dashboard_integrated']:
-                self.dash_apps['multivariate'] = MultivariateRelationshipDashboard(
-                    data_integrator=self.historical_orchestrator.multivariate_integrator if self.historical_orchestrator else None,
-                    relationship_analyzer=self.historical_orchestrator.relationship_analyzer if self.historical_orchestrator else None,
-                    port=None
-                )
-                self._integrate_dash_app(self.dash_apps['multivariate'].app, '/dash/multivariate/')
-            
-            self.system_state['dashboards_ready'] = True
-            logger.info("Dash applications integrated successfully")
-            
-        except Exception as e:
-            logger.error(f"Error initializing Dash apps: {e}")
+    def _create_historical_dashboard(self):
+        """Historical Dash dashboard, served under /dash/historical/"""
+        if not self.config['historical_dashboard_integrated']:
+            return None
+        historical = self.historical_orchestrator
+        self.dash_apps['historical'] = HistoricalDashboard(
+            data_source=historical.data_integrator if historical else None,
+            port=None
+        )
+        return self._dash_wsgi_app(self.dash_apps['historical'].app, '/dash/historical/')
     
-    def _integrate_dash_app(self, dash_app, url_base_pathname):
-        """Integrar una aplicación Dash en Flask"""
-        try:
-            dash_app.config.update({
-                'requests_pathname_prefix': url_base_pathname,
-                'url_base_pathname': url_base_pathname,
-            })
-            dash_app.server = self.flask_app
-            
-            # Register Dash routes with Flask
-            for rule in dash_app.server.url_map.iter_rules():
-                if rule.endpoint.startswith('dash'):
-                    continue
-                
-                # Create new rule for Dash app
-                new_rule = f"{url_base_pathname.rstrip('/')}{rule.rule}"
-                self.flask_app.add_url_rule(
-                    new_rule,
-                    f"dash_{rule.endpoint}",
-                    dash_app.server.view_functions[rule.endpoint],
-                    methods=rule.methods
-                )
-            
-        except Exception as e:
-            logger.error(f"Error integrating Dash app: {e}")
+    def _create_multivariate_dashboard(self):
+        """Multivariate Dash dashboard, served under /dash/multivariate/"""
+        if not self.config['multivariate_dashboard_integrated']:
+            return None
+        historical = self.historical_orchestrator
+        self.dash_apps['multivariate'] = MultivariateRelationshipDashboard(
+            data_integrator=historical.multivariate_integrator if historical else None,
+            relationship_analyzer=historical.relationship_analyzer if historical else None,
+            port=None
+        )
+        return self._dash_wsgi_app(self.dash_apps['multivariate'].app, '/dash/multivariate/')
+    
+    def _dash_wsgi_app(self, dash_app, url_base_pathname):
+        """Servidor Flask propio de una app Dash montada bajo ``url_base_pathname``"""
+        # Las rutas de Dash quedan en la raíz de su servidor (LazyMounts pasa el
+        # prefijo a SCRIPT_NAME); el navegador debe pedirlas con el prefijo
+        dash_app.config.update({'requests_pathname_prefix': url_base_pathname})
+        self.system_state['dashboards_ready'] = True
+        return dash_app.server
     
     def _setup_api_endpoints(self):
         """Configurar endpoints de API REST"""
         try:
-            if self.config['enable_api'] and self.core_orchestrator:
-                api_blueprint = create_api_blueprint(self.core_orchestrator)
+            # Se registra antes de arrancar el servidor; el orquestador se
+            # construye cuando una petición lo necesita
+            if self.config['enable_api']:
+                api_blueprint = create_api_blueprint(ServiceProxy(self.services, 'core_orchestrator'))
                 self.flask_app.register_blueprint(api_blueprint, url_prefix='/api/v1')
                 self.system_state['api_ready'] = True
                 logger.info("API endpoints registered successfully")
@@ -8686,160 +8746,217 @@ Proporciona un análisis conciso de las tendencias principales, riesgos identifi
             self.enrichment_system = None
             return False
     
-    def _initialize_all_systems(self):
-        """Inicializar todos los sistemas del RiskMap"""
+    def _register_services(self):
+        """Registrar las factorías de los subsistemas (en el orden de arranque)"""
+        self.services.register('core_orchestrator', self._create_core_orchestrator)
+        self.services.register('historical_orchestrator', self._create_historical_orchestrator)
+        self.services.register('external_feeds', self._create_external_feeds)
+        self.services.register('integrated_analyzer', self._create_integrated_analyzer)
+        self.services.register('satellite_manager', self._create_satellite_manager)
+        self.services.register('automated_satellite_monitor',
+                               lambda: self.satellite_manager and self.services.peek('automated_satellite_monitor'))
+        self.services.register('enrichment_system', self._create_enrichment_system)
+        self.services.register('etl_controller', self._create_etl_controller)
+        self.services.register('cctv_system', self._create_cctv_system)
+        self.services.register('cctv_app', self._create_cctv_app)
+        self.services.register('news_deduplicator', self._create_news_deduplicator)
+        self.services.register('task_scheduler', lambda: TaskScheduler(self.core_orchestrator))
+        self.services.register('historical_dashboard', self._create_historical_dashboard)
+        self.services.register('multivariate_dashboard', self._create_multivariate_dashboard)
+    
+    def _create_core_orchestrator(self):
+        """Core orchestrator (RSS ingestion, NLP processing)"""
+        logger.info("Initializing core orchestration system...")
+        core_orchestrator = GeopoliticalIntelligenceOrchestrator()
+        
+        # Test core system
+        health_status = core_orchestrator.health_check()
+        if health_status.get('overall_status') in ['healthy', 'degraded']:
+            logger.info("Core system initialized successfully")
+        else:
+            logger.warning("Core system initialization completed with warnings")
+        self.system_state['core_system_initialized'] = True  # Continue anyway
+        return core_orchestrator
+    
+    def _create_historical_orchestrator(self):
+        """Enhanced historical orchestrator"""
+        logger.info("Initializing enhanced historical analysis system...")
+        historical_orchestrator = EnhancedHistoricalOrchestrator()
+        
+        historical_init = asyncio.run(historical_orchestrator.initialize_enhanced_system())
+        if historical_init['status'] in ['success', 'partial_success']:
+            logger.info("Historical analysis system initialized successfully")
+        else:
+            logger.warning("Historical system initialization completed with warnings")
+        self.system_state['historical_system_initialized'] = True  # Continue anyway
+        return historical_orchestrator
+    
+    def _create_external_feeds(self):
+        """External intelligence feeds"""
+        logger.info("Initializing external intelligence feeds...")
+        if not INTELLIGENCE_AVAILABLE:
+            logger.warning("External intelligence modules not available")
+            self.system_state['external_intelligence_initialized'] = False
+            return None
         try:
-            logger.info("Initializing all RiskMap systems...")
-            self.system_state['system_status'] = 'initializing'
+            external_feeds = ExternalIntelligenceFeeds(get_database_path())
+            self.system_state['external_intelligence_initialized'] = True
+            return external_feeds
+        except Exception as e:
+            logger.warning(f"External intelligence initialization failed: {e}")
+            self.system_state['external_intelligence_initialized'] = False
+            return None
+    
+    def _create_integrated_analyzer(self):
+        """Integrated analyzer (with the core orchestrator's Groq client if available)"""
+        if not INTELLIGENCE_AVAILABLE:
+            return None
+        try:
+            groq_client = getattr(self.core_orchestrator, 'groq_client', None)
+            integrated_analyzer = IntegratedGeopoliticalAnalyzer(get_database_path(), groq_client)
+            logger.info("External intelligence modules initialized successfully")
+            return integrated_analyzer
+        except Exception as e:
+            logger.warning(f"Integrated analyzer initialization failed: {e}")
+            return None
+    
+    def _create_satellite_manager(self):
+        """Satellite integration (APIs, manager and automated monitor)"""
+        logger.info("Initializing satellite integration system...")
+        self._initialize_satellite_system()
+        return self.services.peek('satellite_manager')
+    
+    def _create_enrichment_system(self):
+        """Intelligent data enrichment system"""
+        logger.info("Initializing intelligent data enrichment system...")
+        self._initialize_enrichment_system()
+        return self.services.peek('enrichment_system')
+    
+    def _create_etl_controller(self):
+        """ETL system for geopolitical conflicts"""
+        logger.info("Initializing ETL system for geopolitical conflicts...")
+        try:
+            if not ETL_AVAILABLE:
+                logger.warning("ETL system not available - using mock implementation")
+                self.system_state['etl_system_initialized'] = False
+                return None
             
-            # 1. Initialize core orchestrator (RSS ingestion, NLP processing)
-            logger.info("Initializing core orchestration system...")
-            self.core_orchestrator = GeopoliticalIntelligenceOrchestrator()
+            etl_controller = get_etl_controller()
             
-            # Test core system
-            health_status = self.core_orchestrator.health_check()
-            if health_status.get('overall_status') in ['healthy', 'degraded']:
-                self.system_state['core_system_initialized'] = True
-                logger.info("Core system initialized successfully")
+            # Test ETL system
+            etl_status = etl_controller.get_etl_status()
+            if etl_status.get('system_status') in ['operational', 'warning']:
+                logger.info("ETL system initialized successfully")
             else:
-                logger.warning("Core system initialization completed with warnings")
-                self.system_state['core_system_initialized'] = True  # Continue anyway
-            
-            # 2. Load existing data from database for immediate display
-            logger.info("Loading existing data from database...")
-            self._load_existing_data()
-            
-            # 3. Initialize enhanced historical orchestrator
-            logger.info("Initializing enhanced historical analysis system...")
-            self.historical_orchestrator = EnhancedHistoricalOrchestrator()
-            
-            # Initialize historical system
-            historical_init = asyncio.run(
-                self.historical_orchestrator.initialize_enhanced_system()
-            )
+                logger.warning("ETL system initialization completed with warnings")
+            self.system_state['etl_system_initialized'] = True  # Continue anyway
+            return etl_controller
+        except Exception as e:
+            logger.error(f"Error initializing ETL system: {e}")
+            self.system_state['etl_system_initialized'] = False
+            return None
+    
+    def _create_cctv_system(self):
+        """CCTV surveillance system"""
+        logger.info("Initializing CCTV surveillance system...")
+        try:
+            if not CCTV_AVAILABLE:
+                logger.warning("CCTV system not available - using mock implementation")
+                self.system_state['cctv_system_initialized'] = False
+                return None
             
-            if historical_init['status'] in ['success', 'partial_success']:
-                self.system_state['historical_system_initialized'] = True
-                logger.info("Historical analysis system initialized successfully")
-            else:
-                logger.warning("Historical system initialization completed with warnings")
-                self.system_state['historical_system_initialized'] = True  # Continue anyway
+            # Initialize CCTV system with configuration
+            cctv_config = {
+                'data_dir': 'data',
+                'static_dir': 'static',
+                'gpu_device': self.config.get('gpu_device', 'cpu'),
+                'fps_analyze': self.config.get('fps_analyze', 2),
+                'alert_clip_seconds': self.config.get('alert_clip_seconds', 30)
+            }
+            cctv_system = CCTVSystem(cctv_config)
             
-            # 4. Initialize external intelligence feeds and integrated analyzer
-            logger.info("Initializing external intelligence feeds...")
-            if INTELLIGENCE_AVAILABLE:
-                try:
-                    db_path = get_database_path()
-                    self.external_feeds = ExternalIntelligenceFeeds(db_path)
-                    
-                    # Initialize with Groq client if available
-                    groq_client = None
-                    if hasattr(self.core_orchestrator, 'groq_client'):
-                        groq_client = self.core_orchestrator.groq_client
-                    
-                    self.integrated_analyzer = IntegratedGeopoliticalAnalyzer(db_path, groq_client)
-                    
-                    logger.info("External intelligence modules initialized successfully")
-                    self.system_state['external_intelligence_initialized'] = True
-                except Exception as e:
-                    logger.warning(f"External intelligence initialization failed: {e}")
-                    self.system_state['external_intelligence_initialized'] = False
+            # Test CCTV system initialization
+            system_status = cctv_system.get_system_status()
+            if system_status.get('status') in ['ready', 'operational']:
+                logger.info("CCTV system initialized successfully")
+                
+                # Update statistics
+                stats = system_status.get('statistics', {})
+                self.system_state['statistics']['cctv_cameras_monitored'] = stats.get('cameras_available', 0)
             else:
-                logger.warning("External intelligence modules not available")
-                self.system_state['external_intelligence_initialized'] = False
-            
-            # 5. Initialize satellite integration system
-            logger.info("Initializing satellite integration system...")
-            self._initialize_satellite_system()
-            
-            # 6. Initialize intelligent data enrichment system
-            logger.info("Initializing intelligent data enrichment system...")
-            self._initialize_enrichment_system()
-            
-            # 6. Initialize ETL system for geopolitical conflicts
-            logger.info("Initializing ETL system for geopolitical conflicts...")
-            try:
-                if ETL_AVAILABLE:
-                    self.etl_controller = get_etl_controller()
-                    
-                    # Test ETL system
-                    etl_status = self.etl_controller.get_etl_status()
-                    if etl_status.get('system_status') in ['operational', 'warning']:
-                        self.system_state['etl_system_initialized'] = True
-                        logger.info("ETL system initialized successfully")
-                    else:
-                        logger.warning("ETL system initialization completed with warnings")
-                        self.system_state['etl_system_initialized'] = True  # Continue anyway
-                else:
-                    logger.warning("ETL system not available - using mock implementation")
-                    self.system_state['etl_system_initialized'] = False
-            except Exception as e:
-                logger.error(f"Error initializing ETL system: {e}")
-                self.system_state['etl_system_initialized'] = False
-            
-            # 7. Initialize CCTV system
-            logger.info("Initializing CCTV surveillance system...")
-            try:
-                if CCTV_AVAILABLE:
-                    # Initialize CCTV system with configuration
-                    cctv_config = {
-                        'data_dir': 'data',
-                        'static_dir': 'static',
-                        'gpu_device': self.config.get('gpu_device', 'cpu'),
-                        'fps_analyze': self.config.get('fps_analyze', 2),
-                        'alert_clip_seconds': self.config.get('alert_clip_seconds', 30)
-                    }
-                    
-                    self.cctv_system = CCTVSystem(cctv_config)
-                    
-                    # Test CCTV system initialization
-                    system_status = self.cctv_system.get_system_status()
-                    if system_status.get('status') in ['ready', 'operational']:
-                        self.system_state['cctv_system_initialized'] = True
-                        logger.info("CCTV system initialized successfully")
-                        
-                        # Update statistics
-                        stats = system_status.get('statistics', {})
-                        self.system_state['statistics']['cctv_cameras_monitored'] = stats.get('cameras_available', 0)
-                        
-                    else:
-                        logger.warning("CCTV system initialization completed with warnings")
-                        self.system_state['cctv_system_initialized'] = True  # Continue anyway
-                else:
-                    logger.warning("CCTV system not available - using mock implementation")
-                    self.system_state['cctv_system_initialized'] = False
-            except Exception as e:
-                logger.error(f"Error initializing CCTV system: {e}")
-                self.system_state['cctv_system_initialized'] = False
-                self.cctv_system = None
-            
-            # 8. Initialize news deduplication system
-            logger.info("Initializing news deduplication system...")
-            try:
-                if NEWS_DEDUPLICATION_AVAILABLE:
-                    db_path = self.config['database_path']
-                    ollama_url = self.config.get('ollama_base_url', 'http://localhost:11434')
-                    self.news_deduplicator = NewsDeduplicator(db_path, ollama_url)
-                    self.system_state['news_deduplication_initialized'] = True
-                    logger.info("News deduplication system initialized successfully")
-                else:
-                    logger.warning("News deduplication system not available - using mock implementation")
-                    self.system_state['news_deduplication_initialized'] = False
-            except Exception as e:
-                logger.error(f"Error initializing news deduplication system: {e}")
+                logger.warning("CCTV system initialization completed with warnings")
+            self.system_state['cctv_system_initialized'] = True  # Continue anyway
+            return cctv_system
+        except Exception as e:
+            logger.error(f"Error initializing CCTV system: {e}")
+            self.system_state['cctv_system_initialized'] = False
+            return None
+    
+    def _create_cctv_app(self):
+        """CCTV routes in their own Flask app, mounted on /cams, /cctv and /api/cams"""
+        if not CCTV_AVAILABLE:
+            return None
+        cctv_app = Flask(__name__,
+                         template_folder='src/web/templates',
+                         static_folder=None)
+        cctv_app.secret_key = self.flask_app.secret_key
+        register_cctv_routes(cctv_app, self.socketio)
+        logger.info("✅ Rutas del sistema CCTV registradas correctamente")
+        return cctv_app
+    
+    def _create_embedding_deduplicator(self, db_path):
+        """Embedding deduplicator sharing the ingestion MiniLM model (None if unavailable)"""
+        if not EMBEDDING_DEDUP_AVAILABLE:
+            logger.warning("Embedding deduplication not available - falling back to title comparison")
+            return None
+        try:
+            embedder = ArticleEmbedder.from_bert_analyzer(bert_risk_analyzer)
+            return get_embedding_deduplicator(db_path, embedder) if embedder else None
+        except Exception as e:
+            logger.error(f"Error initializing embedding deduplicator: {e}")
+            return None
+    
+    def _create_news_deduplicator(self):
+        """News deduplication system"""
+        logger.info("Initializing news deduplication system...")
+        try:
+            if not NEWS_DEDUPLICATION_AVAILABLE:
+                logger.warning("News deduplication system not available - using mock implementation")
                 self.system_state['news_deduplication_initialized'] = False
+                return None
             
-            # 9. Initialize task scheduler
-            logger.info("Initializing task scheduler...")
-            self.task_scheduler = TaskScheduler(self.core_orchestrator)
+            db_path = self.config['database_path']
+            ollama_url = self.config.get('ollama_base_url', 'http://localhost:11434')
+            news_deduplicator = NewsDeduplicator(db_path, ollama_url,
+                                                 embedding_deduplicator=self._create_embedding_deduplicator(db_path))
+            self.system_state['news_deduplication_initialized'] = True
+            logger.info("News deduplication system initialized successfully")
+            return news_deduplicator
+        except Exception as e:
+            logger.error(f"Error initializing news deduplication system: {e}")
+            self.system_state['news_deduplication_initialized'] = False
+            return None
+    
+    def _initialize_all_systems(self):
+        """
+        Inicializar todos los sistemas del RiskMap. Los subsistemas que ya
+        se construyeron en su primer uso no se vuelven a crear.
+        """
+        try:
+            logger.info("Initializing all RiskMap systems...")
+            self.system_state['system_status'] = 'initializing'
             
-            # 10. Setup API endpoints
-            self._setup_api_endpoints()
+            # 1. Load existing data from database for immediate display
+            logger.info("Loading existing data from database...")
+            with startup_profiler.phase('load_existing_data', 'init'):
+                self._load_existing_data()
             
-            # 11. Initialize Dash applications with existing data
-            self._initialize_dash_apps()
+            # 2. Build every registered subsystem (orchestrators, intelligence,
+            #    satellite, enrichment, ETL, CCTV, deduplication, task scheduler,
+            #    dashboards). Their routes were registered before the server started.
+            self.services.warm_up(stop_event=self.shutdown_event)
             
-            # 12. Start background processes if enabled (for continuous updates)
+            # 3. Start background processes if enabled (for continuous updates)
             if self.config['enable_background_tasks']:
                 self._start_background_processes()
             
@@ -8855,6 +8972,7 @@ Proporciona un análisis conciso de las tendencias principales, riesgos identifi
                 'etl_system': self.system_state['etl_system_initialized'],
                 'dashboards': self.system_state['dashboards_ready'],
                 'api': self.system_state['api_ready'],
+                'services': self.services.status(),
                 'existing_data_loaded': True
             }
             
@@ -8863,6 +8981,28 @@ Proporciona un análisis conciso de las tendencias principales, riesgos identifi
             logger.error(f"Error initializing systems: {e}")
             raise
     
+    def _warm_up_after_server_start(self, timeout: float = 30.0):
+        """
+        Esperar a que el servidor HTTP acepte conexiones y después calentar
+        todos los subsistemas en segundo plano.
+        """
+        host = self.config['flask_host']
+        if host in ('0.0.0.0', ''):
+            host = '127.0.0.1'
+        deadline = time.time() + timeout
+        while time.time() < deadline and not self.shutdown_event.is_set():
+            try:
+                with socket.create_connection((host, self.config['flask_port']), timeout=1):
+                    break
+            except OSError:
+                time.sleep(0.2)
+        else:
+            logger.warning(f"⚠️ El servidor no respondió en {timeout:.0f}s; calentando igualmente los subsistemas")
+        
+        logger.info(f"🔥 Servidor levantado en {time.perf_counter() - startup_profiler.started:.2f}s; "
+                    f"calentando subsistemas en segundo plano")
+        return self._initialize_all_systems()
+    
     def _start_background_processes(self):
         """Iniciar procesos automáticos en background"""
         try:
@@ -8904,6 +9044,9 @@ Proporciona un análisis conciso de las tendencias principales, riesgos identifi
                 except Exception as e:
                     logger.error(f"Error starting enrichment system: {e}")
             
+            # Backfill de los artículos existentes en el índice FTS y el feed del dashboard
+            self._run_background_task('index_backfill', self._run_index_backfill)
+            
             # Start maintenance cycle
             self._run_background_task('maintenance', self._run_maintenance_cycle)
             
@@ -9085,7 +9228,7 @@ Proporciona un análisis conciso de las tendencias principales, riesgos identifi
                 logger.warning(f"Base de datos no encontrada: {db_path}")
                 return {'success': False, 'error': 'Database not found'}
             
-            conn = sqlite3.connect(db_path)
+            conn = db_connect(db_path)
             cursor = conn.cursor()
             
             # Buscar artículos que probablemente están en inglés
@@ -9122,73 +9265,71 @@ Proporciona un análisis conciso de las tendencias principales, riesgos identifi
             
             # Importar servicio de traducción local
             try:
-                from translation_service import translate_text_robust
-                translation_available = True
-                logger.info("✅ Servicio de traducción robusto disponible")
+                from translation_service import get_translation_service
+                translator = get_translation_service()
+                logger.info("✅ Servicio de traducción por lotes disponible")
             except Exception as e:
-                translation_available = False
-                logger.warning(f"⚠️ Servicio de traducción robusto no disponible: {e}")
+                translator = None
+                logger.warning(f"⚠️ Servicio de traducción por lotes no disponible: {e}")
                 logger.info("🔄 Usando traducción básica interna")
             
-            for article_id, title, content, summary, source in articles_to_translate:
+            # Detectar artículos en inglés y reunir todos sus campos en un único lote
+            english_articles = [row for row in articles_to_translate if self._is_likely_english(row[1] or '')]
+            slots = []
+            for position, (article_id, title, content, summary, source) in enumerate(english_articles):
+                if title and self._is_likely_english(title):
+                    slots.append((position, 'title', title))
+                # Traducir contenido (solo primeros 500 caracteres para eficiencia)
+                if content and self._is_likely_english(content):
+                    slots.append((position, 'content', content[:500]))
+                if summary and self._is_likely_english(summary):
+                    slots.append((position, 'summary', summary))
+            
+            translated_fields = {}
+            if translator and slots:
                 try:
-                    # Detectar si está en inglés
-                    if not self._is_likely_english(title or ''):
-                        continue
-                    
-                    logger.info(f"Traduciendo artículo {article_id}: {(title or '')[:50]}...")
-                    
-                    # Traducir campos
-                    translated_title = title
-                    translated_content = content
-                    translated_summary = summary
-                    
-                    if translation_available:
-                        try:
-                            # Traducir título
-                            if title and self._is_likely_english(title):
-                                translated_title, _ = translate_text_robust(title, 'es')
-                            
-                            # Traducir contenido (solo primeros 500 caracteres para eficiencia)
-                            if content and self._is_likely_english(content):
-                                content_snippet = content[:500] + ('...' if len(content) > 500 else '')
-                                translated_content_snippet, _ = translate_text_robust(content_snippet, 'es')
-                                # Reemplazar solo el inicio del contenido
-                                translated_content = translated_content_snippet + (content[500:] if len(content) > 500 else '')
-                            
-                            # Traducir resumen
-                            if summary and self._is_likely_english(summary):
-                                translated_summary, _ = translate_text_robust(summary, 'es')
-                        except Exception as translation_error:
-                            logger.warning(f"⚠️ Error con traducción robusta para artículo {article_id}: {translation_error}")
-                            # Usar traducción básica como fallback
-                            translated_title = self._basic_translate(title or '')
-                            translated_summary = self._basic_translate(summary or '')
+                    # Frases repetidas entre artículos se traducen una vez; el resto sale del cache
+                    translated = translator.batch_translator.translate_batch(
+                        [text for _, _, text in slots], 'en', 'es')
+                    for (position, field, _), translated_text in zip(slots, translated):
+                        translated_fields[(position, field)] = translated_text
+                    logger.info(f"📊 Métricas de traducción: {translator.get_stats()}")
+                except Exception as translation_error:
+                    logger.warning(f"⚠️ Error con traducción por lotes: {translation_error}")
+                    translator = None
+            
+            updates = []
+            for position, (article_id, title, content, summary, source) in enumerate(english_articles):
+                try:
+                    if translator:
+                        translated_title = translated_fields.get((position, 'title'), title)
+                        translated_summary = translated_fields.get((position, 'summary'), summary)
+                        translated_content = content
+                        if (position, 'content') in translated_fields:
+                            # Reemplazar solo el inicio del contenido
+                            translated_content = translated_fields[(position, 'content')] + content[500:]
                     else:
                         # Traducción básica usando diccionario simple
                         translated_title = self._basic_translate(title or '')
+                        translated_content = content
                         translated_summary = self._basic_translate(summary or '')
                     
-                    # Actualizar en la base de datos
-                    cursor.execute("""
-                        UPDATE articles 
-                        SET title = ?, content = ?, summary = ?, 
-                            original_language = 'en', is_translated = 1
-                        WHERE id = ?
-                    """, (translated_title, translated_content, translated_summary, article_id))
-                    
-                    translated_count += 1
-                    logger.info(f"✅ Artículo {article_id} traducido exitosamente")
-                    
-                    # Pausa para no sobrecargar
-                    import time
-                    time.sleep(1)
+                    updates.append((translated_title, translated_content, translated_summary, article_id))
                     
                 except Exception as e:
                     logger.error(f"❌ Error traduciendo artículo {article_id}: {e}")
                     errors += 1
                     continue
             
+            # Actualizar en la base de datos
+            cursor.executemany("""
+                UPDATE articles 
+                SET title = ?, content = ?, summary = ?, 
+                    original_language = 'en', is_translated = 1
+                WHERE id = ?
+            """, updates)
+            translated_count = len(updates)
+            
             # Confirmar cambios
             conn.commit()
             conn.close()
@@ -9420,6 +9561,17 @@ Proporciona un análisis conciso de las tendencias principales, riesgos identifi
                 logger.error(f"Error in maintenance cycle: {e}")
                 self.shutdown_event.wait(3600)  # Wait 1 hour before retry
     
+    def _run_index_backfill(self):
+        """Rellenar en lotes el índice FTS y el feed del dashboard creados al arrancar"""
+        from src.utils.fulltext_search import backfill_fts_index
+        from src.utils.dashboard_feed import backfill_dashboard_feed
+        
+        db_path = get_database_path()
+        return {
+            'fts': backfill_fts_index(db_path),
+            'dashboard_feed': backfill_dashboard_feed(db_path),
+        }
+    
     def _load_existing_data(self):
         """Cargar datos existentes de la base de datos para mostrar resultados inmediatamente"""
         try:
@@ -9429,7 +9581,6 @@ Proporciona un análisis conciso de las tendencias principales, riesgos identifi
                 # Get database connection and load existing articles
                 try:
                     # Import database utilities
-                    import sqlite3
                     from pathlib import Path
                     
                     # Check if database exists
@@ -9439,7 +9590,7 @@ Proporciona un análisis conciso de las tendencias principales, riesgos identifi
                         return
                     
                     # Connect to database
-                    conn = sqlite3.connect(str(db_path))
+                    conn = db_connect(str(db_path))
                     cursor = conn.cursor()
                     
                     # Get article statistics
@@ -9507,13 +9658,12 @@ Proporciona un análisis conciso de las tendencias principales, riesgos identifi
             if self.core_orchestrator:
                 # Update statistics from database
                 try:
-                    import sqlite3
                     from pathlib import Path
                     
                     # Use absolute path to ensure we find the database
                     db_path = os.path.join(os.getcwd(), 'data', 'geopolitical_intel.db')
                     if os.path.exists(db_path):
-                        conn = sqlite3.connect(db_path)
+                        conn = db_connect(db_path)
                         cursor = conn.cursor()
                         
                         # Get updated statistics
@@ -10002,8 +10152,6 @@ RESPONDE ÚNICAMENTE CON UN OBJETO JSON VÁLIDO con esta estructura exacta:
             list: Lista de artículos desde la base de datos
         """
         try:
-            import sqlite3
-            
             # Obtener ruta de la base de datos usando la función correcta
             try:
                 from src.utils.config import get_database_path
@@ -10015,207 +10163,38 @@ RESPONDE ÚNICAMENTE CON UN OBJETO JSON VÁLIDO con esta estructura exacta:
                 logger.warning(f"Base de datos no encontrada en: {db_path}")
                 return self._get_real_articles_from_db(limit)
             
-            conn = sqlite3.connect(db_path)
-            cursor = conn.cursor()
+            from src.utils.dashboard_feed import ensure_dashboard_feed, get_dashboard_articles
             
-            # FILTROS ULTRA ESTRICTOS: SOLO IMÁGENES DE FUENTES DE NOTICIAS REALES + CONTENIDO GEOPOLÍTICO
-            base_filters = """
-                WHERE (is_excluded IS NULL OR is_excluded != 1)
-                AND (image_url IS NOT NULL AND image_url != '' 
-                     AND image_url NOT LIKE '%placeholder%'
-                     AND image_url NOT LIKE '%default%'
-                     AND image_url NOT LIKE '%noimage%'
-                     AND image_url NOT LIKE '%unsplash.com%'
-                     AND image_url NOT LIKE '%pexels.com%'
-                     AND image_url NOT LIKE '%pixabay.com%'
-                     AND image_url NOT LIKE '%fallback%'
-                     AND image_url NOT LIKE '%stock%'
-                     AND image_url NOT LIKE '%generic%'
-                     AND image_url NOT LIKE 'data:image%'
-                     AND (image_url LIKE '%reuters.com%' 
-                          OR image_url LIKE '%bbc.co.uk%'
-                          OR image_url LIKE '%cnn.com%'
-                          OR image_url LIKE '%apnews.com%'
-                          OR image_url LIKE '%france24.com%'
-                          OR image_url LIKE '%aljazeera.com%'
-                          OR image_url LIKE '%bloomberg.com%'
-                          OR image_url LIKE '%theguardian.com%'
-                          OR image_url LIKE '%washingtonpost.com%'
-                          OR image_url LIKE '%nytimes.com%'
-                          OR image_url LIKE '%ft.com%'
-                          OR image_url LIKE '%wsj.com%'
-                          OR image_url LIKE '%elmundo.es%'
-                          OR image_url LIKE '%elpais.com%'
-                          OR image_url LIKE '%lavanguardia.com%'
-                          OR image_url LIKE '%abc.es%'
-                          OR image_url LIKE '%marca.com%'
-                          OR image_url LIKE '%expansion.com%'))
-                AND (language = 'es' OR 
-                     (is_translated = 1 AND original_language IS NOT NULL))
-                AND (title NOT LIKE '%meteor%' 
-                     AND title NOT LIKE '%asteroid%'
-                     AND title NOT LIKE '%space%'
-                     AND title NOT LIKE '%sports%'
-                     AND title NOT LIKE '%deporte%'
-                     AND title NOT LIKE '%football%'
-                     AND title NOT LIKE '%soccer%'
-                     AND title NOT LIKE '%tennis%'
-                     AND title NOT LIKE '%basketball%'
-                     AND title NOT LIKE '%olympic%'
-                     AND title NOT LIKE '%celebrity%'
-                     AND title NOT LIKE '%entertainment%'
-                     AND title NOT LIKE '%weather%'
-                     AND title NOT LIKE '%climate%' 
-                     AND title NOT LIKE '%technology%'
-                     AND title NOT LIKE '%tech%'
-                     AND title NOT LIKE '%gadget%'
-                     AND title NOT LIKE '%iphone%'
-                     AND title NOT LIKE '%samsung%'
-                     AND title NOT LIKE '%health%'
-                     AND title NOT LIKE '%medical%'
-                     AND title NOT LIKE '%covid%'
-                     AND title NOT LIKE '%vaccine%')
-            """
+            conn = db_connect(db_path)
             
-            # Si hay un ID de artículo HERO para excluir, agregarlo a los filtros
-            if exclude_hero_id:
-                base_filters += f" AND id != {exclude_hero_id}"
-            
-            # Si es para el artículo hero (limit=1), usar lógica especial
-            if limit == 1:
-                # Artículo hero: SOLO ALTO RIESGO, CON IMAGEN ORIGINAL, EN ESPAÑOL
-                hero_query = f"""
-                    SELECT id, title, content, url, source, published_at, 
-                           country, region, risk_level, conflict_type, 
-                           sentiment_score, summary, risk_score, image_url
-                    FROM articles 
-                    {base_filters}
-                    AND risk_level = 'high'
-                    ORDER BY 
-                        CASE 
-                            WHEN risk_score IS NOT NULL THEN risk_score 
-                            ELSE 0.8
-                        END DESC,
-                        datetime(published_at) DESC,
-                        id DESC
-                    LIMIT 1
-                """
-                
-                cursor.execute(hero_query)
-                hero_result = cursor.fetchone()
-                
-                # Si no hay artículos de alto riesgo, buscar medium pero MANTENIENDO FILTROS ESTRICTOS
-                if not hero_result:
-                    hero_query = f"""
-                        SELECT id, title, content, url, source, published_at, 
-                               country, region, risk_level, conflict_type, 
-                               sentiment_score, summary, risk_score, image_url
-                        FROM articles 
-                        {base_filters}
-                        AND risk_level = 'medium'
-                        ORDER BY 
-                            CASE 
-                                WHEN risk_score IS NOT NULL THEN risk_score 
-                                ELSE 0.5
-                            END DESC,
-                            datetime(published_at) DESC,
-                            id DESC
-                        LIMIT 1
-                    """
-                    
-                    cursor.execute(hero_query)
-                    hero_result = cursor.fetchone()
-                
-                # SOLO SI NO HAY artículos medium, buscar cualquiera pero MANTENIENDO FILTROS ESTRICTOS
-                if not hero_result:
-                    hero_query = f"""
-                        SELECT id, title, content, url, source, published_at, 
-                               country, region, risk_level, conflict_type, 
-                               sentiment_score, summary, risk_score, image_url
-                        FROM articles 
-                        {base_filters}
-                        ORDER BY 
-                            CASE 
-                                WHEN risk_level = 'high' THEN 1
-                                WHEN risk_level = 'medium' THEN 2
-                                WHEN risk_level = 'low' THEN 3
-                                ELSE 4
-                            END,
-                            CASE 
-                                WHEN risk_score IS NOT NULL THEN risk_score 
-                                ELSE 0.0
-                            END DESC,
-                            datetime(published_at) DESC,
-                            id DESC
-                        LIMIT 1
-                    """
-                    
-                    cursor.execute(hero_query)
-                    hero_result = cursor.fetchone()
-                
-                if hero_result:
-                    rows = [hero_result]
-                else:
-                    # SI NO HAY ARTÍCULOS QUE CUMPLAN CRITERIOS, NO MOSTRAR NADA
-                    logger.warning("⚠️ No se encontraron artículos HERO con imagen original y en español")
-                    rows = []
-            else:
-                # Consulta normal para múltiples artículos (PRIORIZA ALTO RIESGO + SIN DUPLICADOS)
-                query = f"""
-                    SELECT id, title, content, url, source, published_at, 
-                           country, region, risk_level, conflict_type, 
-                           sentiment_score, summary, risk_score, image_url
-                    FROM articles 
-                    {base_filters}
-                    GROUP BY image_url  -- EVITAR IMÁGENES DUPLICADAS EN MOSAICO
-                    HAVING COUNT(*) = 1
-                    ORDER BY 
-                        CASE 
-                            WHEN risk_level = 'high' THEN 1
-                            WHEN risk_level = 'medium' THEN 2
-                            WHEN risk_level = 'low' THEN 3
-                            ELSE 4
-                        END,
-                        CASE 
-                            WHEN risk_score IS NOT NULL THEN risk_score 
-                            ELSE 0.0
-                        END DESC,
-                        datetime(published_at) DESC,
-                        id DESC
-                    LIMIT ?
-                """
-                cursor.execute(query, (limit * 2,))  # Obtener más para tener opciones después del filtrado
-                all_rows = cursor.fetchall()
-                
-                # Filtrar duplicados adicionales manualmente
-                seen_images = set()
-                rows = []
-                for row in all_rows:
-                    if row[13] not in seen_images:  # row[13] es image_url
-                        seen_images.add(row[13])
-                        rows.append(row)
-                        if len(rows) >= limit:
-                            break
+            # Elegibilidad (imagen de fuente original + español + temática geopolítica)
+            # y prioridad se precalculan al escribir; aquí solo se lee el índice
+            if not getattr(self, '_dashboard_feed_ready', False):
+                ensure_dashboard_feed(conn)
+                self._dashboard_feed_ready = True
+            
+            # El artículo HERO es simplemente el primero del feed (alto riesgo primero)
+            rows = get_dashboard_articles(conn, limit, exclude_id=exclude_hero_id)
             
             articles = []
             
             for row in rows:
                 article = {
-                    'id': row[0],
-                    'title': row[1] or 'Sin título',
-                    'content': row[2] or 'Sin contenido',
-                    'url': row[3],
-                    'source': row[4] or 'Fuente desconocida',
-                    'published_at': row[5],
-                    'country': row[6] or 'Global',
-                    'region': row[7] or 'Internacional',
-                    'risk_level': row[8] or 'unknown',
-                    'conflict_type': row[9],
-                    'sentiment_score': row[10] or 0.0,
-                    'summary': row[11],
-                    'risk_score': row[12] or 0.0,
-                    'image_url': row[13],  # SOLO IMÁGENES DE FUENTES ORIGINALES
-                    'location': row[6] or row[7] or 'Global'
+                    'id': row['id'],
+                    'title': row['title'] or 'Sin título',
+                    'content': row['content'] or 'Sin contenido',
+                    'url': row['url'],
+                    'source': row['source'] or 'Fuente desconocida',
+                    'published_at': row['published_at'],
+                    'country': row['country'] or 'Global',
+                    'region': row['region'] or 'Internacional',
+                    'risk_level': row['risk_level'] or 'unknown',
+                    'conflict_type': row['conflict_type'],
+                    'sentiment_score': row['sentiment_score'] or 0.0,
+                    'summary': row['summary'],
+                    'risk_score': row['risk_score'] or 0.0,
+                    'image_url': row['image_url'],  # SOLO IMÁGENES DE FUENTES ORIGINALES
+                    'location': row['country'] or row['region'] or 'Global'
                 }
                 articles.append(article)
             
@@ -10425,7 +10404,7 @@ La estabilidad internacional dependerá de la capacidad de los líderes mundiale
         """
         try:
             db_path = get_database_path()
-            with sqlite3.connect(db_path) as conn:
+            with db_connect(db_path) as conn:
                 cursor = conn.cursor()
                 
                 # Verificar y añadir columnas necesarias
@@ -11152,8 +11131,9 @@ La estabilidad internacional dependerá de la capacidad de los líderes mundiale
             self._create_templates()
             
             # Auto-initialize if enabled
+            # (los subsistemas se calientan cuando el servidor ya acepta conexiones)
             if self.config['auto_initialize']:
-                self._run_background_task('auto_initialize', self._initialize_all_systems)
+                self._run_background_task('auto_initialize', self._warm_up_after_server_start)
             
             # Print startup information
             print("\n" + "="*80)
@@ -11394,29 +11374,34 @@ La estabilidad internacional dependerá de la capacidad de los líderes mundiale
         try:
             logger.info("Stopping RiskMap Unified Application...")
             
+            # Set shutdown event (el calentamiento deja de construir servicios)
+            self.shutdown_event.set()
+            
+            # Solo se detiene lo que ya está construido: peek() no importa ni
+            # construye subsistemas que el calentamiento aún no ha cargado
+            automated_satellite_monitor = self.services.peek('automated_satellite_monitor')
+            enrichment_system = self.services.peek('enrichment_system')
+            
             # Stop satellite monitoring
-            if AUTOMATED_SATELLITE_AVAILABLE and self.automated_satellite_monitor:
+            if automated_satellite_monitor:
                 try:
                     logger.info("Stopping automated satellite monitoring...")
-                    self.automated_satellite_monitor.stop_monitoring()
+                    automated_satellite_monitor.stop_monitoring()
                     self.system_state['satellite_monitoring_running'] = False
                     logger.info("✅ Automated satellite monitoring stopped")
                 except Exception as e:
                     logger.error(f"Error stopping satellite monitoring: {e}")
             
             # Stop enrichment system
-            if self.enrichment_system:
+            if enrichment_system:
                 try:
                     logger.info("Stopping enrichment system...")
-                    self.enrichment_system.stop_automatic_enrichment()
+                    enrichment_system.stop_automatic_enrichment()
                     self.system_state['enrichment_running'] = False
                     logger.info("✅ Enrichment system stopped")
                 except Exception as e:
                     logger.error(f"Error stopping enrichment system: {e}")
             
-            # Set shutdown event
-            self.shutdown_event.set();
-            
             # Wait for background threads to finish
             for thread_name, thread in self.background_threads.items():
                 if thread.is_alive():
@@ -11848,53 +11833,26 @@ La estabilidad internacional dependerá de la capacidad de los líderes mundiale
             return False
     
     def _download_and_save_image(self, image_url, article_id, source_type):
-        """Descargar y guardar imagen"""
+        """Descargar (vía almacén compartido de imágenes) y publicar en static/"""
         try:
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-            }
-            response = requests.get(image_url, headers=headers, timeout=15)
-            response.raise_for_status()
+            # El almacén valida el content-type y no vuelve a descargar URLs conocidas
+            stored = get_image_store().fetch(image_url)
+            if stored is None:
+                logger.warning(f"URL no es una imagen o no se pudo descargar: {image_url}")
+                return None
             
-            # Verificar que es una imagen
-            content_type = response.headers.get('Content-Type', '')
-            if not content_type.startswith('image/'):
-                logger.warning(f"URL no es una imagen: {content_type}")
+            # Verificar que la imagen tiene un tamaño razonable
+            if stored.size <= 1000:  # Al menos 1KB
                 return None
             
-            # Crear directorio de imágenes si no existe
+            # Publicar en static/ con nombre por contenido (sha256): la misma
+            # imagen usada por varios artículos se guarda una sola vez
             images_dir = Path("static/images/articles")
-            images_dir.mkdir(parents=True, exist_ok=True)
-            
-            # Determinar extensión
-            if 'jpeg' in content_type or 'jpg' in content_type:
-                ext = '.jpg'
-            elif 'png' in content_type:
-                ext = '.png'
-            elif 'webp' in content_type:
-                ext = '.webp'
-            elif 'gif' in content_type:
-                ext = '.gif'
-            else:
-                ext = '.jpg'
-            
-            # Generar nombre de archivo único
-            filename = f"article_{article_id}_{source_type}_{int(time.time())}{ext}"
-            file_path = images_dir / filename
+            file_path = get_image_store().link_into(stored, images_dir)
             
-            # Guardar imagen
-            with open(file_path, 'wb') as f:
-                f.write(response.content)
-            
-            # Verificar que la imagen se guardó correctamente
-            if file_path.exists() and file_path.stat().st_size > 1000:  # Al menos 1KB
-                relative_path = f"static/images/articles/{filename}"
-                logger.info(f"Imagen guardada: {relative_path}")
-                return relative_path
-            else:
-                if file_path.exists():
-                    file_path.unlink()
-                return None
+            relative_path = f"static/images/articles/{file_path.name}"
+            logger.info(f"Imagen guardada para artículo {article_id} ({source_type}): {relative_path}")
+            return relative_path
                 
         except Exception as e:
             logger.error(f"Error descargando imagen {image_url}: {e}")
@@ -11904,7 +11862,7 @@ La estabilidad internacional dependerá de la capacidad de los líderes mundiale
         """Actualizar la imagen del artículo en la base de datos"""
         try:
             db_path = get_database_path()
-            with sqlite3.connect(db_path) as conn:
+            with db_connect(db_path) as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     UPDATE articles 
@@ -11924,7 +11882,7 @@ La estabilidad internacional dependerá de la capacidad de los líderes mundiale
         """Obtener artículos que no tienen imagen o tienen imágenes de baja calidad"""
         try:
             db_path = get_database_path()
-            with sqlite3.connect(db_path) as conn:
+            with db_connect(db_path) as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     SELECT id, title, url, source, image_url
@@ -11954,7 +11912,7 @@ La estabilidad internacional dependerá de la capacidad de los líderes mundiale
         """Obtener artículos con imágenes de baja calidad"""
         try:
             db_path = get_database_path()
-            with sqlite3.connect(db_path) as conn:
+            with db_connect(db_path) as conn:
                 cursor = conn.cursor()
                 
                 # Buscar artículos con URLs de imagen que podrían ser de baja calidad
@@ -12287,7 +12245,7 @@ La estabilidad internacional dependerá de la capacidad de los líderes mundiale
                     if not analysis.get('error'):
                         # Guardar análisis en base de datos
                         db_path = get_database_path()
-                        with sqlite3.connect(db_path) as conn:
+                        with db_connect(db_path) as conn:
                             cursor = conn.cursor()
                             
                             # Crear tabla si no existe
@@ -12391,7 +12349,7 @@ La estabilidad internacional dependerá de la capacidad de los líderes mundiale
         """Guardar resultado de análisis satelital en la base de datos"""
         try:
             db_path = get_database_path()
-            with sqlite3.connect(db_path) as conn:
+            with db_connect(db_path) as conn:
                 cursor = conn.cursor()
                 
                 # Crear tabla si no existe
@@ -12437,7 +12395,7 @@ La estabilidad internacional dependerá de la capacidad de los líderes mundiale
         """Guardar resultado de análisis satelital de zona de conflicto en la base de datos"""
         try:
             db_path = get_database_path()
-            with sqlite3.connect(db_path) as conn:
+            with db_connect(db_path) as conn:
                 cursor = conn.cursor()
                 
                 # Crear tabla para zonas satelitales si no existe
@@ -12491,7 +12449,7 @@ La estabilidad internacional dependerá de la capacidad de los líderes mundiale
         """Obtener artículos que necesitan extracción de imágenes originales"""
         try:
             db_path = get_database_path()
-            with sqlite3.connect(db_path) as conn:
+            with db_connect(db_path) as conn:
                 conn.row_factory = sqlite3.Row
                 cursor = conn.cursor()
                 
@@ -12539,7 +12497,7 @@ La estabilidad internacional dependerá de la capacidad de los líderes mundiale
                 return False
                 
             db_path = get_database_path()
-            with sqlite3.connect(db_path) as conn:
+            with db_connect(db_path) as conn:
                 cursor = conn.cursor()
                 
                 # Actualizar imagen del artículo
@@ -12578,8 +12536,7 @@ La estabilidad internacional dependerá de la capacidad de los líderes mundiale
             from src.utils.config import get_database_path
             db_path = get_database_path()
             
-            import sqlite3
-            conn = sqlite3.connect(db_path)
+            conn = db_connect(db_path)
             cursor = conn.cursor()
             
             # Obtener zonas de conflicto reales de la tabla creada
@@ -12678,7 +12635,7 @@ La estabilidad internacional dependerá de la capacidad de los líderes mundiale
     def _get_countries_from_db(self):
         """Obtener lista de países desde la base de datos"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with db_connect(self.db_path) as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     SELECT DISTINCT country 
@@ -12737,7 +12694,7 @@ La estabilidad internacional dependerá de la capacidad de los líderes mundiale
             
             where_clause = " AND ".join(filters) if filters else "1=1"
             
-            with sqlite3.connect(self.db_path) as conn:
+            with db_connect(self.db_path) as conn:
                 cursor = conn.cursor()
                 
                 # Estadísticas resumen
@@ -13128,7 +13085,7 @@ La estabilidad internacional dependerá de la capacidad de los líderes mundiale
     def _get_dataset_statistics(self):
         """Obtener estadísticas de fuentes de datos"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with db_connect(self.db_path) as conn:
                 cursor = conn.cursor()
                 
                 # Contar artículos totales
@@ -13336,7 +13293,7 @@ La estabilidad internacional dependerá de la capacidad de los líderes mundiale
     def _get_high_risk_articles(self, limit, threshold):
         """Obtener artículos de alto riesgo"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with db_connect(self.db_path) as conn:
                 cursor = conn.cursor()
                 
                 # Simular artículos de alto riesgo
@@ -13610,9 +13567,49 @@ La estabilidad internacional dependerá de la capacidad de los líderes mundiale
 # MAIN APPLICATION EXECUTION
 # =====================================================
 
+def profile_startup():
+    """
+    Construir la aplicación e inicializar todos los subsistemas en primer
+    plano (sin servidor ni tareas en segundo plano) e imprimir el desglose
+    de tiempos de importación e inicialización.
+    """
+    with startup_profiler.phase('RiskMapUnifiedApplication()', 'init'):
+        app = RiskMapUnifiedApplication()
+        app.config.update({'auto_initialize': False, 'enable_background_tasks': False})
+    
+    try:
+        app._initialize_all_systems()
+    except Exception as e:
+        print(f"⚠️  Inicialización incompleta: {e}")
+    
+    # Grupos que ningún subsistema ha necesitado todavía
+    for group in LAZY_IMPORT_GROUPS:
+        group.load()
+    
+    print("\n" + "=" * 80)
+    print("⏱️  PERFIL DE ARRANQUE")
+    print("=" * 80)
+    print(startup_profiler.report())
+    print("=" * 80)
+    print("Subsistemas:")
+    for name, state in app.services.status().items():
+        seconds = f"{state['seconds']:.3f}s" if state['seconds'] is not None else '-'
+        error = f"  ({state['error']})" if state['error'] else ''
+        print(f"   {name:<30} {state['state']:<12} {seconds:>9}{error}")
+    return app
+
 def main():
     """Función principal"""
+    parser = argparse.ArgumentParser(description='RiskMap - Aplicación Web Unificada')
+    parser.add_argument('--profile-startup', action='store_true',
+                        help='Imprimir el desglose de tiempos de importación e inicialización y salir')
+    args = parser.parse_args()
+    
     try:
+        if args.profile_startup:
+            profile_startup()
+            return
+        
         # Create and start the unified application
         app = RiskMapUnifiedApplication()
         app.start_application()
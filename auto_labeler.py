@@ -21,10 +21,33 @@ from concurrent.futures import ThreadPoolExecutor
 import zipfile
 import io
 
+from src.utils.keyword_matcher import KeywordMatcher
+
 # Configurar logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Indicadores de riesgo por nivel (palabras completas, una sola pasada por texto)
+RISK_INDICATOR_MATCHER = KeywordMatcher({
+    # Palabras clave de alto riesgo
+    'high': [
+        'war', 'conflict', 'military', 'attack', 'bombing', 'missile',
+        'invasion', 'occupation', 'siege', 'battle', 'combat', 'strike',
+        'terrorist', 'explosion', 'casualties', 'killed', 'dead', 'wounded'
+    ],
+    # Palabras clave de riesgo medio
+    'medium': [
+        'sanction', 'embargo', 'tension', 'dispute', 'crisis', 'protest',
+        'demonstration', 'unrest', 'instability', 'threat', 'warning',
+        'military exercise', 'deployment', 'buildup'
+    ],
+    # Palabras clave de bajo riesgo (diplomáticas)
+    'low': [
+        'negotiation', 'agreement', 'cooperation', 'partnership', 'alliance',
+        'peace', 'treaty', 'diplomatic', 'dialogue', 'meeting', 'summit'
+    ],
+})
+
 class GeopoliticalAutoLabeler:
     """Sistema de etiquetado automático basado en fuentes externas"""
     
@@ -221,32 +244,12 @@ class GeopoliticalAutoLabeler:
             'estimated_risk': 1
         }
         
-        text_lower = text.lower()
-        
-        # Palabras clave de alto riesgo
-        high_risk_keywords = [
-            'war', 'conflict', 'military', 'attack', 'bombing', 'missile',
-            'invasion', 'occupation', 'siege', 'battle', 'combat', 'strike',
-            'terrorist', 'explosion', 'casualties', 'killed', 'dead', 'wounded'
-        ]
-        
-        # Palabras clave de riesgo medio
-        medium_risk_keywords = [
-            'sanction', 'embargo', 'tension', 'dispute', 'crisis', 'protest',
-            'demonstration', 'unrest', 'instability', 'threat', 'warning',
-            'military exercise', 'deployment', 'buildup'
-        ]
-        
-        # Palabras clave de bajo riesgo (diplomáticas)
-        low_risk_keywords = [
-            'negotiation', 'agreement', 'cooperation', 'partnership', 'alliance',
-            'peace', 'treaty', 'diplomatic', 'dialogue', 'meeting', 'summit'
-        ]
-        
-        # Contar ocurrencias
-        high_count = sum(1 for keyword in high_risk_keywords if keyword in text_lower)
-        medium_count = sum(1 for keyword in medium_risk_keywords if keyword in text_lower)
-        low_count = sum(1 for keyword in low_risk_keywords if keyword in text_lower)
+        # Contar palabras clave de cada nivel en una sola pasada
+        scan = RISK_INDICATOR_MATCHER.scan(text)
+        high_count = scan.counts['high']
+        medium_count = scan.counts['medium']
+        low_count = scan.counts['low']
+        indicators['risk_keywords'] = scan.matched['high'] + scan.matched['medium']
         
         # Determinar nivel de riesgo
         if high_count >= 3:
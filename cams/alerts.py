@@ -25,6 +25,8 @@ from email.mime.multipart import MimeMultipart
 from email.mime.image import MimeImage
 import uuid
 
+from src.utils.db_pool import connect as db_connect
+
 logger = logging.getLogger(__name__)
 
 class AlertManager:
@@ -48,6 +50,7 @@ class AlertManager:
         'traffic_jam': 'Atasco de Tráfico',
         'crowd_density': 'Alta Densidad de Personas',
         'suspicious_activity': 'Actividad Sospechosa',
+        'loitering': 'Merodeo',
         'vehicle_anomaly': 'Anomalía Vehicular',
         'perimeter_breach': 'Violación de Perímetro',
         'system_error': 'Error del Sistema'
@@ -83,7 +86,7 @@ class AlertManager:
     def _init_database(self):
         """Inicializar base de datos de alertas"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = db_connect(self.db_path)
             cursor = conn.cursor()
             
             # Tabla principal de alertas
@@ -176,7 +179,7 @@ class AlertManager:
     def _load_notification_rules(self):
         """Cargar reglas de notificación desde la base de datos"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = db_connect(self.db_path)
             cursor = conn.cursor()
             
             cursor.execute('''
@@ -244,7 +247,7 @@ class AlertManager:
             metadata_json = json.dumps(metadata or {})
             
             # Guardar en base de datos
-            conn = sqlite3.connect(self.db_path)
+            conn = db_connect(self.db_path)
             cursor = conn.cursor()
             
             cursor.execute('''
@@ -313,7 +316,7 @@ class AlertManager:
             resolved_at = datetime.now()
             
             # Actualizar en base de datos
-            conn = sqlite3.connect(self.db_path)
+            conn = db_connect(self.db_path)
             cursor = conn.cursor()
             
             cursor.execute('''
@@ -664,7 +667,7 @@ class AlertManager:
                          recipient: str, status: str, error_message: str = ""):
         """Registrar notificación en la base de datos"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = db_connect(self.db_path)
             cursor = conn.cursor()
             
             cursor.execute('''
@@ -708,8 +711,7 @@ class AlertManager:
             Lista de alertas
         """
         try:
-            conn = sqlite3.connect(self.db_path)
-            conn.row_factory = sqlite3.Row
+            conn = db_connect(self.db_path, row_factory=sqlite3.Row)
             cursor = conn.cursor()
             
             # Construir query con filtros
@@ -768,7 +770,7 @@ class AlertManager:
     def get_alert_statistics(self) -> Dict:
         """Obtener estadísticas de alertas"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = db_connect(self.db_path)
             cursor = conn.cursor()
             
             # Estadísticas generales
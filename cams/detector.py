@@ -18,7 +18,11 @@ import json
 import threading
 import time
 
-# Intentar importar YOLO y Sort
+from .inference_scheduler import BatchInferenceScheduler
+from .motion_gate import GateDecision, MotionGate
+from .tracker import IoUTracker
+
+# Intentar importar YOLO
 try:
     from ultralytics import YOLO
     YOLO_AVAILABLE = True
@@ -26,13 +30,6 @@ except ImportError:
     print("⚠️ ultralytics no disponible. Usando detector simulado.")
     YOLO_AVAILABLE = False
 
-try:
-    from sort import Sort
-    SORT_AVAILABLE = True
-except ImportError:
-    print("⚠️ sort-tracker no disponible. Tracking deshabilitado.")
-    SORT_AVAILABLE = False
-
 logger = logging.getLogger(__name__)
 
 class RiskDetector:
@@ -61,7 +58,11 @@ class RiskDetector:
         'manifestation': {
             'min_persons': 50,
             'min_density': 0.15,
-            'min_duration': 30  # segundos
+            'min_duration': 30,  # segundos
+            # Personas con track de al menos min_duration exigidas además de
+            # min_persons (0 = desactivado; las multitudes en movimiento
+            # rara vez mantienen el track tanto tiempo)
+            'min_persistent_persons': 0
         },
         'traffic_jam': {
             'min_vehicles': 30,
@@ -78,6 +79,10 @@ class RiskDetector:
         'crowd_density': {
             'high_density': 0.2,
             'critical_density': 0.35
+        },
+        'loitering': {
+            'min_duration': 120,  # segundos
+            'max_displacement': 1.0  # en alturas de la caja de la persona
         }
     }
     
@@ -94,6 +99,7 @@ class RiskDetector:
         self.tracker = None
         self.active_detections = {}
         self.alert_history = []
+        self._loitering_alerted: Dict[str, set] = {}
         self.frame_count = 0
         self.fps = int(os.getenv('FPS_ANALYZE', '5'))
         
@@ -101,6 +107,26 @@ class RiskDetector:
         self._init_model(model_path)
         self._init_tracker()
         
+        # Inferencia por lotes compartida por todas las cámaras
+        self.scheduler = None
+        if self.model is not None:
+            self.scheduler = BatchInferenceScheduler(
+                self._infer_batch,
+                max_batch_size=int(os.getenv('DETECTOR_BATCH_SIZE', '8')),
+                max_wait_ms=float(os.getenv('DETECTOR_BATCH_WAIT_MS', '50')),
+                input_size=int(os.getenv('DETECTOR_INPUT_SIZE', '640'))
+            )
+        
+        # Gate de movimiento: solo se infiere cuando la escena cambia
+        self.motion_gate = None
+        if os.getenv('MOTION_GATE_ENABLED', 'true').lower() == 'true':
+            self.motion_gate = MotionGate(
+                width=int(os.getenv('MOTION_GATE_WIDTH', '160')),
+                pixel_threshold=float(os.getenv('MOTION_GATE_THRESHOLD', '25')),
+                min_area=float(os.getenv('MOTION_GATE_MIN_AREA', '0.002')),
+                max_interval=float(os.getenv('MOTION_GATE_MAX_INTERVAL', '10'))
+            )
+        
         # Threading para análisis
         self.detection_lock = threading.Lock()
         self.running = False
@@ -147,13 +173,9 @@ class RiskDetector:
     
     def _init_tracker(self):
         """Inicializar tracker de objetos"""
-        if not SORT_AVAILABLE:
-            logger.warning("SORT tracker no disponible")
-            return
-        
         try:
-            self.tracker = Sort(max_age=20, min_hits=3)
-            logger.info("✅ Tracker SORT inicializado")
+            self.tracker = IoUTracker(max_age=20, min_hits=3)
+            logger.info(f"✅ Tracker IoU inicializado ({self.tracker.get_statistics()['assignment']})")
         except Exception as e:
             logger.error(f"❌ Error inicializando tracker: {e}")
             self.tracker = None
@@ -172,15 +194,26 @@ class RiskDetector:
         if frame is None:
             return {"detections": [], "alerts": [], "tracking": []}
         
+        # El muestreo lo hace el frame bus: cada frame recibido se analiza
         self.frame_count += 1
         
-        # Solo procesar cada N frames según FPS configurado
-        if self.frame_count % (30 // self.fps) != 0:
-            return {"detections": [], "alerts": [], "tracking": []}
-        
         try:
+            # Escena sin cambios: reutilizar las últimas detecciones sin inferir
+            if self.motion_gate is not None:
+                decision = self.motion_gate.check(cam_id, frame)
+                if not decision.run:
+                    return self._gated_result(cam_id, decision)
+            
             # Realizar detección
-            detections = self._run_detection(frame)
+            started = time.perf_counter()
+            detections = self._run_detection(frame, cam_id)
+            if detections is None:
+                # Frame descartado por el planificador (llegó uno más reciente o caducó)
+                if self.motion_gate is not None:
+                    self.motion_gate.invalidate(cam_id)
+                return {"detections": [], "alerts": [], "tracking": [], "dropped": True}
+            if self.motion_gate is not None:
+                self.motion_gate.record_inference(time.perf_counter() - started)
             
             # Aplicar tracking si está disponible
             tracked_objects = self._apply_tracking(detections, cam_id)
@@ -211,44 +244,58 @@ class RiskDetector:
             logger.error(f"❌ Error en detección para cámara {cam_id}: {e}")
             return {"detections": [], "alerts": [], "tracking": []}
     
-    def _run_detection(self, frame: np.ndarray) -> List[Dict]:
-        """Ejecutar detección YOLO en el frame"""
+    def _gated_result(self, cam_id: str, decision: GateDecision) -> Dict[str, Any]:
+        """Resultado de un frame que el gate de movimiento no dejó pasar"""
+        with self.detection_lock:
+            last = self.active_detections.get(cam_id, {})
+        return {
+            "detections": last.get('detections', []),
+            "alerts": [],
+            "tracking": last.get('tracking', []),
+            "gated": True,
+            "motion": decision.motion
+        }
+    
+    def set_motion_regions(self, cam_id: str, regions: Optional[List[List[float]]]):
+        """
+        Regiones de interés del gate de movimiento
+        
+        Args:
+            cam_id: ID de la cámara
+            regions: Lista de [x1, y1, x2, y2] normalizados (0-1); None = frame completo
+        """
+        if self.motion_gate is not None:
+            self.motion_gate.set_regions(cam_id, regions)
+    
+    def _run_detection(self, frame: np.ndarray, cam_id: str) -> Optional[List[Dict]]:
+        """
+        Ejecutar detección YOLO en el frame a través del planificador por
+        lotes. Devuelve None si el frame se descartó sin inferir.
+        """
         if self.model is None:
             # Detector simulado para desarrollo
             return self._simulate_detections(frame)
         
         try:
-            # Ejecutar inferencia YOLO
-            results = self.model(frame, verbose=False)
+            boxes = self.scheduler.infer(cam_id, frame)
+            if boxes is None:
+                return None
             
-            if not results or len(results) == 0:
-                return []
+            # Filtrar solo clases relevantes
+            class_ids = boxes[:, 5].astype(int)
+            boxes = boxes[np.isin(class_ids, self._risk_class_ids)]
             
-            # Procesar resultados
             detections = []
-            result = results[0]
-            
-            if result.boxes is not None:
-                for box in result.boxes:
-                    # Extraer información de la detección
-                    x1, y1, x2, y2 = box.xyxy[0].cpu().numpy()
-                    confidence = float(box.conf[0].cpu().numpy())
-                    class_id = int(box.cls[0].cpu().numpy())
-                    
-                    # Filtrar solo clases relevantes
-                    if class_id in self.RISK_CLASSES.values():
-                        class_name = self._get_class_name(class_id)
-                        
-                        detection = {
-                            'bbox': [float(x1), float(y1), float(x2), float(y2)],
-                            'confidence': confidence,
-                            'class_id': class_id,
-                            'class_name': class_name,
-                            'area': (x2 - x1) * (y2 - y1),
-                            'center': [(x1 + x2) / 2, (y1 + y2) / 2]
-                        }
-                        
-                        detections.append(detection)
+            for x1, y1, x2, y2, confidence, class_id in boxes.tolist():
+                class_id = int(class_id)
+                detections.append({
+                    'bbox': [x1, y1, x2, y2],
+                    'confidence': confidence,
+                    'class_id': class_id,
+                    'class_name': self._get_class_name(class_id),
+                    'area': (x2 - x1) * (y2 - y1),
+                    'center': [(x1 + x2) / 2, (y1 + y2) / 2]
+                })
             
             return detections
             
@@ -256,6 +303,18 @@ class RiskDetector:
             logger.error(f"❌ Error en detección YOLO: {e}")
             return []
     
+    def _infer_batch(self, batch: np.ndarray) -> List[np.ndarray]:
+        """Ejecutar el modelo una vez sobre un lote letterbox (n, S, S, 3) BGR"""
+        results = self.model([image for image in batch], imgsz=batch.shape[1], verbose=False)
+        outputs = []
+        for result in results:
+            if result.boxes is None or len(result.boxes) == 0:
+                outputs.append(np.empty((0, 6), dtype=np.float32))
+            else:
+                # [x1, y1, x2, y2, conf, cls]
+                outputs.append(result.boxes.data.cpu().numpy())
+        return outputs
+    
     def _simulate_detections(self, frame: np.ndarray) -> List[Dict]:
         """Simular detecciones para desarrollo/testing"""
         h, w = frame.shape[:2]
@@ -283,39 +342,30 @@ class RiskDetector:
         
         return detections
     
+    @property
+    def _risk_class_ids(self) -> np.ndarray:
+        return np.fromiter(self.RISK_CLASSES.values(), dtype=int)
+    
     def _get_class_name(self, class_id: int) -> str:
         """Obtener nombre de clase por ID"""
         class_map = {v: k for k, v in self.RISK_CLASSES.items()}
         return class_map.get(class_id, f'unknown_{class_id}')
     
     def _apply_tracking(self, detections: List[Dict], cam_id: str) -> List[Dict]:
-        """Aplicar tracking a las detecciones"""
-        if self.tracker is None or not detections:
+        """Asignar track_id a cada detección (-1 hasta que el track se confirma)"""
+        if self.tracker is None:
             return detections
         
         try:
-            # Convertir detecciones a formato SORT
-            dets = []
-            for det in detections:
-                bbox = det['bbox']
-                conf = det['confidence']
-                dets.append([bbox[0], bbox[1], bbox[2], bbox[3], conf])
-            
-            dets = np.array(dets)
+            # Sin detecciones también se actualiza: los tracks envejecen
+            boxes = np.array([det['bbox'] for det in detections], dtype=np.float32).reshape(-1, 4)
+            class_ids = np.array([det['class_id'] for det in detections], dtype=np.int64)
+            track_ids = self.tracker.update(cam_id, boxes, class_ids, time.time())
             
-            # Aplicar tracking
-            tracked = self.tracker.update(dets)
+            for det, track_id in zip(detections, track_ids.tolist()):
+                det['track_id'] = track_id
             
-            # Actualizar detecciones con IDs de tracking
-            tracked_detections = []
-            for i, det in enumerate(detections):
-                if i < len(tracked):
-                    det['track_id'] = int(tracked[i][4])
-                else:
-                    det['track_id'] = -1
-                tracked_detections.append(det)
-            
-            return tracked_detections
+            return detections
             
         except Exception as e:
             logger.error(f"❌ Error en tracking: {e}")
@@ -335,13 +385,26 @@ class RiskDetector:
         person_count = len([d for d in detections if d['class_name'] == 'person'])
         vehicle_count = len([d for d in detections if d['class_name'] in ['car', 'truck', 'bus']])
         
+        # Historial de tracks de personas (permanencia y desplazamiento)
+        persons = None
+        if self.tracker is not None:
+            tracks = self.tracker.track_summary(cam_id)
+            is_person = tracks['class_ids'] == self.RISK_CLASSES['person']
+            persons = {key: values[is_person] for key, values in tracks.items()}
+        
         # Regla 1: Detección de manifestación/multitudes
-        if person_count >= self.ALERT_THRESHOLDS['manifestation']['min_persons']:
+        thresholds = self.ALERT_THRESHOLDS['manifestation']
+        persistent_persons = None
+        if persons is not None:
+            persistent_persons = int((persons['dwell'] >= thresholds['min_duration']).sum())
+        persistence_met = (not thresholds['min_persistent_persons'] or persistent_persons is None or
+                           persistent_persons >= thresholds['min_persistent_persons'])
+        if person_count >= thresholds['min_persons'] and persistence_met:
             # Calcular densidad
             person_area = sum([d['area'] for d in detections if d['class_name'] == 'person'])
             density = person_area / frame_area
             
-            if density >= self.ALERT_THRESHOLDS['manifestation']['min_density']:
+            if density >= thresholds['min_density']:
                 alerts.append({
                     'type': 'manifestation',
                     'severity': 'high' if person_count > 100 else 'medium',
@@ -351,6 +414,7 @@ class RiskDetector:
                     'timestamp': datetime.now().isoformat(),
                     'metadata': {
                         'person_count': person_count,
+                        'persistent_persons': persistent_persons,
                         'density': density,
                         'frame_coverage': person_area / frame_area
                     }
@@ -414,6 +478,38 @@ class RiskDetector:
                     }
                 })
         
+        # Regla 5: Merodeo (persona que permanece sin apenas desplazarse)
+        if persons is not None:
+            # Una alerta por track; olvidar solo los tracks que el tracker ya
+            # eliminó (uno ocluido unos frames sigue vivo y no debe re-alertar)
+            alerted = self._loitering_alerted.setdefault(cam_id, set())
+            alerted &= set(self.tracker.live_ids(cam_id).tolist())
+        if persons is not None and len(persons['ids']):
+            thresholds = self.ALERT_THRESHOLDS['loitering']
+            heights = persons['boxes'][:, 3] - persons['boxes'][:, 1]
+            loitering = ((persons['dwell'] >= thresholds['min_duration']) &
+                         (persons['displacement'] <= thresholds['max_displacement'] * heights))
+            
+            for index in np.flatnonzero(loitering):
+                track_id = int(persons['ids'][index])
+                if track_id in alerted:
+                    continue
+                alerted.add(track_id)
+                alerts.append({
+                    'type': 'loitering',
+                    'severity': 'medium',
+                    'description': f'Persona detenida en la zona durante {int(persons["dwell"][index])}s',
+                    'confidence': 0.7,
+                    'location': cam_id,
+                    'timestamp': datetime.now().isoformat(),
+                    'metadata': {
+                        'track_id': track_id,
+                        'dwell_seconds': float(persons['dwell'][index]),
+                        'displacement': float(persons['displacement'][index]),
+                        'bbox': persons['boxes'][index].tolist()
+                    }
+                })
+        
         # Guardar alertas en historial
         for alert in alerts:
             self.alert_history.append(alert)
@@ -451,12 +547,17 @@ class RiskDetector:
             'device': self.device,
             'fps_target': self.fps,
             'model_loaded': self.model is not None,
-            'tracker_enabled': self.tracker is not None
+            'tracker_enabled': self.tracker is not None,
+            'tracker': self.tracker.get_statistics() if self.tracker else None,
+            'inference': self.scheduler.get_statistics() if self.scheduler else None,
+            'motion_gate': self.motion_gate.get_statistics() if self.motion_gate else None
         }
     
     def cleanup(self):
         """Limpiar recursos del detector"""
         self.running = False
+        if self.scheduler is not None:
+            self.scheduler.stop()
         if hasattr(self, 'model') and self.model:
             del self.model
         if hasattr(self, 'tracker') and self.tracker:
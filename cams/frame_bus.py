@@ -0,0 +1,493 @@
+"""
+Frame Bus
+=========
+
+Un único hilo de captura y decodificación por cámara:
+- Publica el último frame decodificado y un historial acotado (pre-roll
+  en un buffer circular preasignado, ver ring_buffer.py)
+- Los suscriptores (detector, grabador, preview WebSocket, clips de alerta)
+  leen el mismo array, sin copias por suscriptor
+- Un suscriptor lento solo se salta frames; nunca bloquea al decodificador
+- Cada suscriptor declara la frecuencia a la que consume (detección,
+  preview, grabación). El hilo avanza el stream con ``grab()`` y solo
+  llama a ``retrieve()`` (decodificación) cuando algún consumidor o el
+  pre-roll necesita ese frame
+- Los tiempos salen del timestamp del stream (CAP_PROP_POS_MSEC), no de
+  sleeps: una fuente más rápida que tiempo real se ritma a su timestamp y,
+  si el host se queda atrás del directo, se avanza sin decodificar hasta
+  recuperarlo. En una fuente en directo ``grab()`` no puede ir más rápido
+  que el stream: cuando vuelve a entregar frames a su ritmo (o se agota
+  el tiempo de recuperación) el retraso restante es una discontinuidad y
+  se re-ancla el reloj
+
+Los frames publicados se marcan como de solo lectura: quien necesite
+dibujar sobre ellos debe hacer su propia copia.
+"""
+
+import os
+import time
+import threading
+import logging
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from .ring_buffer import FrameRingBuffer, create_ring_buffer
+
+logger = logging.getLogger(__name__)
+
+# Lecturas fallidas seguidas antes de reabrir la captura
+MAX_READ_FAILURES = 10
+
+# Retraso respecto al directo a partir del cual se deja de decodificar para
+# alcanzarlo, y retraso al que se vuelve a decodificar
+MAX_LIVE_LAG = 2.0
+RESUME_LIVE_LAG = 0.5
+
+# Salto del timestamp del stream que obliga a recalcular su origen (discontinuidad)
+MAX_CLOCK_JUMP = 10.0
+
+# Recuperación del directo: grab() seguidos que tardan al menos esa fracción
+# del intervalo del stream (backlog vacío) y duración máxima de la recuperación
+CATCH_UP_REALTIME_RATIO = 0.8
+CATCH_UP_REALTIME_GRABS = 5
+MAX_CATCH_UP_SECONDS = 10.0
+
+
+@dataclass(frozen=True)
+class FramePacket:
+    """Frame decodificado y su posición en el bus"""
+    seq: int
+    timestamp: float
+    frame: np.ndarray
+
+
+class FrameSubscription:
+    """
+    Cursor de un suscriptor sobre el bus. ``next()`` devuelve siempre el
+    frame más reciente que el suscriptor aún no ha visto y que respeta su
+    frecuencia (``fps``, None = todos); los intermedios que se haya perdido
+    se cuentan en ``dropped``.
+
+    Mientras ``active`` es False el suscriptor no pide decodificar frames.
+    """
+
+    def __init__(self, bus: 'FrameBus', name: str, fps: Optional[float] = None):
+        self.bus = bus
+        self.name = name
+        self.interval = 1.0 / fps if fps else 0.0
+        self.active = True
+        self.last_seq = 0
+        self.last_timestamp = 0.0
+        # Timestamp del último frame que el bus decodificó para este suscriptor
+        self.requested_timestamp = 0.0
+        self.received = 0
+        self.dropped = 0
+
+    def is_due(self, timestamp: float) -> bool:
+        """Necesita el frame con este timestamp (y ya recogió el anterior que pidió)"""
+        return (self.active
+                and self.last_timestamp >= self.requested_timestamp
+                and timestamp >= self.last_timestamp + self.interval)
+
+    def next(self, timeout: Optional[float] = None) -> Optional[FramePacket]:
+        """Esperar un frame nuevo (None si vence el timeout o el bus se detiene)"""
+        packet = self.bus.wait_for(self.last_seq, timeout, not_before=self.last_timestamp + self.interval)
+        if packet is not None:
+            if self.last_seq:
+                self.dropped += packet.seq - self.last_seq - 1
+            self.last_seq = packet.seq
+            self.last_timestamp = packet.timestamp
+            self.received += 1
+        return packet
+
+    def latest(self) -> Optional[FramePacket]:
+        """Último frame publicado, sin esperar ni avanzar el cursor"""
+        return self.bus.latest()
+
+    def close(self):
+        self.bus.unsubscribe(self)
+
+    def get_statistics(self) -> Dict:
+        return {'received': self.received, 'dropped': self.dropped, 'last_seq': self.last_seq,
+                'fps': round(1.0 / self.interval, 2) if self.interval else None, 'active': self.active}
+
+
+class FrameBus:
+    """
+    Captura y decodificación de un stream en un solo hilo, compartida por
+    todos los consumidores de la cámara
+    """
+
+    def __init__(self,
+                 cam_id: str,
+                 stream_url: str,
+                 headers: Optional[Dict] = None,
+                 history_seconds: float = 30.0,
+                 history_fps: float = 15.0,
+                 history_mode: Optional[str] = None,
+                 open_capture: Optional[Callable[[str], object]] = None):
+        """
+        Inicializar el bus
+
+        Args:
+            cam_id: ID de la cámara
+            stream_url: URL del stream resuelto
+            headers: Headers para el stream
+            history_seconds: Segundos de historial para clips de alerta
+            history_fps: Frames por segundo que se guardan en el historial
+            history_mode: 'raw' (array preasignado) o 'jpeg' (comprimido)
+            open_capture: Función url -> captura (por defecto cv2.VideoCapture)
+        """
+        self.cam_id = cam_id
+        self.stream_url = stream_url
+        self.headers = headers
+        self.history_interval = 1.0 / history_fps if history_fps > 0 else 0.0
+        self.open_capture = open_capture or cv2.VideoCapture
+
+        self._latest: Optional[FramePacket] = None
+        self.preroll: FrameRingBuffer = create_ring_buffer(history_seconds, history_fps, history_mode)
+        self._last_history_time = 0.0
+        self._condition = threading.Condition()
+        self._subscriptions: List[FrameSubscription] = []
+
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self.status = 'idle'
+        self.frames_grabbed = 0
+        self.frames_decoded = 0
+        self.frames_skipped_lag = 0
+        self.lag = 0.0
+        self._catching_up = False
+        self._catch_up_since = 0.0
+        self._realtime_grabs = 0
+        self.clock_resyncs = 0
+        # Origen del reloj del stream: timestamp = base + posición del stream
+        self._clock_base: Optional[float] = None
+        self._clock_position = 0.0
+        self.read_failures = 0
+        self.reconnects = 0
+        self.started_at: Optional[float] = None
+
+    # =================== CICLO DE VIDA ===================
+
+    def start(self):
+        """Iniciar el hilo de captura (idempotente)"""
+        with self._condition:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop_event.clear()
+            self.status = 'starting'
+            self.started_at = time.time()
+            self._thread = threading.Thread(target=self._capture_worker,
+                                            name=f"frame_bus_{self.cam_id}", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Detener el hilo de captura y despertar a los suscriptores"""
+        self._stop_event.set()
+        with self._condition:
+            self._condition.notify_all()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=timeout)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive() and not self._stop_event.is_set()
+
+    def _open(self):
+        cap = self.open_capture(self.stream_url)
+        if cap is None or not cap.isOpened():
+            logger.error(f"❌ No se pudo abrir stream para {self.cam_id}")
+            return None
+        # Buffer mínimo para reducir latencia
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        self._clock_base = None
+        return cap
+
+    def _stream_timestamp(self, cap) -> float:
+        """
+        Timestamp (epoch) del frame recién avanzado, según la posición del
+        stream. Sin posición válida se usa el reloj del sistema.
+        """
+        now = time.time()
+        position = cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+        if position <= 0:
+            self._clock_base = None
+            return now
+        if (self._clock_base is None
+                or position <= self._clock_position
+                or position - self._clock_position > MAX_CLOCK_JUMP):
+            # Primer frame o discontinuidad: anclar la posición actual al ahora
+            self._clock_base = now - position
+        self._clock_position = position
+        return self._clock_base + position
+
+    def _backlog_drained(self, position_step: float, grab_seconds: float) -> bool:
+        """
+        Durante la recuperación: True si ``grab()`` ya entrega los frames al
+        ritmo del stream (no queda backlog que saltar) o si la recuperación
+        supera MAX_CATCH_UP_SECONDS
+        """
+        if time.time() - self._catch_up_since > MAX_CATCH_UP_SECONDS:
+            return True
+        if position_step > 0 and grab_seconds >= CATCH_UP_REALTIME_RATIO * position_step:
+            self._realtime_grabs += 1
+        else:
+            self._realtime_grabs = 0
+        return self._realtime_grabs >= CATCH_UP_REALTIME_GRABS
+
+    def _resync_clock(self) -> float:
+        """Re-anclar la posición actual del stream al ahora; devuelve el nuevo timestamp"""
+        logger.info(f"🕒 Frame bus de {self.cam_id}: reloj re-anclado tras {self.lag:.1f}s de retraso")
+        self._clock_base = time.time() - self._clock_position
+        self._catching_up = False
+        self.clock_resyncs += 1
+        return self._clock_base + self._clock_position
+
+    def _decode_due(self, timestamp: float) -> Tuple[List[FrameSubscription], bool]:
+        """Suscriptores que necesitan el frame y si toca guardarlo en el pre-roll"""
+        history_due = timestamp - self._last_history_time >= self.history_interval
+        with self._condition:
+            due = [subscription for subscription in self._subscriptions if subscription.is_due(timestamp)]
+        return due, history_due
+
+    def _capture_worker(self):
+        cap = None
+        failures = 0
+        try:
+            while not self._stop_event.is_set():
+                if cap is None:
+                    cap = self._open()
+                    if cap is None:
+                        self.status = 'error'
+                        self._stop_event.wait(5)
+                        continue
+                    self.status = 'running'
+                    logger.info(f"📡 Frame bus activo para cámara {self.cam_id}")
+
+                # Avanzar el stream sin decodificar
+                grab_started = time.time()
+                ret = cap.grab()
+                frame = None
+                if ret:
+                    self.frames_grabbed += 1
+                    grab_seconds = time.time() - grab_started
+                    previous_position = self._clock_position
+                    timestamp = self._stream_timestamp(cap)
+                    if (self._catching_up and self._clock_base is not None
+                            and self._backlog_drained(self._clock_position - previous_position, grab_seconds)):
+                        # El retraso que queda no se puede recuperar con grab()
+                        timestamp = self._resync_clock()
+                    lag = time.time() - timestamp
+                    if lag < -0.005:
+                        # Fuente más rápida que tiempo real (archivo): ritmo del stream
+                        self._stop_event.wait(-lag)
+                    self.lag = max(lag, 0.0)
+
+                    due, history_due = self._decode_due(timestamp)
+                    if not due and not history_due:
+                        failures = 0
+                        continue
+                    catching_up = self.lag > (RESUME_LIVE_LAG if self._catching_up else MAX_LIVE_LAG)
+                    if catching_up and not self._catching_up:
+                        self._catch_up_since = time.time()
+                        self._realtime_grabs = 0
+                    self._catching_up = catching_up
+                    if self._catching_up:
+                        # Atrasados respecto al directo: solo grab() hasta alcanzarlo
+                        self.frames_skipped_lag += 1
+                        failures = 0
+                        continue
+
+                    ret, frame = cap.retrieve()
+                if not ret or frame is None:
+                    self.read_failures += 1
+                    failures += 1
+                    if failures >= MAX_READ_FAILURES:
+                        logger.warning(f"⚠️ Reabriendo stream de {self.cam_id} tras {failures} lecturas fallidas")
+                        cap.release()
+                        cap = None
+                        failures = 0
+                        self.reconnects += 1
+                    else:
+                        logger.warning(f"⚠️ No se pudo leer frame de {self.cam_id}")
+                        self._stop_event.wait(1)
+                    continue
+
+                failures = 0
+                with self._condition:
+                    for subscription in due:
+                        subscription.requested_timestamp = timestamp
+                self.publish(frame, timestamp, store_history=history_due)
+        except Exception as e:
+            logger.error(f"❌ Error en frame bus de {self.cam_id}: {e}")
+            self.status = 'error'
+        finally:
+            if cap is not None:
+                cap.release()
+            if self.status != 'error':
+                self.status = 'stopped'
+            with self._condition:
+                self._condition.notify_all()
+            logger.info(f"📡 Frame bus detenido para cámara {self.cam_id}")
+
+    # =================== PUBLICACIÓN ===================
+
+    def publish(self, frame: np.ndarray, timestamp: Optional[float] = None,
+                store_history: Optional[bool] = None) -> FramePacket:
+        """
+        Publicar un frame decodificado. ``cap.retrieve()`` entrega un array
+        nuevo en cada llamada, así que se comparte tal cual (marcado de solo
+        lectura). ``store_history`` None = según la frecuencia del pre-roll.
+        """
+        frame.flags.writeable = False
+        timestamp = timestamp if timestamp is not None else time.time()
+        with self._condition:
+            self.frames_decoded += 1
+            packet = FramePacket(seq=self.frames_decoded, timestamp=timestamp, frame=frame)
+            self._latest = packet
+            self._condition.notify_all()
+
+        # Copia al hueco siguiente del pre-roll (fuera del lock de suscriptores)
+        if store_history is None:
+            store_history = timestamp - self._last_history_time >= self.history_interval
+        if store_history:
+            self.preroll.write(frame, timestamp)
+            self._last_history_time = timestamp
+        return packet
+
+    # =================== SUSCRIPTORES ===================
+
+    def subscribe(self, name: str, fps: Optional[float] = None) -> FrameSubscription:
+        """Nuevo suscriptor que consume a ``fps`` frames por segundo (None = todos)"""
+        subscription = FrameSubscription(self, name, fps)
+        with self._condition:
+            self._subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: FrameSubscription):
+        with self._condition:
+            if subscription in self._subscriptions:
+                self._subscriptions.remove(subscription)
+
+    def wait_for(self, after_seq: int, timeout: Optional[float] = None,
+                 not_before: float = 0.0) -> Optional[FramePacket]:
+        """
+        Último frame con seq > after_seq y timestamp >= not_before, esperando
+        hasta ``timeout`` segundos
+        """
+        def ready():
+            return (self._latest is not None and self._latest.seq > after_seq
+                    and self._latest.timestamp >= not_before)
+
+        with self._condition:
+            self._condition.wait_for(lambda: ready() or self._stop_event.is_set(), timeout=timeout)
+            return self._latest if ready() else None
+
+    def latest(self) -> Optional[FramePacket]:
+        with self._condition:
+            return self._latest
+
+    def history(self, seconds: Optional[float] = None) -> Iterator[Tuple[float, np.ndarray]]:
+        """(timestamp, frame) del pre-roll, del más antiguo al más reciente"""
+        return self.preroll.iter_frames(seconds)
+
+    # =================== MÉTRICAS ===================
+
+    def get_statistics(self) -> Dict:
+        elapsed = time.time() - self.started_at if self.started_at else 0.0
+        with self._condition:
+            subscribers = {subscription.name: subscription.get_statistics()
+                           for subscription in self._subscriptions}
+        return {
+            'cam_id': self.cam_id,
+            'status': self.status,
+            'frames_grabbed': self.frames_grabbed,
+            'frames_decoded': self.frames_decoded,
+            'decode_ratio': round(self.frames_decoded / self.frames_grabbed, 3) if self.frames_grabbed else 0.0,
+            'frames_skipped_lag': self.frames_skipped_lag,
+            'lag_seconds': round(self.lag, 3),
+            'catching_up': self._catching_up,
+            'clock_resyncs': self.clock_resyncs,
+            'decode_fps': round(self.frames_decoded / elapsed, 2) if elapsed > 0 else 0.0,
+            'read_failures': self.read_failures,
+            'reconnects': self.reconnects,
+            'preroll': self.preroll.get_statistics(),
+            'subscribers': subscribers,
+        }
+
+
+class FrameBusManager:
+    """
+    Buses por cámara con conteo de referencias: el primer consumidor que
+    adquiere una cámara arranca su captura y el último en liberarla la detiene.
+    """
+
+    def __init__(self, history_seconds: float = 30.0, history_fps: Optional[float] = None,
+                 history_mode: Optional[str] = None):
+        self.history_seconds = history_seconds
+        self.history_fps = history_fps or float(os.getenv('RECORDING_FPS', '15'))
+        self.history_mode = history_mode
+        self._buses: Dict[str, FrameBus] = {}
+        self._refs: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, cam_id: str, stream_url: str, headers: Optional[Dict] = None) -> FrameBus:
+        """Obtener (y arrancar si hace falta) el bus de una cámara"""
+        with self._lock:
+            bus = self._buses.get(cam_id)
+            if bus is None:
+                bus = FrameBus(cam_id, stream_url, headers,
+                               history_seconds=self.history_seconds,
+                               history_fps=self.history_fps,
+                               history_mode=self.history_mode)
+                self._buses[cam_id] = bus
+                self._refs[cam_id] = 0
+            self._refs[cam_id] += 1
+        bus.start()
+        return bus
+
+    def release(self, cam_id: str):
+        """Liberar una referencia; el bus se detiene al liberar la última"""
+        with self._lock:
+            if cam_id not in self._refs:
+                return
+            self._refs[cam_id] -= 1
+            if self._refs[cam_id] > 0:
+                return
+            del self._refs[cam_id]
+            bus = self._buses.pop(cam_id)
+        bus.stop()
+
+    def get(self, cam_id: str) -> Optional[FrameBus]:
+        with self._lock:
+            return self._buses.get(cam_id)
+
+    def get_statistics(self) -> Dict:
+        with self._lock:
+            buses = list(self._buses.values())
+        return {bus.cam_id: bus.get_statistics() for bus in buses}
+
+    def cleanup(self):
+        with self._lock:
+            buses = list(self._buses.values())
+            self._buses.clear()
+            self._refs.clear()
+        for bus in buses:
+            bus.stop()
+
+
+_manager: Optional[FrameBusManager] = None
+_manager_lock = threading.Lock()
+
+
+def get_frame_bus_manager() -> FrameBusManager:
+    """Gestor de buses compartido por rutas, grabador y detector"""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = FrameBusManager()
+        return _manager
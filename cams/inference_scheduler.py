@@ -0,0 +1,267 @@
+"""
+Batched Inference Scheduler
+===========================
+
+Planificador de inferencia YOLO compartido por todas las cámaras:
+- Cada cámara tiene como mucho un frame pendiente; uno nuevo sustituye al
+  anterior, que se descarta por obsoleto
+- Los frames pendientes se agrupan en un lote hasta ``max_batch_size`` o
+  hasta que el más antiguo lleva ``max_wait_ms`` esperando
+- Las cámaras se atienden por orden de llegada de su frame pendiente, así
+  que ninguna puede acaparar los lotes
+- Los frames se redimensionan con letterbox sobre un tensor NumPy
+  preasignado, el modelo se ejecuta una sola vez por lote y las cajas se
+  devuelven a cada cámara en coordenadas de su frame original
+"""
+
+import time
+import threading
+import logging
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional, Sequence
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Color de relleno del letterbox (el mismo que usa YOLO)
+LETTERBOX_FILL = 114
+
+# Ventana de lotes recientes para las métricas de rendimiento y latencia
+METRICS_WINDOW = 200
+
+# Lote (n, S, S, 3) uint8 BGR -> por imagen, array (k, 6) [x1, y1, x2, y2, conf, cls]
+# en coordenadas del lote
+BatchInferFn = Callable[[np.ndarray], Sequence[np.ndarray]]
+
+
+class InferenceRequest:
+    """Frame pendiente de una cámara"""
+
+    __slots__ = ('cam_id', 'frame', 'submitted_at', 'future')
+
+    def __init__(self, cam_id: str, frame: np.ndarray):
+        self.cam_id = cam_id
+        self.frame = frame
+        self.submitted_at = time.perf_counter()
+        self.future: Future = Future()
+
+
+class BatchInferenceScheduler:
+    """
+    Agrupa los frames de todas las cámaras en lotes para una única llamada
+    al modelo
+    """
+
+    def __init__(self,
+                 infer_fn: BatchInferFn,
+                 max_batch_size: int = 8,
+                 max_wait_ms: float = 50.0,
+                 input_size: int = 640,
+                 max_frame_age: float = 2.0):
+        """
+        Inicializar el planificador
+
+        Args:
+            infer_fn: Función que ejecuta el modelo sobre un lote
+            max_batch_size: Máximo de frames por lote
+            max_wait_ms: Espera máxima del frame más antiguo antes de lanzar el lote
+            input_size: Lado del tensor de entrada (letterbox cuadrado)
+            max_frame_age: Segundos tras los que un frame pendiente se descarta
+        """
+        self.infer_fn = infer_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.input_size = input_size
+        self.max_frame_age = max_frame_age
+
+        # Tensor de entrada preasignado; solo se usan las primeras n filas
+        self._batch = np.full((max_batch_size, input_size, input_size, 3), LETTERBOX_FILL, dtype=np.uint8)
+
+        self._pending: 'OrderedDict[str, InferenceRequest]' = OrderedDict()
+        self._condition = threading.Condition()
+        self._running = True
+
+        self._stats = {
+            'frames_submitted': 0,
+            'frames_inferred': 0,
+            'batches': 0,
+            'dropped_replaced': 0,
+            'dropped_stale': 0,
+            'errors': 0,
+        }
+        self._per_camera: Dict[str, Dict[str, int]] = {}
+        self._recent_batches: deque = deque(maxlen=METRICS_WINDOW)
+        self._recent_latencies: deque = deque(maxlen=METRICS_WINDOW * max_batch_size)
+
+        self._thread = threading.Thread(target=self._worker, name='inference_scheduler', daemon=True)
+        self._thread.start()
+
+    # =================== API ===================
+
+    def submit(self, cam_id: str, frame: np.ndarray) -> Future:
+        """
+        Encolar el frame de una cámara. El futuro devuelve las detecciones
+        (array (k, 6) en coordenadas del frame) o None si el frame se descartó.
+        """
+        request = InferenceRequest(cam_id, frame)
+        with self._condition:
+            if not self._running:
+                request.future.set_result(None)
+                return request.future
+            self._stats['frames_submitted'] += 1
+            camera = self._camera_stats(cam_id)
+            camera['submitted'] += 1
+
+            previous = self._pending.get(cam_id)
+            if previous is not None:
+                # Solo interesa el frame más reciente; conserva su turno en la cola
+                self._stats['dropped_replaced'] += 1
+                camera['dropped'] += 1
+                previous.future.set_result(None)
+            self._pending[cam_id] = request
+            self._condition.notify()
+        return request.future
+
+    def infer(self, cam_id: str, frame: np.ndarray, timeout: Optional[float] = 10.0) -> Optional[np.ndarray]:
+        """Versión bloqueante de ``submit``"""
+        return self.submit(cam_id, frame).result(timeout=timeout)
+
+    def stop(self):
+        with self._condition:
+            self._running = False
+            for request in self._pending.values():
+                request.future.set_result(None)
+            self._pending.clear()
+            self._condition.notify_all()
+        self._thread.join(timeout=5)
+
+    # =================== PLANIFICACIÓN ===================
+
+    def _camera_stats(self, cam_id: str) -> Dict[str, int]:
+        camera = self._per_camera.get(cam_id)
+        if camera is None:
+            camera = self._per_camera[cam_id] = {'submitted': 0, 'inferred': 0, 'dropped': 0}
+        return camera
+
+    def _next_batch(self) -> List[InferenceRequest]:
+        """Esperar a que haya un lote completo o venza el plazo del frame más antiguo"""
+        with self._condition:
+            while self._running:
+                if not self._pending:
+                    self._condition.wait()
+                    continue
+                oldest = next(iter(self._pending.values()))
+                remaining = oldest.submitted_at + self.max_wait - time.perf_counter()
+                if len(self._pending) >= self.max_batch_size or remaining <= 0:
+                    break
+                self._condition.wait(timeout=remaining)
+            if not self._running:
+                return []
+
+            now = time.perf_counter()
+            batch = []
+            while self._pending and len(batch) < self.max_batch_size:
+                _, request = self._pending.popitem(last=False)
+                if now - request.submitted_at > self.max_frame_age:
+                    self._stats['dropped_stale'] += 1
+                    self._camera_stats(request.cam_id)['dropped'] += 1
+                    request.future.set_result(None)
+                    continue
+                batch.append(request)
+            return batch
+
+    def _worker(self):
+        while True:
+            batch = self._next_batch()
+            if not batch:
+                if not self._running:
+                    return
+                continue
+            self._run_batch(batch)
+
+    def _letterbox(self, index: int, frame: np.ndarray):
+        """Copiar ``frame`` redimensionado en la fila ``index`` del tensor; devuelve (escala, pad_x, pad_y)"""
+        height, width = frame.shape[:2]
+        scale = min(self.input_size / height, self.input_size / width)
+        new_width, new_height = int(round(width * scale)), int(round(height * scale))
+        pad_x = (self.input_size - new_width) // 2
+        pad_y = (self.input_size - new_height) // 2
+
+        slot = self._batch[index]
+        slot[...] = LETTERBOX_FILL
+        target = slot[pad_y:pad_y + new_height, pad_x:pad_x + new_width]
+        if (new_width, new_height) == (width, height):
+            target[...] = frame
+        else:
+            target[...] = cv2.resize(frame, (new_width, new_height), interpolation=cv2.INTER_LINEAR)
+        return scale, pad_x, pad_y
+
+    def _run_batch(self, batch: List[InferenceRequest]):
+        started = time.perf_counter()
+        try:
+            transforms = [self._letterbox(index, request.frame) for index, request in enumerate(batch)]
+            outputs = self.infer_fn(self._batch[:len(batch)])
+        except Exception as e:
+            logger.error(f"❌ Error en inferencia por lotes: {e}")
+            with self._condition:
+                self._stats['errors'] += 1
+            for request in batch:
+                request.future.set_exception(e)
+            return
+        finished = time.perf_counter()
+
+        for request, (scale, pad_x, pad_y), boxes in zip(batch, transforms, outputs):
+            boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 6).copy()
+            if len(boxes):
+                # Deshacer el letterbox: coordenadas del frame original
+                height, width = request.frame.shape[:2]
+                boxes[:, [0, 2]] = ((boxes[:, [0, 2]] - pad_x) / scale).clip(0, width)
+                boxes[:, [1, 3]] = ((boxes[:, [1, 3]] - pad_y) / scale).clip(0, height)
+            request.future.set_result(boxes)
+
+        with self._condition:
+            self._stats['batches'] += 1
+            self._stats['frames_inferred'] += len(batch)
+            for request in batch:
+                self._camera_stats(request.cam_id)['inferred'] += 1
+                self._recent_latencies.append(started - request.submitted_at)
+            self._recent_batches.append((started, finished, len(batch)))
+
+    # =================== MÉTRICAS ===================
+
+    def get_statistics(self) -> Dict:
+        with self._condition:
+            stats = dict(self._stats)
+            batches = list(self._recent_batches)
+            latencies = np.array(self._recent_latencies, dtype=np.float64)
+            per_camera = {cam_id: dict(camera) for cam_id, camera in self._per_camera.items()}
+            stats['pending'] = len(self._pending)
+
+        stats['avg_batch_size'] = (round(stats['frames_inferred'] / stats['batches'], 2)
+                                   if stats['batches'] else 0.0)
+        if batches:
+            frames = sum(size for _, _, size in batches)
+            busy = sum(end - start for start, end, _ in batches)
+            span = batches[-1][1] - batches[0][0]
+            stats['throughput_fps'] = round(frames / span, 2) if span > 0 else 0.0
+            stats['inference_fps'] = round(frames / busy, 2) if busy > 0 else 0.0
+            stats['avg_batch_ms'] = round(busy / len(batches) * 1000, 2)
+        else:
+            stats.update({'throughput_fps': 0.0, 'inference_fps': 0.0, 'avg_batch_ms': 0.0})
+        if len(latencies):
+            stats['queue_latency_ms'] = {
+                'avg': round(float(latencies.mean()) * 1000, 2),
+                'p50': round(float(np.percentile(latencies, 50)) * 1000, 2),
+                'p95': round(float(np.percentile(latencies, 95)) * 1000, 2),
+                'max': round(float(latencies.max()) * 1000, 2),
+            }
+        else:
+            stats['queue_latency_ms'] = {'avg': 0.0, 'p50': 0.0, 'p95': 0.0, 'max': 0.0}
+        stats['cameras'] = per_camera
+        stats.update({'max_batch_size': self.max_batch_size,
+                      'max_wait_ms': self.max_wait * 1000,
+                      'input_size': self.input_size})
+        return stats
@@ -0,0 +1,201 @@
+"""
+Motion Gate
+===========
+
+Etapa barata previa a YOLO que decide, frame a frame, si hace falta
+inferencia completa:
+- Trabaja sobre una versión reducida en escala de grises y suavizada
+- Sustracción de fondo: el fondo es el último frame inferido, que se
+  adapta lentamente mientras la escena está quieta (cambios de luz, ruido)
+- El movimiento se mide por región de interés (coordenadas normalizadas
+  0-1); sin regiones se usa el frame completo
+- Se fuerza inferencia completa cada ``max_interval`` segundos aunque no
+  haya movimiento, para no arrastrar detecciones obsoletas
+"""
+
+import time
+import threading
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Región normalizada [x1, y1, x2, y2]
+Region = Sequence[float]
+FULL_FRAME: List[Region] = [(0.0, 0.0, 1.0, 1.0)]
+
+
+@dataclass
+class GateDecision:
+    """Resultado del gate para un frame"""
+    run: bool
+    reason: str  # 'first', 'motion', 'forced', 'resized' o 'static'
+    motion: float = 0.0
+    regions: List[int] = field(default_factory=list)
+
+
+class _CameraGate:
+    """Estado del gate de una cámara"""
+
+    def __init__(self, regions: Optional[List[Region]] = None):
+        self.regions: List[Region] = list(regions) if regions else FULL_FRAME
+        self.background: Optional[np.ndarray] = None
+        self.last_inference = 0.0
+        self.checked = 0
+        self.passed = 0
+        self.forced = 0
+
+
+class MotionGate:
+    """
+    Gate de movimiento por cámara delante del detector
+    """
+
+    def __init__(self,
+                 width: int = 160,
+                 pixel_threshold: float = 25.0,
+                 min_area: float = 0.002,
+                 max_interval: float = 10.0,
+                 adaptation_rate: float = 0.05):
+        """
+        Inicializar el gate
+
+        Args:
+            width: Ancho del frame reducido sobre el que se mide movimiento
+            pixel_threshold: Diferencia de gris para considerar un píxel en movimiento
+            min_area: Fracción mínima de la región en movimiento para inferir
+            max_interval: Segundos máximos sin inferencia completa
+            adaptation_rate: Peso del frame actual al adaptar el fondo en escenas quietas
+        """
+        self.width = width
+        self.pixel_threshold = pixel_threshold
+        self.min_area = min_area
+        self.max_interval = max_interval
+        self.adaptation_rate = adaptation_rate
+
+        self._cameras: Dict[str, _CameraGate] = {}
+        self._lock = threading.Lock()
+
+        self._stats = {
+            'gate_seconds': 0.0,
+            'inference_seconds': 0.0,
+            'inferences_timed': 0,
+        }
+
+    # =================== CONFIGURACIÓN ===================
+
+    def _camera(self, cam_id: str) -> _CameraGate:
+        camera = self._cameras.get(cam_id)
+        if camera is None:
+            camera = self._cameras[cam_id] = _CameraGate()
+        return camera
+
+    def set_regions(self, cam_id: str, regions: Optional[List[Region]]):
+        """Regiones de interés de una cámara (None o vacío = frame completo)"""
+        with self._lock:
+            self._camera(cam_id).regions = list(regions) if regions else FULL_FRAME
+
+    def invalidate(self, cam_id: str):
+        """Olvidar el fondo: el próximo frame de la cámara se inferirá"""
+        with self._lock:
+            camera = self._cameras.get(cam_id)
+            if camera is not None:
+                camera.background = None
+
+    # =================== DECISIÓN ===================
+
+    def _prepare(self, frame: np.ndarray) -> np.ndarray:
+        """Frame reducido, en gris y suavizado (float32)"""
+        height, width = frame.shape[:2]
+        small_height = max(1, int(height * self.width / width))
+        small = cv2.resize(frame, (self.width, small_height), interpolation=cv2.INTER_AREA)
+        if small.ndim == 3:
+            small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        small = cv2.GaussianBlur(small, (5, 5), 0)
+        return small.astype(np.float32)
+
+    def _region_motion(self, mask: np.ndarray, regions: List[Region]) -> np.ndarray:
+        """Fracción de píxeles en movimiento dentro de cada región"""
+        height, width = mask.shape
+        motion = np.zeros(len(regions), dtype=np.float64)
+        for index, (x1, y1, x2, y2) in enumerate(regions):
+            region = mask[int(y1 * height):max(int(y2 * height), int(y1 * height) + 1),
+                          int(x1 * width):max(int(x2 * width), int(x1 * width) + 1)]
+            motion[index] = region.mean() if region.size else 0.0
+        return motion
+
+    def check(self, cam_id: str, frame: np.ndarray, now: Optional[float] = None) -> GateDecision:
+        """
+        Decidir si ``frame`` necesita inferencia completa. Cuando la
+        respuesta es sí, el frame pasa a ser el nuevo fondo.
+        """
+        started = time.perf_counter()
+        now = now if now is not None else time.time()
+        small = self._prepare(frame)
+
+        with self._lock:
+            camera = self._camera(cam_id)
+            camera.checked += 1
+
+            if camera.background is None or camera.background.shape != small.shape:
+                decision = GateDecision(True, 'first' if camera.background is None else 'resized')
+            else:
+                mask = np.abs(small - camera.background) > self.pixel_threshold
+                motion = self._region_motion(mask, camera.regions)
+                moving = np.flatnonzero(motion >= self.min_area).tolist()
+                if moving:
+                    decision = GateDecision(True, 'motion', float(motion.max()), moving)
+                elif now - camera.last_inference >= self.max_interval:
+                    decision = GateDecision(True, 'forced', float(motion.max()))
+                    camera.forced += 1
+                else:
+                    decision = GateDecision(False, 'static', float(motion.max()))
+                    # Absorber cambios lentos (luz, ruido) en el fondo
+                    camera.background += self.adaptation_rate * (small - camera.background)
+
+            if decision.run:
+                camera.passed += 1
+                camera.background = small
+                camera.last_inference = now
+            self._stats['gate_seconds'] += time.perf_counter() - started
+        return decision
+
+    def record_inference(self, seconds: float):
+        """Registrar la duración de una inferencia completa (para estimar el ahorro)"""
+        with self._lock:
+            self._stats['inference_seconds'] += seconds
+            self._stats['inferences_timed'] += 1
+
+    # =================== MÉTRICAS ===================
+
+    def get_statistics(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+            cameras = {cam_id: {'checked': camera.checked,
+                                'passed': camera.passed,
+                                'skipped': camera.checked - camera.passed,
+                                'forced': camera.forced,
+                                'regions': len(camera.regions)}
+                       for cam_id, camera in self._cameras.items()}
+
+        checked = sum(camera['checked'] for camera in cameras.values())
+        passed = sum(camera['passed'] for camera in cameras.values())
+        skipped = checked - passed
+        avg_inference = (stats['inference_seconds'] / stats['inferences_timed']
+                         if stats['inferences_timed'] else 0.0)
+        return {
+            'frames_checked': checked,
+            'frames_passed': passed,
+            'frames_skipped': skipped,
+            'frames_forced': sum(camera['forced'] for camera in cameras.values()),
+            'pass_rate': round(passed / checked, 3) if checked else 0.0,
+            'avg_gate_ms': round(stats['gate_seconds'] / checked * 1000, 3) if checked else 0.0,
+            'avg_inference_ms': round(avg_inference * 1000, 2),
+            'inference_seconds_saved': round(skipped * avg_inference, 2),
+            'max_interval': self.max_interval,
+            'cameras': cameras,
+        }
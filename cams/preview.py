@@ -0,0 +1,290 @@
+"""
+Preview Streaming
+=================
+
+Previsualización en vivo por WebSocket, una por cámara:
+- Solo codifica cuando la sala ``camera_{cam_id}`` tiene espectadores;
+  sin espectadores el hilo queda dormido y no toca el frame bus
+- Cada tick se codifica una sola vez por nivel de calidad en uso y el
+  mismo JPEG se envía como binario (sin base64) a todos los clientes de
+  ese nivel
+- Los clientes confirman cada frame (``frame_ack``); el retraso se mide
+  por cliente y solo a ese cliente se le baja o sube la resolución y la
+  calidad JPEG, o se le omite el envío si el retraso es excesivo
+- Una confirmación de hace más de ``ACK_STALE_TICKS`` ticks se descarta:
+  un cliente que deja de confirmar no se queda congelado para siempre
+"""
+
+import time
+import threading
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional
+
+import cv2
+
+from .frame_bus import FrameBus
+
+logger = logging.getLogger(__name__)
+
+# Niveles de calidad: (ancho máximo, calidad JPEG), de mejor a peor
+PREVIEW_LEVELS = [(960, 85), (640, 80), (480, 70), (320, 60)]
+DEFAULT_LEVEL = 1
+
+# Retraso (frames enviados sin confirmar) para bajar / subir de nivel y para dejar de enviar
+BACKLOG_DEGRADE = 3
+BACKLOG_RECOVER = 1
+BACKLOG_MAX = 8
+
+# Ticks seguidos con retraso bajo antes de subir de nivel
+RECOVER_TICKS = 10
+
+# Ticks sin confirmaciones tras los que se descarta la última del cliente
+ACK_STALE_TICKS = 10
+
+
+@dataclass
+class _Viewer:
+    """Estado de adaptación de un espectador"""
+    level: int = DEFAULT_LEVEL
+    sent: int = 0                    # Último seq enviado al cliente
+    acked: Optional[int] = None      # Último seq confirmado (None: sin confirmaciones vigentes)
+    ack_tick: int = 0                # Tick de la última confirmación
+    good_ticks: int = 0
+
+    def backlog(self) -> int:
+        # Los clientes que no confirman no cuentan para la adaptación
+        return self.sent - self.acked if self.acked is not None else 0
+
+
+class PreviewStreamer:
+    """
+    Codificador de previsualización de una cámara, compartido por todos
+    sus espectadores
+    """
+
+    def __init__(self,
+                 cam_id: str,
+                 bus: FrameBus,
+                 emit: Callable[[str, Dict], None],
+                 fps: float = 2.0,
+                 viewers: Iterable[str] = ()):
+        """
+        Inicializar el streamer
+
+        Args:
+            cam_id: ID de la cámara
+            bus: Frame bus de la cámara
+            emit: Función (cam_id, payload, sids) que emite el frame a los
+                espectadores ``sids`` (None: a toda la sala)
+            fps: Frames por segundo de la previsualización
+            viewers: Espectadores (sid) que ya estaban en la sala
+        """
+        self.cam_id = cam_id
+        self.bus = bus
+        self.emit = emit
+
+        # sid -> estado de adaptación del cliente
+        self._viewers: Dict[str, _Viewer] = {sid: _Viewer() for sid in viewers}
+        self._lock = threading.Lock()
+        self._has_viewers = threading.Event()
+        if self._viewers:
+            self._has_viewers.set()
+        self._stop_event = threading.Event()
+
+        self._seq = 0
+        self._tick = 0
+        self._idle_since: Optional[float] = None
+        self._stats = {
+            'frames_sent': 0,
+            'bytes_sent': 0,
+            'encode_seconds': 0.0,
+            'skipped_backlog': 0,
+            'stale_acks': 0,
+            'level_changes': 0,
+            'idle_seconds': 0.0,
+        }
+
+        # El bus solo decodifica para la preview a ``fps`` y con espectadores
+        self._subscription = bus.subscribe('preview', fps=fps if fps > 0 else None)
+        self._subscription.active = bool(self._viewers)
+        self._thread = threading.Thread(target=self._worker, name=f"preview_{cam_id}", daemon=True)
+        self._thread.start()
+
+    # =================== ESPECTADORES ===================
+
+    @property
+    def viewer_count(self) -> int:
+        with self._lock:
+            return len(self._viewers)
+
+    def add_viewer(self, sid: str):
+        with self._lock:
+            self._viewers.setdefault(sid, _Viewer())
+            self._has_viewers.set()
+            self._subscription.active = True
+
+    def remove_viewer(self, sid: str):
+        with self._lock:
+            self._viewers.pop(sid, None)
+            if not self._viewers:
+                self._has_viewers.clear()
+                self._subscription.active = False
+
+    def ack(self, sid: str, seq: int):
+        """Confirmación de un cliente: ha mostrado el frame ``seq``"""
+        with self._lock:
+            viewer = self._viewers.get(sid)
+            if viewer is None or seq > viewer.sent:
+                return
+            viewer.acked = seq if viewer.acked is None else max(viewer.acked, seq)
+            viewer.ack_tick = self._tick
+
+    def backlog(self, sid: Optional[str] = None) -> int:
+        """Frames enviados sin confirmar por ``sid`` (o por el cliente más retrasado)"""
+        with self._lock:
+            if sid is not None:
+                viewer = self._viewers.get(sid)
+                return viewer.backlog() if viewer else 0
+            return max((viewer.backlog() for viewer in self._viewers.values()), default=0)
+
+    def level_of(self, sid: str) -> Optional[int]:
+        """Nivel de calidad actual de un espectador"""
+        with self._lock:
+            viewer = self._viewers.get(sid)
+            return viewer.level if viewer else None
+
+    # =================== CODIFICACIÓN ===================
+
+    def stop(self):
+        self._stop_event.set()
+        self._has_viewers.set()
+        self._thread.join(timeout=5)
+        self._subscription.close()
+
+    def _adapt(self, viewer: _Viewer, backlog: int):
+        if backlog >= BACKLOG_DEGRADE and viewer.level < len(PREVIEW_LEVELS) - 1:
+            viewer.level += 1
+            viewer.good_ticks = 0
+            self._stats['level_changes'] += 1
+        elif backlog <= BACKLOG_RECOVER and viewer.level > 0:
+            viewer.good_ticks += 1
+            if viewer.good_ticks >= RECOVER_TICKS:
+                viewer.level -= 1
+                viewer.good_ticks = 0
+                self._stats['level_changes'] += 1
+        else:
+            viewer.good_ticks = 0
+
+    def _plan_tick(self) -> Dict[int, List[str]]:
+        """
+        Avanzar un tick: descartar confirmaciones caducadas, adaptar cada
+        cliente y agrupar por nivel a los que hay que enviar
+        """
+        groups: Dict[int, List[str]] = {}
+        with self._lock:
+            self._tick += 1
+            for sid, viewer in self._viewers.items():
+                if viewer.acked is not None and self._tick - viewer.ack_tick > ACK_STALE_TICKS:
+                    # Cliente que dejó de confirmar: deja de contar como retrasado
+                    viewer.acked = None
+                    self._stats['stale_acks'] += 1
+                if viewer.acked is None:
+                    groups.setdefault(viewer.level, []).append(sid)
+                    continue
+
+                backlog = viewer.backlog()
+                self._adapt(viewer, backlog)
+                if backlog > BACKLOG_MAX:
+                    self._stats['skipped_backlog'] += 1
+                    continue
+                groups.setdefault(viewer.level, []).append(sid)
+        return groups
+
+    def _encode(self, frame, level: int):
+        max_width, quality = PREVIEW_LEVELS[level]
+        height, width = frame.shape[:2]
+        if width > max_width:
+            frame = cv2.resize(frame, (max_width, int(height * max_width / width)),
+                               interpolation=cv2.INTER_AREA)
+        ok, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+        return (buffer.tobytes(), frame.shape[1], frame.shape[0], quality) if ok else None
+
+    def _worker(self):
+        while not self._stop_event.is_set():
+            if not self._has_viewers.is_set():
+                # Sin espectadores: dormir hasta que alguien se una
+                self._idle_since = time.perf_counter()
+                self._has_viewers.wait()
+                self._stats['idle_seconds'] += time.perf_counter() - self._idle_since
+                self._idle_since = None
+                continue
+
+            # El bus entrega como mucho un frame por intervalo (timestamp del stream)
+            packet = self._subscription.next(timeout=1.0)
+            if packet is None:
+                continue
+
+            self._process(packet)
+
+    def _process(self, packet):
+        """Un tick de previsualización: adaptar y enviar el frame a cada nivel"""
+        for level, sids in sorted(self._plan_tick().items()):
+            self._send(packet, level, sids)
+
+    def _send(self, packet, level: int, sids: List[str]):
+        """Codificar el frame a ``level`` y enviarlo a los espectadores ``sids``"""
+        try:
+            started = time.perf_counter()
+            encoded = self._encode(packet.frame, level)
+            self._stats['encode_seconds'] += time.perf_counter() - started
+            if encoded is None:
+                return
+            data, width, height, quality = encoded
+
+            self._seq += 1
+            with self._lock:
+                for sid in sids:
+                    if sid in self._viewers:
+                        self._viewers[sid].sent = self._seq
+                # Todos en el mismo nivel: un único envío a la sala
+                targets = None if len(sids) == len(self._viewers) else list(sids)
+            self.emit(self.cam_id, {
+                'cam_id': self.cam_id,
+                'seq': self._seq,
+                'frame': data,
+                'width': width,
+                'height': height,
+                'source_width': packet.frame.shape[1],
+                'source_height': packet.frame.shape[0],
+                'quality': quality,
+                'timestamp': datetime.fromtimestamp(packet.timestamp).isoformat()
+            }, targets)
+            self._stats['frames_sent'] += 1
+            self._stats['bytes_sent'] += len(data)
+        except Exception as e:
+            logger.error(f"❌ Error enviando frame para {self.cam_id}: {e}")
+
+    # =================== MÉTRICAS ===================
+
+    def get_statistics(self) -> Dict:
+        stats = dict(self._stats)
+        frames = stats['frames_sent']
+        stats['avg_encode_ms'] = round(stats.pop('encode_seconds') / frames * 1000, 2) if frames else 0.0
+        stats['avg_frame_bytes'] = stats['bytes_sent'] // frames if frames else 0
+        idle_since = self._idle_since
+        if idle_since is not None:
+            stats['idle_seconds'] += time.perf_counter() - idle_since
+        stats['idle_seconds'] = round(stats['idle_seconds'], 1)
+        with self._lock:
+            levels = [viewer.level for viewer in self._viewers.values()]
+        stats.update({
+            'idle': idle_since is not None,
+            'viewers': len(levels),
+            'backlog': self.backlog(),
+            # Espectadores por nivel, como "ancho@calidad"
+            'levels': {f"{width}@{quality}": levels.count(level)
+                       for level, (width, quality) in enumerate(PREVIEW_LEVELS) if level in levels},
+        })
+        return stats
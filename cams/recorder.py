@@ -5,7 +5,7 @@ Video Recorder
 Sistema de grabación de video para streams de cámaras:
 - Grabación continua en segmentos
 - Grabación activada por alertas
-- Gestión de almacenamiento
+- Gestión de almacenamiento (catálogo SQLite de segmentos, ver segment_catalog.py)
 - Generación de thumbnails
 """
 
@@ -21,7 +21,10 @@ import logging
 from pathlib import Path
 import subprocess
 import shutil
-from collections import deque
+import itertools
+
+from .frame_bus import get_frame_bus_manager
+from .segment_catalog import SegmentCatalog
 
 logger = logging.getLogger(__name__)
 
@@ -35,7 +38,8 @@ class VideoRecorder:
                  thumb_path: str = "static/thumbs",
                  max_storage_gb: float = 50.0,
                  segment_duration: int = 300,  # 5 minutos
-                 alert_buffer_seconds: int = 30):
+                 alert_buffer_seconds: int = 30,
+                 catalog_path: Optional[str] = None):
         """
         Inicializar el grabador
         
@@ -45,6 +49,7 @@ class VideoRecorder:
             max_storage_gb: Máximo espacio de almacenamiento en GB
             segment_duration: Duración de segmentos en segundos
             alert_buffer_seconds: Buffer antes/después de alertas
+            catalog_path: Base de datos del catálogo (por defecto <storage_path>/catalog.db)
         """
         self.storage_path = Path(storage_path)
         self.thumb_path = Path(thumb_path)
@@ -56,13 +61,20 @@ class VideoRecorder:
         self.storage_path.mkdir(parents=True, exist_ok=True)
         self.thumb_path.mkdir(parents=True, exist_ok=True)
         
+        # Catálogo de segmentos: retención y búsquedas sin recorrer el disco
+        self.catalog = SegmentCatalog(catalog_path or str(self.storage_path / "catalog.db"))
+        self._init_catalog()
+        
         # Estado de grabadores activos
         self.active_recorders = {}
         self.recorder_lock = threading.Lock()
         
-        # Buffer de frames para grabación de alertas
-        self.frame_buffers = {}
-        self.buffer_lock = threading.Lock()
+        # Sufijo de los clips de alerta sin alert_id (varios en el mismo segundo)
+        self._alert_clip_counter = itertools.count(1)
+        
+        # Frames compartidos por cámara (una sola captura para detector y grabador);
+        # el historial del bus es el buffer pre-alerta
+        self.frame_buses = get_frame_bus_manager()
         
         # Configuración de codecs
         self.video_codec = cv2.VideoWriter_fourcc(*'mp4v')
@@ -75,6 +87,24 @@ class VideoRecorder:
         
         logger.info(f"📹 VideoRecorder inicializado - Storage: {storage_path}, Max: {max_storage_gb}GB")
     
+    def _init_catalog(self):
+        """Importar grabaciones previas (solo la primera vez) y cerrar segmentos interrumpidos"""
+        if self.catalog.is_empty():
+            imported = self.catalog.import_directory(self.storage_path, self.thumb_path)
+            if imported:
+                logger.info(f"📚 {imported} grabaciones existentes importadas al catálogo")
+        
+        # Segmentos que quedaron abiertos (proceso detenido a mitad de grabación)
+        missing = []
+        for segment in self.catalog.incomplete_segments():
+            path = Path(segment['path'])
+            if path.exists():
+                stat = path.stat()
+                self.catalog.finalize_segment(str(path), stat.st_mtime, stat.st_size)
+            else:
+                missing.append(segment['id'])
+        self.catalog.delete_segments(missing)
+    
     def start_continuous_recording(self, cam_id: str, stream_url: str, 
                                  headers: Optional[Dict] = None) -> bool:
         """
@@ -98,10 +128,6 @@ class VideoRecorder:
             cam_dir = self.storage_path / cam_id
             cam_dir.mkdir(exist_ok=True)
             
-            # Inicializar buffer de frames
-            with self.buffer_lock:
-                self.frame_buffers[cam_id] = deque(maxlen=self.alert_buffer_seconds * self.video_fps)
-            
             # Crear y iniciar hilo de grabación
             recorder_thread = threading.Thread(
                 target=self._continuous_recording_worker,
@@ -155,10 +181,6 @@ class VideoRecorder:
             with self.recorder_lock:
                 del self.active_recorders[cam_id]
             
-            with self.buffer_lock:
-                if cam_id in self.frame_buffers:
-                    del self.frame_buffers[cam_id]
-            
             logger.info(f"⏹️ Grabación detenida para cámara {cam_id}")
             return True
             
@@ -167,7 +189,8 @@ class VideoRecorder:
             return False
     
     def record_alert_clip(self, cam_id: str, alert_info: Dict, 
-                         duration_after: int = 30) -> Optional[str]:
+                         duration_after: int = 30,
+                         alert_id: Optional[str] = None) -> Optional[str]:
         """
         Grabar clip de alerta usando buffer pre-existente
         
@@ -175,6 +198,7 @@ class VideoRecorder:
             cam_id: ID de la cámara
             alert_info: Información de la alerta
             duration_after: Duración adicional después de la alerta
+            alert_id: ID de la alerta en AlertManager, para enlazarla en el catálogo
             
         Returns:
             Ruta del archivo grabado o None si falló
@@ -185,26 +209,27 @@ class VideoRecorder:
             alert_dir.mkdir(exist_ok=True)
             
             # Generar nombre de archivo
+            # (el timestamp tiene resolución de segundos: el alert_id o un
+            # contador distingue alertas del mismo tipo en el mismo segundo)
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             alert_type = alert_info.get('type', 'unknown')
-            filename = f"alert_{alert_type}_{timestamp}.mp4"
+            suffix = alert_id or f"{os.getpid()}_{next(self._alert_clip_counter)}"
+            filename = f"alert_{alert_type}_{timestamp}_{suffix}.mp4"
             output_path = alert_dir / filename
             
-            # Obtener frames del buffer
-            with self.buffer_lock:
-                if cam_id not in self.frame_buffers:
-                    logger.error(f"❌ No hay buffer de frames para {cam_id}")
-                    return None
-                
-                # Copiar frames del buffer (pre-alerta)
-                buffered_frames = list(self.frame_buffers[cam_id])
+            # Obtener frames del historial del bus (pre-alerta)
+            bus = self.frame_buses.get(cam_id)
+            if bus is None:
+                logger.error(f"❌ No hay buffer de frames para {cam_id}")
+                return None
             
-            if not buffered_frames:
+            shape = bus.preroll.shape
+            if not len(bus.preroll) or shape is None:
                 logger.error(f"❌ Buffer vacío para {cam_id}")
                 return None
             
             # Inicializar writer de video
-            frame_height, frame_width = buffered_frames[0].shape[:2]
+            frame_height, frame_width = shape[:2]
             fourcc = cv2.VideoWriter_fourcc(*'mp4v')
             out = cv2.VideoWriter(
                 str(output_path), 
@@ -217,9 +242,23 @@ class VideoRecorder:
                 logger.error(f"❌ No se pudo abrir writer para {output_path}")
                 return None
             
-            # Escribir frames del buffer (pre-alerta)
-            for frame in buffered_frames:
+            # Escribir frames del buffer (pre-alerta) directamente desde el ring buffer
+            frames_buffered = 0
+            first_timestamp = None
+            last_frame = None
+            for frame_timestamp, frame in bus.history(self.alert_buffer_seconds):
                 out.write(frame)
+                frames_buffered += 1
+                first_timestamp = first_timestamp or frame_timestamp
+                last_frame = frame
+            
+            if last_frame is None:
+                out.release()
+                logger.error(f"❌ Buffer vacío para {cam_id}")
+                return None
+            
+            # El hueco del ring buffer se reutilizará: quedarse con una copia del último frame
+            last_frame = last_frame.copy()
             
             # Continuar grabando por duration_after segundos
             frames_after = duration_after * self.video_fps
@@ -230,7 +269,6 @@ class VideoRecorder:
             if recorder_info and recorder_info['status'] == 'recording':
                 # TODO: Implementar captura de frames adicionales
                 # Por ahora, simplemente duplicar último frame
-                last_frame = buffered_frames[-1]
                 for _ in range(frames_after):
                     out.write(last_frame)
                     frames_written += 1
@@ -238,15 +276,16 @@ class VideoRecorder:
             out.release()
             
             # Generar thumbnail
-            thumb_path = self._generate_thumbnail(output_path, buffered_frames[-1])
+            thumb_path = self._generate_thumbnail(output_path, last_frame)
             
             # Guardar metadata
             metadata = {
                 'cam_id': cam_id,
                 'alert_info': alert_info,
                 'timestamp': datetime.now().isoformat(),
-                'duration_seconds': len(buffered_frames) / self.video_fps + duration_after,
-                'frames_total': len(buffered_frames) + frames_written,
+                'duration_seconds': frames_buffered / self.video_fps + duration_after,
+                'frames_total': frames_buffered + frames_written,
+                'preroll_mode': bus.preroll.mode,
                 'file_size': output_path.stat().st_size,
                 'thumbnail': str(thumb_path) if thumb_path else None
             }
@@ -255,6 +294,21 @@ class VideoRecorder:
             with open(metadata_path, 'w') as f:
                 json.dump(metadata, f, indent=2)
             
+            # Registrar el clip y enlazar la alerta con él y con el segmento continuo en curso
+            alert_time = time.time()
+            self.catalog.add_segment(cam_id, str(output_path), first_timestamp or alert_time,
+                                     kind='alert', fps=self.video_fps)
+            self.catalog.finalize_segment(str(output_path), alert_time + duration_after,
+                                          metadata['file_size'],
+                                          frame_count=metadata['frames_total'],
+                                          duration_seconds=metadata['duration_seconds'],
+                                          thumbnail_path=metadata['thumbnail'],
+                                          metadata=metadata)
+            if alert_id:
+                self.catalog.link_alert(cam_id, alert_id, alert_time,
+                                        alert_type=alert_info.get('type'),
+                                        segment_path=str(output_path))
+            
             logger.info(f"🎬 Clip de alerta grabado: {output_path}")
             return str(output_path)
             
@@ -262,36 +316,34 @@ class VideoRecorder:
             logger.error(f"❌ Error grabando clip de alerta para {cam_id}: {e}")
             return None
     
+    def link_alert(self, cam_id: str, alert_id: str, alert_type: Optional[str] = None) -> int:
+        """Enlazar una alerta con los segmentos de la cámara que cubren el momento actual"""
+        try:
+            return self.catalog.link_alert(cam_id, alert_id, time.time(), alert_type=alert_type)
+        except Exception as e:
+            logger.error(f"❌ Error enlazando alerta {alert_id} con grabaciones: {e}")
+            return 0
+    
     def _continuous_recording_worker(self, cam_id: str, stream_url: str, 
                                    headers: Optional[Dict] = None):
-        """Worker para grabación continua"""
+        """Worker para grabación continua (suscrito al frame bus de la cámara)"""
+        bus = self.frame_buses.acquire(cam_id, stream_url, headers)
+        # El bus solo decodifica los frames que entran en el vídeo (video_fps)
+        subscription = bus.subscribe('recorder', fps=self.video_fps)
+        current_writer = None
+        current_segment_path = None
+        frame_count = 0
         try:
-            # Abrir stream de video
-            cap = self._open_video_stream(stream_url, headers)
-            if cap is None:
-                with self.recorder_lock:
-                    self.active_recorders[cam_id]['status'] = 'error'
-                return
-            
             with self.recorder_lock:
                 self.active_recorders[cam_id]['status'] = 'recording'
             
             segment_start_time = time.time()
-            current_writer = None
-            frame_count = 0
             
             while self.running and self.active_recorders.get(cam_id, {}).get('status') == 'recording':
-                ret, frame = cap.read()
-                
-                if not ret:
-                    logger.warning(f"⚠️ No se pudo leer frame de {cam_id}")
-                    time.sleep(1)
+                packet = subscription.next(timeout=1.0)
+                if packet is None:
                     continue
-                
-                # Actualizar buffer de frames para alertas
-                with self.buffer_lock:
-                    if cam_id in self.frame_buffers:
-                        self.frame_buffers[cam_id].append(frame.copy())
+                frame = packet.frame
                 
                 # Verificar si necesitamos nuevo segmento
                 current_time = time.time()
@@ -317,23 +369,12 @@ class VideoRecorder:
                         self.active_recorders[cam_id]['total_segments'] += 1
                 
                 # Escribir frame
-                if current_writer is not None:
-                    current_writer.write(frame)
-                    frame_count += 1
+                current_writer.write(frame)
+                frame_count += 1
                 
                 # Actualizar timestamp
                 with self.recorder_lock:
                     self.active_recorders[cam_id]['last_frame_time'] = datetime.now()
-                
-                # Control de FPS
-                time.sleep(1.0 / self.video_fps)
-            
-            # Limpiar al finalizar
-            if current_writer is not None:
-                current_writer.release()
-                self._finalize_segment(cam_id, current_segment_path, frame_count)
-            
-            cap.release()
             
             with self.recorder_lock:
                 if cam_id in self.active_recorders:
@@ -346,25 +387,13 @@ class VideoRecorder:
             with self.recorder_lock:
                 if cam_id in self.active_recorders:
                     self.active_recorders[cam_id]['status'] = 'error'
-    
-    def _open_video_stream(self, stream_url: str, headers: Optional[Dict] = None) -> Optional[cv2.VideoCapture]:
-        """Abrir stream de video"""
-        try:
-            # Para streams HTTP/HTTPS, configurar headers si es necesario
-            cap = cv2.VideoCapture(stream_url)
-            
-            if not cap.isOpened():
-                logger.error(f"❌ No se pudo abrir stream: {stream_url}")
-                return None
-            
-            # Configurar buffer mínimo para reducir latencia
-            cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
-            
-            return cap
-            
-        except Exception as e:
-            logger.error(f"❌ Error abriendo stream {stream_url}: {e}")
-            return None
+        finally:
+            # Limpiar al finalizar
+            if current_writer is not None:
+                current_writer.release()
+                self._finalize_segment(cam_id, current_segment_path, frame_count)
+            subscription.close()
+            self.frame_buses.release(cam_id)
     
     def _create_new_segment(self, cam_id: str, sample_frame: np.ndarray) -> tuple:
         """Crear nuevo segmento de grabación"""
@@ -388,6 +417,8 @@ class VideoRecorder:
                 logger.error(f"❌ No se pudo crear writer para {output_path}")
                 return None, None
             
+            self.catalog.add_segment(cam_id, str(output_path), time.time(), fps=self.video_fps)
+            
             logger.debug(f"📹 Nuevo segmento creado: {output_path}")
             return str(output_path), writer
             
@@ -418,6 +449,11 @@ class VideoRecorder:
             with open(metadata_path, 'w') as f:
                 json.dump(metadata, f, indent=2)
             
+            self.catalog.finalize_segment(segment_path, time.time(), metadata['file_size'],
+                                          frame_count=frame_count,
+                                          duration_seconds=metadata['duration_seconds'],
+                                          metadata=metadata)
+            
             logger.debug(f"📹 Segmento finalizado: {segment_path} ({frame_count} frames)")
             
         except Exception as e:
@@ -471,7 +507,8 @@ class VideoRecorder:
             while self.running:
                 try:
                     self._cleanup_storage()
-                    time.sleep(3600)  # Limpiar cada hora
+                    # Consultar el catálogo es barato: revisar la cuota en cada segmento
+                    time.sleep(self.segment_duration)
                 except Exception as e:
                     logger.error(f"❌ Error en limpieza de almacenamiento: {e}")
                     time.sleep(300)  # Reintentar en 5 minutos
@@ -480,74 +517,42 @@ class VideoRecorder:
         self.cleanup_thread.start()
     
     def _cleanup_storage(self):
-        """Limpiar almacenamiento eliminando archivos antiguos"""
+        """Eliminar los segmentos más antiguos del catálogo hasta cumplir la cuota"""
         try:
-            # Calcular uso actual de almacenamiento
-            total_size = self._get_directory_size(self.storage_path)
+            total_size = self.catalog.total_size()
             
             if total_size <= self.max_storage_bytes:
                 return  # No es necesario limpiar
             
             logger.info(f"🧹 Iniciando limpieza de almacenamiento: {total_size / (1024**3):.2f}GB / {self.max_storage_bytes / (1024**3):.2f}GB")
             
-            # Obtener lista de archivos con timestamps
-            files_with_time = []
-            for cam_dir in self.storage_path.iterdir():
-                if cam_dir.is_dir():
-                    for file_path in cam_dir.rglob("*.mp4"):
-                        if file_path.is_file():
-                            files_with_time.append((
-                                file_path.stat().st_mtime,
-                                file_path,
-                                file_path.stat().st_size
-                            ))
-            
-            # Ordenar por timestamp (más antiguos primero)
-            files_with_time.sort(key=lambda x: x[0])
-            
-            # Eliminar archivos hasta estar bajo el límite
+            # Eliminar segmentos hasta estar bajo el límite
             bytes_to_remove = total_size - int(self.max_storage_bytes * 0.8)  # Margen del 20%
             bytes_removed = 0
-            files_removed = 0
+            removed = []
             
-            for mtime, file_path, file_size in files_with_time:
-                if bytes_removed >= bytes_to_remove:
-                    break
-                
+            for segment in self.catalog.oldest_segments(bytes_to_remove):
+                file_path = Path(segment['path'])
                 try:
-                    # Eliminar archivo de video
-                    file_path.unlink()
-                    bytes_removed += file_size
-                    files_removed += 1
+                    # Eliminar archivo de video, metadata y thumbnail asociados
+                    file_path.unlink(missing_ok=True)
+                    file_path.with_suffix('.json').unlink(missing_ok=True)
+                    thumb_path = Path(segment['thumbnail_path'] or self.thumb_path / f"{file_path.stem}.jpg")
+                    thumb_path.unlink(missing_ok=True)
                     
-                    # Eliminar metadata asociada
-                    metadata_path = file_path.with_suffix('.json')
-                    if metadata_path.exists():
-                        metadata_path.unlink()
-                    
-                    # Eliminar thumbnail asociado
-                    thumb_path = self.thumb_path / f"{file_path.stem}.jpg"
-                    if thumb_path.exists():
-                        thumb_path.unlink()
+                    removed.append(segment['id'])
+                    bytes_removed += segment['size_bytes']
                     
                 except Exception as e:
                     logger.error(f"❌ Error eliminando {file_path}: {e}")
             
-            logger.info(f"🧹 Limpieza completada: {files_removed} archivos eliminados, {bytes_removed / (1024**3):.2f}GB liberados")
+            self.catalog.delete_segments(removed)
+            
+            logger.info(f"🧹 Limpieza completada: {len(removed)} archivos eliminados, {bytes_removed / (1024**3):.2f}GB liberados")
             
         except Exception as e:
             logger.error(f"❌ Error en limpieza de almacenamiento: {e}")
     
-    def _get_directory_size(self, path: Path) -> int:
-        """Calcular tamaño total de un directorio"""
-        total_size = 0
-        for dirpath, dirnames, filenames in os.walk(path):
-            for filename in filenames:
-                file_path = os.path.join(dirpath, filename)
-                if os.path.exists(file_path):
-                    total_size += os.path.getsize(file_path)
-        return total_size
-    
     def get_recording_status(self, cam_id: Optional[str] = None) -> Dict:
         """Obtener estado de grabaciones"""
         with self.recorder_lock:
@@ -555,47 +560,47 @@ class VideoRecorder:
                 return self.active_recorders.get(cam_id, {})
             return self.active_recorders.copy()
     
-    def get_recordings(self, cam_id: str, limit: int = 20) -> List[Dict]:
-        """Obtener lista de grabaciones para una cámara"""
+    def get_recordings(self, cam_id: str, limit: int = 20,
+                       start: Optional[datetime] = None,
+                       end: Optional[datetime] = None) -> List[Dict]:
+        """
+        Obtener grabaciones de una cámara, de la más reciente a la más antigua
+        
+        Args:
+            cam_id: ID de la cámara
+            limit: Máximo de grabaciones
+            start: Solo grabaciones que terminan después de este momento
+            end: Solo grabaciones que empiezan antes de este momento
+        """
         try:
-            cam_dir = self.storage_path / cam_id
-            if not cam_dir.exists():
-                return []
+            segments = self.catalog.find_segments(
+                cam_id,
+                start=start.timestamp() if start else None,
+                end=end.timestamp() if end else None,
+                limit=limit
+            )
             
             recordings = []
-            
-            # Buscar archivos de video
-            for video_file in cam_dir.rglob("*.mp4"):
-                metadata_file = video_file.with_suffix('.json')
-                
-                recording_info = {
-                    'file_path': str(video_file),
-                    'filename': video_file.name,
-                    'size_bytes': video_file.stat().st_size,
-                    'created_time': datetime.fromtimestamp(video_file.stat().st_ctime).isoformat(),
-                    'type': 'alert' if 'alerts' in str(video_file) else 'continuous'
-                }
-                
-                # Cargar metadata si existe
-                if metadata_file.exists():
-                    try:
-                        with open(metadata_file, 'r') as f:
-                            metadata = json.load(f)
-                        recording_info.update(metadata)
-                    except:
-                        pass
-                
-                # Buscar thumbnail
-                thumb_path = self.thumb_path / f"{video_file.stem}.jpg"
-                if thumb_path.exists():
-                    recording_info['thumbnail'] = str(thumb_path)
-                
+            for segment in segments:
+                recording_info = dict(segment['metadata'])
+                recording_info.update({
+                    'file_path': segment['path'],
+                    'filename': Path(segment['path']).name,
+                    'size_bytes': segment['size_bytes'],
+                    'created_time': datetime.fromtimestamp(segment['start_time']).isoformat(),
+                    'start_time': datetime.fromtimestamp(segment['start_time']).isoformat(),
+                    'end_time': (datetime.fromtimestamp(segment['end_time']).isoformat()
+                                 if segment['end_time'] else None),
+                    'duration_seconds': segment['duration_seconds'],
+                    'status': segment['status'],
+                    'type': segment['kind'],
+                    'alert_ids': segment['alert_ids']
+                })
+                if segment['thumbnail_path']:
+                    recording_info['thumbnail'] = segment['thumbnail_path']
                 recordings.append(recording_info)
             
-            # Ordenar por timestamp descendente
-            recordings.sort(key=lambda x: x.get('created_time', ''), reverse=True)
-            
-            return recordings[:limit]
+            return recordings
             
         except Exception as e:
             logger.error(f"❌ Error obteniendo grabaciones para {cam_id}: {e}")
@@ -604,21 +609,19 @@ class VideoRecorder:
     def get_storage_stats(self) -> Dict:
         """Obtener estadísticas de almacenamiento"""
         try:
-            total_size = self._get_directory_size(self.storage_path)
-            
-            # Contar archivos por tipo
-            video_count = len(list(self.storage_path.rglob("*.mp4")))
-            thumb_count = len(list(self.thumb_path.rglob("*.jpg")))
+            catalog_stats = self.catalog.get_statistics()
+            total_size = catalog_stats['total_bytes']
             
             return {
                 'total_size_bytes': total_size,
                 'total_size_gb': total_size / (1024**3),
                 'max_size_gb': self.max_storage_bytes / (1024**3),
                 'usage_percentage': (total_size / self.max_storage_bytes) * 100,
-                'video_files': video_count,
-                'thumbnail_files': thumb_count,
+                'video_files': catalog_stats['segments'],
+                'thumbnail_files': catalog_stats['thumbnails'],
                 'active_recorders': len(self.active_recorders),
-                'storage_path': str(self.storage_path)
+                'storage_path': str(self.storage_path),
+                'catalog': catalog_stats
             }
             
         except Exception as e:
@@ -638,6 +641,8 @@ class VideoRecorder:
         if self.cleanup_thread and self.cleanup_thread.is_alive():
             self.cleanup_thread.join(timeout=5)
         
+        self.catalog.close()
+        
         logger.info("📹 VideoRecorder limpiado")
 
 
@@ -0,0 +1,196 @@
+"""
+Pre-alert Ring Buffers
+======================
+
+Buffers circulares de tamaño fijo para el pre-roll de los clips de alerta:
+- ``FrameRingBuffer``: un único array uint8 contiguo [N, H, W, 3] reservado
+  una vez, más marcas de tiempo; cada escritura copia el frame en el
+  siguiente hueco y la exportación copia cada frame, bajo el lock, en un
+  único array de trabajo que reutiliza durante todo el recorrido
+- ``JpegRingBuffer``: modo comprimido que guarda los bytes JPEG de cada
+  frame, para ventanas de pre-roll largas
+
+Ambos exponen la misma interfaz (``write``, ``iter_frames``,
+``get_statistics``). ``iter_frames`` recorre del más antiguo al más
+reciente y omite los huecos que el escritor haya reutilizado mientras
+tanto; un frame exportado nunca mezcla dos escrituras.
+"""
+
+import os
+import threading
+import logging
+from typing import Dict, Iterator, Optional, Tuple
+
+import cv2
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_JPEG_QUALITY = 85
+
+
+class FrameRingBuffer:
+    """Frames crudos en un array preasignado [N, H, W, 3]"""
+
+    mode = 'raw'
+
+    def __init__(self, capacity: int):
+        self.capacity = max(1, capacity)
+        self._frames: Optional[np.ndarray] = None
+        self._timestamps = np.zeros(self.capacity, dtype=np.float64)
+        # Número de escritura guardado en cada hueco (0 = vacío)
+        self._seqs = np.zeros(self.capacity, dtype=np.int64)
+        self._written = 0
+        # Primera escritura con la resolución actual
+        self._first_valid = 1
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return min(self._written - self._first_valid + 1, self.capacity)
+
+    @property
+    def shape(self) -> Optional[Tuple[int, ...]]:
+        return self._frames.shape[1:] if self._frames is not None else None
+
+    @property
+    def nbytes(self) -> int:
+        return self._frames.nbytes if self._frames is not None else 0
+
+    def _allocate(self, frame: np.ndarray):
+        if self._frames is not None:
+            logger.info(f"📐 Resolución cambiada {self.shape} -> {frame.shape}; reiniciando buffer")
+        self._frames = np.empty((self.capacity,) + frame.shape, dtype=frame.dtype)
+        self._seqs[:] = 0
+        self._timestamps[:] = 0
+        self._first_valid = self._written + 1
+
+    def write(self, frame: np.ndarray, timestamp: float):
+        """Copiar ``frame`` en el siguiente hueco"""
+        with self._lock:
+            if self._frames is None or self._frames.shape[1:] != frame.shape:
+                self._allocate(frame)
+            self._written += 1
+            slot = (self._written - 1) % self.capacity
+            self._frames[slot] = frame
+            self._timestamps[slot] = timestamp
+            self._seqs[slot] = self._written
+
+    def _window(self, seconds: Optional[float]) -> Tuple[int, int]:
+        """Rango [primera, última] de escrituras dentro de los últimos ``seconds``"""
+        with self._lock:
+            last = self._written
+            first = max(self._first_valid, last - self.capacity + 1)
+            if seconds is not None and last:
+                since = self._timestamps[(last - 1) % self.capacity] - seconds
+                while first < last and self._timestamps[(first - 1) % self.capacity] < since:
+                    first += 1
+            return first, last
+
+    def _read(self, seq: int, out: Optional[np.ndarray] = None) -> Optional[Tuple[float, np.ndarray]]:
+        """
+        (timestamp, frame) de la escritura ``seq`` copiado en ``out`` (o en un
+        array nuevo si no tiene la forma del buffer), o None si ya se reutilizó
+        """
+        slot = (seq - 1) % self.capacity
+        with self._lock:
+            if self._seqs[slot] != seq:
+                return None
+            frame = self._frames[slot]
+            if out is None or out.shape != frame.shape or out.dtype != frame.dtype:
+                out = np.empty_like(frame)
+            np.copyto(out, frame)
+            return float(self._timestamps[slot]), out
+
+    def iter_frames(self, seconds: Optional[float] = None) -> Iterator[Tuple[float, np.ndarray]]:
+        """
+        (timestamp, frame) de los últimos ``seconds`` segundos. El frame es
+        un array de trabajo que se sobrescribe con el siguiente: copiarlo
+        para conservarlo.
+        """
+        first, last = self._window(seconds)
+        if last < first:
+            return
+        scratch = None
+        for seq in range(first, last + 1):
+            read = self._read(seq, scratch)
+            if read is not None:
+                timestamp, scratch = read
+                yield timestamp, scratch
+
+    def latest(self) -> Optional[np.ndarray]:
+        """Copia del último frame escrito"""
+        with self._lock:
+            if not self._written:
+                return None
+            return self._frames[(self._written - 1) % self.capacity].copy()
+
+    def get_statistics(self) -> Dict:
+        return {
+            'mode': self.mode,
+            'capacity': self.capacity,
+            'frames': len(self),
+            'bytes': self.nbytes,
+            'shape': list(self.shape) if self.shape else None,
+        }
+
+
+class JpegRingBuffer(FrameRingBuffer):
+    """Frames comprimidos en JPEG en huecos fijos"""
+
+    mode = 'jpeg'
+
+    def __init__(self, capacity: int, quality: int = DEFAULT_JPEG_QUALITY):
+        super().__init__(capacity)
+        self.quality = quality
+        self._encoded = [None] * self.capacity
+        self._shape: Optional[Tuple[int, ...]] = None
+
+    @property
+    def shape(self) -> Optional[Tuple[int, ...]]:
+        return self._shape
+
+    @property
+    def nbytes(self) -> int:
+        return sum(len(data) for data in self._encoded if data is not None)
+
+    def write(self, frame: np.ndarray, timestamp: float):
+        # Codificar fuera del lock: el JPEG es lo caro
+        ok, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, self.quality])
+        if not ok:
+            return
+        with self._lock:
+            if self._shape != frame.shape:
+                self._shape = frame.shape
+                self._seqs[:] = 0
+                self._first_valid = self._written + 1
+            self._written += 1
+            slot = (self._written - 1) % self.capacity
+            self._encoded[slot] = buffer.tobytes()
+            self._timestamps[slot] = timestamp
+            self._seqs[slot] = self._written
+
+    def _read(self, seq: int, out: Optional[np.ndarray] = None) -> Optional[Tuple[float, np.ndarray]]:
+        # Los bytes JPEG no se modifican: basta con leerlos bajo el lock
+        slot = (seq - 1) % self.capacity
+        with self._lock:
+            if self._seqs[slot] != seq:
+                return None
+            data = self._encoded[slot]
+            timestamp = float(self._timestamps[slot])
+        return timestamp, cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+
+    def latest(self) -> Optional[np.ndarray]:
+        read = self._read(self._written) if self._written else None
+        return read[1] if read is not None else None
+
+
+def create_ring_buffer(seconds: float, fps: float, mode: Optional[str] = None) -> FrameRingBuffer:
+    """
+    Buffer de pre-roll para ``seconds`` segundos a ``fps``. ``mode`` es
+    'raw' o 'jpeg' (por defecto la variable PREROLL_BUFFER_MODE, 'raw').
+    """
+    capacity = max(1, int(seconds * fps))
+    mode = (mode or os.getenv('PREROLL_BUFFER_MODE', 'raw')).lower()
+    if mode == 'jpeg':
+        return JpegRingBuffer(capacity, int(os.getenv('PREROLL_JPEG_QUALITY', str(DEFAULT_JPEG_QUALITY))))
+    return FrameRingBuffer(capacity)
@@ -10,8 +10,6 @@ Rutas Flask y handlers SocketIO para el sistema de cámaras:
 
 import os
 import json
-import cv2
-import base64
 import threading
 import time
 from datetime import datetime, timedelta
@@ -27,6 +25,8 @@ from .detector import RiskDetector
 from .resolver import StreamResolver
 from .recorder import VideoRecorder
 from .alerts import AlertManager
+from .frame_bus import get_frame_bus_manager
+from .preview import PreviewStreamer
 
 logger = logging.getLogger(__name__)
 
@@ -44,6 +44,15 @@ socketio = None
 active_streams = {}
 stream_lock = threading.Lock()
 
+# Espectadores (sid) de cada sala camera_{cam_id}, aunque el stream no esté activo
+camera_viewers: Dict[str, set] = {}
+
+# Frames por segundo de la previsualización WebSocket
+PREVIEW_FPS = float(os.getenv('PREVIEW_FPS', '2'))
+
+# Segundos entre detecciones por cámara (medidos con el timestamp del stream)
+DETECTION_INTERVAL = float(os.getenv('DETECTION_INTERVAL', '2'))
+
 def init_cams_services(app_socketio: SocketIO):
     """
     Inicializar servicios de cámaras
@@ -77,6 +86,19 @@ def _emit_alert_notification(alert: Dict):
         except Exception as e:
             logger.error(f"❌ Error emitiendo alerta via WebSocket: {e}")
 
+def _emit_preview_frame(cam_id: str, payload: Dict, sids: Optional[List[str]] = None):
+    """Emitir un frame de previsualización (JPEG binario) a la sala de la cámara o a ``sids``"""
+    if socketio:
+        if sids is None:
+            socketio.emit('frame', payload, room=f"camera_{cam_id}", namespace='/cams')
+            return
+        for sid in sids:
+            socketio.emit('frame', payload, room=sid, namespace='/cams')
+
+def _viewer_count(cam_id: str) -> int:
+    """Espectadores de una cámara (llamar con stream_lock adquirido)"""
+    return len(camera_viewers.get(cam_id, ()))
+
 # =================== RUTAS REST API ===================
 
 @cams_bp.route('/')
@@ -134,11 +156,12 @@ def get_camera(cam_id: str):
         # Agregar información de estado
         with stream_lock:
             stream_info = active_streams.get(cam_id, {})
+            viewer_count = _viewer_count(cam_id)
         
         camera_info = camera.copy()
         camera_info["status"] = stream_info.get("status", "stopped")
         camera_info["last_update"] = stream_info.get("last_update")
-        camera_info["viewer_count"] = stream_info.get("viewer_count", 0)
+        camera_info["viewer_count"] = viewer_count
         
         return jsonify({
             "success": True,
@@ -190,9 +213,9 @@ def start_camera_stream(cam_id: str):
                 "resolved_stream": resolved_stream,
                 "status": "starting",
                 "start_time": datetime.now(),
-                "viewer_count": 0,
                 "last_update": datetime.now().isoformat(),
-                "thread": None
+                "thread": None,
+                "preview": None
             }
         
         # Iniciar grabación si está habilitada
@@ -265,6 +288,7 @@ def get_camera_status(cam_id: str):
     try:
         with stream_lock:
             stream_info = active_streams.get(cam_id, {})
+            viewer_count = _viewer_count(cam_id)
         
         if not stream_info:
             return jsonify({
@@ -276,15 +300,19 @@ def get_camera_status(cam_id: str):
         # Agregar información de detección
         detection_stats = detector.get_statistics() if detector else {}
         active_detections = detector.get_active_detections(cam_id) if detector else {}
+        bus = get_frame_bus_manager().get(cam_id)
+        preview = stream_info.get("preview")
         
         return jsonify({
             "success": True,
             "status": stream_info.get("status"),
             "start_time": stream_info.get("start_time", datetime.now()).isoformat(),
-            "viewer_count": stream_info.get("viewer_count", 0),
+            "viewer_count": viewer_count,
             "last_update": stream_info.get("last_update"),
             "detection_stats": detection_stats,
-            "active_detections": active_detections
+            "active_detections": active_detections,
+            "frame_bus": bus.get_statistics() if bus else None,
+            "preview": preview.get_statistics() if preview else None
         })
         
     except Exception as e:
@@ -372,10 +400,16 @@ def get_alert_statistics():
 
 @cams_bp.route('/api/recordings/<cam_id>')
 def get_recordings(cam_id: str):
-    """Obtener grabaciones de una cámara"""
+    """Obtener grabaciones de una cámara (opcionalmente en un rango ?start=&end= ISO)"""
     try:
         limit = int(request.args.get('limit', 20))
-        recordings = recorder.get_recordings(cam_id, limit)
+        start = request.args.get('start')
+        end = request.args.get('end')
+        recordings = recorder.get_recordings(
+            cam_id, limit,
+            start=datetime.fromisoformat(start) if start else None,
+            end=datetime.fromisoformat(end) if end else None
+        )
         
         return jsonify({
             "success": True,
@@ -415,11 +449,14 @@ def handle_disconnect():
     """Cliente desconectado de WebSocket"""
     logger.debug(f"🔌 Cliente desconectado de /cams: {request.sid}")
     
-    # Remover de todas las salas
+    # Remover solo de las salas a las que se había unido
     with stream_lock:
-        for cam_id in active_streams:
-            if active_streams[cam_id]["viewer_count"] > 0:
-                active_streams[cam_id]["viewer_count"] -= 1
+        for cam_id, viewers in camera_viewers.items():
+            if request.sid in viewers:
+                viewers.discard(request.sid)
+                preview = active_streams.get(cam_id, {}).get("preview")
+                if preview:
+                    preview.remove_viewer(request.sid)
 
 @socketio.on('join_camera', namespace='/cams')
 def handle_join_camera(data):
@@ -433,8 +470,10 @@ def handle_join_camera(data):
         join_room(f"camera_{cam_id}")
         
         with stream_lock:
-            if cam_id in active_streams:
-                active_streams[cam_id]["viewer_count"] += 1
+            camera_viewers.setdefault(cam_id, set()).add(request.sid)
+            preview = active_streams.get(cam_id, {}).get("preview")
+            if preview:
+                preview.add_viewer(request.sid)
         
         emit('joined_camera', {'cam_id': cam_id, 'message': f'Unido a cámara {cam_id}'})
         logger.debug(f"👁️ Cliente {request.sid} se unió a cámara {cam_id}")
@@ -454,8 +493,10 @@ def handle_leave_camera(data):
         leave_room(f"camera_{cam_id}")
         
         with stream_lock:
-            if cam_id in active_streams and active_streams[cam_id]["viewer_count"] > 0:
-                active_streams[cam_id]["viewer_count"] -= 1
+            camera_viewers.get(cam_id, set()).discard(request.sid)
+            preview = active_streams.get(cam_id, {}).get("preview")
+            if preview:
+                preview.remove_viewer(request.sid)
         
         emit('left_camera', {'cam_id': cam_id})
         logger.debug(f"👁️ Cliente {request.sid} abandonó cámara {cam_id}")
@@ -485,6 +526,23 @@ def handle_request_frame(data):
         logger.error(f"❌ Error en request_frame: {e}")
         emit('error', {'message': str(e)})
 
+@socketio.on('frame_ack', namespace='/cams')
+def handle_frame_ack(data):
+    """Cliente confirma que ha mostrado un frame (mide su retraso)"""
+    try:
+        cam_id = data.get('cam_id')
+        seq = data.get('seq')
+        if not cam_id or seq is None:
+            return
+        
+        with stream_lock:
+            preview = active_streams.get(cam_id, {}).get("preview")
+        if preview:
+            preview.ack(request.sid, int(seq))
+        
+    except Exception as e:
+        logger.error(f"❌ Error en frame_ack: {e}")
+
 # =================== FUNCIONES DE PROCESAMIENTO ===================
 
 def _process_camera_stream(cam_id: str):
@@ -494,6 +552,9 @@ def _process_camera_stream(cam_id: str):
     Args:
         cam_id: ID de la cámara a procesar
     """
+    frame_buses = get_frame_bus_manager()
+    subscription = None
+    preview = None
     try:
         with stream_lock:
             stream_info = active_streams.get(cam_id)
@@ -504,23 +565,23 @@ def _process_camera_stream(cam_id: str):
         camera = stream_info["camera"]
         resolved_stream = stream_info["resolved_stream"]
         
-        # Abrir stream de video
-        cap = cv2.VideoCapture(resolved_stream["stream_url"])
+        # Regiones de interés para el gate de movimiento del detector
+        detector.set_motion_regions(cam_id, camera.get("motion_regions"))
         
-        if not cap.isOpened():
-            logger.error(f"❌ No se pudo abrir stream para {cam_id}")
-            with stream_lock:
-                if cam_id in active_streams:
-                    active_streams[cam_id]["status"] = "error"
-            return
+        # Suscribirse al frame bus de la cámara (captura compartida con el grabador)
+        bus = frame_buses.acquire(cam_id, resolved_stream["stream_url"], resolved_stream.get("headers"))
+        subscription = bus.subscribe('detector', fps=1.0 / DETECTION_INTERVAL)
         
-        # Configurar captura
-        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)  # Buffer mínimo
+        # Previsualización: codifica solo mientras la sala tenga espectadores
+        with stream_lock:
+            preview = PreviewStreamer(cam_id, bus, _emit_preview_frame, fps=PREVIEW_FPS,
+                                      viewers=camera_viewers.get(cam_id, ()))
+            if cam_id in active_streams:
+                active_streams[cam_id]["preview"] = preview
         
         logger.info(f"📹 Procesamiento iniciado para cámara {cam_id}")
         
         frame_count = 0
-        last_detection_time = time.time()
         
         while True:
             # Verificar si debe continuar
@@ -530,96 +591,66 @@ def _process_camera_stream(cam_id: str):
             if current_status != "running":
                 break
             
-            # Leer frame
-            ret, frame = cap.read()
+            # Último frame publicado por el bus (de solo lectura, sin copia)
+            packet = subscription.next(timeout=1.0)
             
-            if not ret:
-                logger.warning(f"⚠️ No se pudo leer frame de {cam_id}")
-                time.sleep(1)
+            if packet is None:
+                if frame_count == 0 and bus.status == 'error':
+                    logger.error(f"❌ No se pudo abrir stream para {cam_id}")
+                    with stream_lock:
+                        if cam_id in active_streams:
+                            active_streams[cam_id]["status"] = "error"
+                    break
                 continue
             
+            frame = packet.frame
             frame_count += 1
-            current_time = time.time()
             
-            # Procesar detección cada 2 segundos
-            if current_time - last_detection_time >= 2.0:
-                try:
-                    # Ejecutar detección
-                    detection_result = detector.detect_frame(frame, cam_id)
+            # Detección: el bus entrega un frame por intervalo (timestamp del stream)
+            try:
+                # Ejecutar detección
+                detection_result = detector.detect_frame(frame, cam_id)
+                
+                # Procesar alertas
+                alerts = detection_result.get("alerts", [])
+                for alert in alerts:
+                    # Crear alerta en el sistema
+                    alert_id = alert_manager.create_alert(
+                        cam_id=cam_id,
+                        alert_type=alert["type"],
+                        severity=alert["severity"],
+                        title=alert.get("description", "Alerta detectada"),
+                        description=alert.get("description", ""),
+                        confidence=alert.get("confidence", 1.0),
+                        metadata=alert.get("metadata", {}),
+                        zone_id=camera.get("zone")
+                    )
                     
-                    # Procesar alertas
-                    alerts = detection_result.get("alerts", [])
-                    for alert in alerts:
-                        # Crear alerta en el sistema
-                        alert_id = alert_manager.create_alert(
-                            cam_id=cam_id,
-                            alert_type=alert["type"],
-                            severity=alert["severity"],
-                            title=alert.get("description", "Alerta detectada"),
-                            description=alert.get("description", ""),
-                            confidence=alert.get("confidence", 1.0),
-                            metadata=alert.get("metadata", {}),
-                            zone_id=camera.get("zone")
-                        )
-                        
-                        # Grabar clip de alerta si está habilitado
-                        if camera.get("record_alerts", True):
-                            recorder.record_alert_clip(cam_id, alert)
-                    
-                    # Emitir detecciones via WebSocket
-                    if socketio and detection_result.get("detections"):
-                        socketio.emit('detections', {
-                            'cam_id': cam_id,
-                            'detections': detection_result["detections"],
-                            'tracking': detection_result.get("tracking", []),
-                            'timestamp': datetime.now().isoformat()
-                        }, room=f"camera_{cam_id}", namespace='/cams')
-                    
-                    last_detection_time = current_time
-                    
-                except Exception as e:
-                    logger.error(f"❌ Error en detección para {cam_id}: {e}")
-            
-            # Enviar frame via WebSocket (cada 5 frames para reducir carga)
-            if frame_count % 5 == 0 and socketio:
-                try:
-                    # Redimensionar frame para WebSocket
-                    height, width = frame.shape[:2]
-                    if width > 640:
-                        ratio = 640 / width
-                        new_width = 640
-                        new_height = int(height * ratio)
-                        frame_resized = cv2.resize(frame, (new_width, new_height))
-                    else:
-                        frame_resized = frame
-                    
-                    # Codificar a JPEG
-                    _, buffer = cv2.imencode('.jpg', frame_resized, [cv2.IMWRITE_JPEG_QUALITY, 80])
-                    frame_b64 = base64.b64encode(buffer).decode('utf-8')
-                    
-                    # Emitir frame
-                    socketio.emit('frame', {
+                    # Grabar clip de alerta si está habilitado (el catálogo enlaza
+                    # la alerta con el clip y con el segmento continuo en curso)
+                    if camera.get("record_alerts", True):
+                        recorder.record_alert_clip(cam_id, alert, alert_id=alert_id)
+                    elif alert_id:
+                        recorder.link_alert(cam_id, alert_id, alert["type"])
+                
+                # Emitir detecciones via WebSocket
+                if socketio and detection_result.get("detections"):
+                    socketio.emit('detections', {
                         'cam_id': cam_id,
-                        'frame': frame_b64,
+                        'detections': detection_result["detections"],
+                        'tracking': detection_result.get("tracking", []),
                         'timestamp': datetime.now().isoformat()
                     }, room=f"camera_{cam_id}", namespace='/cams')
-                    
-                except Exception as e:
-                    logger.error(f"❌ Error enviando frame para {cam_id}: {e}")
+            except Exception as e:
+                logger.error(f"❌ Error en detección para {cam_id}: {e}")
             
             # Actualizar timestamp
             with stream_lock:
                 if cam_id in active_streams:
                     active_streams[cam_id]["last_update"] = datetime.now().isoformat()
-            
-            # Control de FPS (procesar a ~10 FPS)
-            time.sleep(0.1)
-        
-        # Limpiar
-        cap.release()
         
         with stream_lock:
-            if cam_id in active_streams:
+            if cam_id in active_streams and active_streams[cam_id]["status"] != "error":
                 active_streams[cam_id]["status"] = "stopped"
         
         logger.info(f"📹 Procesamiento finalizado para cámara {cam_id}")
@@ -629,6 +660,13 @@ def _process_camera_stream(cam_id: str):
         with stream_lock:
             if cam_id in active_streams:
                 active_streams[cam_id]["status"] = "error"
+    finally:
+        # Limpiar
+        if preview is not None:
+            preview.stop()
+        if subscription is not None:
+            subscription.close()
+            frame_buses.release(cam_id)
 
 def get_active_streams_status():
     """Obtener estado de todos los streams activos"""
@@ -636,7 +674,7 @@ def get_active_streams_status():
         return {
             cam_id: {
                 "status": info["status"],
-                "viewer_count": info["viewer_count"],
+                "viewer_count": _viewer_count(cam_id),
                 "last_update": info["last_update"],
                 "camera_name": info["camera"].get("name", cam_id)
             }
@@ -661,5 +699,6 @@ def cleanup_cams_services():
         recorder.cleanup()
     if alert_manager:
         alert_manager.cleanup()
+    get_frame_bus_manager().cleanup()
     
     logger.info("🧹 Servicios de cámaras limpiados")
@@ -0,0 +1,299 @@
+"""
+Segment Catalog
+===============
+
+Catálogo SQLite de las grabaciones de cámaras:
+- Una fila por segmento continuo o clip de alerta, creada al abrir el
+  archivo y completada al cerrarlo (tamaño, duración, rango temporal)
+- Enlaces alerta -> segmentos que cubren el momento de la alerta
+- La retención borra los segmentos más antiguos por índice hasta cumplir
+  la cuota, sin recorrer el árbol de grabaciones
+- La reproducción busca por cámara y rango de tiempo con una consulta de
+  rango sobre (cam_id, start_time)
+
+Los tiempos se guardan como epoch (segundos, REAL).
+"""
+
+import json
+import time
+import sqlite3
+import threading
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = '''
+    CREATE TABLE IF NOT EXISTS segments (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        cam_id TEXT NOT NULL,
+        path TEXT NOT NULL UNIQUE,
+        kind TEXT NOT NULL DEFAULT 'continuous',
+        status TEXT NOT NULL DEFAULT 'recording',
+        start_time REAL NOT NULL,
+        end_time REAL,
+        duration_seconds REAL,
+        frame_count INTEGER,
+        size_bytes INTEGER NOT NULL DEFAULT 0,
+        fps REAL,
+        thumbnail_path TEXT,
+        metadata TEXT
+    );
+    CREATE TABLE IF NOT EXISTS segment_alerts (
+        segment_id INTEGER NOT NULL REFERENCES segments (id) ON DELETE CASCADE,
+        alert_id TEXT NOT NULL,
+        alert_type TEXT,
+        timestamp REAL,
+        PRIMARY KEY (segment_id, alert_id)
+    );
+    CREATE INDEX IF NOT EXISTS idx_segments_cam_start ON segments (cam_id, start_time);
+    CREATE INDEX IF NOT EXISTS idx_segments_start ON segments (start_time);
+    CREATE INDEX IF NOT EXISTS idx_segment_alerts_alert ON segment_alerts (alert_id);
+'''
+
+
+class SegmentCatalog:
+    """
+    Índice de segmentos grabados, compartido por los hilos del grabador
+    """
+
+    def __init__(self, db_path: str):
+        """
+        Inicializar el catálogo
+
+        Args:
+            db_path: Ruta de la base de datos SQLite
+        """
+        self.db_path = str(db_path)
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+            self._conn.execute('PRAGMA foreign_keys=ON')
+            self._conn.executescript(SCHEMA)
+            self._conn.commit()
+
+    def _execute(self, sql: str, params=()) -> sqlite3.Cursor:
+        with self._lock:
+            cursor = self._conn.execute(sql, params)
+            self._conn.commit()
+            return cursor
+
+    def _query(self, sql: str, params=()) -> List[sqlite3.Row]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    # =================== ESCRITURA ===================
+
+    def add_segment(self,
+                    cam_id: str,
+                    path: str,
+                    start_time: float,
+                    kind: str = 'continuous',
+                    fps: Optional[float] = None) -> int:
+        """
+        Registrar un segmento recién abierto; devuelve su id. Una ruta ya
+        registrada lanza ``sqlite3.IntegrityError`` en lugar de sustituir
+        (y dejar huérfanos los enlaces de) la fila existente
+        """
+        cursor = self._execute(
+            'INSERT INTO segments (cam_id, path, kind, status, start_time, fps) '
+            'VALUES (?, ?, ?, ?, ?, ?)',
+            (cam_id, str(path), kind, 'recording', start_time, fps)
+        )
+        return cursor.lastrowid
+
+    def finalize_segment(self,
+                         path: str,
+                         end_time: float,
+                         size_bytes: int,
+                         frame_count: Optional[int] = None,
+                         duration_seconds: Optional[float] = None,
+                         thumbnail_path: Optional[str] = None,
+                         metadata: Optional[Dict] = None):
+        """Completar un segmento al cerrar su archivo"""
+        self._execute(
+            'UPDATE segments SET status = ?, end_time = ?, size_bytes = ?, frame_count = ?, '
+            'duration_seconds = COALESCE(?, ? - start_time), '
+            'thumbnail_path = COALESCE(?, thumbnail_path), metadata = ? WHERE path = ?',
+            ('complete', end_time, size_bytes, frame_count, duration_seconds, end_time,
+             thumbnail_path, json.dumps(metadata) if metadata is not None else None, str(path))
+        )
+
+    def link_alert(self,
+                   cam_id: str,
+                   alert_id: str,
+                   timestamp: float,
+                   alert_type: Optional[str] = None,
+                   segment_path: Optional[str] = None) -> int:
+        """
+        Enlazar una alerta con los segmentos de la cámara que cubren
+        ``timestamp`` (y con su propio clip, si se indica)
+
+        Returns:
+            Número de segmentos enlazados
+        """
+        cursor = self._execute(
+            'INSERT OR IGNORE INTO segment_alerts (segment_id, alert_id, alert_type, timestamp) '
+            'SELECT id, ?, ?, ? FROM segments WHERE (cam_id = ? AND start_time <= ? '
+            'AND COALESCE(end_time, ?) >= ?) OR path = ?',
+            (alert_id, alert_type, timestamp, cam_id, timestamp, time.time(), timestamp,
+             str(segment_path) if segment_path else None)
+        )
+        return cursor.rowcount
+
+    def delete_segments(self, segment_ids: List[int]):
+        if not segment_ids:
+            return
+        placeholders = ','.join('?' * len(segment_ids))
+        self._execute(f'DELETE FROM segments WHERE id IN ({placeholders})', list(segment_ids))
+
+    # =================== CONSULTAS ===================
+
+    def find_segments(self,
+                      cam_id: str,
+                      start: Optional[float] = None,
+                      end: Optional[float] = None,
+                      kind: Optional[str] = None,
+                      limit: Optional[int] = None) -> List[Dict]:
+        """
+        Segmentos de una cámara que se solapan con [start, end], del más
+        reciente al más antiguo
+        """
+        sql = 'SELECT * FROM segments WHERE cam_id = ?'
+        params: list = [cam_id]
+        if end is not None:
+            sql += ' AND start_time <= ?'
+            params.append(end)
+        if start is not None:
+            # El solape también exige que el segmento termine después de start;
+            # ningún segmento dura más de un día, lo que acota el rango del índice
+            sql += ' AND start_time >= ? AND COALESCE(end_time, ?) >= ?'
+            params.extend([start - 86400, time.time(), start])
+        if kind is not None:
+            sql += ' AND kind = ?'
+            params.append(kind)
+        sql += ' ORDER BY start_time DESC'
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params.append(limit)
+
+        segments = [dict(row) for row in self._query(sql, params)]
+        if segments:
+            placeholders = ','.join('?' * len(segments))
+            links: Dict[int, List[str]] = {}
+            for row in self._query(
+                    f'SELECT segment_id, alert_id FROM segment_alerts WHERE segment_id IN ({placeholders})',
+                    [segment['id'] for segment in segments]):
+                links.setdefault(row['segment_id'], []).append(row['alert_id'])
+            for segment in segments:
+                segment['alert_ids'] = links.get(segment['id'], [])
+                segment['metadata'] = json.loads(segment['metadata']) if segment['metadata'] else {}
+        return segments
+
+    def segments_for_alert(self, alert_id: str) -> List[Dict]:
+        rows = self._query(
+            'SELECT s.* FROM segments s JOIN segment_alerts a ON a.segment_id = s.id '
+            'WHERE a.alert_id = ? ORDER BY s.start_time', (alert_id,)
+        )
+        return [dict(row) for row in rows]
+
+    def oldest_segments(self, bytes_to_free: int, batch: int = 500) -> List[Dict]:
+        """
+        Segmentos completos más antiguos cuyo tamaño acumulado alcanza
+        ``bytes_to_free`` (recorriendo el índice por start_time)
+        """
+        selected: List[Dict] = []
+        freed = 0
+        offset = 0
+        while freed < bytes_to_free:
+            rows = self._query(
+                'SELECT id, cam_id, path, thumbnail_path, size_bytes FROM segments '
+                "WHERE status = 'complete' ORDER BY start_time LIMIT ? OFFSET ?",
+                (batch, offset)
+            )
+            if not rows:
+                break
+            for row in rows:
+                selected.append(dict(row))
+                freed += row['size_bytes']
+                if freed >= bytes_to_free:
+                    break
+            offset += batch
+        return selected
+
+    def incomplete_segments(self) -> List[Dict]:
+        return [dict(row) for row in self._query("SELECT * FROM segments WHERE status = 'recording'")]
+
+    def total_size(self) -> int:
+        return self._query('SELECT COALESCE(SUM(size_bytes), 0) AS total FROM segments')[0]['total']
+
+    def is_empty(self) -> bool:
+        return not self._query('SELECT 1 FROM segments LIMIT 1')
+
+    def get_statistics(self) -> Dict:
+        rows = self._query(
+            'SELECT kind, COUNT(*) AS segments, COALESCE(SUM(size_bytes), 0) AS bytes, '
+            'COUNT(thumbnail_path) AS thumbnails, MIN(start_time) AS oldest, MAX(start_time) AS newest '
+            'FROM segments GROUP BY kind'
+        )
+        by_kind = {row['kind']: {'segments': row['segments'], 'bytes': row['bytes']} for row in rows}
+        oldest = min((row['oldest'] for row in rows), default=None)
+        newest = max((row['newest'] for row in rows), default=None)
+        return {
+            'segments': sum(row['segments'] for row in rows),
+            'total_bytes': sum(row['bytes'] for row in rows),
+            'thumbnails': sum(row['thumbnails'] for row in rows),
+            'by_kind': by_kind,
+            'oldest': datetime.fromtimestamp(oldest).isoformat() if oldest else None,
+            'newest': datetime.fromtimestamp(newest).isoformat() if newest else None,
+            'alert_links': self._query('SELECT COUNT(*) AS n FROM segment_alerts')[0]['n'],
+        }
+
+    # =================== IMPORTACIÓN ===================
+
+    def import_directory(self, storage_path: Path, thumb_path: Path) -> int:
+        """
+        Importar las grabaciones existentes (archivos .mp4 y sus .json) de
+        una instalación anterior al catálogo; solo se usa con un catálogo vacío
+
+        Returns:
+            Número de segmentos importados
+        """
+        imported = 0
+        for video_file in Path(storage_path).rglob('*.mp4'):
+            try:
+                stat = video_file.stat()
+                metadata = {}
+                metadata_file = video_file.with_suffix('.json')
+                if metadata_file.exists():
+                    with open(metadata_file, 'r') as f:
+                        metadata = json.load(f)
+
+                kind = 'alert' if video_file.parent.name == 'alerts' else 'continuous'
+                cam_id = metadata.get('cam_id') or (video_file.parent.parent.name if kind == 'alert'
+                                                    else video_file.parent.name)
+                duration = metadata.get('duration_seconds')
+                end_time = stat.st_mtime
+                start_time = end_time - duration if duration else end_time
+                thumbnail = Path(thumb_path) / f"{video_file.stem}.jpg"
+
+                self.add_segment(cam_id, str(video_file), start_time, kind, metadata.get('fps'))
+                self.finalize_segment(str(video_file), end_time, stat.st_size,
+                                      frame_count=metadata.get('frame_count') or metadata.get('frames_total'),
+                                      duration_seconds=duration,
+                                      thumbnail_path=str(thumbnail) if thumbnail.exists() else None,
+                                      metadata=metadata)
+                imported += 1
+            except Exception as e:
+                logger.error(f"❌ Error importando {video_file} al catálogo: {e}")
+        return imported
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,291 @@
+"""
+IoU Tracker
+===========
+
+Tracker multiobjeto por cámara, sin filtro de Kalman:
+- Matriz IoU detecciones x tracks calculada en NumPy de una vez
+- Asignación húngara (scipy) o voraz por IoU descendente si scipy no
+  está disponible; solo se emparejan objetos de la misma clase
+- Predicción a velocidad constante: cada track avanza según su última
+  velocidad por los frames que lleva sin actualizarse
+- Estado en arrays por cámara (cajas, velocidades, contadores, historial
+  de centros en un buffer circular), de modo que las reglas de alerta
+  (merodeo, multitudes persistentes) consultan permanencia y
+  desplazamiento sin recorrer objetos Python
+
+``update`` devuelve los IDs en el mismo orden que las detecciones de
+entrada, así que no depende del orden de salida del tracker.
+"""
+
+import threading
+import logging
+from typing import Dict, Optional
+
+import numpy as np
+
+try:
+    from scipy.optimize import linear_sum_assignment
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+def iou_matrix(boxes_a: np.ndarray, boxes_b: np.ndarray) -> np.ndarray:
+    """IoU entre cada caja de ``boxes_a`` (N, 4) y de ``boxes_b`` (M, 4) -> (N, M)"""
+    boxes_a = np.asarray(boxes_a, dtype=np.float32).reshape(-1, 4)
+    boxes_b = np.asarray(boxes_b, dtype=np.float32).reshape(-1, 4)
+    x1 = np.maximum(boxes_a[:, None, 0], boxes_b[None, :, 0])
+    y1 = np.maximum(boxes_a[:, None, 1], boxes_b[None, :, 1])
+    x2 = np.minimum(boxes_a[:, None, 2], boxes_b[None, :, 2])
+    y2 = np.minimum(boxes_a[:, None, 3], boxes_b[None, :, 3])
+    intersection = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    area_a = (boxes_a[:, 2] - boxes_a[:, 0]) * (boxes_a[:, 3] - boxes_a[:, 1])
+    area_b = (boxes_b[:, 2] - boxes_b[:, 0]) * (boxes_b[:, 3] - boxes_b[:, 1])
+    union = area_a[:, None] + area_b[None, :] - intersection
+    return np.where(union > 0, intersection / np.maximum(union, 1e-9), 0.0).astype(np.float32)
+
+
+def greedy_assignment(iou: np.ndarray, threshold: float):
+    """Emparejar por IoU descendente; devuelve (filas, columnas)"""
+    rows, cols = np.nonzero(iou >= threshold)
+    if not len(rows):
+        return rows, cols
+    order = np.argsort(-iou[rows, cols], kind='stable')
+    used_rows = np.zeros(iou.shape[0], dtype=bool)
+    used_cols = np.zeros(iou.shape[1], dtype=bool)
+    keep = []
+    for index in order:
+        row, col = rows[index], cols[index]
+        if not used_rows[row] and not used_cols[col]:
+            used_rows[row] = used_cols[col] = True
+            keep.append(index)
+    keep = np.array(keep, dtype=np.intp)
+    return rows[keep], cols[keep]
+
+
+def optimal_assignment(iou: np.ndarray, threshold: float):
+    """Asignación húngara maximizando IoU, descartando pares bajo el umbral"""
+    rows, cols = linear_sum_assignment(-iou)
+    valid = iou[rows, cols] >= threshold
+    return rows[valid], cols[valid]
+
+
+class CameraTracks:
+    """Tracks de una cámara, guardados como arrays paralelos"""
+
+    def __init__(self, history: int):
+        self.history = history
+        self.boxes = np.empty((0, 4), dtype=np.float32)
+        self.velocity = np.empty((0, 4), dtype=np.float32)
+        self.ids = np.empty(0, dtype=np.int64)
+        self.class_ids = np.empty(0, dtype=np.int64)
+        self.hits = np.empty(0, dtype=np.int32)
+        self.misses = np.empty(0, dtype=np.int32)
+        self.first_seen = np.empty(0, dtype=np.float64)
+        self.last_seen = np.empty(0, dtype=np.float64)
+        # Historial de centros: buffer circular (K, H, 2) y su número de escrituras
+        self.centers = np.empty((0, history, 2), dtype=np.float32)
+        self.writes = np.empty(0, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def predicted(self) -> np.ndarray:
+        """Cajas previstas a velocidad constante"""
+        return self.boxes + self.velocity * (self.misses[:, None] + 1)
+
+    def keep(self, mask: np.ndarray):
+        for name in ('boxes', 'velocity', 'ids', 'class_ids', 'hits', 'misses',
+                     'first_seen', 'last_seen', 'centers', 'writes'):
+            setattr(self, name, getattr(self, name)[mask])
+
+    def append(self, boxes: np.ndarray, class_ids: np.ndarray, ids: np.ndarray, timestamp: float):
+        count = len(ids)
+        self.boxes = np.concatenate([self.boxes, boxes])
+        self.velocity = np.concatenate([self.velocity, np.zeros((count, 4), dtype=np.float32)])
+        self.ids = np.concatenate([self.ids, ids])
+        self.class_ids = np.concatenate([self.class_ids, class_ids])
+        self.hits = np.concatenate([self.hits, np.ones(count, dtype=np.int32)])
+        self.misses = np.concatenate([self.misses, np.zeros(count, dtype=np.int32)])
+        self.first_seen = np.concatenate([self.first_seen, np.full(count, timestamp)])
+        self.last_seen = np.concatenate([self.last_seen, np.full(count, timestamp)])
+        self.centers = np.concatenate([self.centers, np.zeros((count, self.history, 2), dtype=np.float32)])
+        self.writes = np.concatenate([self.writes, np.zeros(count, dtype=np.int64)])
+        self.record_centers(np.arange(len(self.ids) - count, len(self.ids)))
+
+    def record_centers(self, rows: np.ndarray):
+        boxes = self.boxes[rows]
+        slots = self.writes[rows] % self.history
+        self.centers[rows, slots, 0] = (boxes[:, 0] + boxes[:, 2]) / 2
+        self.centers[rows, slots, 1] = (boxes[:, 1] + boxes[:, 3]) / 2
+        self.writes[rows] += 1
+
+
+class IoUTracker:
+    """
+    Tracker IoU con predicción a velocidad constante, un estado por cámara
+    """
+
+    def __init__(self,
+                 iou_threshold: float = 0.3,
+                 max_age: int = 20,
+                 min_hits: int = 3,
+                 history: int = 64,
+                 velocity_smoothing: float = 0.5,
+                 use_hungarian: Optional[bool] = None):
+        """
+        Inicializar el tracker
+
+        Args:
+            iou_threshold: IoU mínimo para emparejar detección y track
+            max_age: Actualizaciones sin emparejar antes de eliminar un track
+            min_hits: Emparejamientos necesarios para confirmar un track
+            history: Centros guardados por track
+            velocity_smoothing: Peso de la velocidad anterior en la media móvil
+            use_hungarian: Forzar (o desactivar) la asignación húngara; por defecto si hay scipy
+        """
+        self.iou_threshold = iou_threshold
+        self.max_age = max_age
+        self.min_hits = min_hits
+        self.history = history
+        self.velocity_smoothing = velocity_smoothing
+        self.use_hungarian = SCIPY_AVAILABLE if use_hungarian is None else use_hungarian and SCIPY_AVAILABLE
+
+        self._cameras: Dict[str, CameraTracks] = {}
+        self._next_id = 1
+        self._lock = threading.Lock()
+
+    def _camera(self, cam_id: str) -> CameraTracks:
+        tracks = self._cameras.get(cam_id)
+        if tracks is None:
+            tracks = self._cameras[cam_id] = CameraTracks(self.history)
+        return tracks
+
+    # =================== ACTUALIZACIÓN ===================
+
+    def update(self,
+               cam_id: str,
+               boxes: np.ndarray,
+               class_ids: Optional[np.ndarray] = None,
+               timestamp: float = 0.0) -> np.ndarray:
+        """
+        Actualizar los tracks de una cámara con las detecciones de un frame
+
+        Args:
+            cam_id: ID de la cámara
+            boxes: Cajas (N, 4) [x1, y1, x2, y2]
+            class_ids: Clase de cada caja (N,); None = todas iguales
+            timestamp: Momento del frame (segundos)
+
+        Returns:
+            ID de track de cada detección, en el orden de entrada
+            (-1 mientras el track no está confirmado)
+        """
+        boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+        class_ids = (np.zeros(len(boxes), dtype=np.int64) if class_ids is None
+                     else np.asarray(class_ids, dtype=np.int64).reshape(-1))
+
+        with self._lock:
+            tracks = self._camera(cam_id)
+            detection_rows = np.empty(0, dtype=np.intp)
+            track_rows = np.empty(0, dtype=np.intp)
+
+            if len(tracks) and len(boxes):
+                iou = iou_matrix(boxes, tracks.predicted())
+                iou[class_ids[:, None] != tracks.class_ids[None, :]] = 0.0
+                assign = optimal_assignment if self.use_hungarian else greedy_assignment
+                detection_rows, track_rows = assign(iou, self.iou_threshold)
+
+            # Tracks emparejados: velocidad suavizada por frame y nueva caja
+            if len(track_rows):
+                steps = (tracks.misses[track_rows] + 1)[:, None].astype(np.float32)
+                observed = (boxes[detection_rows] - tracks.boxes[track_rows]) / steps
+                tracks.velocity[track_rows] = (self.velocity_smoothing * tracks.velocity[track_rows]
+                                               + (1 - self.velocity_smoothing) * observed)
+                tracks.boxes[track_rows] = boxes[detection_rows]
+                tracks.hits[track_rows] += 1
+                tracks.misses[track_rows] = 0
+                tracks.last_seen[track_rows] = timestamp
+                tracks.record_centers(track_rows)
+
+            matched = np.zeros(len(tracks), dtype=bool)
+            matched[track_rows] = True
+            tracks.misses[~matched] += 1
+
+            result = np.full(len(boxes), -1, dtype=np.int64)
+            confirmed = tracks.hits[track_rows] >= self.min_hits
+            result[detection_rows[confirmed]] = tracks.ids[track_rows[confirmed]]
+
+            # Eliminar tracks caducados antes de crear los nuevos
+            tracks.keep(tracks.misses <= self.max_age)
+
+            unmatched = np.ones(len(boxes), dtype=bool)
+            unmatched[detection_rows] = False
+            if unmatched.any():
+                count = int(unmatched.sum())
+                new_ids = np.arange(self._next_id, self._next_id + count, dtype=np.int64)
+                self._next_id += count
+                tracks.append(boxes[unmatched], class_ids[unmatched], new_ids, timestamp)
+                if self.min_hits <= 1:
+                    result[unmatched] = new_ids
+            return result
+
+    def reset(self, cam_id: str):
+        with self._lock:
+            self._cameras.pop(cam_id, None)
+
+    # =================== CONSULTAS ===================
+
+    def track_summary(self, cam_id: str) -> Dict[str, np.ndarray]:
+        """
+        Tracks confirmados y vivos (actualizados en la última llamada) de una
+        cámara: id, clase, caja, permanencia en segundos y desplazamiento
+        neto del centro a lo largo del historial guardado
+        """
+        with self._lock:
+            tracks = self._cameras.get(cam_id)
+            if tracks is None or not len(tracks):
+                empty = np.empty(0)
+                return {'ids': empty.astype(np.int64), 'class_ids': empty.astype(np.int64),
+                        'boxes': np.empty((0, 4), dtype=np.float32), 'dwell': empty,
+                        'displacement': empty.astype(np.float32)}
+
+            mask = (tracks.hits >= self.min_hits) & (tracks.misses == 0)
+            rows = np.flatnonzero(mask)
+            writes = tracks.writes[rows]
+            # Centro más antiguo aún en el buffer y el más reciente
+            oldest = np.where(writes > self.history, writes % self.history, 0)
+            newest = (writes - 1) % self.history
+            start = tracks.centers[rows, oldest]
+            end = tracks.centers[rows, newest]
+            return {
+                'ids': tracks.ids[rows].copy(),
+                'class_ids': tracks.class_ids[rows].copy(),
+                'boxes': tracks.boxes[rows].copy(),
+                'dwell': tracks.last_seen[rows] - tracks.first_seen[rows],
+                'displacement': np.linalg.norm(end - start, axis=1),
+            }
+
+    def live_ids(self, cam_id: str) -> np.ndarray:
+        """
+        IDs de todos los tracks que el tracker aún mantiene en una cámara,
+        incluidos los que no se han emparejado en las últimas llamadas
+        """
+        with self._lock:
+            tracks = self._cameras.get(cam_id)
+            return tracks.ids.copy() if tracks is not None else np.empty(0, dtype=np.int64)
+
+    def get_statistics(self) -> Dict:
+        with self._lock:
+            cameras = {cam_id: {'tracks': len(tracks),
+                                'confirmed': int((tracks.hits >= self.min_hits).sum())}
+                       for cam_id, tracks in self._cameras.items()}
+        return {
+            'assignment': 'hungarian' if self.use_hungarian else 'greedy',
+            'iou_threshold': self.iou_threshold,
+            'max_age': self.max_age,
+            'min_hits': self.min_hits,
+            'cameras': cameras,
+        }
@@ -605,35 +605,22 @@ class GeopoliticalDataIngestion:
             
             try:
                 # Importar servicio de traducción
-                from translation_service import TranslationService, get_database_connection
+                from translation_service import get_translation_service
                 
-                # Crear servicio de traducción
-                trans_db_conn = get_database_connection()
-                if trans_db_conn:
-                    translator = TranslationService(trans_db_conn)
-                    
-                    import asyncio
-                    
-                    # Traducir título si no está en español
-                    if article.title:
-                        translated_title, detected_lang_title = asyncio.run(
-                            translator.translate_text(article.title, 'es')
-                        )
-                        if translated_title != article.title:
-                            logger.info(f"🔄 Título traducido de {detected_lang_title} → es")
-                            article.title = translated_title
-                    
-                    # Traducir contenido si no está en español
-                    if article.content:
-                        translated_content, detected_lang_content = asyncio.run(
-                            translator.translate_text(article.content, 'es')
-                        )
-                        if translated_content != article.content:
-                            logger.info(f"🔄 Contenido traducido de {detected_lang_content} → es")
-                            article.content = translated_content
-                    
-                    # Cerrar conexión de traducción
-                    trans_db_conn.close()
+                # Servicio compartido; título y contenido en un único lote
+                translator = get_translation_service()
+                (translated_title, detected_lang_title), (translated_content, detected_lang_content) = \
+                    translator.translate_texts([article.title, article.content], 'es')
+                
+                # Traducir título si no está en español
+                if article.title and translated_title != article.title:
+                    logger.info(f"🔄 Título traducido de {detected_lang_title} → es")
+                    article.title = translated_title
+                
+                # Traducir contenido si no está en español
+                if article.content and translated_content != article.content:
+                    logger.info(f"🔄 Contenido traducido de {detected_lang_content} → es")
+                    article.content = translated_content
                     
             except ImportError:
                 logger.warning("⚠️ Servicio de traducción no disponible durante ingesta")
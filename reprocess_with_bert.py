@@ -9,15 +9,11 @@ from pathlib import Path
 # Add src directory to path
 sys.path.append(str(Path(__file__).parent / 'src'))
 
-from src.utils.bert_risk_analyzer import BERTRiskAnalyzer
+from src.ai.bert_risk_analyzer import bert_risk_analyzer
 
 def reprocess_articles():
     """Reprocess existing articles with BERT risk analyzer."""
     
-    # Initialize BERT analyzer
-    print("Initializing BERT Risk Analyzer...")
-    analyzer = BERTRiskAnalyzer()
-    
     # Connect to database
     conn = sqlite3.connect('data/geopolitical_intel.db')
     cursor = conn.cursor()
@@ -38,20 +34,19 @@ def reprocess_articles():
     high_risk_found = 0
     medium_risk_found = 0
     
-    for article in articles:
+    # Analyze with BERT in batches
+    results = bert_risk_analyzer.analyze_batch([
+        {'title': title or '', 'content': content or '', 'country': country}
+        for _, title, content, country, _ in articles
+    ])
+    
+    for article, result in zip(articles, results):
         article_id, title, content, country, old_risk_level = article
         
-        print(f"\nProcessing ID {article_id}: {title[:50]}...")
+        print(f"\nProcessing ID {article_id}: {(title or '')[:50]}...")
         print(f"  Old risk level: {old_risk_level}")
         
-        # Analyze with BERT
         try:
-            result = analyzer.analyze_risk(
-                title=title or '',
-                content=content or '',
-                country=country
-            )
-            
             new_risk_level = result['level']
             new_risk_score = result['score']
             
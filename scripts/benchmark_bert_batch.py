@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark de throughput del BertRiskAnalyzer en CPU.
+
+Compara artículos/segundo para tamaños de lote 1, 8, 32 y 64 usando
+analyze_batch, y verifica que los resultados por lotes coinciden con el
+análisis artículo a artículo.
+
+Uso:
+    python scripts/benchmark_bert_batch.py [--articles 256] [--db data/geopolitical_intel.db]
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+# Forzar CPU antes de importar torch
+os.environ.setdefault('CUDA_VISIBLE_DEVICES', '')
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src'))
+
+from ai.bert_risk_analyzer import BertRiskAnalyzer  # noqa: E402
+
+BATCH_SIZES = [1, 8, 32, 64]
+
+SAMPLE_SENTENCES = [
+    "Troops crossed the border overnight as the conflict escalated near the frontier.",
+    "El gobierno anunció nuevas sanciones económicas tras la crisis política.",
+    "The central bank kept interest rates unchanged amid stable inflation.",
+    "Un terremoto obligó a la evacuación de miles de personas en la región.",
+    "Protesters gathered in the capital demanding the resignation of the minister.",
+    "La OTAN celebró una cumbre para discutir la seguridad en Europa del Este.",
+    "Missile strikes hit an industrial zone, leaving several casualties.",
+    "Trade negotiations between the two countries resumed after months of tension.",
+]
+
+
+def load_articles(db_path: str, limit: int):
+    """Cargar artículos reales de la base de datos o generar un corpus sintético."""
+    if db_path and Path(db_path).exists():
+        conn = sqlite3.connect(db_path)
+        rows = conn.execute(
+            "SELECT title, content, country FROM articles WHERE title IS NOT NULL "
+            "ORDER BY id DESC LIMIT ?", (limit,)
+        ).fetchall()
+        conn.close()
+        if rows:
+            return [{'title': t or '', 'content': c or '', 'country': co} for t, c, co in rows]
+
+    rng = random.Random(42)
+    articles = []
+    for i in range(limit):
+        sentences = rng.sample(SAMPLE_SENTENCES, k=rng.randint(1, len(SAMPLE_SENTENCES)))
+        articles.append({
+            'title': sentences[0],
+            'content': ' '.join(sentences[1:]) * rng.randint(1, 4),
+            'country': rng.choice([None, 'Ukraine', 'Spain', 'Iran'])
+        })
+    return articles
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--articles', type=int, default=256)
+    parser.add_argument('--db', default='data/geopolitical_intel.db')
+    args = parser.parse_args()
+
+    analyzer = BertRiskAnalyzer()
+    if not analyzer.models_loaded:
+        print("❌ Modelos BERT no disponibles; el benchmark requiere transformers y torch")
+        return 1
+
+    articles = load_articles(args.db, args.articles)
+    print(f"📊 {len(articles)} artículos, CPU")
+
+    # Referencia: análisis artículo a artículo
+    reference = [analyzer.analyze_risk_level(a['title'], a['content'], a['country']) for a in articles]
+
+    print(f"{'batch':>6} {'seg':>8} {'art/s':>8} {'coinciden':>10}")
+    for batch_size in BATCH_SIZES:
+        start = time.perf_counter()
+        results = analyzer.analyze_batch(articles, batch_size=batch_size)
+        elapsed = time.perf_counter() - start
+
+        matching = sum(
+            1 for ref, res in zip(reference, results)
+            if ref['level'] == res['level'] and abs(ref['score'] - res['score']) < 1e-3
+        )
+        print(f"{batch_size:>6} {elapsed:>8.2f} {len(articles) / elapsed:>8.1f} "
+              f"{matching:>5}/{len(articles)}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
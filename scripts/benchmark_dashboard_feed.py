@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Benchmark de /api/articles: filtro LIKE en lectura frente al feed precalculado.
+
+"Antes" reproduce las dos consultas que hacía /api/articles (héroe + mosaico
+con ~40 cláusulas LIKE, GROUP BY image_url y ordenación por CASE). "Después"
+es una única lectura por rango de idx_articles_dashboard_feed.
+
+Uso:
+    python scripts/benchmark_dashboard_feed.py [--articles 200000] [--requests 50]
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src'))
+
+from utils.dashboard_feed import (  # noqa: E402
+    EXCLUDED_IMAGE_PATTERNS, EXCLUDED_TITLE_TERMS, FEED_COLUMNS, NEWS_IMAGE_DOMAINS,
+    backfill_dashboard_feed, ensure_dashboard_feed, get_dashboard_articles,
+)
+
+IMAGE_HOSTS = NEWS_IMAGE_DOMAINS + ['unsplash.com', 'cdn.example.com', 'placeholder.com']
+TITLE_WORDS = "crisis frontera sanciones cumbre misiles tropas elecciones acuerdo tensión gobierno".split()
+
+LEGACY_FILTERS = (
+    "WHERE (is_excluded IS NULL OR is_excluded != 1) AND (image_url IS NOT NULL AND image_url != '' "
+    + ''.join(f" AND image_url NOT LIKE '%{p}%'" for p in EXCLUDED_IMAGE_PATTERNS)
+    + " AND image_url NOT LIKE 'data:image%' AND ("
+    + ' OR '.join(f"image_url LIKE '%{d}%'" for d in NEWS_IMAGE_DOMAINS)
+    + ")) AND (language = 'es' OR (is_translated = 1 AND original_language IS NOT NULL)) AND ("
+    + ' AND '.join(f"title NOT LIKE '%{t}%'" for t in EXCLUDED_TITLE_TERMS) + ")"
+)
+
+LEGACY_ORDER = """
+    ORDER BY CASE WHEN risk_level = 'high' THEN 1 WHEN risk_level = 'medium' THEN 2
+                  WHEN risk_level = 'low' THEN 3 ELSE 4 END,
+             CASE WHEN risk_score IS NOT NULL THEN risk_score ELSE 0.0 END DESC,
+             datetime(published_at) DESC, id DESC
+"""
+
+
+def build_database(path: str, count: int):
+    """Crear una base de datos sintética de artículos."""
+    rng = random.Random(42)
+    conn = sqlite3.connect(path)
+    conn.execute("""
+        CREATE TABLE articles (
+            id INTEGER PRIMARY KEY, title TEXT, content TEXT, url TEXT, source TEXT,
+            published_at TEXT, country TEXT, region TEXT, risk_level TEXT, conflict_type TEXT,
+            sentiment_score REAL, summary TEXT, risk_score REAL, image_url TEXT, language TEXT,
+            is_excluded INTEGER, is_translated INTEGER, original_language TEXT
+        )
+    """)
+    rows = []
+    for i in range(count):
+        title = ' '.join(rng.sample(TITLE_WORDS, 4))
+        if rng.random() < 0.1:
+            title += ' ' + rng.choice(EXCLUDED_TITLE_TERMS)
+        image_url = f"https://{rng.choice(IMAGE_HOSTS)}/img/{rng.randint(0, count)}.jpg" if rng.random() < 0.8 else None
+        rows.append((
+            title, 'contenido ' * 200, f'https://example.org/{i}', 'Fuente',
+            f'2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T12:00:00',
+            rng.choice(['high', 'medium', 'low', None]), rng.random() if rng.random() < 0.7 else None,
+            image_url, rng.choice(['es', 'en']), int(rng.random() < 0.3), 'en'
+        ))
+        if len(rows) == 10000:
+            conn.executemany("""
+                INSERT INTO articles (title, content, url, source, published_at, risk_level, risk_score,
+                                      image_url, language, is_translated, original_language)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+            rows = []
+    if rows:
+        conn.executemany("""
+            INSERT INTO articles (title, content, url, source, published_at, risk_level, risk_score,
+                                  image_url, language, is_translated, original_language)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, rows)
+    conn.commit()
+    conn.close()
+
+
+def legacy_request(conn, limit=20):
+    """Las dos consultas que ejecutaba /api/articles antes del cambio."""
+    hero = conn.execute(f"SELECT {FEED_COLUMNS} FROM articles {LEGACY_FILTERS} "
+                        f"AND risk_level = 'high' {LEGACY_ORDER} LIMIT 1").fetchone()
+    hero_id = hero[0] if hero else -1
+    conn.execute(f"SELECT {FEED_COLUMNS} FROM articles {LEGACY_FILTERS} AND id != ? "
+                 f"GROUP BY image_url HAVING COUNT(*) = 1 {LEGACY_ORDER} LIMIT ?",
+                 (hero_id, limit * 2)).fetchall()
+
+
+def feed_request(conn, limit=20):
+    get_dashboard_articles(conn, limit + 1)
+
+
+def measure(fn, conn, requests):
+    timings = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        fn(conn)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return statistics.median(timings), timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--articles', type=int, default=200000)
+    parser.add_argument('--requests', type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db_path = os.path.join(tmpdir, 'bench.db')
+        build_database(db_path, args.articles)
+        conn = sqlite3.connect(db_path)
+        print(f"📊 {args.articles} artículos sintéticos")
+
+        before = measure(legacy_request, conn, args.requests)
+
+        start = time.perf_counter()
+        ensure_dashboard_feed(conn)
+        backfill_dashboard_feed(db_path)
+        print(f"🔧 Materialización inicial: {time.perf_counter() - start:.1f}s")
+
+        after = measure(feed_request, conn, args.requests)
+        conn.close()
+
+    print(f"{'':>8} {'p50 ms':>10} {'p99 ms':>10}")
+    print(f"{'antes':>8} {before[0]:>10.2f} {before[1]:>10.2f}")
+    print(f"{'después':>8} {after[0]:>10.2f} {after[1]:>10.2f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Benchmark de búsqueda de artículos: LIKE '%term%' frente a FTS5 + BM25.
+
+Genera una base de datos sintética con N artículos, construye el índice FTS5
+y mide la latencia p50/p99 de ambas estrategias para un conjunto de consultas.
+
+Uso:
+    python scripts/benchmark_fts_search.py [--articles 100000] [--queries 50]
+"""
+
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src'))
+
+from utils.fulltext_search import rebuild_fts_index, search_articles  # noqa: E402
+
+VOCABULARY = (
+    "conflict military border sanctions election protest missile economy crisis "
+    "ceasefire diplomacy refugees drought inflation summit nuclear trade cyber "
+    "attack embassy minister parliament troops alliance pipeline energy grain "
+    "tension negotiation humanitarian earthquake flood coup insurgency"
+).split()
+
+QUERIES = ['sanctions', 'missile attack', 'nuclear', 'ceasefire negotiation', 'refug', 'cyber']
+
+# Palabras de relleno con distribución tipo Zipf (texto más realista)
+FILLER = [f"w{i}" for i in range(20000)]
+
+
+def random_text(rng, words: int, topical: int) -> str:
+    tokens = [FILLER[int(rng.paretovariate(1.0)) % len(FILLER)] for _ in range(words)]
+    tokens += rng.sample(VOCABULARY, k=topical)
+    rng.shuffle(tokens)
+    return ' '.join(tokens)
+
+
+def build_database(path: str, count: int):
+    """Crear una base de datos sintética de artículos."""
+    rng = random.Random(42)
+    conn = sqlite3.connect(path)
+    conn.execute("""
+        CREATE TABLE articles (
+            id INTEGER PRIMARY KEY, title TEXT, content TEXT, summary TEXT, url TEXT,
+            source TEXT, language TEXT, risk_level TEXT, published_at TEXT, created_at TEXT
+        )
+    """)
+    batch = []
+    for i in range(count):
+        title = random_text(rng, 8, 1)
+        content = random_text(rng, 250, 2)
+        summary = random_text(rng, 30, 1)
+        batch.append((title, content, summary, f'https://example.org/{i}', 'en'))
+        if len(batch) == 10000:
+            conn.executemany("INSERT INTO articles (title, content, summary, url, language) "
+                             "VALUES (?, ?, ?, ?, ?)", batch)
+            batch = []
+    if batch:
+        conn.executemany("INSERT INTO articles (title, content, summary, url, language) "
+                         "VALUES (?, ?, ?, ?, ?)", batch)
+    conn.commit()
+    conn.close()
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def measure(fn, queries):
+    timings = []
+    for query in queries:
+        start = time.perf_counter()
+        fn(query)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), percentile(timings, 99)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--articles', type=int, default=100000)
+    parser.add_argument('--queries', type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db_path = os.path.join(tmpdir, 'bench.db')
+        start = time.perf_counter()
+        build_database(db_path, args.articles)
+        print(f"📊 {args.articles} artículos generados en {time.perf_counter() - start:.1f}s")
+
+        backfill = rebuild_fts_index(db_path)
+        print(f"🔎 Backfill FTS5: {backfill['elapsed_time']:.1f}s")
+
+        queries = [QUERIES[i % len(QUERIES)] for i in range(args.queries)]
+        conn = sqlite3.connect(db_path)
+
+        def like_search(query):
+            term = f"%{query}%"
+            conn.execute("""
+                SELECT id, title FROM articles
+                WHERE title LIKE ? OR content LIKE ? OR summary LIKE ?
+                ORDER BY created_at DESC LIMIT 50
+            """, (term, term, term)).fetchall()
+
+        def fts_search(query):
+            search_articles(conn, query, limit=50)
+
+        print(f"{'método':>8} {'p50 ms':>10} {'p99 ms':>10}")
+        for name, fn in (('LIKE', like_search), ('FTS5', fts_search)):
+            p50, p99 = measure(fn, queries)
+            print(f"{name:>8} {p50:>10.2f} {p99:>10.2f}")
+        conn.close()
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
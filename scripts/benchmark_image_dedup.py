@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Benchmark de detección de imágenes duplicadas por hash perceptual.
+
+Compara la comparación exhaustiva por pares (como hacía check_duplicate_images)
+con HammingIndex.near_pairs sobre hashes sintéticos de 256 bits (phash con
+hash_size=16) con un porcentaje de casi-duplicados. La versión exhaustiva se
+mide sobre una muestra y se extrapola a n²/2 pares.
+
+Uso:
+    python scripts/benchmark_image_dedup.py [--count 50000] [--bits 256] [--threshold 0.85]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src'))
+
+from utils.hamming_index import HammingIndex, hamming_distance, radius_for_similarity  # noqa: E402
+
+
+def synthetic_hashes(count: int, n_bits: int, seed: int = 42):
+    rng = random.Random(seed)
+    hashes = [rng.getrandbits(n_bits) for _ in range(count)]
+    for position in rng.sample(range(count), count // 20):
+        value = hashes[rng.randrange(count)]
+        for _ in range(rng.randint(0, n_bits // 10)):
+            value ^= 1 << rng.randrange(n_bits)
+        hashes[position] = value
+    return hashes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--count', type=int, default=50000)
+    parser.add_argument('--bits', type=int, default=256)
+    parser.add_argument('--threshold', type=float, default=0.85)
+    parser.add_argument('--sample', type=int, default=2000, help='Hashes para medir la versión exhaustiva')
+    args = parser.parse_args()
+
+    radius = radius_for_similarity(args.bits, args.threshold)
+    hashes = synthetic_hashes(args.count, args.bits)
+    print(f"{args.count} hashes de {args.bits} bits, radio {radius}")
+
+    sample = hashes[:args.sample]
+    start = time.perf_counter()
+    for i in range(len(sample)):
+        for j in range(i + 1, len(sample)):
+            hamming_distance(sample[i], sample[j])
+    per_pair = (time.perf_counter() - start) / (len(sample) * (len(sample) - 1) / 2)
+    total_pairs = args.count * (args.count - 1) / 2
+    print(f"exhaustivo:  ~{per_pair * total_pairs:.1f}s estimados ({per_pair * 1e9:.0f} ns/par, "
+          f"sin el coste de hex_to_hash)")
+
+    start = time.perf_counter()
+    index = HammingIndex(args.bits, radius, expected_items=len(hashes))
+    for position, value in enumerate(hashes):
+        index.add(position, value)
+    build = time.perf_counter() - start
+    start = time.perf_counter()
+    pairs = index.near_pairs()
+    print(f"índice:      {build:.2f}s construcción + {time.perf_counter() - start:.2f}s pares "
+          f"({index.n_blocks} bloques, radio por bloque {index.sub_radius}, {len(pairs)} pares)")
+
+    start = time.perf_counter()
+    for value in hashes[:1000]:
+        index.query(value)
+    print(f"consulta:    {(time.perf_counter() - start):.3f} ms por hash (media de 1000)")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
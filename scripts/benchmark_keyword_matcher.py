@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark de clasificación por palabras clave.
+
+Compara el recorrido anterior de ContentClassifier (``keyword in text_lower``
+por cada palabra clave de cada categoría, una vez en classify y otra en
+get_category_scores) con un único ``KeywordMatcher.scan`` por artículo, sobre
+un corpus sintético de artículos con vocabulario de las propias categorías.
+
+Uso:
+    python scripts/benchmark_keyword_matcher.py [--articles 5000] [--words 400]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / 'src'))
+
+from utils.content_classifier import ContentClassifier  # noqa: E402
+
+FILLER = (
+    "the government said on monday that officials would meet again next week to discuss "
+    "the situation while analysts warned markets could react el gobierno dijo que la "
+    "situación sigue siendo complicada según fuentes oficiales"
+).split()
+
+
+def synthetic_articles(classifier: ContentClassifier, count: int, words: int, seed: int = 42):
+    rng = random.Random(seed)
+    vocabulary = [keyword for data in classifier.categories.values() for keyword in data['keywords']]
+    articles = []
+    for _ in range(count):
+        tokens = [rng.choice(vocabulary) if rng.random() < 0.05 else rng.choice(FILLER)
+                  for _ in range(words)]
+        articles.append(' '.join(tokens).capitalize() + '.')
+    return articles
+
+
+def legacy_scores(classifier: ContentClassifier, text: str):
+    """Puntuaciones como las calculaba el bucle de subcadenas."""
+    text_lower = text.lower()
+    scores = {}
+    for category, data in classifier.categories.items():
+        matches = sum(1 for keyword in data['keywords'] if keyword.lower() in text_lower)
+        scores[category] = (matches / len(data['keywords'])) * data['weight']
+    strong = any(indicator in text_lower for indicator in classifier.strong_sports_indicators)
+    return scores, strong
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--articles', type=int, default=5000)
+    parser.add_argument('--words', type=int, default=400)
+    args = parser.parse_args()
+
+    classifier = ContentClassifier()
+    articles = synthetic_articles(classifier, args.articles, args.words)
+    n_keywords = sum(len(data['keywords']) for data in classifier.categories.values())
+    print(f"{len(articles)} artículos de {args.words} palabras, {n_keywords} palabras clave")
+
+    # classify + get_category_scores recorrían las categorías dos veces
+    start = time.perf_counter()
+    for text in articles:
+        legacy_scores(classifier, text)
+        legacy_scores(classifier, text)
+    legacy = time.perf_counter() - start
+    print(f"subcadenas:     {legacy:.2f}s ({legacy / len(articles) * 1000:.2f} ms/artículo)")
+
+    start = time.perf_counter()
+    for text in articles:
+        classifier.classify(text)
+        classifier.get_category_scores(text)
+    compiled = time.perf_counter() - start
+    print(f"KeywordMatcher: {compiled:.2f}s ({compiled / len(articles) * 1000:.2f} ms/artículo), "
+          f"x{legacy / compiled:.1f}")
+
+    changed = sum(
+        1 for text in articles
+        if max(legacy_scores(classifier, text)[0].items(), key=lambda item: item[1])[0]
+        != max(classifier.get_category_scores(text).items(), key=lambda item: item[1])[0]
+    )
+    print(f"categoría principal distinta en {changed} artículos (coincidencias dentro de otras palabras)")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
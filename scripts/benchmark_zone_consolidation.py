@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark de consolidación de zonas de conflicto.
+
+Compara, para 1k, 10k y 100k eventos sintéticos agrupados en focos:
+- legacy: bucle O(eventos × zonas) con distancia euclídea en grados
+- grid:   ZoneGridIndex incremental (vecindad 3×3 + haversine)
+- bulk:   cluster_points vectorizado con NumPy
+
+Uso:
+    python scripts/benchmark_zone_consolidation.py [--sizes 1000 10000 100000] [--legacy-max 10000]
+"""
+
+import argparse
+import math
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from src.intelligence.spatial_index import ZoneGridIndex, cluster_points  # noqa: E402
+
+RADIUS_KM = 50.0
+LEGACY_THRESHOLD_DEG = 0.5
+
+
+def synthetic_events(count: int, seed: int = 42):
+    """Eventos alrededor de focos repartidos por el mundo, con ruido."""
+    rng = np.random.default_rng(seed)
+    hotspots = np.column_stack([rng.uniform(-60, 70, 400), rng.uniform(-180, 180, 400)])
+    choice = rng.integers(0, len(hotspots), count)
+    lats = np.clip(hotspots[choice, 0] + rng.normal(0, 1.5, count), -89.9, 89.9)
+    lons = (hotspots[choice, 1] + rng.normal(0, 1.5, count) + 180.0) % 360.0 - 180.0
+    return lats, lons
+
+
+def legacy(lats, lons):
+    zones = []
+    for lat, lng in zip(lats, lons):
+        for zone_lat, zone_lng in zones:
+            if math.sqrt((lat - zone_lat) ** 2 + (lng - zone_lng) ** 2) <= LEGACY_THRESHOLD_DEG:
+                break
+        else:
+            zones.append((lat, lng))
+    return len(zones)
+
+
+def grid(lats, lons):
+    index = ZoneGridIndex(RADIUS_KM)
+    for lat, lng in zip(lats.tolist(), lons.tolist()):
+        index.assign(lat, lng)
+    return len(index)
+
+
+def bulk(lats, lons):
+    _, leaders = cluster_points(lats, lons, RADIUS_KM)
+    return len(leaders)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--legacy-max', type=int, default=10000,
+                        help='No ejecutar el método legacy por encima de este tamaño')
+    args = parser.parse_args()
+
+    print(f"{'eventos':>8} {'método':>7} {'seg':>9} {'zonas':>7}")
+    for size in args.sizes:
+        lats, lons = synthetic_events(size)
+        for name, fn in (('legacy', legacy), ('grid', grid), ('bulk', bulk)):
+            if name == 'legacy' and size > args.legacy_max:
+                print(f"{size:>8} {name:>7} {'(omitido)':>9}")
+                continue
+            start = time.perf_counter()
+            zones = fn(lats, lons)
+            print(f"{size:>8} {name:>7} {time.perf_counter() - start:>9.3f} {zones:>7}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
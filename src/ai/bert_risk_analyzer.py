@@ -8,6 +8,7 @@ y usa exclusivamente BERT para un análisis más consistente y confiable.
 import sqlite3
 import json
 import logging
+import threading
 from datetime import datetime
 from typing import Dict, List, Any, Optional, Tuple
 import traceback
@@ -27,8 +28,64 @@ except ImportError as e:
     BERT_AVAILABLE = False
     logging.warning(f"BERT no disponible: {e}")
 
+from utils.keyword_matcher import KeywordMatcher
+
 logger = logging.getLogger(__name__)
 
+# Categorías candidatas para la clasificación zero-shot
+RISK_CATEGORIES = [
+    "guerra y conflicto armado",
+    "terrorismo y violencia",
+    "crisis política",
+    "desastre natural",
+    "crisis económica",
+    "noticia rutinaria"
+]
+
+# Palabras clave de alto riesgo con pesos
+HIGH_RISK_KEYWORDS = {
+    # Guerra y conflicto (peso alto)
+    'guerra': 1.0, 'war': 1.0, 'conflicto': 0.9, 'conflict': 0.9,
+    'batalla': 0.9, 'battle': 0.9, 'invasión': 1.0, 'invasion': 1.0,
+    'bombardeo': 0.95, 'bombing': 0.95, 'ataque': 0.9, 'attack': 0.9,
+    'militar': 0.8, 'military': 0.8, 'ejército': 0.8, 'army': 0.8,
+    'soldados': 0.8, 'soldiers': 0.8, 'tropas': 0.8, 'troops': 0.8,
+    
+    # Terrorismo y violencia
+    'terrorismo': 1.0, 'terrorism': 1.0, 'terrorista': 1.0, 'terrorist': 1.0,
+    'bomba': 0.95, 'bomb': 0.95, 'explosión': 0.9, 'explosion': 0.9,
+    'secuestro': 0.9, 'kidnapping': 0.9, 'asesinato': 0.95, 'murder': 0.95,
+    'violencia': 0.8, 'violence': 0.8, 'amenaza': 0.7, 'threat': 0.7,
+    
+    # Crisis política
+    'golpe': 0.9, 'coup': 0.9, 'revolución': 0.85, 'revolution': 0.85,
+    'crisis': 0.8, 'disturbios': 0.8, 'riots': 0.8, 'protesta': 0.6, 'protest': 0.6,
+    'manifestación': 0.5, 'demonstration': 0.5, 'oposición': 0.6, 'opposition': 0.6,
+    
+    # Armas y tecnología militar
+    'nuclear': 0.95, 'misil': 0.9, 'missile': 0.9, 'armas': 0.8, 'weapons': 0.8,
+    'química': 0.9, 'chemical': 0.9, 'biológica': 0.9, 'biological': 0.9,
+    
+    # Geografía conflictiva
+    'frontera': 0.7, 'border': 0.7, 'territorio': 0.7, 'territory': 0.7,
+    'zona': 0.6, 'zone': 0.6, 'región': 0.6, 'region': 0.6,
+    
+    # Instituciones y organizaciones
+    'otan': 0.8, 'nato': 0.8, 'onu': 0.7, 'un': 0.7, 'consejo': 0.7, 'council': 0.7,
+    'sanciones': 0.8, 'sanctions': 0.8, 'embargo': 0.8,
+    
+    # Impacto humanitario
+    'refugiados': 0.8, 'refugees': 0.8, 'desplazados': 0.8, 'displaced': 0.8,
+    'víctimas': 0.8, 'victims': 0.8, 'muertos': 0.9, 'dead': 0.9,
+    'heridos': 0.8, 'wounded': 0.8, 'casualties': 0.9,
+    
+    # Emergencias y desastres
+    'emergencia': 0.7, 'emergency': 0.7, 'evacuación': 0.8, 'evacuation': 0.8,
+    'desastre': 0.8, 'disaster': 0.8, 'catástrofe': 0.9, 'catastrophe': 0.9,
+}
+
+RISK_KEYWORD_MATCHER = KeywordMatcher({'risk': HIGH_RISK_KEYWORDS})
+
 class BertRiskAnalyzer:
     """
     Analizador de riesgo unificado usando BERT.
@@ -42,6 +99,10 @@ class BertRiskAnalyzer:
         self.classifier = None
         self.tokenizer = None
         self.embedding_model = None
+        # Los pipelines y tokenizers de transformers no admiten llamadas
+        # concurrentes (p. ej. desde los workers del fetch RSS concurrente):
+        # la inferencia sobre la instancia compartida se serializa
+        self.inference_lock = threading.RLock()
         
         if BERT_AVAILABLE:
             self._load_models()
@@ -67,6 +128,10 @@ class BertRiskAnalyzer:
                 device=0 if torch.cuda.is_available() else -1
             )
             
+            # La inferencia por lotes necesita token de padding (los modelos tipo GPT no lo traen)
+            for nlp_pipeline in (self.sentiment_analyzer, self.classifier):
+                self._enable_batch_padding(nlp_pipeline)
+            
             # Embedding model for semantic analysis
             self.tokenizer = AutoTokenizer.from_pretrained("sentence-transformers/all-MiniLM-L6-v2")
             self.embedding_model = AutoModel.from_pretrained("sentence-transformers/all-MiniLM-L6-v2")
@@ -94,129 +159,170 @@ class BertRiskAnalyzer:
             return self._fallback_keyword_analysis(title, content)
         
         try:
-            # Combinar título y contenido para análisis
-            full_text = f"{title}. {content[:500]}"  # Limitar para BERT
-            
-            # 1. Análisis de sentimiento
-            sentiment_result = self.sentiment_analyzer(full_text)[0]
-            sentiment_score = sentiment_result['score']
-            sentiment_label = sentiment_result['label']
-            
-            # 2. Clasificación de riesgo por categorías
-            risk_categories = [
-                "guerra y conflicto armado",
-                "terrorismo y violencia",
-                "crisis política",
-                "desastre natural",
-                "crisis económica",
-                "noticia rutinaria"
-            ]
-            
-            classification_result = self.classifier(full_text, risk_categories)
-            top_category = classification_result['labels'][0]
-            category_confidence = classification_result['scores'][0]
+            full_text = self._build_full_text(title, content)
             
-            # 3. Análisis de palabras clave de alto riesgo
-            keyword_score = self._calculate_keyword_risk_score(full_text)
+            with self.inference_lock:
+                # 1. Análisis de sentimiento
+                sentiment_result = self.sentiment_analyzer(full_text)[0]
+                
+                # 2. Clasificación de riesgo por categorías
+                classification_result = self.classifier(full_text, RISK_CATEGORIES)
             
-            # 4. Análisis geográfico si hay país
-            geographic_score = self._analyze_geographic_risk(country) if country else 0.5
-            
-            # 5. Análisis de escalamiento potencial
-            escalation_score = self._analyze_escalation_potential(full_text)
-            
-            # 6. Combinar todos los scores
-            final_risk_score = self._calculate_final_risk_score(
-                sentiment_score, sentiment_label, category_confidence, 
-                keyword_score, geographic_score, escalation_score, top_category
-            )
-            
-            # 7. Determinar nivel de riesgo final
-            risk_level = self._score_to_risk_level(final_risk_score)
-            
-            # 8. Generar explicación
-            reasoning = self._generate_reasoning(
-                sentiment_label, top_category, category_confidence,
-                keyword_score, geographic_score, escalation_score, country
-            )
-            
-            return {
-                'level': risk_level,
-                'score': final_risk_score,
-                'confidence': category_confidence,
-                'reasoning': reasoning,
-                'sentiment': {
-                    'label': sentiment_label,
-                    'score': sentiment_score
-                },
-                'category': top_category,
-                'keyword_score': keyword_score,
-                'geographic_score': geographic_score,
-                'escalation_score': escalation_score,
-                'ai_powered': True,
-                'model_used': 'bert_unified',
-                'analysis_timestamp': datetime.now().isoformat()
-            }
+            return self._compose_risk_result(full_text, country, sentiment_result, classification_result)
             
         except Exception as e:
             logger.error(f"❌ Error en análisis BERT: {e}")
             logger.error(traceback.format_exc())
             return self._fallback_keyword_analysis(title, content)
 
-    def _calculate_keyword_risk_score(self, text: str) -> float:
-        """Calcular score de riesgo basado en palabras clave."""
-        text_lower = text.lower()
+    def analyze_batch(self, articles: List[Dict[str, Any]], batch_size: int = 32) -> List[Dict[str, Any]]:
+        """
+        Analizar el riesgo de muchos artículos con inferencia por lotes.
         
-        # Palabras clave de alto riesgo con pesos
-        high_risk_keywords = {
-            # Guerra y conflicto (peso alto)
-            'guerra': 1.0, 'war': 1.0, 'conflicto': 0.9, 'conflict': 0.9,
-            'batalla': 0.9, 'battle': 0.9, 'invasión': 1.0, 'invasion': 1.0,
-            'bombardeo': 0.95, 'bombing': 0.95, 'ataque': 0.9, 'attack': 0.9,
-            'militar': 0.8, 'military': 0.8, 'ejército': 0.8, 'army': 0.8,
-            'soldados': 0.8, 'soldiers': 0.8, 'tropas': 0.8, 'troops': 0.8,
-            
-            # Terrorismo y violencia
-            'terrorismo': 1.0, 'terrorism': 1.0, 'terrorista': 1.0, 'terrorist': 1.0,
-            'bomba': 0.95, 'bomb': 0.95, 'explosión': 0.9, 'explosion': 0.9,
-            'secuestro': 0.9, 'kidnapping': 0.9, 'asesinato': 0.95, 'murder': 0.95,
-            'violencia': 0.8, 'violence': 0.8, 'amenaza': 0.7, 'threat': 0.7,
-            
-            # Crisis política
-            'golpe': 0.9, 'coup': 0.9, 'revolución': 0.85, 'revolution': 0.85,
-            'crisis': 0.8, 'disturbios': 0.8, 'riots': 0.8, 'protesta': 0.6, 'protest': 0.6,
-            'manifestación': 0.5, 'demonstration': 0.5, 'oposición': 0.6, 'opposition': 0.6,
-            
-            # Armas y tecnología militar
-            'nuclear': 0.95, 'misil': 0.9, 'missile': 0.9, 'armas': 0.8, 'weapons': 0.8,
-            'química': 0.9, 'chemical': 0.9, 'biológica': 0.9, 'biological': 0.9,
-            
-            # Geografía conflictiva
-            'frontera': 0.7, 'border': 0.7, 'territorio': 0.7, 'territory': 0.7,
-            'zona': 0.6, 'zone': 0.6, 'región': 0.6, 'region': 0.6,
-            
-            # Instituciones y organizaciones
-            'otan': 0.8, 'nato': 0.8, 'onu': 0.7, 'un': 0.7, 'consejo': 0.7, 'council': 0.7,
-            'sanciones': 0.8, 'sanctions': 0.8, 'embargo': 0.8,
-            
-            # Impacto humanitario
-            'refugiados': 0.8, 'refugees': 0.8, 'desplazados': 0.8, 'displaced': 0.8,
-            'víctimas': 0.8, 'victims': 0.8, 'muertos': 0.9, 'dead': 0.9,
-            'heridos': 0.8, 'wounded': 0.8, 'casualties': 0.9,
+        Los textos se ordenan por longitud en tokens y se agrupan en lotes de
+        longitud similar (padding dinámico por lote), de modo que los modelos de
+        sentimiento y clasificación procesan lotes completos en lugar de un
+        artículo cada vez. El resultado es equivalente al de analyze_risk_level.
+        
+        Args:
+            articles: Lista de dicts con 'title', 'content' y opcionalmente 'country'
+            batch_size: Número máximo de textos por lote
             
-            # Emergencias y desastres
-            'emergencia': 0.7, 'emergency': 0.7, 'evacuación': 0.8, 'evacuation': 0.8,
-            'desastre': 0.8, 'disaster': 0.8, 'catástrofe': 0.9, 'catastrophe': 0.9,
-        }
+        Returns:
+            Lista de resultados en el mismo orden que ``articles``
+        """
+        if not articles:
+            return []
         
-        # Calcular score basado en palabras encontradas
-        total_score = 0.0
-        words_found = 0
+        if not self.models_loaded:
+            return [
+                self._fallback_keyword_analysis(a.get('title') or '', a.get('content') or '')
+                for a in articles
+            ]
         
-        for keyword, weight in high_risk_keywords.items():
-            if keyword in text_lower:
-                total_score += weight
-                words_found += 1
+        full_texts = [
+            self._build_full_text(a.get('title') or '', a.get('content') or '')
+            for a in articles
+        ]
+        results: List[Optional[Dict[str, Any]]] = [None] * len(articles)
+        
+        try:
+            with self.inference_lock:
+                buckets = self._length_buckets(full_texts, batch_size)
+            for bucket in buckets:
+                texts = [full_texts[i] for i in bucket]
+                
+                # 1. Sentimiento y 2. clasificación sobre el lote completo
+                with self.inference_lock:
+                    sentiment_results = self.sentiment_analyzer(texts, batch_size=len(texts))
+                    classification_results = self.classifier(texts, RISK_CATEGORIES, batch_size=len(texts))
+                if isinstance(classification_results, dict):
+                    classification_results = [classification_results]
+                
+                for i, sentiment, classification in zip(bucket, sentiment_results, classification_results):
+                    results[i] = self._compose_risk_result(
+                        full_texts[i], articles[i].get('country'), sentiment, classification
+                    )
+                    
+        except Exception as e:
+            logger.error(f"❌ Error en análisis BERT por lotes: {e}")
+            logger.error(traceback.format_exc())
+        
+        # Cualquier artículo sin resultado (error en su lote) se analiza individualmente
+        for i, result in enumerate(results):
+            if result is None:
+                article = articles[i]
+                results[i] = self.analyze_risk_level(
+                    article.get('title') or '', article.get('content') or '', article.get('country')
+                )
+        
+        return results
+
+    def _length_buckets(self, texts: List[str], batch_size: int) -> List[List[int]]:
+        """Agrupar índices de textos en lotes de longitud similar."""
+        tokenizer = getattr(self.sentiment_analyzer, 'tokenizer', None)
+        if tokenizer is not None:
+            lengths = [len(ids) for ids in tokenizer(texts, truncation=True)['input_ids']]
+        else:
+            lengths = [len(text) for text in texts]
+        
+        order = sorted(range(len(texts)), key=lambda i: lengths[i])
+        batch_size = max(1, batch_size)
+        return [order[start:start + batch_size] for start in range(0, len(order), batch_size)]
+
+    @staticmethod
+    def _enable_batch_padding(nlp_pipeline) -> None:
+        """Asignar token de padding a pipelines cuyo tokenizer no lo define."""
+        tokenizer = getattr(nlp_pipeline, 'tokenizer', None)
+        if tokenizer is None or tokenizer.pad_token is not None:
+            return
+        tokenizer.pad_token = tokenizer.eos_token
+        if getattr(nlp_pipeline.model.config, 'pad_token_id', None) is None:
+            nlp_pipeline.model.config.pad_token_id = tokenizer.eos_token_id
+
+    @staticmethod
+    def _build_full_text(title: str, content: str) -> str:
+        """Combinar título y contenido para análisis."""
+        return f"{title}. {content[:500]}"  # Limitar para BERT
+
+    def _compose_risk_result(self, full_text: str, country: Optional[str],
+                             sentiment_result: Dict[str, Any],
+                             classification_result: Dict[str, Any]) -> Dict[str, Any]:
+        """Combinar las salidas de los modelos con los análisis heurísticos."""
+        sentiment_score = sentiment_result['score']
+        sentiment_label = sentiment_result['label']
+        
+        top_category = classification_result['labels'][0]
+        category_confidence = classification_result['scores'][0]
+        
+        # 3. Análisis de palabras clave de alto riesgo
+        keyword_score = self._calculate_keyword_risk_score(full_text)
+        
+        # 4. Análisis geográfico si hay país
+        geographic_score = self._analyze_geographic_risk(country) if country else 0.5
+        
+        # 5. Análisis de escalamiento potencial
+        escalation_score = self._analyze_escalation_potential(full_text)
+        
+        # 6. Combinar todos los scores
+        final_risk_score = self._calculate_final_risk_score(
+            sentiment_score, sentiment_label, category_confidence, 
+            keyword_score, geographic_score, escalation_score, top_category
+        )
+        
+        # 7. Determinar nivel de riesgo final
+        risk_level = self._score_to_risk_level(final_risk_score)
+        
+        # 8. Generar explicación
+        reasoning = self._generate_reasoning(
+            sentiment_label, top_category, category_confidence,
+            keyword_score, geographic_score, escalation_score, country
+        )
+        
+        return {
+            'level': risk_level,
+            'score': final_risk_score,
+            'confidence': category_confidence,
+            'reasoning': reasoning,
+            'sentiment': {
+                'label': sentiment_label,
+                'score': sentiment_score
+            },
+            'category': top_category,
+            'keyword_score': keyword_score,
+            'geographic_score': geographic_score,
+            'escalation_score': escalation_score,
+            'ai_powered': True,
+            'model_used': 'bert_unified',
+            'analysis_timestamp': datetime.now().isoformat()
+        }
+
+    def _calculate_keyword_risk_score(self, text: str) -> float:
+        """Calcular score de riesgo basado en palabras clave."""
+        # Una sola pasada sobre el texto con el matcher compilado (palabras completas)
+        scan = RISK_KEYWORD_MATCHER.scan(text)
+        total_score = scan.weights['risk']
+        words_found = scan.counts['risk']
         
         # Normalizar score (máximo 1.0)
         if words_found > 0:
@@ -395,3 +501,7 @@ bert_risk_analyzer = BertRiskAnalyzer()
 def analyze_article_risk(title: str, content: str, country: str = None) -> Dict[str, Any]:
     """Función de conveniencia para análisis de riesgo de artículos."""
     return bert_risk_analyzer.analyze_risk_level(title, content, country)
+
+def analyze_articles_risk_batch(articles: List[Dict[str, Any]], batch_size: int = 32) -> List[Dict[str, Any]]:
+    """Función de conveniencia para análisis de riesgo por lotes."""
+    return bert_risk_analyzer.analyze_batch(articles, batch_size)
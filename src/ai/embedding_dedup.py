@@ -0,0 +1,438 @@
+#!/usr/bin/env python3
+"""
+Deduplicación de noticias basada en embeddings
+==============================================
+Sustituye las comparaciones por pares con Ollama por embeddings de oraciones
+(MiniLM, ya cargado en BertRiskAnalyzer) y un índice incremental de vecinos
+más cercanos. Los vectores se guardan en la tabla ``dedup_vectors`` de la
+propia base de datos; el índice en memoria es una caché que cada proceso
+sincroniza con ella antes de asignar, así que la app y la ingesta comparten
+clusters. Cada artículo recibe un ``dedup_cluster_id`` al ingerirse; los
+endpoints de display solo leen esos identificadores.
+"""
+
+import os
+import logging
+import threading
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from utils import share_module
+from utils.db_pool import connect as db_connect
+
+share_module(__name__)
+
+logger = logging.getLogger(__name__)
+
+# Similitud coseno a partir de la cual dos artículos cuentan como la misma noticia
+DEFAULT_DUPLICATE_THRESHOLD = 0.88
+# Ventana temporal dentro de la que se buscan duplicados
+DEFAULT_WINDOW_HOURS = 72
+# Índice .npz de versiones anteriores; se importa una vez a dedup_vectors
+LEGACY_INDEX_NAME = 'dedup_index.npz'
+
+
+class ArticleEmbedder:
+    """Genera embeddings normalizados (L2) con un modelo tipo MiniLM."""
+
+    def __init__(self, tokenizer=None, model=None,
+                 encode_fn: Optional[Callable[[List[str]], np.ndarray]] = None,
+                 max_length: int = 256, lock: Optional[threading.RLock] = None):
+        self.tokenizer = tokenizer
+        self.model = model
+        self.encode_fn = encode_fn
+        self.max_length = max_length
+        # Lock del propietario del modelo si este se comparte entre hilos
+        self.lock = lock or threading.RLock()
+
+    @classmethod
+    def from_bert_analyzer(cls, analyzer) -> Optional['ArticleEmbedder']:
+        """Reutilizar el MiniLM cargado por BertRiskAnalyzer."""
+        if analyzer is None or not getattr(analyzer, 'embedding_model', None):
+            return None
+        return cls(tokenizer=analyzer.tokenizer, model=analyzer.embedding_model,
+                   lock=getattr(analyzer, 'inference_lock', None))
+
+    @classmethod
+    def from_enrichment(cls, enrichment) -> Optional['ArticleEmbedder']:
+        """Reutilizar el SentenceTransformer de IntelligentDataEnrichment."""
+        model = getattr(enrichment, 'models', {}).get('embeddings')
+        if model is None:
+            return None
+        return cls(encode_fn=lambda texts: model.encode(texts, batch_size=32))
+
+    @property
+    def available(self) -> bool:
+        return self.encode_fn is not None or (self.tokenizer is not None and self.model is not None)
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """Codificar textos en una matriz float32 (n, dim) normalizada."""
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+
+        if self.encode_fn is not None:
+            with self.lock:
+                vectors = np.asarray(self.encode_fn(texts), dtype=np.float32)
+        else:
+            import torch
+
+            with self.lock, torch.no_grad():
+                encoded = self.tokenizer(texts, padding=True, truncation=True,
+                                         max_length=self.max_length, return_tensors='pt')
+                output = self.model(**encoded)
+            # Mean pooling respetando la máscara de atención
+            mask = encoded['attention_mask'].unsqueeze(-1).float()
+            summed = (output.last_hidden_state * mask).sum(dim=1)
+            vectors = (summed / mask.sum(dim=1).clamp(min=1e-9)).cpu().numpy().astype(np.float32)
+
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+
+class FlatVectorIndex:
+    """
+    Índice plano de producto interno sobre vectores normalizados.
+
+    Los vectores se guardan en una matriz contigua con crecimiento amortizado,
+    junto con el id de artículo, su cluster y su timestamp. ``save``/``load``
+    usan un único fichero ``.npz`` (el formato de versiones anteriores).
+    """
+
+    def __init__(self, dim: int = 0):
+        self.dim = dim
+        self._size = 0
+        self._vectors = np.zeros((0, dim), dtype=np.float32)
+        self._ids = np.zeros(0, dtype=np.int64)
+        self._clusters = np.zeros(0, dtype=np.int64)
+        self._timestamps = np.zeros(0, dtype=np.float64)
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _reserve(self, extra: int):
+        needed = self._size + extra
+        capacity = self._vectors.shape[0]
+        if needed <= capacity:
+            return
+        new_capacity = max(needed, capacity * 2, 256)
+
+        vectors = np.zeros((new_capacity, self.dim), dtype=np.float32)
+        vectors[:self._size] = self._vectors[:self._size]
+        self._vectors = vectors
+        for name, dtype in (('_ids', np.int64), ('_clusters', np.int64), ('_timestamps', np.float64)):
+            grown = np.zeros(new_capacity, dtype=dtype)
+            grown[:self._size] = getattr(self, name)[:self._size]
+            setattr(self, name, grown)
+
+    def add(self, ids: Sequence[int], vectors: np.ndarray, clusters: Sequence[int],
+            timestamps: Sequence[float]):
+        """Añadir vectores (ya normalizados) al índice."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if vectors.size == 0:
+            return
+        with self._lock:
+            if self.dim == 0:
+                self.dim = vectors.shape[1]
+                self._vectors = np.zeros((0, self.dim), dtype=np.float32)
+            self._reserve(len(vectors))
+            end = self._size + len(vectors)
+            self._vectors[self._size:end] = vectors
+            self._ids[self._size:end] = ids
+            self._clusters[self._size:end] = clusters
+            self._timestamps[self._size:end] = timestamps
+            self._size = end
+
+    def search(self, vectors: np.ndarray, k: int = 1,
+               min_timestamp: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Devolver (posiciones, similitudes) de los k vecinos más cercanos.
+
+        Las posiciones sin vecino válido se marcan con -1.
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        n = len(vectors)
+        with self._lock:
+            if self._size == 0 or n == 0:
+                return np.full((n, k), -1, dtype=np.int64), np.zeros((n, k), dtype=np.float32)
+
+            sims = vectors @ self._vectors[:self._size].T
+            if min_timestamp is not None:
+                sims[:, self._timestamps[:self._size] < min_timestamp] = -np.inf
+
+            k = min(k, self._size)
+            top = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+            top_sims = np.take_along_axis(sims, top, axis=1)
+            order = np.argsort(-top_sims, axis=1)
+            top = np.take_along_axis(top, order, axis=1)
+            top_sims = np.take_along_axis(top_sims, order, axis=1)
+            top[~np.isfinite(top_sims)] = -1
+            return top, top_sims
+
+    def contains(self, ids: Sequence[int]) -> np.ndarray:
+        """Máscara de los ``ids`` que ya están en el índice."""
+        with self._lock:
+            return np.isin(np.asarray(ids, dtype=np.int64), self._ids[:self._size])
+
+    def cluster_at(self, position: int) -> int:
+        return int(self._clusters[position])
+
+    def id_at(self, position: int) -> int:
+        return int(self._ids[position])
+
+    def prune(self, min_timestamp: float) -> int:
+        """Eliminar vectores más antiguos que ``min_timestamp``."""
+        with self._lock:
+            keep = self._timestamps[:self._size] >= min_timestamp
+            removed = int(self._size - keep.sum())
+            if removed:
+                self._vectors = self._vectors[:self._size][keep].copy()
+                self._ids = self._ids[:self._size][keep].copy()
+                self._clusters = self._clusters[:self._size][keep].copy()
+                self._timestamps = self._timestamps[:self._size][keep].copy()
+                self._size = len(self._ids)
+            return removed
+
+    def save(self, path: str):
+        """Persistir el índice de forma atómica."""
+        with self._lock:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = f"{path}.tmp.npz"
+            np.savez(tmp_path,
+                     vectors=self._vectors[:self._size],
+                     ids=self._ids[:self._size],
+                     clusters=self._clusters[:self._size],
+                     timestamps=self._timestamps[:self._size])
+            os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'FlatVectorIndex':
+        data = np.load(path)
+        index = cls(dim=data['vectors'].shape[1] if data['vectors'].ndim == 2 else 0)
+        index.add(data['ids'], data['vectors'], data['clusters'], data['timestamps'])
+        return index
+
+
+class EmbeddingDeduplicator:
+    """
+    Asigna ``dedup_cluster_id`` a los artículos en el momento de la ingesta.
+
+    Un artículo cuyo vecino más cercano (dentro de la ventana temporal) supera
+    el umbral de similitud hereda el cluster de ese vecino y se marca como
+    duplicado; en caso contrario abre un cluster nuevo con su propio id.
+    """
+
+    def __init__(self, db_path: str, embedder: ArticleEmbedder,
+                 threshold: float = DEFAULT_DUPLICATE_THRESHOLD,
+                 window_hours: int = DEFAULT_WINDOW_HOURS):
+        self.db_path = db_path
+        self.embedder = embedder
+        self.threshold = threshold
+        self.window_hours = window_hours
+        self._lock = threading.Lock()
+        # Último ``seq`` de dedup_vectors incorporado al índice en memoria
+        self._synced_seq = 0
+
+        self.ensure_schema()
+        self._import_legacy_index(str(Path(db_path).parent / LEGACY_INDEX_NAME))
+        self.index = FlatVectorIndex()
+        self._sync()
+
+    def ensure_schema(self):
+        """Añadir las columnas de clustering a ``articles`` si no existen."""
+        with db_connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute("PRAGMA table_info(articles)")
+            existing_columns = [row[1] for row in cursor.fetchall()]
+
+            new_columns = [
+                ("dedup_cluster_id", "INTEGER"),
+                ("is_duplicate", "INTEGER DEFAULT 0"),
+                ("duplicate_similarity", "REAL"),
+            ]
+            for col_name, col_def in new_columns:
+                if col_name not in existing_columns:
+                    cursor.execute(f"ALTER TABLE articles ADD COLUMN {col_name} {col_def}")
+                    logger.info(f"Added column: {col_name}")
+
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_articles_dedup_cluster ON articles (dedup_cluster_id)")
+
+            # ``seq`` crece con cada escritura confirmada: permite sincronizar solo lo nuevo
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS dedup_vectors (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    article_id INTEGER NOT NULL UNIQUE,
+                    cluster_id INTEGER NOT NULL,
+                    published_ts REAL NOT NULL,
+                    vector BLOB NOT NULL
+                )
+            """)
+            cursor.execute("CREATE INDEX IF NOT EXISTS idx_dedup_vectors_published ON dedup_vectors (published_ts)")
+            conn.commit()
+
+    def _import_legacy_index(self, legacy_path: str):
+        """Pasar a dedup_vectors el índice .npz de versiones anteriores (una sola vez)."""
+        if not os.path.exists(legacy_path):
+            return
+        try:
+            legacy = FlatVectorIndex.load(legacy_path)
+            rows = [(legacy.id_at(i), legacy.cluster_at(i), float(legacy._timestamps[i]),
+                     legacy._vectors[i].tobytes()) for i in range(len(legacy))]
+            self._write_vectors(rows)
+            os.replace(legacy_path, legacy_path + '.imported')
+            logger.info(f"✅ Índice de deduplicación importado a la base de datos: {len(rows)} vectores")
+        except Exception as e:
+            logger.warning(f"⚠️ No se pudo importar el índice de deduplicación {legacy_path}: {e}")
+
+    def _sync(self):
+        """Añadir al índice los vectores guardados por otras instancias o procesos."""
+        with db_connect(self.db_path) as conn:
+            rows = conn.execute("""
+                SELECT seq, article_id, cluster_id, published_ts, vector
+                FROM dedup_vectors
+                WHERE seq > ? AND published_ts >= ?
+                ORDER BY seq
+            """, (self._synced_seq, self._window_start())).fetchall()
+        if not rows:
+            return
+        self._synced_seq = rows[-1][0]
+
+        vectors = [np.frombuffer(row[4], dtype=np.float32) for row in rows]
+        fresh = ~self.index.contains([row[1] for row in rows])
+        keep = [i for i in np.flatnonzero(fresh)
+                if not self.index.dim or len(vectors[i]) == self.index.dim]
+        if keep:
+            self.index.add([rows[i][1] for i in keep], np.stack([vectors[i] for i in keep]),
+                           [rows[i][2] for i in keep], [rows[i][3] for i in keep])
+
+    def _window_start(self) -> float:
+        return (datetime.now() - timedelta(hours=self.window_hours)).timestamp()
+
+    @staticmethod
+    def _article_text(title: str, content: str) -> str:
+        return f"{title or ''}. {(content or '')[:500]}"
+
+    @staticmethod
+    def _timestamp(value) -> float:
+        if isinstance(value, datetime):
+            return value.timestamp()
+        if value:
+            try:
+                return datetime.fromisoformat(str(value).replace('Z', '')).timestamp()
+            except ValueError:
+                pass
+        return datetime.now().timestamp()
+
+    def assign_articles(self, articles: List[Dict]) -> Dict[int, Dict]:
+        """
+        Asignar cluster a una lista de artículos ``{'id', 'title', 'content', 'published'}``.
+
+        Los artículos del mismo lote se comparan también entre sí.
+        """
+        if not articles or not self.embedder or not self.embedder.available:
+            return {}
+
+        vectors = self.embedder.encode([
+            self._article_text(a.get('title'), a.get('content')) for a in articles
+        ])
+        min_ts = self._window_start()
+        assignments = {}
+
+        with self._lock:
+            self._sync()
+            stored_vectors = []
+            for article, vector in zip(articles, vectors):
+                article_id = int(article['id'])
+                positions, sims = self.index.search(vector[None, :], k=1, min_timestamp=min_ts)
+                position, similarity = int(positions[0, 0]), float(sims[0, 0])
+
+                if position >= 0 and similarity >= self.threshold:
+                    cluster_id = self.index.cluster_at(position)
+                    is_duplicate = True
+                else:
+                    cluster_id = article_id
+                    is_duplicate = False
+
+                # Añadir antes de procesar el siguiente para detectar duplicados dentro del lote
+                published_ts = self._timestamp(article.get('published'))
+                self.index.add([article_id], vector[None, :], [cluster_id], [published_ts])
+                stored_vectors.append((article_id, cluster_id, published_ts, vector.tobytes()))
+                assignments[article_id] = {
+                    'cluster_id': cluster_id,
+                    'is_duplicate': is_duplicate,
+                    'similarity': similarity if position >= 0 else None
+                }
+
+            self.index.prune(min_ts)
+
+        self._store_assignments(assignments, stored_vectors, min_ts)
+        duplicates = sum(1 for a in assignments.values() if a['is_duplicate'])
+        logger.info(f"🔄 Deduplicación: {len(assignments)} artículos, {duplicates} duplicados")
+        return assignments
+
+    def _write_vectors(self, rows: List[Tuple[int, int, float, bytes]], conn=None):
+        """Guardar filas ``(article_id, cluster_id, published_ts, vector)`` en dedup_vectors."""
+        sql = """
+            INSERT OR IGNORE INTO dedup_vectors (article_id, cluster_id, published_ts, vector)
+            VALUES (?, ?, ?, ?)
+        """
+        if conn is not None:
+            conn.executemany(sql, rows)
+            return
+        with db_connect(self.db_path) as conn:
+            conn.executemany(sql, rows)
+            conn.commit()
+
+    def _store_assignments(self, assignments: Dict[int, Dict],
+                           vectors: List[Tuple[int, int, float, bytes]], min_ts: float):
+        """Clusters y vectores en una sola transacción; se descartan los vectores caducados."""
+        with db_connect(self.db_path) as conn:
+            conn.executemany("""
+                UPDATE articles
+                SET dedup_cluster_id = ?, is_duplicate = ?, duplicate_similarity = ?
+                WHERE id = ?
+            """, [(a['cluster_id'], int(a['is_duplicate']), a['similarity'], article_id)
+                  for article_id, a in assignments.items()])
+            self._write_vectors(vectors, conn)
+            conn.execute("DELETE FROM dedup_vectors WHERE published_ts < ?", (min_ts,))
+            conn.commit()
+
+    def assign_pending(self, limit: int = 500) -> int:
+        """Asignar cluster a artículos recientes que aún no lo tienen (backfill)."""
+        cutoff = datetime.now() - timedelta(hours=self.window_hours)
+        with db_connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT id, title, content, COALESCE(published_at, created_at)
+                FROM articles
+                WHERE dedup_cluster_id IS NULL
+                AND COALESCE(published_at, created_at) > ?
+                ORDER BY COALESCE(published_at, created_at) ASC
+                LIMIT ?
+            """, (cutoff.isoformat(), limit))
+            rows = cursor.fetchall()
+
+        articles = [{'id': r[0], 'title': r[1], 'content': r[2], 'published': r[3]} for r in rows]
+        total = 0
+        for start in range(0, len(articles), 64):
+            total += len(self.assign_articles(articles[start:start + 64]))
+        return total
+
+
+_deduplicators: Dict[str, EmbeddingDeduplicator] = {}
+_deduplicators_lock = threading.Lock()
+
+
+def get_embedding_deduplicator(db_path: str, embedder: ArticleEmbedder) -> EmbeddingDeduplicator:
+    """Deduplicador compartido por base de datos: un índice en memoria por proceso."""
+    key = os.path.abspath(db_path)
+    with _deduplicators_lock:
+        deduplicator = _deduplicators.get(key)
+        if deduplicator is None:
+            deduplicator = _deduplicators[key] = EmbeddingDeduplicator(db_path, embedder)
+        elif not (deduplicator.embedder and deduplicator.embedder.available):
+            deduplicator.embedder = embedder
+        return deduplicator
@@ -13,6 +13,8 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 import re
 
+from ..utils.db_pool import connect as db_connect
+
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -379,7 +381,7 @@ IMPORTANTE: Solo responde con JSON válido, sin texto adicional."""
         logger.info(f"🧠 Analizando artículos de los últimos {timeframe_days} días con IA...")
         
         # Conectar a base de datos
-        conn = sqlite3.connect('data/geopolitical_intel.db')
+        conn = db_connect('data/geopolitical_intel.db')
         cursor = conn.cursor()
         
         # Obtener artículos recientes con contenido sustancial
@@ -466,7 +468,7 @@ IMPORTANTE: Solo responde con JSON válido, sin texto adicional."""
         if not conflicts:
             return
             
-        conn = sqlite3.connect('data/geopolitical_intel.db')
+        conn = db_connect('data/geopolitical_intel.db')
         cursor = conn.cursor()
         
         # Crear tabla de conflictos si no existe (versión mejorada)
@@ -589,7 +591,7 @@ IMPORTANTE: Solo responde con JSON válido, sin texto adicional."""
     def generate_satellite_target_zones(self):
         """Generar zonas agregadas optimizadas para consultas satelitales"""
         try:
-            conn = sqlite3.connect('data/geopolitical_intel.db')
+            conn = db_connect('data/geopolitical_intel.db')
             cursor = conn.cursor()
             
             # Obtener conflictos recientes con coordenadas válidas
@@ -695,7 +697,7 @@ IMPORTANTE: Solo responde con JSON válido, sin texto adicional."""
     def get_satellite_ready_zones(self) -> List[Dict]:
         """Obtener zonas listas para consulta satelital"""
         try:
-            conn = sqlite3.connect('data/geopolitical_intel.db')
+            conn = db_connect('data/geopolitical_intel.db')
             cursor = conn.cursor()
             
             cursor.execute("""
@@ -4,7 +4,6 @@ News Deduplication and Risk Assessment with Ollama
 Sistema para evitar noticias duplicadas y evaluar correctamente el nivel de riesgo
 """
 
-import sqlite3
 import logging
 import hashlib
 from datetime import datetime, timedelta
@@ -12,14 +11,33 @@ from typing import List, Dict, Tuple, Optional
 import requests
 import json
 
+from ..utils.db_pool import connect as db_connect
+from ..utils.keyword_matcher import KeywordMatcher
+
 # Configurar logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Palabras clave del análisis de riesgo de respaldo (sin tildes: el matcher
+# compara ignorando acentos, así 'politico' también encuentra 'político')
+RISK_LEVEL_MATCHER = KeywordMatcher({
+    'high': [
+        'guerra', 'conflicto', 'ataque', 'bomba', 'terrorismo', 'crisis', 'golpe',
+        'invasion', 'militar', 'ejercito', 'amenaza', 'tension', 'nuclear'
+    ],
+    'medium': [
+        'protesta', 'manifestacion', 'elecciones', 'politico', 'gobierno',
+        'economia', 'mercado', 'inflacion', 'desempleo'
+    ],
+}, fold_accents=True)
+
 class NewsDeduplicator:
-    def __init__(self, db_path: str, ollama_base_url: str = "http://localhost:11434"):
+    def __init__(self, db_path: str, ollama_base_url: str = "http://localhost:11434",
+                 embedding_deduplicator=None):
         self.db_path = db_path
         self.ollama_base_url = ollama_base_url
+        # EmbeddingDeduplicator opcional para asignar clusters a artículos aún sin procesar
+        self.embedding_deduplicator = embedding_deduplicator
         
     def call_ollama(self, model: str, prompt: str, timeout: int = 30) -> Optional[str]:
         """Llamar a Ollama con un modelo específico"""
@@ -86,8 +104,13 @@ Respuesta:"""
                     return False
         
         # Fallback: comparación simple por texto
-        title1 = article1.get('title', '').lower()
-        title2 = article2.get('title', '').lower()
+        return self.titles_similar(article1, article2)
+    
+    @staticmethod
+    def titles_similar(article1: Dict, article2: Dict, threshold: float = 0.7) -> bool:
+        """Comparación barata por solapamiento de palabras del título (Jaccard)"""
+        title1 = (article1.get('title') or '').lower()
+        title2 = (article2.get('title') or '').lower()
         
         # Si los títulos comparten más del 70% de palabras, considerarlos duplicados
         words1 = set(title1.split())
@@ -97,7 +120,7 @@ Respuesta:"""
             intersection = len(words1.intersection(words2))
             union = len(words1.union(words2))
             similarity = intersection / union
-            return similarity > 0.7
+            return similarity > threshold
         
         return False
     
@@ -135,20 +158,9 @@ Respuesta:"""
                     return 'low'
         
         # Fallback: análisis por palabras clave
-        content_lower = (article.get('title', '') + ' ' + article.get('content', '')).lower()
-        
-        high_risk_keywords = [
-            'guerra', 'conflicto', 'ataque', 'bomba', 'terrorismo', 'crisis', 'golpe',
-            'invasion', 'militar', 'ejercito', 'amenaza', 'tension', 'nuclear'
-        ]
-        
-        medium_risk_keywords = [
-            'protesta', 'manifestacion', 'elecciones', 'politico', 'gobierno',
-            'economia', 'mercado', 'inflacion', 'desempleo'
-        ]
-        
-        high_count = sum(1 for keyword in high_risk_keywords if keyword in content_lower)
-        medium_count = sum(1 for keyword in medium_risk_keywords if keyword in content_lower)
+        scan = RISK_LEVEL_MATCHER.scan(article.get('title', '') + ' ' + article.get('content', ''))
+        high_count = scan.counts['high']
+        medium_count = scan.counts['medium']
         
         if high_count >= 2:
             return 'high'
@@ -178,15 +190,20 @@ Respuesta:"""
     def get_recent_articles(self, hours: int = 24, limit: int = 50) -> List[Dict]:
         """Obtener artículos recientes de la base de datos"""
         try:
-            db = sqlite3.connect(self.db_path)
+            db = db_connect(self.db_path)
             cursor = db.cursor()
             
             # Calcular timestamp de hace X horas
             cutoff_time = datetime.now() - timedelta(hours=hours)
             
-            cursor.execute("""
+            cursor.execute("PRAGMA table_info(articles)")
+            has_clusters = 'dedup_cluster_id' in [row[1] for row in cursor.fetchall()]
+            cluster_column = 'dedup_cluster_id' if has_clusters else 'NULL AS dedup_cluster_id'
+            
+            cursor.execute(f"""
                 SELECT id, title, content, country, risk_level, 
-                       image_url, url, published_at, auto_generated_summary
+                       image_url, url, published_at, auto_generated_summary,
+                       {cluster_column}
                 FROM articles 
                 WHERE published_at > ? 
                 ORDER BY published_at DESC 
@@ -211,8 +228,33 @@ Respuesta:"""
             logger.error(f"Error getting recent articles: {e}")
             return []
     
-    def process_articles_for_display(self, hours: int = 24) -> Dict:
-        """Procesar artículos para mostrar: deduplicar, evaluar riesgo, seleccionar hero"""
+    def _assign_missing_clusters(self, articles: List[Dict]):
+        """Asignar cluster a artículos que llegaron sin él (p.ej. ingeridos por otra vía)"""
+        missing = [a for a in articles if a.get('dedup_cluster_id') is None]
+        if not missing or not self.embedding_deduplicator:
+            return
+        
+        try:
+            assignments = self.embedding_deduplicator.assign_articles([
+                {'id': a['id'], 'title': a.get('title'), 'content': a.get('content'),
+                 'published': a.get('published_at')}
+                for a in missing
+            ])
+            for article in missing:
+                assignment = assignments.get(article['id'])
+                if assignment:
+                    article['dedup_cluster_id'] = assignment['cluster_id']
+        except Exception as e:
+            logger.error(f"Error asignando clusters de deduplicación: {e}")
+    
+    def process_articles_for_display(self, hours: int = 24, reassess_risk: bool = True) -> Dict:
+        """Procesar artículos para mostrar: deduplicar, evaluar riesgo, seleccionar hero
+        
+        La deduplicación lee los ``dedup_cluster_id`` precalculados en la ingesta
+        (EmbeddingDeduplicator); solo los artículos sin cluster se comparan por
+        título. Con ``reassess_risk=False`` se omite la reevaluación del riesgo
+        con Ollama.
+        """
         logger.info("🔍 Iniciando procesamiento de artículos para display...")
         
         # Obtener artículos recientes
@@ -222,31 +264,40 @@ Respuesta:"""
         if not articles:
             return {'hero': None, 'mosaic': [], 'duplicates_removed': 0}
         
-        # 1. Detectar y remover duplicados
+        # 1. Detectar y remover duplicados usando los clusters precalculados
+        self._assign_missing_clusters(articles)
+        
         unique_articles = []
+        unclustered_kept = []
+        seen_clusters = set()
         removed_duplicates = 0
         
         for article in articles:
-            is_duplicate = False
+            cluster_id = article.get('dedup_cluster_id')
             
-            for unique_article in unique_articles:
-                if self.are_articles_duplicate(article, unique_article):
-                    logger.info(f"🔄 Duplicado detectado: '{article.get('title', '')[:50]}...'")
-                    is_duplicate = True
-                    removed_duplicates += 1
-                    break
+            if cluster_id is not None:
+                is_duplicate = cluster_id in seen_clusters
+                seen_clusters.add(cluster_id)
+            else:
+                is_duplicate = any(self.titles_similar(article, kept) for kept in unclustered_kept)
+                if not is_duplicate:
+                    unclustered_kept.append(article)
             
-            if not is_duplicate:
+            if is_duplicate:
+                logger.info(f"🔄 Duplicado detectado: '{article.get('title', '')[:50]}...'")
+                removed_duplicates += 1
+            else:
                 unique_articles.append(article)
         
         logger.info(f"✅ {removed_duplicates} duplicados removidos, {len(unique_articles)} artículos únicos")
         
-        # 2. Reevaluar niveles de riesgo
-        for article in unique_articles:
-            new_risk = self.assess_risk_level(article)
-            if new_risk != article.get('risk_level'):
-                logger.info(f"📊 Riesgo actualizado para '{article.get('title', '')[:50]}...': {article.get('risk_level')} → {new_risk}")
-                article['risk_level'] = new_risk
+        # 2. Reevaluar niveles de riesgo con Ollama (una llamada por artículo)
+        if reassess_risk:
+            for article in unique_articles:
+                new_risk = self.assess_risk_level(article)
+                if new_risk != article.get('risk_level'):
+                    logger.info(f"📊 Riesgo actualizado para '{article.get('title', '')[:50]}...': {article.get('risk_level')} → {new_risk}")
+                    article['risk_level'] = new_risk
         
         # 3. Detectar imágenes duplicadas
         duplicate_images = self.detect_duplicate_images(unique_articles)
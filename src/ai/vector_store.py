@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+"""
+Almacén vectorial persistente para búsqueda semántica de artículos
+=================================================================
+Matriz float32 memory-mapped (una fila por artículo) con columnas paralelas
+de id, idioma, nivel de riesgo y fecha que permiten aplicar filtros *antes*
+del producto escalar. Las filas se añaden de forma incremental cuando un
+artículo se enriquece y el almacén completo puede reconstruirse offline a
+partir de la tabla ``article_embeddings``.
+
+Estructura en disco (directorio ``data/vector_store`` por defecto)::
+
+    manifest.json   dimensión, modelo, número de filas, códigos de idioma
+    vectors.f32     matriz (n, dim) float32 normalizada
+    ids.i64         id de artículo por fila
+    lang.u8         código de idioma por fila
+    risk.u8         código de riesgo por fila (255 = fila reemplazada)
+    day.i32         días desde epoch de la fecha de publicación
+
+El código de riesgo es el del momento del append: los artículos se vuelven a
+puntuar sin reescribir su vector, así que quien necesite el nivel actual
+(p. ej. la API) pide más vecinos de los necesarios y filtra los ids devueltos
+contra la base de datos.
+"""
+
+import os
+import json
+import shutil
+import sqlite3
+import logging
+import threading
+from datetime import date, datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+RISK_CODES = {'low': 0, 'medium': 1, 'high': 2, 'critical': 3}
+UNKNOWN_RISK = 254
+TOMBSTONE = 255
+
+# Filas procesadas por bloque al buscar, para acotar la memoria temporal
+SEARCH_CHUNK_ROWS = 262144
+
+_COLUMNS = {
+    'ids': ('ids.i64', np.int64),
+    'lang': ('lang.u8', np.uint8),
+    'risk': ('risk.u8', np.uint8),
+    'day': ('day.i32', np.int32),
+}
+
+
+def _to_day(value) -> int:
+    """Convertir fecha/ISO string a días desde epoch."""
+    if value is None or value == '':
+        return 0
+    if isinstance(value, datetime):
+        value = value.date()
+    if not isinstance(value, date):
+        try:
+            value = datetime.fromisoformat(str(value).replace('Z', '')[:19]).date()
+        except ValueError:
+            return 0
+    return value.toordinal() - date(1970, 1, 1).toordinal()
+
+
+class ArticleVectorStore:
+    """Índice k-NN exacto sobre una matriz memory-mapped con pre-filtros."""
+
+    def __init__(self, base_dir: str, dim: int = 384, model_name: Optional[str] = None):
+        self.base_dir = Path(base_dir)
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._manifest_path = self.base_dir / 'manifest.json'
+
+        if self._manifest_path.exists():
+            self.manifest = json.loads(self._manifest_path.read_text(encoding='utf-8'))
+        else:
+            self.manifest = {'dim': dim, 'model': model_name, 'count': 0, 'languages': []}
+            self._write_manifest()
+        self._manifest_mtime = self._manifest_path.stat().st_mtime
+
+        self._maps: Dict[str, np.ndarray] = {}
+        self._row_by_id: Optional[Dict[int, int]] = None
+
+    # ------------------------------------------------------------------
+    # Gestión de ficheros
+    # ------------------------------------------------------------------
+
+    @property
+    def dim(self) -> int:
+        return int(self.manifest['dim'])
+
+    @property
+    def count(self) -> int:
+        return int(self.manifest['count'])
+
+    @property
+    def model_name(self) -> Optional[str]:
+        return self.manifest.get('model')
+
+    def _write_manifest(self):
+        tmp_path = self._manifest_path.with_suffix('.tmp')
+        tmp_path.write_text(json.dumps(self.manifest), encoding='utf-8')
+        os.replace(tmp_path, self._manifest_path)
+        self._manifest_mtime = self._manifest_path.stat().st_mtime
+
+    def refresh(self):
+        """Recargar el manifiesto si otro proceso ha añadido filas o reconstruido el almacén."""
+        try:
+            mtime = self._manifest_path.stat().st_mtime
+        except FileNotFoundError:
+            return
+        if mtime != self._manifest_mtime:
+            self.manifest = json.loads(self._manifest_path.read_text(encoding='utf-8'))
+            self._manifest_mtime = mtime
+            self._maps = {}
+            self._row_by_id = None
+
+    def _path(self, filename: str) -> Path:
+        return self.base_dir / filename
+
+    def _open_maps(self):
+        """Abrir (o reabrir tras un append) los memmaps de solo lectura."""
+        n = self.count
+        if self._maps.get('_count') is not None and self._maps['_count'] == n:
+            return
+        self._maps = {'_count': n}
+        if n == 0:
+            return
+        self._maps['vectors'] = np.memmap(self._path('vectors.f32'), dtype=np.float32,
+                                          mode='r', shape=(n, self.dim))
+        for name, (filename, dtype) in _COLUMNS.items():
+            self._maps[name] = np.memmap(self._path(filename), dtype=dtype, mode='r', shape=(n,))
+
+    def _language_code(self, language: Optional[str]) -> int:
+        language = (language or 'unknown').lower()
+        languages = self.manifest['languages']
+        if language not in languages:
+            if len(languages) >= 250:
+                language = 'unknown'
+                if language not in languages:
+                    languages.append(language)
+            else:
+                languages.append(language)
+        return languages.index(language)
+
+    def _ensure_row_index(self) -> Dict[int, int]:
+        if self._row_by_id is None:
+            self._open_maps()
+            self._row_by_id = {}
+            if self.count:
+                ids = self._maps['ids']
+                risk = self._maps['risk']
+                for row in np.nonzero(risk != TOMBSTONE)[0]:
+                    self._row_by_id[int(ids[row])] = int(row)
+        return self._row_by_id
+
+    # ------------------------------------------------------------------
+    # Escritura
+    # ------------------------------------------------------------------
+
+    def append(self, article_ids: Sequence[int], vectors: np.ndarray,
+               languages: Sequence[Optional[str]], risk_levels: Sequence[Optional[str]],
+               dates: Sequence) -> int:
+        """Añadir (o reemplazar) vectores de artículos. Devuelve filas escritas."""
+        vectors = np.asarray(vectors, dtype=np.float32).reshape(len(article_ids), -1)
+        if len(article_ids) == 0:
+            return 0
+        if vectors.shape[1] != self.dim:
+            raise ValueError(f"Dimensión {vectors.shape[1]} distinta de la del almacén ({self.dim})")
+
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = vectors / np.maximum(norms, 1e-12)
+
+        with self._lock:
+            self.refresh()
+            row_by_id = self._ensure_row_index()
+            replaced = [row_by_id[int(i)] for i in article_ids if int(i) in row_by_id]
+
+            columns = {
+                'ids': np.asarray(article_ids, dtype=np.int64),
+                'lang': np.asarray([self._language_code(language) for language in languages], dtype=np.uint8),
+                'risk': np.asarray([RISK_CODES.get((r or '').lower(), UNKNOWN_RISK) for r in risk_levels],
+                                   dtype=np.uint8),
+                'day': np.asarray([_to_day(d) for d in dates], dtype=np.int32),
+            }
+
+            # Cada fichero se escribe en la posición que marca el manifiesto:
+            # los restos de un append anterior que falló a medias se descartan
+            start = self.count
+            self._maps = {}
+            self._write_rows('vectors.f32', start * self.dim * 4, vectors)
+            for name, (filename, dtype) in _COLUMNS.items():
+                self._write_rows(filename, start * np.dtype(dtype).itemsize, columns[name])
+
+            self.manifest['count'] = start + len(columns['ids'])
+            self._write_manifest()
+            # Las filas reemplazadas se marcan solo cuando las nuevas ya cuentan
+            if replaced:
+                self._set_risk_codes(replaced, TOMBSTONE)
+            for offset, article_id in enumerate(columns['ids']):
+                row_by_id[int(article_id)] = start + offset
+
+        return len(article_ids)
+
+    def _write_rows(self, filename: str, offset: int, values: np.ndarray):
+        """Escribir ``values`` a partir de ``offset`` y truncar lo que haya detrás."""
+        path = self._path(filename)
+        with open(path, 'r+b' if path.exists() else 'wb') as fh:
+            fh.seek(0, os.SEEK_END)
+            if fh.tell() < offset:
+                raise IOError(f"{filename} tiene menos filas que el manifiesto ({fh.tell()} < {offset} bytes)")
+            fh.seek(offset)
+            fh.truncate()
+            fh.write(values.tobytes())
+
+    def _set_risk_codes(self, rows: List[int], code: int):
+        risk = np.memmap(self._path('risk.u8'), dtype=np.uint8, mode='r+', shape=(self.count,))
+        risk[rows] = code
+        risk.flush()
+        del risk
+        self._maps = {}
+
+    # ------------------------------------------------------------------
+    # Búsqueda
+    # ------------------------------------------------------------------
+
+    def search(self, query: np.ndarray, k: int = 10, language: Optional[str] = None,
+               risk_level: Optional[str] = None, since=None, until=None) -> List[Tuple[int, float]]:
+        """Devolver [(article_id, similitud)] de los k artículos más similares."""
+        query = np.asarray(query, dtype=np.float32).reshape(-1)
+        query = query / max(float(np.linalg.norm(query)), 1e-12)
+
+        with self._lock:
+            self.refresh()
+            self._open_maps()
+            n = self.count
+            if n == 0 or k <= 0:
+                return []
+
+            language_code = None
+            if language:
+                language = language.lower()
+                if language not in self.manifest['languages']:
+                    return []
+                language_code = self.manifest['languages'].index(language)
+            risk_codes = None
+            if risk_level:
+                risk_codes = [RISK_CODES[r.strip().lower()] for r in risk_level.split(',')
+                              if r.strip().lower() in RISK_CODES]
+                if not risk_codes:
+                    return []
+            since_day = _to_day(since) if since else None
+            until_day = _to_day(until) if until else None
+
+            maps = self._maps
+            best_rows = np.zeros(0, dtype=np.int64)
+            best_scores = np.zeros(0, dtype=np.float32)
+
+            for start in range(0, n, SEARCH_CHUNK_ROWS):
+                end = min(start + SEARCH_CHUNK_ROWS, n)
+
+                # Pre-filtros vectorizados sobre las columnas de metadatos
+                mask = maps['risk'][start:end] != TOMBSTONE
+                if language_code is not None:
+                    mask &= maps['lang'][start:end] == language_code
+                if risk_codes is not None:
+                    mask &= np.isin(maps['risk'][start:end], risk_codes)
+                if since_day is not None:
+                    mask &= maps['day'][start:end] >= since_day
+                if until_day is not None:
+                    mask &= maps['day'][start:end] <= until_day
+
+                rows = np.nonzero(mask)[0]
+                if rows.size == 0:
+                    continue
+                if rows.size == end - start:
+                    scores = maps['vectors'][start:end] @ query
+                else:
+                    scores = maps['vectors'][start + rows] @ query
+
+                best_rows = np.concatenate([best_rows, rows + start])
+                best_scores = np.concatenate([best_scores, scores.astype(np.float32)])
+                if best_rows.size > k:
+                    keep = np.argpartition(-best_scores, k - 1)[:k]
+                    best_rows, best_scores = best_rows[keep], best_scores[keep]
+
+            order = np.argsort(-best_scores)
+            ids = maps['ids']
+            return [(int(ids[best_rows[i]]), float(best_scores[i])) for i in order]
+
+    # ------------------------------------------------------------------
+    # Reconstrucción offline
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def rebuild_from_database(cls, db_path: str, base_dir: str, batch_size: int = 5000,
+                              model_name: Optional[str] = None) -> 'ArticleVectorStore':
+        """
+        Reconstruir el almacén completo a partir de ``article_embeddings``.
+
+        Se escribe en un directorio temporal que sustituye al actual al final,
+        de modo que las búsquedas en curso nunca ven un almacén a medias.
+        """
+        tmp_dir = Path(f"{base_dir}.rebuild")
+        if tmp_dir.exists():
+            shutil.rmtree(tmp_dir)
+
+        store = None
+        total = 0
+        with sqlite3.connect(db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute("""
+                SELECT e.article_id, e.combined_embedding, e.embedding_model,
+                       a.language, a.risk_level, COALESCE(a.published_at, a.created_at)
+                FROM article_embeddings e
+                JOIN articles a ON a.id = e.article_id
+                WHERE e.combined_embedding IS NOT NULL
+                ORDER BY e.article_id
+            """)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                vectors = [np.frombuffer(r[1], dtype=np.float32) for r in rows]
+                if store is None:
+                    store = cls(str(tmp_dir), dim=len(vectors[0]), model_name=model_name or rows[0][2])
+                valid = [i for i, v in enumerate(vectors) if len(v) == store.dim]
+                store.append([rows[i][0] for i in valid], np.stack([vectors[i] for i in valid]),
+                             [rows[i][3] for i in valid], [rows[i][4] for i in valid],
+                             [rows[i][5] for i in valid])
+                total += len(valid)
+
+        if store is None:
+            store = cls(str(tmp_dir), model_name=model_name)
+
+        base = Path(base_dir)
+        old_dir = Path(f"{base_dir}.old")
+        if base.exists():
+            if old_dir.exists():
+                shutil.rmtree(old_dir)
+            os.replace(base, old_dir)
+        os.replace(tmp_dir, base)
+        if old_dir.exists():
+            shutil.rmtree(old_dir)
+
+        logger.info(f"✅ Almacén vectorial reconstruido: {total} vectores en {base_dir}")
+        return cls(base_dir)
+
+
+def default_store_path(db_path: str) -> str:
+    """Directorio del almacén vectorial junto a la base de datos."""
+    return str(Path(db_path).parent / 'vector_store')
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Reconstruir el almacén vectorial de artículos")
+    parser.add_argument('--db', default='data/geopolitical_intel.db')
+    parser.add_argument('--out', default=None)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    ArticleVectorStore.rebuild_from_database(args.db, args.out or default_store_path(args.db))
@@ -5,10 +5,10 @@ prints alert messages (placeholder for email/Telegram/Slack).
 """
 
 import yaml
-import sqlite3
 from datetime import datetime, timedelta
 from pathlib import Path
 from utils.config import config, logger
+from utils.db_pool import connect as db_connect
 from alerts.notify import send_notification
 
 RULES_PATH = Path(__file__).parent / "rules.yaml"
@@ -27,7 +27,7 @@ def evaluate_rules():
     rules = load_rules()
     if not rules:
         return
-    conn = sqlite3.connect(DB_PATH)
+    conn = db_connect(DB_PATH)
     cur = conn.cursor()
     for rule in rules:
         try:
@@ -13,6 +13,7 @@ import numpy as np
 from datetime import datetime, timedelta
 from flask import jsonify, request
 import json
+import threading
 from typing import Dict, List, Optional, Tuple
 import logging
 from pathlib import Path
@@ -441,9 +442,20 @@ class HistoricalAnalysisService:
 
 # Flask route functions
 def register_historical_analysis_routes(app):
-    """Register all historical analysis routes with the Flask app"""
+    """Register all historical analysis routes with the Flask app.
     
-    service = HistoricalAnalysisService()
+    Routes must be registered before the app serves its first request, so the
+    service (and its ETL database) is only built on the first request.
+    """
+    
+    services = {}
+    services_lock = threading.Lock()
+    
+    def get_service() -> HistoricalAnalysisService:
+        with services_lock:
+            if 'service' not in services:
+                services['service'] = HistoricalAnalysisService()
+            return services['service']
     
     @app.route('/api/historical/dashboard', methods=['GET'])
     def get_historical_dashboard():
@@ -455,7 +467,7 @@ def register_historical_analysis_routes(app):
             countries = request.args.getlist('countries')
             categories = request.args.getlist('categories')
             
-            data = service.get_dashboard_data(
+            data = get_service().get_dashboard_data(
                 date_from=date_from,
                 date_to=date_to,
                 countries=countries if countries else None,
@@ -489,7 +501,7 @@ def register_historical_analysis_routes(app):
                     'error': 'No indicators specified'
                 }), 400
             
-            analysis = service.get_correlation_analysis(indicators, time_window)
+            analysis = get_service().get_correlation_analysis(indicators, time_window)
             
             return jsonify({
                 'success': True,
@@ -508,7 +520,7 @@ def register_historical_analysis_routes(app):
     def get_historical_filters():
         """Get available filter options"""
         try:
-            filters = service.get_available_filters()
+            filters = get_service().get_available_filters()
             
             return jsonify({
                 'success': True,
@@ -530,7 +542,7 @@ def register_historical_analysis_routes(app):
             data = request.get_json() or {}
             force_refresh = data.get('force_refresh', False)
             
-            result = service.trigger_etl_update(force_refresh=force_refresh)
+            result = get_service().trigger_etl_update(force_refresh=force_refresh)
             
             return jsonify(result)
             
@@ -546,7 +558,7 @@ def register_historical_analysis_routes(app):
     def get_historical_etl_status():
         """Get ETL status and statistics"""
         try:
-            status = service.get_etl_status()
+            status = get_service().get_etl_status()
             
             return jsonify({
                 'success': True,
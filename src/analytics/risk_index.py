@@ -2,9 +2,9 @@
 Combines recent event count, fatalities, GDP per capita (inverse), oil production volatility and democracy score.
 Stores in table `country_risk`.
 """
-import sqlite3
 from datetime import datetime, timedelta
 from utils.config import config, logger
+from utils.db_pool import connect as db_connect
 
 DB=config.database.path
 
@@ -17,7 +17,7 @@ WEIGHTS={
 }
 
 def calc_risk():
-    conn=sqlite3.connect(DB)
+    conn=db_connect(DB)
     cur=conn.cursor()
     last30=(datetime.utcnow()-timedelta(days=30)).isoformat()
     # recent events per country
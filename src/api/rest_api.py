@@ -7,6 +7,9 @@ from reporting.report_generator import ReportGenerator
 from data_quality.validator import data_validator
 from monitoring.system_monitor import system_monitor
 from utils.config import config, logger
+from utils.db_pool import connect as db_connect
+from utils.fulltext_search import (FTS_TABLE, RANK_EXPRESSION, SNIPPET_START, SNIPPET_END,
+                                   SNIPPET_TOKENS, build_match_query, fts_index_exists)
 from flask import Flask, request, jsonify, send_file
 from flask_cors import CORS
 import sqlite3
@@ -17,6 +20,7 @@ from pathlib import Path
 import logging
 from functools import wraps
 import time
+import threading
 
 # Import system modules
 import sys
@@ -32,6 +36,15 @@ app.logger.setLevel(logging.INFO)
 # Database path
 DB_PATH = config.get('database', {}).get('path', 'data/riskmap.db')
 
+# Semantic search state (loaded lazily on first request)
+_semantic_search = {'store': None, 'encoder': None}
+_semantic_search_lock = threading.Lock()
+
+# Risk-filtered semantic searches over-fetch neighbours and keep the ones whose
+# current risk level matches, widening by this factor up to the candidate cap
+SEMANTIC_RISK_OVERFETCH = 4
+SEMANTIC_RISK_MAX_CANDIDATES = 4000
+
 # Rate limiting decorator
 
 
@@ -158,8 +171,7 @@ def api_articles():
         params.extend([per_page, (page - 1) * per_page])
 
         # Execute query
-        conn = sqlite3.connect(DB_PATH)
-        conn.row_factory = sqlite3.Row
+        conn = db_connect(DB_PATH, row_factory=sqlite3.Row)
         cursor = conn.cursor()
 
         cursor.execute(query, params)
@@ -202,8 +214,7 @@ def api_articles():
 def api_article_detail(article_id):
     """Get detailed information about a specific article."""
     try:
-        conn = sqlite3.connect(DB_PATH)
-        conn.row_factory = sqlite3.Row
+        conn = db_connect(DB_PATH, row_factory=sqlite3.Row)
         cursor = conn.cursor()
 
         cursor.execute("""
@@ -244,7 +255,7 @@ def api_sentiment_analytics():
     try:
         days = request.args.get('days', 7, type=int)
 
-        conn = sqlite3.connect(DB_PATH)
+        conn = db_connect(DB_PATH)
         cursor = conn.cursor()
 
         cursor.execute("""
@@ -287,7 +298,7 @@ def api_risk_analytics():
     try:
         days = request.args.get('days', 7, type=int)
 
-        conn = sqlite3.connect(DB_PATH)
+        conn = db_connect(DB_PATH)
         cursor = conn.cursor()
 
         cursor.execute("""
@@ -331,7 +342,7 @@ def api_entities_analytics():
         days = request.args.get('days', 7, type=int)
         limit = min(request.args.get('limit', 20, type=int), 100)
 
-        conn = sqlite3.connect(DB_PATH)
+        conn = db_connect(DB_PATH)
         cursor = conn.cursor()
 
         cursor.execute("""
@@ -433,7 +444,7 @@ def api_generate_report():
 @app.route('/api/v1/search', methods=['GET'])
 @rate_limit(max_requests=100, window=3600)
 def api_search():
-    """Advanced search across articles."""
+    """Full-text search across articles (FTS5 + BM25, prefix matching)."""
     try:
         query = request.args.get('q', '').strip()
         if not query:
@@ -444,22 +455,32 @@ def api_search():
         risk_level = request.args.get('risk_level')
         limit = min(request.args.get('limit', 50, type=int), 100)
 
+        match_query = build_match_query(query)
+        if not match_query:
+            return jsonify({'query': query, 'results': [], 'total_found': 0})
+
+        conn = db_connect(DB_PATH, row_factory=sqlite3.Row)
+        cursor = conn.cursor()
+
+        if not fts_index_exists(conn):
+            conn.close()
+            return jsonify({
+                'error': 'Full-text index missing; run python src/utils/fulltext_search.py to build it'
+            }), 503
+
         # Build search query
-        search_query = """
+        search_query = f"""
             SELECT a.id, a.title, a.url, a.created_at, a.language,
                    ar.sentiment, ar.risk_level, ar.summary,
-                   (CASE
-                    WHEN a.title LIKE ? THEN 3
-                    WHEN a.content LIKE ? THEN 2
-                    WHEN ar.summary LIKE ? THEN 1
-                    ELSE 0 END) as relevance_score
-            FROM articles a
+                   snippet({FTS_TABLE}, -1, ?, ?, '…', {SNIPPET_TOKENS}) as snippet,
+                   -{RANK_EXPRESSION} as relevance_score
+            FROM {FTS_TABLE}
+            JOIN articles a ON a.id = {FTS_TABLE}.rowid
             LEFT JOIN analysis_results ar ON a.id = ar.article_id
-            WHERE (a.title LIKE ? OR a.content LIKE ? OR ar.summary LIKE ?)
+            WHERE {FTS_TABLE} MATCH ?
         """
 
-        search_term = f"%{query}%"
-        params = [search_term] * 6
+        params = [SNIPPET_START, SNIPPET_END, match_query]
 
         if language:
             search_query += " AND a.language = ?"
@@ -473,13 +494,9 @@ def api_search():
             search_query += " AND ar.risk_level = ?"
             params.append(risk_level)
 
-        search_query += " ORDER BY relevance_score DESC, a.created_at DESC LIMIT ?"
+        search_query += f" ORDER BY {RANK_EXPRESSION}, a.created_at DESC LIMIT ?"
         params.append(limit)
 
-        conn = sqlite3.connect(DB_PATH)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-
         cursor.execute(search_query, params)
         results = [dict(row) for row in cursor.fetchall()]
 
@@ -496,12 +513,115 @@ def api_search():
         return jsonify({'error': str(e)}), 500
 
 
+def _get_semantic_search():
+    """Open the article vector store and its query encoder on first use."""
+    with _semantic_search_lock:
+        if _semantic_search['store'] is None:
+            from ai.vector_store import ArticleVectorStore, default_store_path
+            store = ArticleVectorStore(default_store_path(DB_PATH))
+            if store.count == 0 or not store.model_name:
+                raise RuntimeError('Vector store is empty; run python -m ai.vector_store to rebuild it')
+
+            from sentence_transformers import SentenceTransformer
+            _semantic_search['encoder'] = SentenceTransformer(store.model_name)
+            _semantic_search['store'] = store
+        return _semantic_search['store'], _semantic_search['encoder']
+
+
+def _articles_by_id(ids):
+    """Article rows for ``ids`` keyed by id (primary-key lookup)."""
+    conn = db_connect(DB_PATH, row_factory=sqlite3.Row)
+    try:
+        placeholders = ','.join('?' * len(ids))
+        rows = conn.execute(f"""
+            SELECT id, title, url, source, language, risk_level,
+                   published_at, created_at
+            FROM articles WHERE id IN ({placeholders})
+        """, ids).fetchall()
+    finally:
+        conn.close()
+    return {row['id']: dict(row) for row in rows}
+
+
+def _semantic_results(store, query_vector, k, risk_level=None, **filters):
+    """
+    Top ``k`` store matches joined with their article rows.
+
+    Risk is filtered on the current database value (the store keeps the level
+    an article had when its vector was written): neighbours are over-fetched
+    and post-filtered, widening the candidate set until ``k`` remain or the
+    store or ``SEMANTIC_RISK_MAX_CANDIDATES`` runs out.
+    """
+    levels = set()
+    if risk_level:
+        levels = {level.strip().lower() for level in risk_level.split(',') if level.strip()}
+        if not levels:
+            return []
+
+    fetch_k = k * SEMANTIC_RISK_OVERFETCH if levels else k
+    rows = {}
+    looked_up = set()
+    while True:
+        matches = store.search(query_vector, k=fetch_k, **filters)
+        missing = [article_id for article_id, _ in matches if article_id not in looked_up]
+        if missing:
+            rows.update(_articles_by_id(missing))
+            looked_up.update(missing)
+
+        results = [{**rows[article_id], 'similarity': round(similarity, 4)}
+                   for article_id, similarity in matches
+                   if article_id in rows
+                   and (not levels or (rows[article_id]['risk_level'] or '').lower() in levels)]
+        if (not levels or len(results) >= k or len(matches) < fetch_k
+                or fetch_k >= SEMANTIC_RISK_MAX_CANDIDATES):
+            return results[:k]
+        fetch_k = min(fetch_k * SEMANTIC_RISK_OVERFETCH, SEMANTIC_RISK_MAX_CANDIDATES)
+
+
+@app.route('/api/v1/search/semantic', methods=['GET'])
+@rate_limit(max_requests=100, window=3600)
+def api_semantic_search():
+    """k-NN semantic search over article embeddings."""
+    try:
+        query = request.args.get('q', '').strip()
+        if not query:
+            return jsonify({'error': 'Search query is required'}), 400
+
+        k = max(1, min(request.args.get('k', 10, type=int), 100))
+        language = request.args.get('language')
+        risk_level = request.args.get('risk_level')
+        since = request.args.get('since')
+        until = request.args.get('until')
+
+        try:
+            store, encoder = _get_semantic_search()
+        except (ImportError, RuntimeError) as e:
+            return jsonify({'error': f'Semantic search not available: {e}'}), 503
+
+        start_time = time.time()
+        query_vector = encoder.encode(query)
+        results = _semantic_results(store, query_vector, k, risk_level=risk_level,
+                                    language=language, since=since, until=until)
+        search_time = time.time() - start_time
+
+        return jsonify({
+            'query': query,
+            'results': results,
+            'total_found': len(results),
+            'search_time_ms': round(search_time * 1000, 2)
+        })
+
+    except Exception as e:
+        logger.error(f"Error in semantic search API: {e}")
+        return jsonify({'error': str(e)}), 500
+
+
 @app.route('/api/v1/stats', methods=['GET'])
 @rate_limit(max_requests=50, window=3600)
 def api_stats():
     """Get general system statistics."""
     try:
-        conn = sqlite3.connect(DB_PATH)
+        conn = db_connect(DB_PATH)
         cursor = conn.cursor()
 
         # Basic counts
@@ -567,6 +687,7 @@ def api_info():
             'GET /api/v1/data-quality': 'Data quality report',
             'POST /api/v1/reports/generate': 'Generate reports',
             'GET /api/v1/search': 'Search articles',
+            'GET /api/v1/search/semantic': 'Semantic k-NN search over article embeddings',
             'GET /api/v1/stats': 'System statistics',
             'GET /api/v1/info': 'API information'
         }
@@ -163,18 +163,28 @@ def create_api_blueprint(core_orchestrator=None):
                     'error': 'Query parameter "q" is required'
                 }), 400
             
-            if core_orchestrator:
+            if core_orchestrator and hasattr(core_orchestrator, 'search_articles'):
                 articles = core_orchestrator.search_articles(query=query, limit=limit)
-                return jsonify({
-                    'query': query,
-                    'articles': articles,
-                    'count': len(articles),
-                    'timestamp': datetime.now().isoformat()
-                })
             else:
-                return jsonify({
-                    'error': 'Core orchestrator not available'
-                }), 503
+                # Búsqueda FTS5 directa sobre la base de datos principal
+                from utils.config import get_database_path
+                from utils.db_pool import connect as db_connect
+                from utils.fulltext_search import search_articles as fts_search
+
+                conn = db_connect(get_database_path())
+                try:
+                    articles = fts_search(conn, query, limit=limit,
+                                          language=request.args.get('language'),
+                                          risk_level=request.args.get('risk_level'))
+                finally:
+                    conn.close()
+
+            return jsonify({
+                'query': query,
+                'articles': articles,
+                'count': len(articles),
+                'timestamp': datetime.now().isoformat()
+            })
                 
         except Exception as e:
             logger.error(f"Error searching articles: {e}")
@@ -1,130 +1,470 @@
+"""
+Sistema de cache de dos niveles para optimizar rendimiento
+=========================================================
+- Nivel 1: LRU en memoria, acotado en bytes por namespace.
+- Nivel 2: un único fichero SQLite en disco con cuota en bytes y TTL por
+  namespace; la expulsión es LRU dentro de cada namespace, de modo que una
+  ráfaga de escrituras ``geojson`` nunca expulsa entradas ``analysis``.
+- Protección contra estampidas (single-flight): si varias peticiones piden
+  la misma clave ausente, solo una ejecuta el constructor y el resto espera
+  su resultado.
+- Decorador ``memoize`` para constructores de endpoints costosos.
+- Contadores de aciertos/fallos/expulsiones por namespace (``get_stats``).
+
+``IntelligentCacheSystem`` mantiene la interfaz anterior
+(``get_from_cache``/``save_to_cache``/...) sobre el nuevo almacenamiento.
+"""
 
 import json
-import os
 import time
-from pathlib import Path
-from datetime import datetime, timedelta
-import hashlib
+import os
 import pickle
+import hashlib
+import logging
+import sqlite3
+import threading
+from collections import OrderedDict, defaultdict
+from concurrent.futures import Future
+from dataclasses import dataclass
+from functools import wraps
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from utils.db_pool import connect as db_connect
+
+logger = logging.getLogger(__name__)
+
+# Anclado a la raíz del proyecto: app y scripts comparten el nivel en disco
+BASE_DIR = Path(__file__).resolve().parents[2]
+DEFAULT_DB_PATH = os.getenv('INTELLIGENT_CACHE_DB', str(BASE_DIR / 'data' / 'cache' / 'intelligent_cache.db'))
+_MISSING = object()
+
+
+@dataclass
+class NamespacePolicy:
+    """Política de un namespace: TTL, presupuesto en memoria y cuota en disco."""
+    ttl: int = 3600
+    memory_bytes: int = 16 * 1024 * 1024
+    disk_bytes: int = 128 * 1024 * 1024
+
+
+DEFAULT_POLICIES = {
+    'maps': NamespacePolicy(ttl=3600, memory_bytes=32 * 1024 * 1024, disk_bytes=256 * 1024 * 1024),
+    'satellite': NamespacePolicy(ttl=7200, memory_bytes=32 * 1024 * 1024, disk_bytes=512 * 1024 * 1024),
+    'geojson': NamespacePolicy(ttl=1800, memory_bytes=32 * 1024 * 1024, disk_bytes=128 * 1024 * 1024),
+    'analysis': NamespacePolicy(ttl=86400, memory_bytes=16 * 1024 * 1024, disk_bytes=256 * 1024 * 1024),
+    'dashboard': NamespacePolicy(ttl=60, memory_bytes=8 * 1024 * 1024, disk_bytes=32 * 1024 * 1024),
+}
+
+
+def make_cache_key(*parts: Any) -> str:
+    """Clave estable a partir de valores serializables en JSON."""
+    key_string = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha1(key_string.encode('utf-8')).hexdigest()
+
+
+class MemoryLRU:
+    """LRU en memoria acotado en bytes; guarda los valores ya serializados."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self._entries: 'OrderedDict[str, Tuple[bytes, float]]' = OrderedDict()
+
+    def get(self, key: str, now: float):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        payload, expires_at = entry
+        if expires_at <= now:
+            self.delete(key)
+            return None
+        self._entries.move_to_end(key)
+        return payload
+
+    def put(self, key: str, payload: bytes, expires_at: float) -> int:
+        """Insertar y devolver el número de entradas expulsadas."""
+        self.delete(key)
+        if len(payload) > self.max_bytes:
+            return 0
+        self._entries[key] = (payload, expires_at)
+        self.current_bytes += len(payload)
+
+        evicted = 0
+        while self.current_bytes > self.max_bytes:
+            _, (old_payload, _) = self._entries.popitem(last=False)
+            self.current_bytes -= len(old_payload)
+            evicted += 1
+        return evicted
+
+    def delete(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.current_bytes -= len(entry[0])
+
+    def clear(self):
+        self._entries.clear()
+        self.current_bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class DiskCache:
+    """Nivel en disco: una tabla SQLite con cuota LRU por namespace."""
+
+    PURGE_EVERY_WRITES = 500
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._writes = 0
+        self._lock = threading.Lock()
+
+        with db_connect(self.db_path) as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS cache_entries (
+                    namespace TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    expires_at REAL NOT NULL,
+                    last_access REAL NOT NULL,
+                    PRIMARY KEY (namespace, key)
+                ) WITHOUT ROWID
+            """)
+            conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_cache_entries_lru
+                ON cache_entries(namespace, last_access)
+            """)
+            self.namespace_bytes = defaultdict(int, conn.execute(
+                "SELECT namespace, SUM(size) FROM cache_entries GROUP BY namespace"
+            ).fetchall())
+
+    def get(self, namespace: str, key: str, now: float):
+        with db_connect(self.db_path) as conn:
+            row = conn.execute(
+                "SELECT value, expires_at FROM cache_entries WHERE namespace = ? AND key = ?",
+                (namespace, key)
+            ).fetchone()
+            if row is None:
+                return None, None
+            payload, expires_at = row
+            if expires_at > now:
+                conn.execute("UPDATE cache_entries SET last_access = ? WHERE namespace = ? AND key = ?",
+                             (now, namespace, key))
+                return payload, expires_at
+        self.delete(namespace, key)
+        return None, None
+
+    def put(self, namespace: str, key: str, payload: bytes, expires_at: float,
+            quota_bytes: int, now: float) -> int:
+        """Insertar y devolver cuántas entradas se expulsaron por cuota."""
+        with self._lock, db_connect(self.db_path) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                old = conn.execute("SELECT size FROM cache_entries WHERE namespace = ? AND key = ?",
+                                   (namespace, key)).fetchone()
+                conn.execute("""
+                    INSERT OR REPLACE INTO cache_entries (namespace, key, value, size, expires_at, last_access)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """, (namespace, key, payload, len(payload), expires_at, now))
+                self.namespace_bytes[namespace] += len(payload) - (old[0] if old else 0)
+
+                evicted = 0
+                if self.namespace_bytes[namespace] > quota_bytes:
+                    evicted = self._evict(conn, namespace, quota_bytes)
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+            self._writes += 1
+            purge = self._writes % self.PURGE_EVERY_WRITES == 0
+
+        if purge:
+            self.purge_expired(now)
+        return evicted
+
+    def _evict(self, conn: sqlite3.Connection, namespace: str, quota_bytes: int) -> int:
+        """Expulsar las entradas menos usadas del namespace hasta cumplir la cuota."""
+        excess = self.namespace_bytes[namespace] - quota_bytes
+        victims = []
+        freed = 0
+        for key, size in conn.execute(
+            "SELECT key, size FROM cache_entries WHERE namespace = ? ORDER BY last_access",
+            (namespace,)
+        ):
+            victims.append((namespace, key))
+            freed += size
+            if freed >= excess:
+                break
+        conn.executemany("DELETE FROM cache_entries WHERE namespace = ? AND key = ?", victims)
+        self.namespace_bytes[namespace] -= freed
+        return len(victims)
+
+    def delete(self, namespace: str, key: str):
+        with self._lock, db_connect(self.db_path) as conn:
+            row = conn.execute("SELECT size FROM cache_entries WHERE namespace = ? AND key = ?",
+                               (namespace, key)).fetchone()
+            if row:
+                conn.execute("DELETE FROM cache_entries WHERE namespace = ? AND key = ?", (namespace, key))
+                self.namespace_bytes[namespace] -= row[0]
+
+    def purge_expired(self, now: float) -> int:
+        with self._lock, db_connect(self.db_path) as conn:
+            expired = conn.execute(
+                "SELECT namespace, SUM(size), COUNT(*) FROM cache_entries WHERE expires_at <= ? GROUP BY namespace",
+                (now,)
+            ).fetchall()
+            conn.execute("DELETE FROM cache_entries WHERE expires_at <= ?", (now,))
+            for namespace, size, _ in expired:
+                self.namespace_bytes[namespace] -= size
+        return sum(count for _, _, count in expired)
+
+    def clear(self, namespace: Optional[str] = None):
+        with self._lock, db_connect(self.db_path) as conn:
+            if namespace:
+                conn.execute("DELETE FROM cache_entries WHERE namespace = ?", (namespace,))
+                self.namespace_bytes[namespace] = 0
+            else:
+                conn.execute("DELETE FROM cache_entries")
+                self.namespace_bytes.clear()
+
+    def entry_counts(self) -> Dict[str, int]:
+        with db_connect(self.db_path) as conn:
+            return dict(conn.execute(
+                "SELECT namespace, COUNT(*) FROM cache_entries GROUP BY namespace"
+            ).fetchall())
+
+
+class TwoTierCache:
+    """Cache memoria + disco con namespaces, single-flight y métricas."""
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH,
+                 policies: Optional[Dict[str, NamespacePolicy]] = None,
+                 default_policy: Optional[NamespacePolicy] = None):
+        self.policies = dict(DEFAULT_POLICIES)
+        self.policies.update(policies or {})
+        self.default_policy = default_policy or NamespacePolicy()
+
+        self.disk = DiskCache(db_path)
+        self._memory: Dict[str, MemoryLRU] = {}
+        self._lock = threading.RLock()
+        self._inflight: Dict[Tuple[str, str], Future] = {}
+        self._stats = defaultdict(lambda: defaultdict(int))
+
+    def policy(self, namespace: str) -> NamespacePolicy:
+        return self.policies.get(namespace, self.default_policy)
+
+    def _memory_tier(self, namespace: str) -> MemoryLRU:
+        tier = self._memory.get(namespace)
+        if tier is None:
+            tier = self._memory[namespace] = MemoryLRU(self.policy(namespace).memory_bytes)
+        return tier
+
+    def _count(self, namespace: str, counter: str, amount: int = 1):
+        self._stats[namespace][counter] += amount
+
+    # ------------------------------------------------------------------
+    # Lectura / escritura
+    # ------------------------------------------------------------------
+
+    def get(self, namespace: str, key: str, default: Any = None) -> Any:
+        """Obtener un valor (memoria primero, luego disco)."""
+        now = time.time()
+        with self._lock:
+            payload = self._memory_tier(namespace).get(key, now)
+            if payload is not None:
+                self._count(namespace, 'memory_hits')
+                return pickle.loads(payload)
+
+        try:
+            payload, expires_at = self.disk.get(namespace, key, now)
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ Error leyendo cache en disco ({namespace}): {e}")
+            payload = None
+
+        with self._lock:
+            if payload is None:
+                self._count(namespace, 'misses')
+                return default
+            self._count(namespace, 'disk_hits')
+            # Promoción al nivel de memoria
+            evicted = self._memory_tier(namespace).put(key, payload, expires_at)
+            self._count(namespace, 'memory_evictions', evicted)
+        return pickle.loads(payload)
+
+    def set(self, namespace: str, key: str, value: Any, ttl: Optional[int] = None):
+        """Guardar un valor en ambos niveles."""
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        policy = self.policy(namespace)
+        now = time.time()
+        expires_at = now + (ttl if ttl is not None else policy.ttl)
+
+        with self._lock:
+            evicted = self._memory_tier(namespace).put(key, payload, expires_at)
+            self._count(namespace, 'memory_evictions', evicted)
+            self._count(namespace, 'sets')
+
+        try:
+            evicted = self.disk.put(namespace, key, payload, expires_at, policy.disk_bytes, now)
+            with self._lock:
+                self._count(namespace, 'disk_evictions', evicted)
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ Error escribiendo cache en disco ({namespace}): {e}")
+
+    def delete(self, namespace: str, key: str):
+        with self._lock:
+            self._memory_tier(namespace).delete(key)
+        self.disk.delete(namespace, key)
+
+    def clear(self, namespace: Optional[str] = None):
+        with self._lock:
+            if namespace:
+                self._memory_tier(namespace).clear()
+            else:
+                for tier in self._memory.values():
+                    tier.clear()
+        self.disk.clear(namespace)
+
+    def get_or_compute(self, namespace: str, key: str, builder: Callable[[], Any],
+                       ttl: Optional[int] = None) -> Any:
+        """
+        Devolver el valor cacheado o calcularlo una sola vez (single-flight):
+        las peticiones concurrentes de la misma clave esperan al primer cálculo.
+        """
+        value = self.get(namespace, key, _MISSING)
+        if value is not _MISSING:
+            return value
+
+        flight_key = (namespace, key)
+        with self._lock:
+            future = self._inflight.get(flight_key)
+            leader = future is None
+            if leader:
+                future = self._inflight[flight_key] = Future()
+            else:
+                self._count(namespace, 'singleflight_waits')
+
+        if not leader:
+            return future.result()
+
+        try:
+            value = builder()
+            self.set(namespace, key, value, ttl)
+            future.set_result(value)
+            return value
+        except Exception as e:
+            self._count(namespace, 'builder_errors')
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(flight_key, None)
+
+    # ------------------------------------------------------------------
+    # Métricas
+    # ------------------------------------------------------------------
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Contadores y ocupación por namespace."""
+        try:
+            disk_entries = self.disk.entry_counts()
+        except sqlite3.Error:
+            disk_entries = {}
+
+        with self._lock:
+            namespaces = set(self._stats) | set(self._memory) | set(disk_entries)
+            result = {}
+            for namespace in sorted(namespaces):
+                counters = dict(self._stats[namespace])
+                hits = counters.get('memory_hits', 0) + counters.get('disk_hits', 0)
+                lookups = hits + counters.get('misses', 0)
+                tier = self._memory.get(namespace)
+                policy = self.policy(namespace)
+                result[namespace] = {
+                    **counters,
+                    'hit_rate': round(hits / lookups, 4) if lookups else 0.0,
+                    'memory_entries': len(tier) if tier else 0,
+                    'memory_bytes': tier.current_bytes if tier else 0,
+                    'memory_limit_bytes': policy.memory_bytes,
+                    'disk_entries': disk_entries.get(namespace, 0),
+                    'disk_bytes': self.disk.namespace_bytes.get(namespace, 0),
+                    'disk_quota_bytes': policy.disk_bytes,
+                    'ttl': policy.ttl,
+                }
+        return {'namespaces': result, 'db_path': self.disk.db_path}
+
+
+_default_cache: Optional[TwoTierCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_cache() -> TwoTierCache:
+    """Cache compartido del proceso (se crea bajo demanda)."""
+    global _default_cache
+    if _default_cache is None:
+        with _default_cache_lock:
+            if _default_cache is None:
+                _default_cache = TwoTierCache()
+    return _default_cache
+
+
+def memoize(namespace: str, ttl: Optional[int] = None,
+            key: Optional[Callable[..., Any]] = None,
+            cache: Optional[TwoTierCache] = None):
+    """
+    Memoizar un constructor costoso en el cache de dos niveles.
+
+    La clave por defecto combina el nombre cualificado de la función y sus
+    argumentos; ``key(*args, **kwargs)`` permite personalizarla.
+    """
+    def decorator(func):
+        qualified_name = f"{func.__module__}.{func.__qualname__}"
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            target = cache or get_cache()
+            key_parts = key(*args, **kwargs) if key else (args, kwargs)
+            cache_key = make_cache_key(qualified_name, key_parts)
+            return target.get_or_compute(namespace, cache_key, lambda: func(*args, **kwargs), ttl)
+
+        wrapper.cache_namespace = namespace
+        return wrapper
+    return decorator
+
 
 class IntelligentCacheSystem:
-    """Sistema de cache inteligente para optimizar rendimiento"""
-    
-    def __init__(self):
-        self.cache_dir = Path('src/cache')
-        self.cache_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Configuración de cache
+    """Sistema de cache inteligente para optimizar rendimiento (interfaz anterior)"""
+
+    def __init__(self, cache: Optional[TwoTierCache] = None):
+        self.cache = cache or get_cache()
         self.cache_config = {
-            'maps': {'ttl': 3600, 'max_size': 100},  # 1 hora
-            'satellite': {'ttl': 7200, 'max_size': 50},  # 2 horas
-            'geojson': {'ttl': 1800, 'max_size': 200},  # 30 minutos
-            'analysis': {'ttl': 86400, 'max_size': 1000}  # 24 horas
+            name: {'ttl': policy.ttl, 'max_bytes': policy.disk_bytes}
+            for name, policy in self.cache.policies.items()
         }
-    
+
     def generate_cache_key(self, data_type, params):
         """Generar clave única para cache"""
-        key_string = f"{data_type}:{json.dumps(params, sort_keys=True)}"
-        return hashlib.md5(key_string.encode()).hexdigest()
-    
-    def get_cache_file_path(self, cache_key):
-        """Obtener ruta del archivo cache"""
-        return self.cache_dir / f"{cache_key}.cache"
-    
-    def is_cache_valid(self, cache_file, ttl):
-        """Verificar si cache es válido"""
-        if not cache_file.exists():
-            return False
-        
-        file_time = datetime.fromtimestamp(cache_file.stat().st_mtime)
-        expiry_time = datetime.now() - timedelta(seconds=ttl)
-        
-        return file_time > expiry_time
-    
+        return make_cache_key(data_type, params)
+
     def get_from_cache(self, data_type, params):
         """Obtener datos del cache"""
-        try:
-            cache_key = self.generate_cache_key(data_type, params)
-            cache_file = self.get_cache_file_path(cache_key)
-            
-            config = self.cache_config.get(data_type, {'ttl': 3600})
-            
-            if self.is_cache_valid(cache_file, config['ttl']):
-                with open(cache_file, 'rb') as f:
-                    cached_data = pickle.load(f)
-                
-                print(f"Cache HIT para {data_type}: {cache_key[:8]}...")
-                return cached_data
-            else:
-                print(f"Cache MISS para {data_type}: {cache_key[:8]}...")
-                return None
-                
-        except Exception as e:
-            print(f"Error obteniendo del cache: {e}")
-            return None
-    
+        return self.cache.get(data_type, self.generate_cache_key(data_type, params))
+
     def save_to_cache(self, data_type, params, data):
         """Guardar datos en cache"""
-        try:
-            cache_key = self.generate_cache_key(data_type, params)
-            cache_file = self.get_cache_file_path(cache_key)
-            
-            with open(cache_file, 'wb') as f:
-                pickle.dump(data, f)
-            
-            print(f"Guardado en cache {data_type}: {cache_key[:8]}...")
-            
-            # Limpiar cache si es necesario
-            self.cleanup_cache(data_type)
-            
-        except Exception as e:
-            print(f"Error guardando en cache: {e}")
-    
-    def cleanup_cache(self, data_type):
-        """Limpiar cache antiguo"""
-        try:
-            config = self.cache_config.get(data_type, {'max_size': 100})
-            max_size = config['max_size']
-            
-            # Obtener archivos cache ordenados por fecha
-            cache_files = list(self.cache_dir.glob('*.cache'))
-            cache_files.sort(key=lambda x: x.stat().st_mtime, reverse=True)
-            
-            # Eliminar archivos excedentes
-            if len(cache_files) > max_size:
-                for old_file in cache_files[max_size:]:
-                    old_file.unlink()
-                    print(f"Cache limpiado: {old_file.name}")
-                    
-        except Exception as e:
-            print(f"Error limpiando cache: {e}")
-    
+        self.cache.set(data_type, self.generate_cache_key(data_type, params), data)
+
+    def cleanup_cache(self, data_type=None):
+        """Eliminar entradas expiradas (las cuotas se aplican al escribir)"""
+        return self.cache.disk.purge_expired(time.time())
+
     def clear_all_cache(self):
         """Limpiar todo el cache"""
-        try:
-            cache_files = list(self.cache_dir.glob('*.cache'))
-            for cache_file in cache_files:
-                cache_file.unlink()
-            
-            print(f"Cache completamente limpiado: {len(cache_files)} archivos eliminados")
-            
-        except Exception as e:
-            print(f"Error limpiando cache completo: {e}")
-    
+        self.cache.clear()
+
     def get_cache_stats(self):
         """Obtener estadísticas del cache"""
-        try:
-            cache_files = list(self.cache_dir.glob('*.cache'))
-            total_size = sum(f.stat().st_size for f in cache_files)
-            
-            return {
-                'total_files': len(cache_files),
-                'total_size_mb': round(total_size / (1024 * 1024), 2),
-                'oldest_file': min((f.stat().st_mtime for f in cache_files), default=0),
-                'newest_file': max((f.stat().st_mtime for f in cache_files), default=0)
-            }
-            
-        except Exception as e:
-            print(f"Error obteniendo estadísticas cache: {e}")
-            return {}
-            
\ No newline at end of file
+        return self.cache.get_stats()
@@ -4,7 +4,6 @@
 Integración del sistema de posicionamiento inteligente con el dashboard
 """
 
-import sqlite3
 import json
 import logging
 from typing import Dict, List, Optional
@@ -12,6 +11,8 @@ from pathlib import Path
 import os
 from dotenv import load_dotenv
 
+from ..utils.db_pool import connect as db_connect
+
 # Cargar variables de entorno
 load_dotenv()
 
@@ -156,7 +157,7 @@ class MosaicLayoutManager:
         y colocarlo en thumbnail si tiene imagen de baja resolución
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with db_connect(self.db_path) as conn:
                 cursor = conn.cursor()
                 
                 # Buscar el artículo específico de Ucrania
@@ -195,7 +196,7 @@ class MosaicLayoutManager:
         para situarlos en cuadros pequeños del mosaico
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with db_connect(self.db_path) as conn:
                 cursor = conn.cursor()
                 
                 # Buscar artículos con indicadores de baja calidad en URL o título
@@ -269,7 +270,7 @@ class MosaicLayoutManager:
         Asegurar que existe la columna mosaic_position en la tabla articles
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with db_connect(self.db_path) as conn:
                 cursor = conn.cursor()
                 
                 # Verificar si la columna existe
@@ -294,7 +295,7 @@ class MosaicLayoutManager:
         Obtener artículos organizados por posición para el mosaico
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with db_connect(self.db_path) as conn:
                 cursor = conn.cursor()
                 
                 # Asegurar que existen las columnas necesarias
@@ -494,7 +495,7 @@ class MosaicLayoutManager:
         Obtener artículos de respaldo en caso de error
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with db_connect(self.db_path) as conn:
                 cursor = conn.cursor()
                 
                 cursor.execute("""
@@ -559,7 +560,7 @@ class MosaicLayoutManager:
         Obtener estadísticas del layout actual
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with db_connect(self.db_path) as conn:
                 cursor = conn.cursor()
                 
                 # Estadísticas por posición
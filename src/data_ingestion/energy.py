@@ -8,10 +8,10 @@ Docs: https://www.eia.gov/opendata/
 
 import os
 import requests
-import sqlite3
 from typing import List, Dict
 from datetime import datetime
 from utils.config import logger, config
+from utils.db_pool import connect as db_connect
 
 API_KEY = os.getenv("EIA_API_KEY", "")
 BASE_URL = "https://api.eia.gov/v2/international/data/?api_key={key}&data=production&frequency=annual&type=oil&facets=series-id:&sort=desc&offset=0&length=5000".format(key=API_KEY)
@@ -44,25 +44,23 @@ def fetch_oil_production() -> List[Dict]:
 def store_energy(records: List[Dict]):
     if not records:
         return
-    conn = sqlite3.connect(config.database.path)
-    cur = conn.cursor()
-    cur.execute(
-        """
-        CREATE TABLE IF NOT EXISTS country_energy (
-            iso3 TEXT,
-            year INTEGER,
-            oil_production_kbd REAL,
-            PRIMARY KEY(iso3, year)
-        )"""
-    )
-    for rec in records:
+    with db_connect(config.database.path) as conn:
+        cur = conn.cursor()
         cur.execute(
-            """INSERT OR REPLACE INTO country_energy (iso3, year, oil_production_kbd)
-            VALUES (?,?,?)""",
-            (rec["iso3"], rec["year"], rec["oil_production_kbd"])
+            """
+            CREATE TABLE IF NOT EXISTS country_energy (
+                iso3 TEXT,
+                year INTEGER,
+                oil_production_kbd REAL,
+                PRIMARY KEY(iso3, year)
+            )"""
         )
-    conn.commit()
-    conn.close()
+        for rec in records:
+            cur.execute(
+                """INSERT OR REPLACE INTO country_energy (iso3, year, oil_production_kbd)
+                VALUES (?,?,?)""",
+                (rec["iso3"], rec["year"], rec["oil_production_kbd"])
+            )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,181 @@
+"""
+Persistent conditional-GET cache for RSS/Atom feeds.
+Stores per-feed validators (ETag, Last-Modified, body hash and recently seen
+entry GUIDs) so collectors can send conditional requests, skip parsing when a
+feed is unchanged and only process entries they have not seen before.
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from utils.db_pool import connect as db_connect
+
+logger = logging.getLogger(__name__)
+
+# Number of GUIDs remembered per feed. Feeds rarely publish more than 100
+# entries, so this comfortably covers entries rotating in and out.
+MAX_SEEN_GUIDS = 500
+
+
+def entry_guid(entry: Any) -> str:
+    """Return a stable identifier for a feedparser entry."""
+    for key in ('id', 'guid', 'link'):
+        value = entry.get(key) if hasattr(entry, 'get') else getattr(entry, key, None)
+        if value:
+            return str(value)
+    title = entry.get('title', '') if hasattr(entry, 'get') else getattr(entry, 'title', '')
+    return hashlib.sha1(str(title).encode('utf-8')).hexdigest()
+
+
+def content_hash(body: bytes) -> str:
+    """Hash of a raw feed body."""
+    return hashlib.sha256(body or b'').hexdigest()
+
+
+class FeedValidatorStore:
+    """SQLite-backed store of HTTP validators and seen entry GUIDs per feed URL."""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self.stats = {'requests': 0, 'not_modified': 0, 'unchanged_body': 0,
+                      'entries_seen': 0, 'entries_new': 0}
+        self._setup_table()
+
+    def _connect(self) -> sqlite3.Connection:
+        return db_connect(self.db_path, row_factory=sqlite3.Row)
+
+    def _setup_table(self):
+        conn = self._connect()
+        try:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS feed_validators (
+                    url TEXT PRIMARY KEY,
+                    etag TEXT,
+                    last_modified TEXT,
+                    content_hash TEXT,
+                    seen_guids TEXT,
+                    last_checked DATETIME,
+                    last_changed DATETIME
+                )
+            ''')
+            conn.commit()
+        finally:
+            conn.close()
+
+    def get(self, url: str) -> Optional[Dict[str, Any]]:
+        """Return the stored validators for a feed, if any."""
+        conn = self._connect()
+        try:
+            row = conn.execute('SELECT * FROM feed_validators WHERE url = ?', (url,)).fetchone()
+        finally:
+            conn.close()
+        if not row:
+            return None
+        record = dict(row)
+        record['seen_guids'] = json.loads(record['seen_guids'] or '[]')
+        return record
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """Build If-None-Match / If-Modified-Since headers for a feed."""
+        with self._lock:
+            self.stats['requests'] += 1
+        record = self.get(url)
+        headers = {}
+        if record:
+            if record.get('etag'):
+                headers['If-None-Match'] = record['etag']
+            if record.get('last_modified'):
+                headers['If-Modified-Since'] = record['last_modified']
+        return headers
+
+    def is_not_modified(self, url: str, status: Optional[int], body: Optional[bytes]) -> bool:
+        """True when the server answered 304 or returned the same body as last time."""
+        if status == 304:
+            with self._lock:
+                self.stats['not_modified'] += 1
+            self.touch(url)
+            return True
+
+        record = self.get(url)
+        if record and body is not None and record.get('content_hash') == content_hash(body):
+            with self._lock:
+                self.stats['unchanged_body'] += 1
+            self.touch(url)
+            return True
+        return False
+
+    def filter_new_entries(self, url: str, entries: Iterable[Any]) -> List[Any]:
+        """Return only entries whose GUID has not been seen for this feed."""
+        record = self.get(url)
+        seen = set(record['seen_guids']) if record else set()
+        entries = list(entries)
+        new_entries = [e for e in entries if entry_guid(e) not in seen]
+        with self._lock:
+            self.stats['entries_seen'] += len(entries)
+            self.stats['entries_new'] += len(new_entries)
+        return new_entries
+
+    def update(self, url: str, headers: Optional[Dict[str, str]], body: Optional[bytes],
+               entries: Iterable[Any], complete: bool = True):
+        """Record validators, body hash and the GUIDs of the processed entries.
+
+        ``entries`` must only contain entries that were fully handled (saved,
+        filtered out or already stored). When ``complete`` is False some new
+        entries were left for later, so the validators and body hash are
+        cleared: the next fetch downloads and parses the feed again instead of
+        being answered as not modified.
+        """
+        headers = {k.lower(): v for k, v in (headers or {}).items()}
+        record = self.get(url)
+        previous = record['seen_guids'] if record else []
+
+        guids = [entry_guid(e) for e in entries]
+        merged = list(dict.fromkeys(guids + previous))[:MAX_SEEN_GUIDS]
+        now = datetime.now().isoformat()
+        if complete:
+            etag, last_modified = headers.get('etag'), headers.get('last-modified')
+            body_hash = content_hash(body) if body is not None else None
+        else:
+            etag = last_modified = body_hash = None
+
+        conn = self._connect()
+        try:
+            conn.execute('''
+                INSERT INTO feed_validators
+                    (url, etag, last_modified, content_hash, seen_guids, last_checked, last_changed)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(url) DO UPDATE SET
+                    etag = excluded.etag,
+                    last_modified = excluded.last_modified,
+                    content_hash = excluded.content_hash,
+                    seen_guids = excluded.seen_guids,
+                    last_checked = excluded.last_checked,
+                    last_changed = excluded.last_changed
+            ''', (url, etag, last_modified, body_hash, json.dumps(merged), now, now))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def touch(self, url: str):
+        """Mark a feed as checked without changing its validators."""
+        conn = self._connect()
+        try:
+            conn.execute('UPDATE feed_validators SET last_checked = ? WHERE url = ?',
+                         (datetime.now().isoformat(), url))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return skip counters for this store instance."""
+        with self._lock:
+            stats = dict(self.stats)
+        requests = stats['requests'] or 1
+        stats['skip_rate'] = round((stats['not_modified'] + stats['unchanged_body']) / requests, 3)
+        return stats
@@ -8,12 +8,12 @@ import csv
 import gzip
 import io
 import json
-import sqlite3
 import requests
 from datetime import datetime
 from typing import List, Dict, Any
 
 from utils.config import config, logger
+from utils.db_pool import connect as db_connect
 from utils.geo import country_code_to_latlon
 
 UCDP_CSV_URL = (
@@ -67,31 +67,29 @@ def fetch_ucdp_conflicts() -> List[Dict[str, Any]]:
 def store_historical(events: List[Dict[str, Any]]):
     if not events:
         return
-    conn = sqlite3.connect(config.database.path)
-    cur = conn.cursor()
-    cur.execute(
-        """
-        CREATE TABLE IF NOT EXISTS historical_events (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            title TEXT, description TEXT, published_at TEXT, source TEXT,
-            lat REAL, lon REAL, type TEXT, fatalities INTEGER
-        )
-        """
-    )
-    for ev in events:
+    with db_connect(config.database.path) as conn:
+        cur = conn.cursor()
         cur.execute(
-            """INSERT INTO historical_events
-            (title, description, published_at, source, lat, lon, type, fatalities)
-            VALUES (?,?,?,?,?,?,?,?)""",
-            (
-                ev["title"], ev["description"], ev["published_at"], ev["source"],
-                ev["latlon"][0] if ev.get("latlon") else None,
-                ev["latlon"][1] if ev.get("latlon") else None,
-                ev["type"], ev.get("fatalities")
+            """
+            CREATE TABLE IF NOT EXISTS historical_events (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                title TEXT, description TEXT, published_at TEXT, source TEXT,
+                lat REAL, lon REAL, type TEXT, fatalities INTEGER
             )
+            """
         )
-    conn.commit()
-    conn.close()
+        for ev in events:
+            cur.execute(
+                """INSERT INTO historical_events
+                (title, description, published_at, source, lat, lon, type, fatalities)
+                VALUES (?,?,?,?,?,?,?,?)""",
+                (
+                    ev["title"], ev["description"], ev["published_at"], ev["source"],
+                    ev["latlon"][0] if ev.get("latlon") else None,
+                    ev["latlon"][1] if ev.get("latlon") else None,
+                    ev["type"], ev.get("fatalities")
+                )
+            )
 
 if __name__ == "__main__":
     data = fetch_ucdp_conflicts()
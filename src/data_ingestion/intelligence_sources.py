@@ -7,8 +7,10 @@ from utils.config import config, DatabaseManager
 import requests
 import feedparser
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterable, Optional
 import time
+import sqlite3
+import threading
 import logging
 from pathlib import Path
 import sys
@@ -20,6 +22,8 @@ from urllib.parse import urljoin, urlparse
 # Add src to path
 sys.path.append(str(Path(__file__).parent.parent))
 
+from data_ingestion.feed_cache import FeedValidatorStore
+
 
 logger = logging.getLogger(__name__)
 
@@ -353,6 +357,10 @@ class IntelligenceCollector:
         self.sources_registry = IntelligenceSourcesRegistry()
         # Fixed: use config directly, not config.config
         self.db = DatabaseManager(config)
+        self.feed_cache = FeedValidatorStore(self.db.db_path)
+        # Feed cache updates waiting for their articles to be saved, by feed URL
+        self._pending_feed_updates: Dict[str, Dict[str, Any]] = {}
+        self._pending_lock = threading.Lock()
         self.request_timeout = 30
         self.request_delay = 1.0
 
@@ -407,16 +415,41 @@ class IntelligenceCollector:
         try:
             await asyncio.sleep(self.request_delay)
 
-            async with session.get(source['rss']) as response:
-                content = await response.text()
+            url = source['rss']
+            async with session.get(url, headers=self.feed_cache.conditional_headers(url)) as response:
+                status = response.status
+                headers = dict(response.headers)
+                content = await response.read()
+
+            if self.feed_cache.is_not_modified(url, status, content):
+                logger.debug(f"Intelligence feed not modified: {source['name']}")
+                return []
 
             feed = feedparser.parse(content)
             articles = []
 
-            for entry in feed.entries[:max_articles]:
+            # Entries are only marked seen once their article is saved
+            # (see confirm_saved_articles); the rest wait for the next fetch
+            new_entries = self.feed_cache.filter_new_entries(url, feed.entries)
+            skipped = []
+            entries_by_url: Dict[str, List[Any]] = {}
+            for entry in new_entries[:max_articles]:
                 article = self._process_intelligence_entry(entry, source)
                 if article:
                     articles.append(article)
+                    entries_by_url.setdefault(article.get('url'), []).append(entry)
+                else:
+                    skipped.append(entry)
+
+            if status < 400:
+                with self._pending_lock:
+                    self._pending_feed_updates[url] = {
+                        'headers': headers,
+                        'content': content,
+                        'skipped': skipped,
+                        'entries_by_url': entries_by_url,
+                        'new_entries': len(new_entries),
+                    }
 
             logger.debug(
                 f"Collected {len(articles)} intelligence articles from {source['name']}")
@@ -427,6 +460,29 @@ class IntelligenceCollector:
                 f"Error fetching intelligence RSS from {source['name']}: {e}")
             return []
 
+    def confirm_saved_articles(self, saved_urls: Iterable[str]):
+        """Record feed validators and seen entries once articles are stored.
+
+        Entries that produced no article, and entries whose article URL is in
+        ``saved_urls``, are marked seen. Entries whose article was not saved
+        stay unseen and the feed's validators are cleared, so the next fetch
+        downloads and processes them again.
+        """
+        saved_urls = set(saved_urls)
+        with self._pending_lock:
+            pending, self._pending_feed_updates = self._pending_feed_updates, {}
+
+        for feed_url, update in pending.items():
+            handled = list(update['skipped'])
+            for article_url, entries in update['entries_by_url'].items():
+                if article_url in saved_urls:
+                    handled.extend(entries)
+            try:
+                self.feed_cache.update(feed_url, update['headers'], update['content'], handled,
+                                       complete=len(handled) == update['new_entries'])
+            except Exception as e:
+                logger.error(f"Error updating feed cache for {feed_url}: {e}")
+
     def _process_intelligence_entry(
             self, entry: Any, source: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Process intelligence RSS entry with enhanced metadata."""
@@ -590,6 +646,7 @@ class IntelligenceCollector:
             cursor = conn.cursor()
 
             saved_count = 0
+            stored_urls = []
 
             for article in articles:
                 try:
@@ -620,7 +677,12 @@ class IntelligenceCollector:
                     """, article_data)
 
                     saved_count += 1
+                    stored_urls.append(article.get('url'))
 
+                except sqlite3.IntegrityError:
+                    # Already stored by an earlier collection
+                    stored_urls.append(article.get('url'))
+                    continue
                 except Exception as e:
                     logger.error(f"Error saving intelligence article: {e}")
                     continue
@@ -628,6 +690,7 @@ class IntelligenceCollector:
             conn.commit()
             conn.close()
 
+            self.confirm_saved_articles(stored_urls)
             return saved_count
 
         except Exception as e:
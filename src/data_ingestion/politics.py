@@ -11,9 +11,9 @@ import csv
 import io
 import zipfile
 import requests
-import sqlite3
 from typing import List, Dict
 from utils.config import config, logger
+from utils.db_pool import connect as db_connect
 
 VDEM_ZIP_URL = "https://www.v-dem.net/media/publications/vdem_2024_csv.zip"  # fictitious placeholder; actual link may differ
 FH_CSV_URL = "https://freedomhouse.org/sites/default/files/2023-03/freedom_in_the_world_2023.csv"  # example link
@@ -71,33 +71,31 @@ def fetch_freedom_house() -> List[Dict]:
 
 
 def store_politics(vdem_rows: List[Dict], fh_rows: List[Dict]):
-    conn = sqlite3.connect(config.database.path)
-    cur = conn.cursor()
-    cur.execute(
-        """
-        CREATE TABLE IF NOT EXISTS country_politics (
-            iso3 TEXT,
-            year INTEGER,
-            polyarchy REAL,
-            lib_dem REAL,
-            fh_status TEXT,
-            fh_total REAL,
-            PRIMARY KEY(iso3, year)
-        )
-        """
-    )
-    for row in vdem_rows:
-        cur.execute(
-            "INSERT OR IGNORE INTO country_politics (iso3, year, polyarchy, lib_dem) VALUES (?,?,?,?)",
-            (row["iso3"], row["year"], row["polyarchy"], row["lib_dem"])
-        )
-    for row in fh_rows:
+    with db_connect(config.database.path) as conn:
+        cur = conn.cursor()
         cur.execute(
-            "UPDATE country_politics SET fh_status=?, fh_total=? WHERE iso3=? AND year=?",
-            (row["fh_status"], row["fh_total"], row["iso3"], row["year"])
+            """
+            CREATE TABLE IF NOT EXISTS country_politics (
+                iso3 TEXT,
+                year INTEGER,
+                polyarchy REAL,
+                lib_dem REAL,
+                fh_status TEXT,
+                fh_total REAL,
+                PRIMARY KEY(iso3, year)
+            )
+            """
         )
-    conn.commit()
-    conn.close()
+        for row in vdem_rows:
+            cur.execute(
+                "INSERT OR IGNORE INTO country_politics (iso3, year, polyarchy, lib_dem) VALUES (?,?,?,?)",
+                (row["iso3"], row["year"], row["polyarchy"], row["lib_dem"])
+            )
+        for row in fh_rows:
+            cur.execute(
+                "UPDATE country_politics SET fh_status=?, fh_total=? WHERE iso3=? AND year=?",
+                (row["fh_status"], row["fh_total"], row["iso3"], row["year"])
+            )
 
 
 if __name__ == "__main__":
@@ -11,8 +11,8 @@ import json
 from datetime import datetime, timedelta
 from typing import List, Dict, Any
 from utils.config import config, logger
+from utils.db_pool import connect as db_connect
 from utils.geo import extract_event_location
-import sqlite3
 
 # --- GDELT: Eventos geopolíticos globales ---
 def fetch_gdelt_events(days: int = 1) -> List[Dict[str, Any]]:
@@ -277,21 +277,19 @@ def store_events(events: List[Dict[str, Any]], table: str = "events"):
     """
     if not events:
         return
-    conn = sqlite3.connect(config.database.path)
-    cursor = conn.cursor()
-    cursor.execute(f"""
-        CREATE TABLE IF NOT EXISTS {table} (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            title TEXT, content TEXT, url TEXT, published_at TEXT, source TEXT, location TEXT, type TEXT, magnitude REAL
-        )
-    """)
-    for ev in events:
+    with db_connect(config.database.path) as conn:
+        cursor = conn.cursor()
         cursor.execute(f"""
-            INSERT INTO {table} (title, content, url, published_at, source, location, type, magnitude)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            ev.get("title"), ev.get("content"), ev.get("url"), ev.get("published_at"),
-            ev.get("source"), json.dumps(ev.get("location")), ev.get("type"), ev.get("magnitude")
-        ))
-    conn.commit()
-    conn.close()
+            CREATE TABLE IF NOT EXISTS {table} (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                title TEXT, content TEXT, url TEXT, published_at TEXT, source TEXT, location TEXT, type TEXT, magnitude REAL
+            )
+        """)
+        for ev in events:
+            cursor.execute(f"""
+                INSERT INTO {table} (title, content, url, published_at, source, location, type, magnitude)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                ev.get("title"), ev.get("content"), ev.get("url"), ev.get("published_at"),
+                ev.get("source"), json.dumps(ev.get("location")), ev.get("type"), ev.get("magnitude")
+            ))
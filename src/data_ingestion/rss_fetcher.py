@@ -23,9 +23,14 @@ sys.path.append(str(Path(__file__).parent.parent))
 sys.path.append(str(Path(__file__).parent.parent.parent))
 
 from utils.config import config
+from utils.db_pool import connect as db_connect, get_pool
 from utils.translation import TranslationService
+from utils.batch_translation import BatchTranslator
 from ai.bert_risk_analyzer import bert_risk_analyzer, analyze_article_risk
+from data_ingestion.async_feed_fetcher import AsyncFeedFetcher, FeedRequest, FeedResponse
+from data_ingestion.feed_cache import FeedValidatorStore
 from utils.content_classifier import ContentClassifier
+from utils.keyword_matcher import KeywordMatcher
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
@@ -40,15 +45,115 @@ except ImportError as e:
     logger.warning(f"Advanced NLP analyzer not available: {e}")
     ADVANCED_NLP_AVAILABLE = False
 
+# Import embedding-based deduplication
+try:
+    from ai.embedding_dedup import ArticleEmbedder, get_embedding_deduplicator
+    EMBEDDING_DEDUP_AVAILABLE = True
+except ImportError as e:
+    logger.warning(f"Embedding deduplication not available: {e}")
+    EMBEDDING_DEDUP_AVAILABLE = False
+
+# Patterns that mark obviously non-geopolitical content (sports, entertainment,
+# lifestyle); compiled into a single alternation so each article is searched once
+NON_RELEVANT_PATTERNS = [
+    # Cricket specific patterns (high priority)
+    r'\bcricket\b', r'\bcríquet\b', r'\bpcb\b', r'\bbcci\b', r'\bicc\b',
+    r'\bcricket board\b', r'\bcricket council\b', r'\bcricket asia\b',
+    
+    # Sports - English
+    r'\bsports?\b', r'\bfootball\b', r'\bbasketball\b', r'\bsoccer\b',
+    r'\bbaseball\b', r'\btennis\b', r'\bgolf\b', r'\bhockey\b',
+    r'\bvolleyball\b', r'\bswimming\b', r'\bathletics\b', r'\bgymnastics\b',
+    r'\boxing\b', r'\bwrestling\b', r'\bmma\b', r'\bufc\b',
+    r'\bolympics?\b', r'\bworld cup\b', r'\bchampionship\b(?!.*political)',
+    r'\bteam\b.*\b(wins?|lost?|defeats?|victory|champion)\b',
+    r'\bplayer\b', r'\bcoach\b', r'\bstadium\b', r'\bmatch\b(?!.*diplomatic)',
+    r'\btournament\b', r'\bleague\b', r'\bseason\b(?!.*political)',
+    
+    # Major sports organizations
+    r'\bfifa\b', r'\buefa\b', r'\bnba\b', r'\bnfl\b', r'\bmlb\b', r'\bnhl\b',
+    
+    # Sports - Spanish
+    r'\bdeporte\b', r'\bfútbol\b', r'\bbaloncesto\b', r'\btenis\b',
+    r'\bgolf\b', r'\bjockey\b', r'\bvoleibol\b', r'\bnatación\b',
+    r'\batletismo\b', r'\bgimnasia\b', r'\bbox\b', r'\blucha\b',
+    r'\bolímpicos?\b', r'\bmundial\b(?!.*político)', r'\bcampeonato\b(?!.*político)',
+    r'\bequipo\b.*\b(gana|ganó|pierde|perdió|derrota|victoria|campeón)\b',
+    r'\bjugador\b', r'\bentrenador\b', r'\bestadio\b', r'\bpartido\b(?!.*político)',
+    r'\btorneo\b', r'\bliga\b', r'\btemporada\b(?!.*política)',
+    
+    # Sports - French
+    r'\bsport\b', r'\bfootball\b', r'\bbasket\b', r'\btennis\b',
+    r'\bgolf\b', r'\bhockey\b', r'\bvolley\b', r'\bnatation\b',
+    r'\bathlétisme\b', r'\bgymnastique\b', r'\bbox\b', r'\blutte\b',
+    r'\bolympiques?\b', r'\bmondial\b(?!.*politique)', r'\bchampionnat\b(?!.*politique)',
+    r'\béquipe\b.*\b(gagne|gagné|perd|perdu|défaite|victoire|champion)\b',
+    r'\bjoueur\b', r'\bentraîneur\b', r'\bstade\b', r'\bmatch\b(?!.*diplomatique)',
+    r'\btournoi\b', r'\bligue\b', r'\bsaison\b(?!.*politique)',
+    
+    # Sports - German
+    r'\bsport\b', r'\bfußball\b', r'\bbasketball\b', r'\btennis\b',
+    r'\bgolf\b', r'\bhockey\b', r'\bvolleyball\b', r'\bschwimmen\b',
+    r'\bleichtathletik\b', r'\bturnen\b', r'\bbox\b', r'\bringen\b',
+    r'\bolympische?\b', r'\bweltmeisterschaft\b(?!.*politisch)',
+    r'\bmannschaft\b.*\b(gewinnt|gewonnen|verliert|verloren|niederlage|sieg|meister)\b',
+    r'\bspieler\b', r'\btrainer\b', r'\bstadion\b', r'\bspiel\b(?!.*diplomatisch)',
+    r'\bturnier\b', r'\bliga\b', r'\bsaison\b(?!.*politisch)',
+    
+    # Entertainment and lifestyle
+    r'\bentertainment\b', r'\bcelebrity\b', r'\bmovie\b', r'\bmusic\b',
+    r'\bfashion\b', r'\bbeauty\b', r'\brecipe\b', r'\bcooking\b',
+    r'\bhealth\b(?!.*public)', r'\bfitness\b', r'\bdiet\b', r'\bweight loss\b',
+    r'\btechnology\b(?!.*security)', r'\bgaming\b', r'\bapp\b(?!.*government)',
+    
+    # Entertainment - Spanish
+    r'\bentretenimiento\b', r'\bcelebridad\b', r'\bpelícula\b', r'\bmúsica\b',
+    r'\bmoda\b', r'\bbelleza\b', r'\breceta\b', r'\bcocina\b',
+    r'\bsalud\b(?!.*pública)', r'\bejercicio\b', r'\bdieta\b',
+    
+    # Entertainment - French
+    r'\bdivertissement\b', r'\bcélébrité\b', r'\bfilm\b', r'\bmusique\b',
+    r'\bmode\b', r'\bbeauté\b', r'\brecette\b', r'\bcuisine\b',
+    r'\bsanté\b(?!.*publique)', r'\bexercice\b', r'\brégime\b',
+    
+    # Entertainment - German
+    r'\bunterhaltung\b', r'\bprominente\b', r'\bfilm\b', r'\bmusik\b',
+    r'\bmode\b', r'\bschönheit\b', r'\brezept\b', r'\bkochen\b',
+    r'\bgesundheit\b(?!.*öffentlich)', r'\bübung\b', r'\bdiät\b'
+]
+NON_RELEVANT_RE = re.compile('|'.join(f'(?:{pattern})' for pattern in NON_RELEVANT_PATTERNS),
+                             re.IGNORECASE)
+
+# Keyword sets for the simplified sentiment score
+SENTIMENT_MATCHER = KeywordMatcher({
+    'positive': ['peace', 'agreement', 'cooperation', 'stability', 'progress', 'success'],
+    'negative': ['war', 'conflict', 'crisis', 'threat', 'attack', 'violence', 'tension'],
+})
+
 class RSSFetcher:
     """RSS Fetcher with translation, risk analysis and content filtering."""
     
     def __init__(self, db_path: str):
         self.db_path = db_path
         self.translation_service = TranslationService()
+        # Sentence-level dedup + shared cache in front of the providers
+        self.batch_translator = BatchTranslator(self.translation_service.translate_or_none,
+                                                backend_name='libretranslate')
         # Initialize risk analyzer with our new BERT system
         self.risk_analyzer = bert_risk_analyzer
         self.content_classifier = ContentClassifier()
+        # Conditional GET validators (ETag / Last-Modified / seen GUIDs) per feed
+        self.feed_cache = FeedValidatorStore(db_path)
+        
+        # Near-duplicate clustering at ingestion time (reuses the MiniLM model of the BERT analyzer)
+        self.embedding_deduplicator = None
+        if EMBEDDING_DEDUP_AVAILABLE:
+            try:
+                embedder = ArticleEmbedder.from_bert_analyzer(self.risk_analyzer)
+                if embedder:
+                    self.embedding_deduplicator = get_embedding_deduplicator(db_path, embedder)
+            except Exception as e:
+                logger.error(f"Failed to initialize embedding deduplicator: {e}")
         
         # Initialize advanced NLP analyzer if available
         if ADVANCED_NLP_AVAILABLE:
@@ -100,21 +205,20 @@ class RSSFetcher:
                 'manifestation', 'soulèvement', 'crise', 'urgence', 'catastrophe'
             ]
         }
+        self.geopolitical_matchers = {
+            language: KeywordMatcher({'geopolitical': keywords})
+            for language, keywords in self.geopolitical_keywords.items()
+        }
     
     def get_db_connection(self):
         """Get database connection."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        return conn
+        return db_connect(self.db_path, row_factory=sqlite3.Row)
     
-    def fetch_all_sources(self, target_language: str = 'es') -> Dict[str, int]:
-        """Fetch articles from all active RSS sources."""
-        logger.info(f"Starting RSS fetch for all sources (target language: {target_language})")
-        
+    def get_active_sources(self) -> List[sqlite3.Row]:
+        """Get active RSS sources ordered by priority."""
         conn = self.get_db_connection()
         cursor = conn.cursor()
         
-        # Get active RSS sources
         cursor.execute('''
             SELECT id, name, url, language, region, priority
             FROM sources 
@@ -124,6 +228,72 @@ class RSSFetcher:
         
         sources = cursor.fetchall()
         conn.close()
+        return sources
+    
+    def fetch_all_sources(self, target_language: str = 'es',
+                          max_in_flight: int = 32, per_host_limit: int = 4,
+                          timeout: float = 20.0, max_workers: int = 4) -> Dict:
+        """Fetch all active RSS sources concurrently.
+        
+        Feeds are downloaded with a bounded async client (global and per-host
+        limits, per-source timeout) while parsing, filtering and saving run on a
+        worker pool. Returns the aggregate counters (sources, articles, errors)
+        plus per-source fetch/parse/process timings.
+        """
+        logger.info(f"Starting concurrent RSS fetch for all sources (target language: {target_language})")
+        started = time.perf_counter()
+        
+        sources = self.get_active_sources()
+        requests_to_fetch = []
+        for source in sources:
+            if self._requires_configuration(source['url']):
+                logger.info(f"Skipping API endpoint that requires configuration: {source['url']}")
+                continue
+            requests_to_fetch.append(FeedRequest(
+                source_id=source['id'],
+                url=source['url'],
+                name=source['name'],
+                headers=self.feed_cache.conditional_headers(source['url']),
+                context={'language': source['language'], 'region': source['region']}
+            ))
+        
+        def handle(response: FeedResponse) -> Dict:
+            request = response.request
+            if self.feed_cache.is_not_modified(request.url, response.status, response.body):
+                self.update_source_stats(request.source_id, 0, None)
+                return {'total_articles': 0, 'new_articles': 0, 'filtered_articles': 0,
+                        'not_modified': True, 'parse_time': 0.0, 'process_time': 0.0}
+            if not response.ok:
+                raise RuntimeError(response.error or f"HTTP {response.status}")
+            
+            parse_started = time.perf_counter()
+            feed = feedparser.parse(response.body)
+            parse_time = time.perf_counter() - parse_started
+            if feed.bozo:
+                logger.warning(f"RSS feed has issues: {request.url}")
+            
+            process_started = time.perf_counter()
+            new_entries = self.feed_cache.filter_new_entries(request.url, feed.entries)
+            source_result = self.process_feed_entries(
+                new_entries,
+                request.context['language'],
+                request.context['region'],
+                request.source_id,
+                target_language
+            )
+            source_result['parse_time'] = parse_time
+            source_result['process_time'] = time.perf_counter() - process_started
+            source_result['not_modified'] = False
+            
+            handled = source_result.pop('handled_entries')
+            self.feed_cache.update(request.url, response.headers, response.body, handled,
+                                   complete=len(handled) == len(new_entries))
+            self.update_source_stats(request.source_id, source_result['total_articles'], None)
+            return source_result
+        
+        fetcher = AsyncFeedFetcher(max_in_flight=max_in_flight, per_host_limit=per_host_limit,
+                                   timeout=timeout, max_workers=max_workers)
+        jobs = fetcher.run(requests_to_fetch, handle)
         
         results = {
             'total_sources': len(sources),
@@ -131,111 +301,185 @@ class RSSFetcher:
             'total_articles': 0,
             'new_articles': 0,
             'filtered_articles': 0,
-            'errors': 0
+            'errors': 0,
+            'not_modified_sources': 0,
+            'insert_time': 0.0,
+            'source_timings': []
         }
         
-        for source in sources:
-            try:
-                logger.info(f"Processing source: {source['name']}")
-                source_result = self.fetch_source(
-                    source['id'], 
-                    source['url'], 
-                    source['language'],
-                    source['region'],
-                    target_language
-                )
-                
+        for job in jobs:
+            request = job.response.request
+            error = job.error or job.response.error
+            timing = {
+                'source_id': request.source_id,
+                'name': request.name,
+                'status': job.response.status,
+                'fetch_time': round(job.response.fetch_time, 4),
+                'queue_time': round(job.response.queue_time, 4),
+                'parse_time': 0.0,
+                'process_time': 0.0,
+                'error': error
+            }
+            
+            if error:
+                results['errors'] += 1
+                self.update_source_stats(request.source_id, 0, error)
+            else:
+                source_result = job.result
                 results['processed_sources'] += 1
                 results['total_articles'] += source_result['total_articles']
                 results['new_articles'] += source_result['new_articles']
                 results['filtered_articles'] += source_result['filtered_articles']
-                
-                # Update source fetch statistics
-                self.update_source_stats(source['id'], source_result['total_articles'], None)
-                
-                # Small delay between sources to be respectful
-                time.sleep(1)
-                
+                results['not_modified_sources'] += int(source_result['not_modified'])
+                results['insert_time'] += source_result.get('insert_time', 0.0)
+                timing['rows_per_sec'] = source_result.get('rows_per_sec', 0.0)
+                timing['not_modified'] = source_result['not_modified']
+                timing['parse_time'] = round(source_result['parse_time'], 4)
+                timing['process_time'] = round(source_result['process_time'], 4)
+            
+            results['source_timings'].append(timing)
+        
+        # Backfill clusters for articles whose assignment failed or that arrived by other paths
+        if self.embedding_deduplicator:
+            try:
+                results['dedup_backfilled'] = self.embedding_deduplicator.assign_pending()
             except Exception as e:
-                logger.error(f"Error processing source {source['name']}: {e}")
-                results['errors'] += 1
-                self.update_source_stats(source['id'], 0, str(e))
+                logger.error(f"❌ Error backfilling dedup clusters: {e}")
         
-        logger.info(f"RSS fetch completed: {results}")
+        results['rows_per_sec'] = self._rows_per_sec(results['new_articles'], results['insert_time'])
+        results['elapsed_time'] = round(time.perf_counter() - started, 3)
+        summary = {k: v for k, v in results.items() if k != 'source_timings'}
+        logger.info(f"Concurrent RSS fetch completed: {summary}")
         return results
     
+    @staticmethod
+    def _rows_per_sec(rows: int, seconds: float) -> float:
+        """Write throughput, guarding against empty batches."""
+        return round(rows / seconds, 1) if seconds > 0 else 0.0
+    
+    @staticmethod
+    def _requires_configuration(url: str) -> bool:
+        """Check whether a source URL is an unconfigured API endpoint."""
+        return any(pattern in url for pattern in ['{keywords}', 'YOUR_KEY', 'access_key=YOUR_KEY'])
+    
     def fetch_source(self, source_id: int, url: str, source_language: str, 
                     region: str, target_language: str = 'es') -> Dict[str, int]:
         """Fetch articles from a single RSS source."""
         
         # Skip API endpoints that require configuration
-        if any(pattern in url for pattern in ['{keywords}', 'YOUR_KEY', 'access_key=YOUR_KEY']):
+        if self._requires_configuration(url):
             logger.info(f"Skipping API endpoint that requires configuration: {url}")
             return {'total_articles': 0, 'new_articles': 0, 'filtered_articles': 0}
         
         try:
-            # Fetch RSS feed
+            # Fetch RSS feed with a conditional request
             logger.info(f"Fetching RSS from: {url}")
-            feed = feedparser.parse(url)
+            response = requests.get(url, headers=self.feed_cache.conditional_headers(url), timeout=30)
             
-            if feed.bozo:
-                logger.warning(f"RSS feed has issues: {url}")
+            if self.feed_cache.is_not_modified(url, response.status_code, response.content):
+                logger.info(f"RSS feed not modified since last fetch: {url}")
+                return {'total_articles': 0, 'new_articles': 0, 'filtered_articles': 0}
+            response.raise_for_status()
             
-            result = {
-                'total_articles': len(feed.entries),
-                'new_articles': 0,
-                'filtered_articles': 0
-            }
+            feed = feedparser.parse(response.content)
             
-            for entry in feed.entries:
-                try:
-                    # Extract article data
-                    article_data = self.extract_article_data(entry, source_language, region)
-                    
-                    if not article_data:
-                        continue
-                    
-                    # Check if article already exists
-                    if self.article_exists(article_data['url']):
-                        continue
-                    
-                    # Filter geopolitical content
-                    if not self.is_geopolitical_content(article_data['title'], article_data['content'], source_language):
-                        result['filtered_articles'] += 1
-                        continue
-                    
-                    # Additional filter using content classifier to exclude sports/entertainment
-                    text_for_classification = f"{article_data['title']} {article_data['content']}"
-                    category = self.content_classifier.classify(text_for_classification)
-                    if category == 'sports_entertainment':
-                        result['filtered_articles'] += 1
-                        logger.info(f"Filtered sports/entertainment article: {article_data['title'][:50]}...")
-                        continue
-                    
-                    # Translate if needed
-                    if source_language != target_language:
-                        article_data = self.translate_article(article_data, source_language, target_language)
-                    
-                    # Analyze risk and extract metadata
-                    article_data = self.analyze_article(article_data)
-                    
-                    # Save to database
-                    article_id = self.save_article(article_data, source_id)
-                    
-                    if article_id:
-                        result['new_articles'] += 1
-                        logger.info(f"Saved article: {article_data['title'][:50]}...")
-                    
-                except Exception as e:
-                    logger.error(f"Error processing article: {e}")
-                    continue
+            if feed.bozo:
+                logger.warning(f"RSS feed has issues: {url}")
             
+            new_entries = self.feed_cache.filter_new_entries(url, feed.entries)
+            result = self.process_feed_entries(new_entries, source_language, region, source_id, target_language)
+            handled = result.pop('handled_entries')
+            self.feed_cache.update(url, dict(response.headers), response.content, handled,
+                                   complete=len(handled) == len(new_entries))
             return result
             
         except Exception as e:
             logger.error(f"Error fetching RSS source {url}: {e}")
             raise
     
+    def process_feed_entries(self, entries: List, source_language: str, region: str,
+                             source_id: int, target_language: str = 'es') -> Dict:
+        """Filter, translate, analyze and save the entries of a parsed feed.
+        
+        Candidate URLs are resolved against ``articles`` in one query and the
+        surviving articles are written in a single transaction.
+        
+        ``handled_entries`` in the result lists the entries that are done with
+        (saved, filtered out, already stored or unparseable); entries whose
+        analysis or save failed are left out so the feed cache retries them.
+        """
+        result = {
+            'total_articles': len(entries),
+            'new_articles': 0,
+            'filtered_articles': 0,
+            'insert_time': 0.0,
+            'rows_per_sec': 0.0
+        }
+        
+        candidates = []
+        entries_by_url: Dict[str, List] = {}
+        handled = []
+        for entry in entries:
+            article_data = self.extract_article_data(entry, source_language, region)
+            if not article_data:
+                handled.append(entry)
+                continue
+            if article_data['url'] not in entries_by_url:
+                entries_by_url[article_data['url']] = []
+                candidates.append(article_data)
+            entries_by_url[article_data['url']].append(entry)
+        
+        # Check which articles already exist with a single query
+        existing = self.existing_urls([a['url'] for a in candidates])
+        
+        done_urls = set(existing)
+        accepted = []
+        for article_data in candidates:
+            if article_data['url'] in existing:
+                continue
+            try:
+                # Filter geopolitical content
+                if not self.is_geopolitical_content(article_data['title'], article_data['content'], source_language):
+                    result['filtered_articles'] += 1
+                    done_urls.add(article_data['url'])
+                    continue
+                
+                # Additional filter using content classifier to exclude sports/entertainment
+                text_for_classification = f"{article_data['title']} {article_data['content']}"
+                category = self.content_classifier.classify(text_for_classification)
+                if category == 'sports_entertainment':
+                    result['filtered_articles'] += 1
+                    done_urls.add(article_data['url'])
+                    logger.info(f"Filtered sports/entertainment article: {article_data['title'][:50]}...")
+                    continue
+                
+                accepted.append(article_data)
+                
+            except Exception as e:
+                logger.error(f"Error processing article: {e}")
+                continue
+        
+        # Translate the whole feed in one batch (texts in another language than
+        # the feed declares are detected and translated in the same pass)
+        if accepted:
+            accepted = self.translate_articles(accepted, source_language, target_language)
+        
+        # Extract metadata and run the BERT risk model once over the whole feed
+        pending = self.analyze_articles(accepted) if accepted else []
+        
+        if pending:
+            batch = self.save_articles_batch(pending, source_id)
+            result['new_articles'] = batch['inserted']
+            result['insert_time'] = batch['insert_time']
+            result['rows_per_sec'] = batch['rows_per_sec']
+            done_urls.update(batch['stored_urls'])
+        
+        for url, url_entries in entries_by_url.items():
+            if url in done_urls:
+                handled.extend(url_entries)
+        result['handled_entries'] = handled
+        return result
+    
     def extract_article_data(self, entry, source_language: str, region: str) -> Optional[Dict]:
         """Extract article data from RSS entry."""
         try:
@@ -335,150 +579,114 @@ class RSSFetcher:
         """Check if content is geopolitically relevant."""
         text = f"{title} {content}".lower()
         
-        # Get keywords for the language
-        keywords = self.geopolitical_keywords.get(language, self.geopolitical_keywords['en'])
+        # Get the compiled keyword matcher for the language
+        matcher = self.geopolitical_matchers.get(language, self.geopolitical_matchers['en'])
         
-        # Check for keyword matches
-        matches = sum(1 for keyword in keywords if keyword.lower() in text)
+        # Check for keyword matches (whole words, one pass over the text)
+        matches = matcher.scan(text).counts['geopolitical']
         
         # Require at least 2 keyword matches for relevance
         is_relevant = matches >= 2
         
         # Additional checks for obvious non-geopolitical content
         # Enhanced sports filtering with multilingual support
-        non_relevant_patterns = [
-            # Cricket specific patterns (high priority)
-            r'\bcricket\b', r'\bcríquet\b', r'\bpcb\b', r'\bbcci\b', r'\bicc\b',
-            r'\bcricket board\b', r'\bcricket council\b', r'\bcricket asia\b',
-            
-            # Sports - English
-            r'\bsports?\b', r'\bfootball\b', r'\bbasketball\b', r'\bsoccer\b',
-            r'\bbaseball\b', r'\btennis\b', r'\bgolf\b', r'\bhockey\b',
-            r'\bvolleyball\b', r'\bswimming\b', r'\bathletics\b', r'\bgymnastics\b',
-            r'\boxing\b', r'\bwrestling\b', r'\bmma\b', r'\bufc\b',
-            r'\bolympics?\b', r'\bworld cup\b', r'\bchampionship\b(?!.*political)',
-            r'\bteam\b.*\b(wins?|lost?|defeats?|victory|champion)\b',
-            r'\bplayer\b', r'\bcoach\b', r'\bstadium\b', r'\bmatch\b(?!.*diplomatic)',
-            r'\btournament\b', r'\bleague\b', r'\bseason\b(?!.*political)',
-            
-            # Major sports organizations
-            r'\bfifa\b', r'\buefa\b', r'\bnba\b', r'\bnfl\b', r'\bmlb\b', r'\bnhl\b',
-            
-            # Sports - Spanish
-            r'\bdeporte\b', r'\bfútbol\b', r'\bbaloncesto\b', r'\btenis\b',
-            r'\bgolf\b', r'\bjockey\b', r'\bvoleibol\b', r'\bnatación\b',
-            r'\batletismo\b', r'\bgimnasia\b', r'\bbox\b', r'\blucha\b',
-            r'\bolímpicos?\b', r'\bmundial\b(?!.*político)', r'\bcampeonato\b(?!.*político)',
-            r'\bequipo\b.*\b(gana|ganó|pierde|perdió|derrota|victoria|campeón)\b',
-            r'\bjugador\b', r'\bentrenador\b', r'\bestadio\b', r'\bpartido\b(?!.*político)',
-            r'\btorneo\b', r'\bliga\b', r'\btemporada\b(?!.*política)',
-            
-            # Sports - French
-            r'\bsport\b', r'\bfootball\b', r'\bbasket\b', r'\btennis\b',
-            r'\bgolf\b', r'\bhockey\b', r'\bvolley\b', r'\bnatation\b',
-            r'\bathlétisme\b', r'\bgymnastique\b', r'\bbox\b', r'\blutte\b',
-            r'\bolympiques?\b', r'\bmondial\b(?!.*politique)', r'\bchampionnat\b(?!.*politique)',
-            r'\béquipe\b.*\b(gagne|gagné|perd|perdu|défaite|victoire|champion)\b',
-            r'\bjoueur\b', r'\bentraîneur\b', r'\bstade\b', r'\bmatch\b(?!.*diplomatique)',
-            r'\btournoi\b', r'\bligue\b', r'\bsaison\b(?!.*politique)',
-            
-            # Sports - German
-            r'\bsport\b', r'\bfußball\b', r'\bbasketball\b', r'\btennis\b',
-            r'\bgolf\b', r'\bhockey\b', r'\bvolleyball\b', r'\bschwimmen\b',
-            r'\bleichtathletik\b', r'\bturnen\b', r'\bbox\b', r'\bringen\b',
-            r'\bolympische?\b', r'\bweltmeisterschaft\b(?!.*politisch)',
-            r'\bmannschaft\b.*\b(gewinnt|gewonnen|verliert|verloren|niederlage|sieg|meister)\b',
-            r'\bspieler\b', r'\btrainer\b', r'\bstadion\b', r'\bspiel\b(?!.*diplomatisch)',
-            r'\bturnier\b', r'\bliga\b', r'\bsaison\b(?!.*politisch)',
-            
-            # Entertainment and lifestyle
-            r'\bentertainment\b', r'\bcelebrity\b', r'\bmovie\b', r'\bmusic\b',
-            r'\bfashion\b', r'\bbeauty\b', r'\brecipe\b', r'\bcooking\b',
-            r'\bhealth\b(?!.*public)', r'\bfitness\b', r'\bdiet\b', r'\bweight loss\b',
-            r'\btechnology\b(?!.*security)', r'\bgaming\b', r'\bapp\b(?!.*government)',
-            
-            # Entertainment - Spanish
-            r'\bentretenimiento\b', r'\bcelebridad\b', r'\bpelícula\b', r'\bmúsica\b',
-            r'\bmoda\b', r'\bbelleza\b', r'\breceta\b', r'\bcocina\b',
-            r'\bsalud\b(?!.*pública)', r'\bejercicio\b', r'\bdieta\b',
-            
-            # Entertainment - French
-            r'\bdivertissement\b', r'\bcélébrité\b', r'\bfilm\b', r'\bmusique\b',
-            r'\bmode\b', r'\bbeauté\b', r'\brecette\b', r'\bcuisine\b',
-            r'\bsanté\b(?!.*publique)', r'\bexercice\b', r'\brégime\b',
-            
-            # Entertainment - German
-            r'\bunterhaltung\b', r'\bprominente\b', r'\bfilm\b', r'\bmusik\b',
-            r'\bmode\b', r'\bschönheit\b', r'\brezept\b', r'\bkochen\b',
-            r'\bgesundheit\b(?!.*öffentlich)', r'\bübung\b', r'\bdiät\b'
-        ]
-        
-        for pattern in non_relevant_patterns:
-            if re.search(pattern, text, re.IGNORECASE):
-                is_relevant = False
-                break
+        if is_relevant and NON_RELEVANT_RE.search(text):
+            is_relevant = False
         
         return is_relevant
     
     def translate_article(self, article_data: Dict, source_lang: str, target_lang: str) -> Dict:
         """Translate article to target language."""
+        return self.translate_articles([article_data], source_lang, target_lang)[0]
+    
+    def translate_articles(self, articles: List[Dict], source_lang: str, target_lang: str) -> List[Dict]:
+        """Translate titles and contents of a batch of articles in a single batched pass.
+        
+        The language of each text is detected when the ingestion translation
+        service is available, so articles a feed mislabels are translated too;
+        otherwise the feed language is used with the local BatchTranslator.
+        """
         try:
-            # Translate title
-            article_data['title'] = self.translation_service.translate(
-                article_data['title'], source_lang, target_lang
-            )
-            
-            # Translate content (limit to first 1000 chars for efficiency)
-            content_to_translate = article_data['content'][:1000]
-            article_data['content'] = self.translation_service.translate(
-                content_to_translate, source_lang, target_lang
-            )
-            
-            # Update language
-            article_data['language'] = target_lang
-            
-            return article_data
+            # Content is limited to the first 1000 chars for efficiency
+            texts = [article_data['title'] or '' for article_data in articles]
+            texts += [(article_data['content'] or '')[:1000] for article_data in articles]
+            translated = self._translate_texts(texts, source_lang, target_lang)
+            
+            for position, article_data in enumerate(articles):
+                title, content = translated[position], translated[len(articles) + position]
+                if title != texts[position]:
+                    article_data['title'] = title
+                if content != texts[len(articles) + position]:
+                    article_data['content'] = content
+                # Update language
+                article_data['language'] = target_lang
+            
+            return articles
             
         except Exception as e:
-            logger.error(f"Error translating article: {e}")
-            return article_data
+            logger.error(f"Error translating articles: {e}")
+            return articles
+    
+    def _translate_texts(self, texts: List[str], source_lang: str, target_lang: str) -> List[str]:
+        """One BatchTranslator pass over ``texts``, detecting languages when possible."""
+        try:
+            from translation_service import get_translation_service
+        except ImportError:
+            if source_lang == target_lang:
+                return texts
+            return self.batch_translator.translate_batch(texts, source_lang, target_lang)
+        
+        results = get_translation_service().translate_texts(texts, target_lang)
+        return [translated for translated, _ in results]
     
     def analyze_article(self, article_data: Dict) -> Dict:
         """Analyze article for risk level and extract metadata."""
+        return self.analyze_articles([article_data])[0]
+    
+    def analyze_articles(self, articles: List[Dict]) -> List[Dict]:
+        """Analyze a batch of articles for risk level and extract metadata.
+        
+        Metadata is extracted per article; the BERT risk model runs once over
+        the whole batch. The full BERT result is kept in ``risk_analysis`` so
+        the save step reuses it instead of analyzing the article again.
+        """
+        for article_data in articles:
+            try:
+                text = f"{article_data['title']} {article_data['content']}"
+                
+                # Extract country/region
+                country = self.extract_country(text)
+                if country:
+                    article_data['country'] = country
+                
+                # Classify content category
+                article_data['category'] = self.content_classifier.classify(text)
+                
+                # Extract keywords
+                article_data['keywords'] = self.extract_keywords(text)
+                
+                # Analyze sentiment
+                article_data['sentiment'] = self.analyze_sentiment(text)
+                
+            except Exception as e:
+                logger.error(f"Error analyzing article: {e}")
+        
         try:
-            text = f"{article_data['title']} {article_data['content']}"
-            
             # Analyze risk level using title and content separately
-            risk_analysis = self.risk_analyzer.analyze_risk(
-                title=article_data['title'],
-                content=article_data['content'],
-                country=article_data.get('country')
-            )
+            risk_results = self.risk_analyzer.analyze_batch([
+                {'title': a['title'] or '', 'content': a['content'] or '', 'country': a.get('country')}
+                for a in articles
+            ])
+        except Exception as e:
+            logger.error(f"Error analyzing article risk: {e}")
+            return articles
+        
+        for article_data, risk_analysis in zip(articles, risk_results):
+            article_data['risk_analysis'] = risk_analysis
             article_data['risk_level'] = risk_analysis['level']
             article_data['risk_score'] = risk_analysis['score']
-            
-            # Extract country/region
-            country = self.extract_country(text)
-            if country:
-                article_data['country'] = country
-            
-            # Classify content category
-            category = self.content_classifier.classify(text)
-            article_data['category'] = category
-            
-            # Extract keywords
-            keywords = self.extract_keywords(text)
-            article_data['keywords'] = keywords
-            
-            # Analyze sentiment
-            sentiment = self.analyze_sentiment(text)
-            article_data['sentiment'] = sentiment
-            
-            return article_data
-            
-        except Exception as e:
-            logger.error(f"Error analyzing article: {e}")
-            return article_data
+        
+        return articles
     
     def extract_country(self, text: str) -> Optional[str]:
         """Extract country/region from text."""
@@ -518,7 +726,7 @@ class RSSFetcher:
     def extract_keywords(self, text: str) -> List[str]:
         """Extract relevant keywords from text."""
         # Simple keyword extraction (can be enhanced with NLP)
-        words = re.findall(r'\b\w{4,}\b', text.lower())
+        words = set(re.findall(r'\b\w{4,}\b', text.lower()))
         
         # Filter common words and get geopolitical terms
         relevant_keywords = []
@@ -532,12 +740,9 @@ class RSSFetcher:
     def analyze_sentiment(self, text: str) -> float:
         """Analyze sentiment of text (simplified)."""
         # Simple sentiment analysis based on keywords
-        positive_words = ['peace', 'agreement', 'cooperation', 'stability', 'progress', 'success']
-        negative_words = ['war', 'conflict', 'crisis', 'threat', 'attack', 'violence', 'tension']
-        
-        text_lower = text.lower()
-        positive_count = sum(1 for word in positive_words if word in text_lower)
-        negative_count = sum(1 for word in negative_words if word in text_lower)
+        scan = SENTIMENT_MATCHER.scan(text)
+        positive_count = scan.counts['positive']
+        negative_count = scan.counts['negative']
         
         if positive_count + negative_count == 0:
             return 0.0
@@ -546,210 +751,255 @@ class RSSFetcher:
     
     def article_exists(self, url: str) -> bool:
         """Check if article already exists in database."""
-        conn = self.get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute('SELECT id FROM articles WHERE url = ?', (url,))
-        exists = cursor.fetchone() is not None
+        return url in self.existing_urls([url])
+    
+    def existing_urls(self, urls: List[str]) -> set:
+        """Return the subset of ``urls`` already stored in ``articles``."""
+        if not urls:
+            return set()
         
+        conn = self.get_db_connection()
+        found = set(self._ids_for_urls(conn.cursor(), urls))
         conn.close()
-        return exists
+        return found
+    
+    @staticmethod
+    def _ids_for_urls(cursor, urls: List[str]) -> Dict[str, int]:
+        """Map stored article URLs to their ids."""
+        ids_by_url = {}
+        # Stay below SQLite's bound-parameter limit
+        for start in range(0, len(urls), 900):
+            chunk = urls[start:start + 900]
+            placeholders = ','.join('?' * len(chunk))
+            cursor.execute(f'SELECT id, url FROM articles WHERE url IN ({placeholders})', chunk)
+            ids_by_url.update((row[1], row[0]) for row in cursor.fetchall())
+        return ids_by_url
     
     def save_article(self, article_data: Dict, source_id: int) -> Optional[int]:
         """Save article to database with MANDATORY advanced NLP analysis."""
+        batch = self.save_articles_batch([article_data], source_id)
+        return batch['ids'][0] if batch['ids'] else None
+    
+    def run_mandatory_nlp(self, article_data: Dict, bert_results: Optional[Dict] = None) -> Dict:
+        """Run advanced NLP and BERT risk analysis for an article about to be saved.
+        
+        ``bert_results`` may carry a precomputed (batched) BERT risk analysis.
+        """
+        # Prepare article data for comprehensive analysis
+        article_for_nlp = {
+            'title': article_data['title'] or '',
+            'content': article_data['content'] or '',
+            'description': ''
+        }
+        
+        # Initialize default values
+        analysis = {
+            'advanced_nlp': None,
+            'entities': {},
+            'sentiment': {'score': 0.0, 'label': 'neutral'},
+            'bert': None
+        }
+        
+        # Perform advanced NLP analysis if available
+        if not self.advanced_nlp_analyzer:
+            logger.warning(f"⚠️  Advanced NLP analyzer not available, using basic analysis")
+            return analysis
+        
         try:
-            conn = self.get_db_connection()
-            cursor = conn.cursor()
-            
-            # ========================================
-            # TRADUCCIÓN AUTOMÁTICA DURANTE INGESTA RSS
-            # ========================================
-            original_title = article_data['title']
-            original_content = article_data['content']
+            logger.info(f"🔬 Running comprehensive NLP analysis...")
+            nlp_results = self.advanced_nlp_analyzer.analyze_article_comprehensive(article_for_nlp)
+            
+            # Perform BERT risk analysis
+            if bert_results is None:
+                bert_results = self.risk_analyzer.analyze_risk(
+                    title=article_data['title'] or '',
+                    content=article_data['content'] or '',
+                    country=article_data.get('country')
+                )
             
-            try:
-                # Importar servicio de traducción
-                from translation_service import TranslationService, get_database_connection
-                
-                # Crear servicio de traducción
-                trans_db_conn = get_database_connection()
-                if trans_db_conn:
-                    translator = TranslationService(trans_db_conn)
-                    
-                    import asyncio
-                    
-                    # Traducir título si no está en español
-                    if article_data['title']:
-                        translated_title, detected_lang_title = asyncio.run(
-                            translator.translate_text(article_data['title'], 'es')
-                        )
-                        if translated_title != article_data['title']:
-                            logger.info(f"🔄 RSS Título traducido de {detected_lang_title} → es")
-                            article_data['title'] = translated_title
-                    
-                    # Traducir contenido si no está en español
-                    if article_data['content']:
-                        translated_content, detected_lang_content = asyncio.run(
-                            translator.translate_text(article_data['content'], 'es')
-                        )
-                        if translated_content != article_data['content']:
-                            logger.info(f"🔄 RSS Contenido traducido de {detected_lang_content} → es")
-                            article_data['content'] = translated_content
-                    
-                    # Cerrar conexión de traducción
-                    trans_db_conn.close()
-                    
-            except ImportError:
-                logger.warning("⚠️ Servicio de traducción no disponible durante ingesta RSS")
-            except Exception as e:
-                logger.error(f"❌ Error en traducción durante ingesta RSS: {e}")
-                # Continuar con el texto original si la traducción falla
-                article_data['title'] = original_title
-                article_data['content'] = original_content
-            
-            # Insert article (ya traducido si fue necesario)
-            cursor.execute('''
-                INSERT INTO articles (
-                    title, content, url, source, language, country, region,
-                    risk_level, risk_score, image_url, created_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                article_data['title'],
-                article_data['content'],
-                article_data['url'],
-                article_data.get('source', 'RSS Feed'),
-                article_data['language'],
-                article_data.get('country'),
-                article_data['region'],
-                article_data.get('risk_level', 'low'),
-                article_data.get('risk_score', 0.0),
-                article_data.get('image_url'),
-                article_data['published'].isoformat()
-            ))
+            # Combine all analysis results
+            analysis['advanced_nlp'] = {
+                'nlp_entities': nlp_results['entities'],
+                'sentiment_analysis': nlp_results['sentiment'],
+                'title_sentiment': nlp_results['title_sentiment'],
+                'nlp_risk_score': nlp_results['risk_score'],
+                'bert_risk_level': bert_results['level'],
+                'bert_risk_score': bert_results['score'],
+                'bert_confidence': bert_results['confidence'],
+                'bert_reasoning': bert_results['reasoning'],
+                'key_factors': bert_results.get('key_factors', []),
+                'geographic_impact': bert_results.get('geographic_impact', 'Unknown'),
+                'escalation_potential': bert_results.get('potential_escalation', 'Unknown'),
+                'key_persons': nlp_results['key_persons'],
+                'key_locations': nlp_results['key_locations'],
+                'conflict_indicators': nlp_results['conflict_indicators'],
+                'total_entities': nlp_results['total_entities'],
+                'ai_powered': bert_results['ai_powered'],
+                'model_used': bert_results['model_used'],
+                'analysis_timestamp': nlp_results['analysis_timestamp']
+            }
+            analysis['bert'] = bert_results
+            analysis['entities'] = nlp_results['entities']
+            analysis['sentiment'] = nlp_results['sentiment']
             
-            article_id = cursor.lastrowid
+            logger.info(f"✅ Advanced NLP analysis completed:")
+            logger.info(f"   - BERT Risk: {bert_results['level']} ({bert_results['score']:.3f})")
+            logger.info(f"   - Sentiment: {analysis['sentiment']['label']} ({analysis['sentiment']['score']:.3f})")
+            logger.info(f"   - Entities: {nlp_results['total_entities']}")
+            logger.info(f"   - Key persons: {', '.join(nlp_results['key_persons'][:3])}")
+            logger.info(f"   - Key locations: {', '.join(nlp_results['key_locations'][:3])}")
             
+        except Exception as e:
+            logger.error(f"❌ Advanced NLP analysis failed for {article_data['url']}: {e}")
+            # Continue with basic analysis
+        
+        return analysis
+    
+    def save_articles_batch(self, articles: List[Dict], source_id: int) -> Dict:
+        """Save a batch of articles with MANDATORY advanced NLP analysis in one transaction.
+        
+        Returns inserted ids, the URLs stored once the transaction committed,
+        the insert time and the write throughput in rows/sec.
+        """
+        batch = {'inserted': 0, 'ids': [], 'stored_urls': set(), 'insert_time': 0.0, 'rows_per_sec': 0.0}
+        if not articles:
+            return batch
+        
+        try:
             # ===== MANDATORY ADVANCED NLP ANALYSIS =====
-            logger.info(f"🧠 Performing MANDATORY advanced NLP analysis for article {article_id}")
-            
-            # Prepare article data for comprehensive analysis
-            article_for_nlp = {
-                'title': article_data['title'] or '',
-                'content': article_data['content'] or '',
-                'description': ''
-            }
+            # Models run before the write transaction so the DB lock is held briefly
+            logger.info(f"🧠 Performing MANDATORY advanced NLP analysis for {len(articles)} articles")
+            # BERT risk already computed by analyze_articles is reused as is
+            bert_batch = [article_data.get('risk_analysis') for article_data in articles]
+            missing = [i for i, bert_results in enumerate(bert_batch) if bert_results is None]
+            if self.advanced_nlp_analyzer and missing:
+                try:
+                    computed = self.risk_analyzer.analyze_batch([
+                        {'title': articles[i]['title'] or '', 'content': articles[i]['content'] or '',
+                         'country': articles[i].get('country')}
+                        for i in missing
+                    ])
+                    for i, bert_results in zip(missing, computed):
+                        bert_batch[i] = bert_results
+                except Exception as e:
+                    logger.error(f"❌ Batched BERT analysis failed, falling back to per-article: {e}")
+            analyses = [
+                self.run_mandatory_nlp(article_data, bert_results)
+                for article_data, bert_results in zip(articles, bert_batch)
+            ]
             
-            # Initialize default values
-            advanced_nlp_data = None
-            nlp_entities = {}
-            nlp_sentiment = {'score': 0.0, 'label': 'neutral'}
-            bert_results = {'level': 'low', 'score': 0.0, 'confidence': 0.0, 'reasoning': 'Basic analysis'}
+            article_rows = []
+            for article_data, analysis in zip(articles, analyses):
+                bert_results = analysis['bert'] or {}
+                article_rows.append((
+                    article_data['title'],
+                    article_data['content'],
+                    article_data['url'],
+                    article_data.get('source', 'RSS Feed'),
+                    article_data['language'],
+                    article_data.get('country'),
+                    article_data['region'],
+                    bert_results.get('level', article_data.get('risk_level', 'low')),
+                    bert_results.get('score', article_data.get('risk_score', 0.0)),
+                    article_data.get('image_url'),
+                    article_data['published'].isoformat()
+                ))
+            
+            started = time.perf_counter()
+            conn = self.get_db_connection()
+            cursor = conn.cursor()
             
-            # Perform advanced NLP analysis if available
-            if self.advanced_nlp_analyzer:
+            try:
+                urls = [article_data['url'] for article_data in articles]
+                already_stored = self._ids_for_urls(cursor, urls)
+                
+                # Insert articles (ya traducidos si fue necesario)
+                cursor.executemany('''
+                    INSERT OR IGNORE INTO articles (
+                        title, content, url, source, language, country, region,
+                        risk_level, risk_score, image_url, created_at
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', article_rows)
+                
+                ids_by_url = self._ids_for_urls(cursor, urls)
+                
+                processed_rows = []
+                for article_data, analysis in zip(articles, analyses):
+                    article_id = ids_by_url.get(article_data['url'])
+                    if article_id is None or article_data['url'] in already_stored:
+                        continue
+                    nlp_entities = analysis['entities']
+                    processed_rows.append((
+                        article_id,
+                        article_data['content'][:300] + '...' if len(article_data['content']) > 300 else article_data['content'],
+                        article_data.get('category', 'geopolitical_analysis'),
+                        json.dumps(article_data.get('keywords', []) + nlp_entities.get('persons', [])[:3] + nlp_entities.get('locations', [])[:3]),
+                        analysis['sentiment']['score'],
+                        json.dumps(nlp_entities),
+                        json.dumps(analysis['advanced_nlp']) if analysis['advanced_nlp'] else None
+                    ))
+                    batch['ids'].append(article_id)
+                
+                # Insert processed data with advanced NLP results
+                cursor.executemany('''
+                    INSERT INTO processed_data (
+                        article_id, summary, category, keywords, sentiment, entities, advanced_nlp
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?)
+                ''', processed_rows)
+                
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                batch['ids'] = []
+                raise
+            finally:
+                conn.close()
+            
+            batch['stored_urls'] = set(ids_by_url)
+            batch['inserted'] = len(batch['ids'])
+            batch['insert_time'] = time.perf_counter() - started
+            batch['rows_per_sec'] = self._rows_per_sec(batch['inserted'], batch['insert_time'])
+            
+            if self.embedding_deduplicator and batch['ids']:
+                ids = set(batch['ids'])
                 try:
-                    logger.info(f"🔬 Running comprehensive NLP analysis...")
-                    nlp_results = self.advanced_nlp_analyzer.analyze_article_comprehensive(article_for_nlp)
-                    
-                    # Perform BERT risk analysis
-                    bert_results = self.risk_analyzer.analyze_risk(
-                        title=article_data['title'] or '',
-                        content=article_data['content'] or '',
-                        country=article_data.get('country')
-                    )
-                    
-                    # Update article with BERT risk analysis
-                    cursor.execute('''
-                        UPDATE articles 
-                        SET risk_level = ?, risk_score = ?
-                        WHERE id = ?
-                    ''', (bert_results['level'], bert_results['score'], article_id))
-                    
-                    # Combine all analysis results
-                    advanced_nlp_data = {
-                        'nlp_entities': nlp_results['entities'],
-                        'sentiment_analysis': nlp_results['sentiment'],
-                        'title_sentiment': nlp_results['title_sentiment'],
-                        'nlp_risk_score': nlp_results['risk_score'],
-                        'bert_risk_level': bert_results['level'],
-                        'bert_risk_score': bert_results['score'],
-                        'bert_confidence': bert_results['confidence'],
-                        'bert_reasoning': bert_results['reasoning'],
-                        'key_factors': bert_results.get('key_factors', []),
-                        'geographic_impact': bert_results.get('geographic_impact', 'Unknown'),
-                        'escalation_potential': bert_results.get('potential_escalation', 'Unknown'),
-                        'key_persons': nlp_results['key_persons'],
-                        'key_locations': nlp_results['key_locations'],
-                        'conflict_indicators': nlp_results['conflict_indicators'],
-                        'total_entities': nlp_results['total_entities'],
-                        'ai_powered': bert_results['ai_powered'],
-                        'model_used': bert_results['model_used'],
-                        'analysis_timestamp': nlp_results['analysis_timestamp']
-                    }
-                    
-                    nlp_entities = nlp_results['entities']
-                    nlp_sentiment = nlp_results['sentiment']
-                    
-                    logger.info(f"✅ Advanced NLP analysis completed:")
-                    logger.info(f"   - BERT Risk: {bert_results['level']} ({bert_results['score']:.3f})")
-                    logger.info(f"   - Sentiment: {nlp_sentiment['label']} ({nlp_sentiment['score']:.3f})")
-                    logger.info(f"   - Entities: {nlp_results['total_entities']}")
-                    logger.info(f"   - Key persons: {', '.join(nlp_results['key_persons'][:3])}")
-                    logger.info(f"   - Key locations: {', '.join(nlp_results['key_locations'][:3])}")
-                    
+                    self.embedding_deduplicator.assign_articles([
+                        {'id': ids_by_url[a['url']], 'title': a['title'], 'content': a['content'],
+                         'published': a['published']}
+                        for a in articles if ids_by_url.get(a['url']) in ids
+                    ])
                 except Exception as e:
-                    logger.error(f"❌ Advanced NLP analysis failed for article {article_id}: {e}")
-                    # Continue with basic analysis
-                    pass
-            else:
-                logger.warning(f"⚠️  Advanced NLP analyzer not available, using basic analysis")
-            
-            # Insert processed data with advanced NLP results
-            cursor.execute('''
-                INSERT INTO processed_data (
-                    article_id, summary, category, keywords, sentiment, entities, advanced_nlp
-                ) VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                article_id,
-                article_data['content'][:300] + '...' if len(article_data['content']) > 300 else article_data['content'],
-                article_data.get('category', 'geopolitical_analysis'),
-                json.dumps(article_data.get('keywords', []) + nlp_entities.get('persons', [])[:3] + nlp_entities.get('locations', [])[:3]),
-                nlp_sentiment['score'],
-                json.dumps(nlp_entities),
-                json.dumps(advanced_nlp_data) if advanced_nlp_data else None
-            ))
-            
-            conn.commit()
-            conn.close()
+                    logger.error(f"❌ Error assigning dedup clusters: {e}")
             
-            logger.info(f"💾 Article {article_id} saved with complete NLP analysis")
-            return article_id
+            logger.info(f"💾 {batch['inserted']} articles saved with complete NLP analysis "
+                        f"({batch['rows_per_sec']} rows/sec)")
+            return batch
             
         except Exception as e:
-            logger.error(f"❌ Error saving article with NLP analysis: {e}")
-            return None
+            logger.error(f"❌ Error saving articles with NLP analysis: {e}")
+            return batch
     
     def update_source_stats(self, source_id: int, fetch_count: int, error: Optional[str]):
-        """Update source fetch statistics."""
+        """Queue a source fetch statistics update on the serialized writer."""
         try:
-            conn = self.get_db_connection()
-            cursor = conn.cursor()
-            
             if error:
-                cursor.execute('''
+                future = get_pool(self.db_path).submit_write('''
                     UPDATE sources 
                     SET last_fetched = ?, error_count = error_count + 1, last_error = ?
                     WHERE id = ?
                 ''', (datetime.now().isoformat(), error, source_id))
             else:
-                cursor.execute('''
+                future = get_pool(self.db_path).submit_write('''
                     UPDATE sources 
                     SET last_fetched = ?, fetch_count = fetch_count + ?, last_error = NULL
                     WHERE id = ?
                 ''', (datetime.now().isoformat(), fetch_count, source_id))
             
-            conn.commit()
-            conn.close()
+            def log_failure(done):
+                if done.exception():
+                    logger.error(f"Error updating source stats: {done.exception()}")
+            
+            future.add_done_callback(log_failure)
             
         except Exception as e:
             logger.error(f"Error updating source stats: {e}")
@@ -5,13 +5,13 @@ World Bank API docs: https://data.worldbank.org/developers
 """
 
 import requests
-import sqlite3
 from datetime import datetime
 from typing import List, Dict, Any
 import time
 import itertools
 
 from utils.config import config, logger
+from utils.db_pool import connect as db_connect
 
 INDICATORS = {
     "NY.GDP.MKTP.CD": "gdp_current_usd",
@@ -47,27 +47,25 @@ def fetch_all_countries() -> List[str]:
 def store_indicator_rows(rows: List[Dict[str, Any]], indicator_code: str):
     if not rows:
         return
-    conn = sqlite3.connect(config.database.path)
-    cur = conn.cursor()
-    cur.execute(
-        """
-        CREATE TABLE IF NOT EXISTS country_indicators (
-            country_iso TEXT,
-            year INTEGER,
-            indicator TEXT,
-            value REAL,
-            PRIMARY KEY(country_iso, year, indicator)
-        )
-        """
-    )
-    for r in rows:
+    with db_connect(config.database.path) as conn:
+        cur = conn.cursor()
         cur.execute(
-            """INSERT OR REPLACE INTO country_indicators (country_iso, year, indicator, value)
-            VALUES (?,?,?,?)""",
-            (r["countryiso3code"], int(r["date"]), indicator_code, float(r["value"]))
+            """
+            CREATE TABLE IF NOT EXISTS country_indicators (
+                country_iso TEXT,
+                year INTEGER,
+                indicator TEXT,
+                value REAL,
+                PRIMARY KEY(country_iso, year, indicator)
+            )
+            """
         )
-    conn.commit()
-    conn.close()
+        for r in rows:
+            cur.execute(
+                """INSERT OR REPLACE INTO country_indicators (country_iso, year, indicator, value)
+                VALUES (?,?,?,?)""",
+                (r["countryiso3code"], int(r["date"]), indicator_code, float(r["value"]))
+            )
 
 
 def ingest_world_bank():
@@ -4,7 +4,6 @@ Ensures data integrity, validates sources, and maintains quality standards.
 """
 
 import re
-import sqlite3
 import hashlib
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional, Tuple
@@ -14,6 +13,7 @@ from urllib.parse import urlparse
 import unicodedata
 
 from utils.config import config, logger
+from utils.db_pool import connect as db_connect
 
 
 class DataValidator:
@@ -263,7 +263,7 @@ class DataValidator:
             content_hash = hashlib.md5(content.encode('utf-8')).hexdigest()
             title_hash = hashlib.md5(title.encode('utf-8')).hexdigest()
 
-            conn = sqlite3.connect(self.db_path)
+            conn = db_connect(self.db_path)
             cursor = conn.cursor()
 
             # Check for exact content match
@@ -411,7 +411,7 @@ class DataValidator:
     def get_quality_report(self, days: int = 7) -> Dict[str, Any]:
         """Generate a quality report for articles in the specified time period."""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = db_connect(self.db_path)
             cursor = conn.cursor()
 
             # Get articles from the specified period
@@ -470,7 +470,7 @@ class DataValidator:
     def cleanup_invalid_articles(self, min_quality_score: int = 30) -> int:
         """Remove articles with very low quality scores from the database."""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = db_connect(self.db_path)
             cursor = conn.cursor()
 
             # Count articles to be deleted
@@ -7,7 +7,6 @@ para mantener la base de datos rica, limpia y completa automáticamente
 """
 
 import os
-import sqlite3
 import logging
 import json
 import re
@@ -21,6 +20,8 @@ import threading
 from concurrent.futures import ThreadPoolExecutor
 import hashlib
 
+from src.utils.db_pool import connect as db_connect, get_pool
+
 # Configurar logging
 logger = logging.getLogger(__name__)
 
@@ -71,6 +72,17 @@ except ImportError:
     VECTOR_SEARCH_AVAILABLE = False
     logger.warning("⚠️ Vector Search not available")
 
+try:
+    import numpy as np
+    from src.ai.vector_store import ArticleVectorStore, default_store_path
+    VECTOR_STORE_AVAILABLE = True
+except ImportError:
+    VECTOR_STORE_AVAILABLE = False
+    logger.warning("⚠️ Article vector store not available")
+
+# Los embeddings se guardan si hay sqlite-vss o el almacén vectorial propio
+EMBEDDINGS_ENABLED = VECTOR_SEARCH_AVAILABLE or VECTOR_STORE_AVAILABLE
+
 @dataclass
 class EnrichmentResult:
     """Resultado del enriquecimiento de un artículo"""
@@ -113,6 +125,7 @@ class IntelligentDataEnrichment:
         # Modelos de IA
         self.models = {}
         self.groq_client = None
+        self.vector_store = None
         
         # Estado del sistema
         self.running = False
@@ -169,7 +182,7 @@ class IntelligentDataEnrichment:
                 logger.info("✅ Sentiment model loaded")
                 
                 # Modelo de embeddings para búsqueda vectorial
-                if VECTOR_SEARCH_AVAILABLE:
+                if EMBEDDINGS_ENABLED:
                     self.models['embeddings'] = SentenceTransformer(self.config.embedding_model_name)
                     logger.info("✅ Embedding model loaded")
                     
@@ -199,11 +212,11 @@ class IntelligentDataEnrichment:
     def _ensure_enrichment_tables(self):
         """Crear tablas necesarias para el enriquecimiento"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with db_connect(self.db_path) as conn:
                 cursor = conn.cursor()
                 
                 # Tabla de vectores para búsqueda semántica (siguiendo ChatGPT)
-                if VECTOR_SEARCH_AVAILABLE:
+                if EMBEDDINGS_ENABLED:
                     cursor.execute("""
                         CREATE TABLE IF NOT EXISTS article_embeddings (
                             article_id INTEGER PRIMARY KEY,
@@ -536,6 +549,35 @@ JSON:
             logger.error(f"Error generating embedding: {e}")
             return None
 
+    def get_vector_store(self) -> Optional['ArticleVectorStore']:
+        """Almacén vectorial persistente (se abre bajo demanda)"""
+        if self.vector_store is None and VECTOR_STORE_AVAILABLE:
+            try:
+                self.vector_store = ArticleVectorStore(
+                    default_store_path(self.db_path),
+                    dim=self.config.vector_dimension,
+                    model_name=self.config.embedding_model_name
+                )
+            except Exception as e:
+                logger.error(f"Error opening vector store: {e}")
+        return self.vector_store
+
+    def _append_to_vector_store(self, article_id: int, embedding: bytes, article_data: Dict[str, Any]):
+        """Añadir incrementalmente el embedding combinado de un artículo enriquecido"""
+        store = self.get_vector_store()
+        if store is None:
+            return
+        try:
+            vector = np.frombuffer(embedding, dtype=np.float32)
+            store.append(
+                [article_id], vector.reshape(1, -1),
+                [article_data.get('language')],
+                [article_data.get('risk_level')],
+                [article_data.get('published_at')]
+            )
+        except Exception as e:
+            logger.error(f"Error appending article {article_id} to vector store: {e}")
+
     def enrich_single_article(self, article_id: int) -> EnrichmentResult:
         """Enriquecer un artículo individual con todas las técnicas disponibles"""
         start_time = time.time()
@@ -544,12 +586,12 @@ JSON:
         
         try:
             # Obtener datos del artículo
-            with sqlite3.connect(self.db_path) as conn:
+            with db_connect(self.db_path) as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     SELECT id, title, content, url, source, published_at, country, region, 
                            conflict_type, sentiment_score, summary, image_url, key_persons, 
-                           key_locations, risk_level, enrichment_status
+                           key_locations, risk_level, enrichment_status, language
                     FROM articles WHERE id = ?
                 """, (article_id,))
                 
@@ -562,6 +604,7 @@ JSON:
             
             # Preparar updates
             updates = {}
+            combined_embedding = None
             
             # 1. Análisis NLP con BERT
             if article_data.get('title') and article_data.get('content'):
@@ -596,21 +639,18 @@ JSON:
                 updates['semantic_hash'] = semantic_hash
                 
                 # Generar embeddings para búsqueda vectorial
-                if VECTOR_SEARCH_AVAILABLE:
+                if EMBEDDINGS_ENABLED:
                     title_embedding = self.generate_embedding(article_data['title'])
                     content_embedding = self.generate_embedding(article_data['content'][:500])
                     combined_embedding = self.generate_embedding(full_text[:1000])
                     
                     if title_embedding and content_embedding:
-                        # Guardar embeddings en tabla separada
-                        with sqlite3.connect(self.db_path) as conn:
-                            cursor = conn.cursor()
-                            cursor.execute("""
-                                INSERT OR REPLACE INTO article_embeddings 
-                                (article_id, title_embedding, content_embedding, combined_embedding, embedding_model, updated_at)
-                                VALUES (?, ?, ?, ?, ?, datetime('now'))
-                            """, (article_id, title_embedding, content_embedding, combined_embedding, self.config.embedding_model_name))
-                            conn.commit()
+                        # Guardar embeddings en tabla separada (escritor serializado)
+                        get_pool(self.db_path).submit_write("""
+                            INSERT OR REPLACE INTO article_embeddings 
+                            (article_id, title_embedding, content_embedding, combined_embedding, embedding_model, updated_at)
+                            VALUES (?, ?, ?, ?, ?, datetime('now'))
+                        """, (article_id, title_embedding, content_embedding, combined_embedding, self.config.embedding_model_name))
                         
                         fields_updated.append('embeddings')
                         confidence_scores['embeddings'] = 0.95
@@ -678,25 +718,26 @@ JSON:
                     set_clause = ', '.join([f"{key} = ?" for key in updates.keys()])
                     values = list(updates.values()) + [article_id]
                     
-                    with sqlite3.connect(self.db_path) as conn:
-                        cursor = conn.cursor()
-                        cursor.execute(f"UPDATE articles SET {set_clause} WHERE id = ?", values)
-                        conn.commit()
+                    # Escritor serializado; se espera para que el artículo quede actualizado al volver
+                    get_pool(self.db_path).submit_write(
+                        f"UPDATE articles SET {set_clause} WHERE id = ?", values
+                    ).result()
+            
+            # Añadir el vector al almacén con los metadatos ya actualizados
+            if combined_embedding:
+                self._append_to_vector_store(article_id, combined_embedding, {**article_data, **updates})
             
             processing_time = time.time() - start_time
             
             # Registrar en log
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    INSERT INTO enrichment_log 
-                    (article_id, processing_type, fields_processed, success, processing_time, confidence_scores)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                """, (
-                    article_id, 'auto', json.dumps(fields_updated), 
-                    1, processing_time, json.dumps(confidence_scores)
-                ))
-                conn.commit()
+            get_pool(self.db_path).submit_write("""
+                INSERT INTO enrichment_log 
+                (article_id, processing_type, fields_processed, success, processing_time, confidence_scores)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (
+                article_id, 'auto', json.dumps(fields_updated), 
+                1, processing_time, json.dumps(confidence_scores)
+            ))
             
             logger.info(f"✅ Enriched article {article_id}: {len(fields_updated)} fields updated in {processing_time:.2f}s")
             
@@ -713,14 +754,11 @@ JSON:
             error_msg = str(e)
             
             # Registrar error
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    INSERT INTO enrichment_log 
-                    (article_id, processing_type, fields_processed, success, error_message, processing_time)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                """, (article_id, 'auto', json.dumps([]), 0, error_msg, processing_time))
-                conn.commit()
+            get_pool(self.db_path).submit_write("""
+                INSERT INTO enrichment_log 
+                (article_id, processing_type, fields_processed, success, error_message, processing_time)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (article_id, 'auto', json.dumps([]), 0, error_msg, processing_time))
             
             logger.error(f"❌ Error enriching article {article_id}: {error_msg}")
             
@@ -741,7 +779,7 @@ JSON:
         try:
             duplicates_detected = 0
             
-            with sqlite3.connect(self.db_path) as conn:
+            with db_connect(self.db_path) as conn:
                 cursor = conn.cursor()
                 
                 # Detectar duplicados exactos por hash semántico
@@ -782,7 +820,7 @@ JSON:
         
         if not article_ids:
             # Obtener artículos NUEVOS que necesitan enriquecimiento (últimas 48 horas)
-            with sqlite3.connect(self.db_path) as conn:
+            with db_connect(self.db_path) as conn:
                 cursor = conn.cursor()
                 
                 # Primero intentar artículos de las últimas 48 horas
@@ -858,7 +896,7 @@ JSON:
     def setup_automatic_enrichment_triggers(self):
         """Configurar triggers de base de datos para enriquecimiento automático"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with db_connect(self.db_path) as conn:
                 cursor = conn.cursor()
                 
                 # Trigger para marcar nuevos artículos para enriquecimiento
@@ -961,7 +999,7 @@ JSON:
     def get_enrichment_statistics(self) -> Dict[str, Any]:
         """Obtener estadísticas del sistema de enriquecimiento"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with db_connect(self.db_path) as conn:
                 cursor = conn.cursor()
                 
                 # Estadísticas generales
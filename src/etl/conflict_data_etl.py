@@ -23,6 +23,8 @@ import hashlib
 import time
 from dataclasses import dataclass
 
+from utils.db_pool import connect as db_connect
+
 # Configurar logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -115,7 +117,7 @@ class ConflictDataETL:
     def _ensure_tables(self):
         """Crear tablas necesarias para el ETL"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with db_connect(self.db_path) as conn:
                 cursor = conn.cursor()
                 
                 # Tabla principal de eventos de conflicto
@@ -576,7 +578,7 @@ class ConflictDataETL:
     def _save_critical_events(self, critical_events: List[Dict]):
         """Guardar eventos críticos en la base de datos"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with db_connect(self.db_path) as conn:
                 cursor = conn.cursor()
                 
                 for event in critical_events:
@@ -707,7 +709,7 @@ class ConflictDataETL:
     def _save_etl_run(self, run_id: str, status: str, start_time: datetime):
         """Guardar información inicial del run ETL"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with db_connect(self.db_path) as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     INSERT INTO etl_runs (run_id, config_json, status, started_at)
@@ -725,7 +727,7 @@ class ConflictDataETL:
     def _update_etl_run(self, run_id: str, status: str, results: Dict, end_time: datetime, error_msg: str = None):
         """Actualizar información del run ETL al completar"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with db_connect(self.db_path) as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     UPDATE etl_runs SET 
@@ -756,7 +758,7 @@ class ConflictDataETL:
     def get_etl_statistics(self) -> Dict[str, Any]:
         """Obtener estadísticas generales del ETL"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with db_connect(self.db_path) as conn:
                 cursor = conn.cursor()
                 
                 # Estadísticas de runs
@@ -821,7 +823,7 @@ class ConflictDataETL:
     def get_recent_critical_events(self, limit: int = 20) -> List[Dict]:
         """Obtener eventos críticos recientes"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with db_connect(self.db_path) as conn:
                 cursor = conn.cursor()
                 cursor.execute("""
                     SELECT ce.*, ev.event_date, ev.country, ev.region, ev.latitude, ev.longitude, ev.data_source
@@ -5,7 +5,9 @@ Integra ACLED, GDELT, GPR y otras fuentes abiertas de inteligencia geopolítica
 """
 
 import os
+import csv
 import requests
+import tempfile
 import zipfile
 import io
 import pandas as pd
@@ -18,10 +20,75 @@ from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 import time
 
+from ..utils.db_pool import connect as db_connect, get_pool
+
 # Configuración de logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Columnas del export diario de GDELT 1.0 (el archivo no trae cabecera)
+GDELT_COLUMNS = [
+    'globaleventid', 'sqldate', 'monthyear', 'year', 'fractiondate',
+    'actor1code', 'actor1name', 'actor1countrycode', 'actor1knowngroupcode',
+    'actor1ethniccode', 'actor1religion1code', 'actor1religion2code',
+    'actor1type1code', 'actor1type2code', 'actor1type3code',
+    'actor2code', 'actor2name', 'actor2countrycode', 'actor2knowngroupcode',
+    'actor2ethniccode', 'actor2religion1code', 'actor2religion2code',
+    'actor2type1code', 'actor2type2code', 'actor2type3code',
+    'isrootevent', 'eventcode', 'eventbasecode', 'eventrootcode',
+    'quadclass', 'goldsteinscale', 'nummentions', 'numsources',
+    'numarticles', 'avgtone', 'actor1geo_type', 'actor1geo_fullname',
+    'actor1geo_countrycode', 'actor1geo_adm1code', 'actor1geo_lat',
+    'actor1geo_long', 'actor1geo_featureid', 'actor2geo_type',
+    'actor2geo_fullname', 'actor2geo_countrycode', 'actor2geo_adm1code',
+    'actor2geo_lat', 'actor2geo_long', 'actor2geo_featureid',
+    'actiongeo_type', 'actiongeo_fullname', 'actiongeo_countrycode',
+    'actiongeo_adm1code', 'actiongeo_lat', 'actiongeo_long',
+    'actiongeo_featureid', 'dateadded', 'sourceurl'
+]
+
+# Columnas que se importan y su tipo; el resto (geografía de actores, códigos
+# de etnia/religión/tipo) no lo consulta ningún análisis y queda a NULL
+GDELT_DTYPES = {
+    'globaleventid': 'Int64',
+    'sqldate': 'Int32',
+    'monthyear': 'Int32',
+    'year': 'Int16',
+    'fractiondate': 'float64',
+    'actor1code': 'str',
+    'actor1name': 'str',
+    'actor1countrycode': 'str',
+    'actor2code': 'str',
+    'actor2name': 'str',
+    'actor2countrycode': 'str',
+    'isrootevent': 'Int8',
+    'eventcode': 'str',
+    'eventbasecode': 'str',
+    'eventrootcode': 'str',
+    'quadclass': 'Int8',
+    'goldsteinscale': 'float64',
+    'nummentions': 'Int32',
+    'numsources': 'Int32',
+    'numarticles': 'Int32',
+    'avgtone': 'float64',
+    'actiongeo_type': 'Int8',
+    'actiongeo_fullname': 'str',
+    'actiongeo_countrycode': 'str',
+    'actiongeo_adm1code': 'str',
+    'actiongeo_lat': 'float64',
+    'actiongeo_long': 'float64',
+    'actiongeo_featureid': 'str',
+    'dateadded': 'str',
+    'sourceurl': 'str',
+}
+GDELT_IMPORT_COLUMNS = list(GDELT_DTYPES)
+
+# Códigos CAMEO raíz de conflicto: protestas, coerción, asaltos, violencia...
+GDELT_CONFLICT_ROOT_CODES = ['14', '15', '16', '17', '18', '19', '20']
+
+# Filas por chunk al parsear el export diario
+GDELT_CHUNK_SIZE = 50000
+
 class ExternalIntelligenceFeeds:
     """
     Gestor de feeds externos de inteligencia geopolítica
@@ -58,7 +125,7 @@ class ExternalIntelligenceFeeds:
     def _initialize_database(self):
         """Inicializar tablas de feeds externos"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with db_connect(self.db_path) as conn:
                 cursor = conn.cursor()
                 
                 # Tabla para eventos ACLED
@@ -276,52 +343,42 @@ class ExternalIntelligenceFeeds:
             url = f"{self.sources['gdelt']['base_url']}/{date_str}.export.CSV.zip"
             
             logger.info(f"📡 Descargando GDELT: {url}")
-            response = requests.get(url, timeout=120)
-            response.raise_for_status()
             
-            # Extraer y leer CSV del ZIP
-            with zipfile.ZipFile(io.BytesIO(response.content)) as z:
-                csv_filename = z.namelist()[0]
-                with z.open(csv_filename) as csv_file:
-                    # GDELT no tiene headers, usar nombres de columnas estándar
-                    column_names = [
-                        'globaleventid', 'sqldate', 'monthyear', 'year', 'fractiondate',
-                        'actor1code', 'actor1name', 'actor1countrycode', 'actor1knowngroupcode',
-                        'actor1ethniccode', 'actor1religion1code', 'actor1religion2code',
-                        'actor1type1code', 'actor1type2code', 'actor1type3code',
-                        'actor2code', 'actor2name', 'actor2countrycode', 'actor2knowngroupcode',
-                        'actor2ethniccode', 'actor2religion1code', 'actor2religion2code',
-                        'actor2type1code', 'actor2type2code', 'actor2type3code',
-                        'isrootevent', 'eventcode', 'eventbasecode', 'eventrootcode',
-                        'quadclass', 'goldsteinscale', 'nummentions', 'numsources',
-                        'numarticles', 'avgtone', 'actor1geo_type', 'actor1geo_fullname',
-                        'actor1geo_countrycode', 'actor1geo_adm1code', 'actor1geo_lat',
-                        'actor1geo_long', 'actor1geo_featureid', 'actor2geo_type',
-                        'actor2geo_fullname', 'actor2geo_countrycode', 'actor2geo_adm1code',
-                        'actor2geo_lat', 'actor2geo_long', 'actor2geo_featureid',
-                        'actiongeo_type', 'actiongeo_fullname', 'actiongeo_countrycode',
-                        'actiongeo_adm1code', 'actiongeo_lat', 'actiongeo_long',
-                        'actiongeo_featureid', 'dateadded', 'sourceurl'
-                    ]
-                    
-                    df = pd.read_csv(csv_file, sep='\t', header=None, names=column_names, low_memory=False)
+            # Descargar el ZIP a disco por bloques en lugar de mantenerlo en memoria
+            with tempfile.TemporaryFile() as zip_buffer:
+                with requests.get(url, timeout=120, stream=True) as response:
+                    response.raise_for_status()
+                    for block in response.iter_content(chunk_size=1024 * 1024):
+                        zip_buffer.write(block)
+                zip_buffer.seek(0)
+                
+                # Descomprimir y parsear por chunks
+                with zipfile.ZipFile(zip_buffer) as z:
+                    csv_filename = z.namelist()[0]
+                    with z.open(csv_filename) as csv_file:
+                        rows_read, records_imported, records_skipped, failed_chunks = \
+                            self._import_gdelt_csv(csv_file)
+            
+            duration = time.time() - start_time
             
-            # Filtrar eventos relevantes (conflictos, violencia, protestas)
-            relevant_events = df[df['eventrootcode'].isin(['14', '15', '16', '17', '18', '19', '20'])]
+            if failed_chunks:
+                # Import parcial: se registra como fallido (INSERT OR IGNORE hace
+                # que reintentar el mismo día sea seguro)
+                error = f"{failed_chunks} chunks no se pudieron guardar"
+                logger.error(f"❌ GDELT {target_date}: {error} "
+                             f"({records_imported} eventos importados en los demás chunks)")
+                self._log_feed_update('gdelt', records_imported, duration, str(target_date), 'error', error)
+                return False
             
-            if relevant_events.empty:
+            if records_imported + records_skipped == 0:
                 logger.warning("⚠️ No se encontraron eventos relevantes en GDELT")
                 return False
             
-            # Guardar en base de datos
-            records_imported = self._save_gdelt_data(relevant_events)
-            
-            duration = time.time() - start_time
-            
             # Registrar actualización
             self._log_feed_update('gdelt', records_imported, duration, str(target_date))
             
-            logger.info(f"✅ GDELT: {records_imported} eventos relevantes importados en {duration:.2f}s")
+            logger.info(f"✅ GDELT: {records_imported} eventos relevantes importados, "
+                        f"{records_skipped} ya existentes, {rows_read} filas leídas en {duration:.2f}s")
             return True
             
         except Exception as e:
@@ -429,21 +486,67 @@ class ExternalIntelligenceFeeds:
             logger.error(f"Error guardando datos ACLED: {e}")
             return 0
     
-    def _save_gdelt_data(self, df: pd.DataFrame) -> int:
-        """Guardar datos GDELT en base de datos"""
-        try:
-            with sqlite3.connect(self.db_path) as conn:
-                records_before = conn.execute("SELECT COUNT(*) FROM gdelt_events").fetchone()[0]
-                
-                df.to_sql('gdelt_events', conn, if_exists='append', index=False, method='multi')
-                
-                records_after = conn.execute("SELECT COUNT(*) FROM gdelt_events").fetchone()[0]
-                
-                return records_after - records_before
-                
-        except Exception as e:
-            logger.error(f"Error guardando datos GDELT: {e}")
-            return 0
+    def _import_gdelt_csv(self, csv_file) -> Tuple[int, int, int, int]:
+        """
+        Importar un export diario de GDELT en streaming.
+        
+        El CSV se parsea por chunks de GDELT_CHUNK_SIZE filas, solo con las
+        columnas de GDELT_IMPORT_COLUMNS y tipos explícitos; cada chunk se
+        filtra a los códigos raíz de conflicto antes de convertirlo en filas
+        para SQLite, así que la memoria no depende del tamaño del archivo.
+        Un chunk que no se puede guardar se cuenta y la importación sigue.
+        
+        Returns:
+            (filas leídas, eventos insertados, eventos ya existentes, chunks fallidos)
+        """
+        reader = pd.read_csv(
+            csv_file,
+            sep='\t',
+            header=None,
+            names=GDELT_COLUMNS,
+            usecols=GDELT_IMPORT_COLUMNS,
+            dtype=GDELT_DTYPES,
+            quoting=csv.QUOTE_NONE,
+            chunksize=GDELT_CHUNK_SIZE,
+            on_bad_lines='skip',
+        )
+        
+        rows_read = inserted = skipped = failed_chunks = 0
+        for chunk in reader:
+            rows_read += len(chunk)
+            relevant = chunk[chunk['eventrootcode'].isin(GDELT_CONFLICT_ROOT_CODES)
+                             & chunk['globaleventid'].notna()]
+            if relevant.empty:
+                continue
+            
+            try:
+                chunk_inserted, chunk_skipped = self._save_gdelt_data(relevant)
+            except Exception as e:
+                logger.error(f"Error guardando datos GDELT: {e}")
+                failed_chunks += 1
+                continue
+            inserted += chunk_inserted
+            skipped += chunk_skipped
+        
+        return rows_read, inserted, skipped, failed_chunks
+    
+    def _save_gdelt_data(self, df: pd.DataFrame) -> Tuple[int, int]:
+        """
+        Guardar un chunk de eventos GDELT en base de datos.
+        
+        Usa INSERT OR IGNORE sobre la restricción UNIQUE(globaleventid), en una
+        sola transacción del escritor del pool, y devuelve (insertados,
+        omitidos) a partir del rowcount en lugar de contar la tabla. Los errores
+        se propagan para que el llamador cuente el chunk como fallido.
+        """
+        columns = list(df.columns)
+        rows = list(df.astype(object).where(df.notna(), None).itertuples(index=False, name=None))
+        sql = (f"INSERT OR IGNORE INTO gdelt_events ({', '.join(columns)}) "
+               f"VALUES ({', '.join('?' for _ in columns)})")
+        
+        # Esperar al resultado para que los chunks no se acumulen en la cola
+        inserted = get_pool(self.db_path).submit_write(sql, rows, many=True).result()
+        return inserted, len(rows) - inserted
     
     def _save_gpr_data(self, df: pd.DataFrame) -> int:
         """Guardar datos GPR en base de datos"""
@@ -465,15 +568,12 @@ class ExternalIntelligenceFeeds:
                         date_range: str, status: str = 'success', error: str = None):
         """Registrar actualización de feed"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    INSERT INTO feed_updates 
-                    (source, last_update, records_imported, status, error_message, 
-                     update_duration, data_date_range)
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                """, (source, datetime.now(), records, status, error, duration, date_range))
-                conn.commit()
+            get_pool(self.db_path).submit_write("""
+                INSERT INTO feed_updates 
+                (source, last_update, records_imported, status, error_message, 
+                 update_duration, data_date_range)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, (source, datetime.now(), records, status, error, duration, date_range)).result()
         except Exception as e:
             logger.error(f"Error logging feed update: {e}")
     
@@ -511,7 +611,7 @@ class ExternalIntelligenceFeeds:
         stats = {}
         
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with db_connect(self.db_path) as conn:
                 cursor = conn.cursor()
                 
                 # Estadísticas ACLED
@@ -607,7 +707,7 @@ class ExternalIntelligenceFeeds:
         hotspots = []
         
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with db_connect(self.db_path) as conn:
                 cursor = conn.cursor()
                 
                 cutoff_date = (datetime.now() - timedelta(days=days_back)).strftime('%Y-%m-%d')
@@ -6,16 +6,16 @@ y genera GeoJSON optimizado para consultas satelitales de Sentinel Hub
 """
 
 import json
-import sqlite3
 import logging
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 import numpy as np
 from collections import defaultdict
-import math
 
+from ..utils.db_pool import connect as db_connect
 from .external_feeds import ExternalIntelligenceFeeds
+from .spatial_index import cluster_points
 
 logger = logging.getLogger(__name__)
 
@@ -109,7 +109,7 @@ class IntegratedGeopoliticalAnalyzer:
         try:
             cutoff_date = datetime.now() - timedelta(days=days)
             
-            with sqlite3.connect(self.db_path) as conn:
+            with db_connect(self.db_path) as conn:
                 cursor = conn.cursor()
                 
                 cursor.execute("""
@@ -163,7 +163,7 @@ class IntegratedGeopoliticalAnalyzer:
         try:
             cutoff_date = datetime.now() - timedelta(days=days)
             
-            with sqlite3.connect(self.db_path) as conn:
+            with db_connect(self.db_path) as conn:
                 cursor = conn.cursor()
                 
                 # Verificar si existe la tabla ACLED
@@ -233,7 +233,7 @@ class IntegratedGeopoliticalAnalyzer:
             cutoff_date = datetime.now() - timedelta(days=days)
             sqldate_cutoff = int(cutoff_date.strftime('%Y%m%d'))
             
-            with sqlite3.connect(self.db_path) as conn:
+            with db_connect(self.db_path) as conn:
                 cursor = conn.cursor()
                 
                 # Verificar si existe la tabla GDELT
@@ -308,7 +308,7 @@ class IntegratedGeopoliticalAnalyzer:
         }
         
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with db_connect(self.db_path) as conn:
                 cursor = conn.cursor()
                 
                 # Verificar si existe la tabla GPR
@@ -360,11 +360,10 @@ class IntegratedGeopoliticalAnalyzer:
                                    gdelt_conflicts: List, gpr_context: Dict) -> List[Dict]:
         """Consolidar zonas de conflicto de múltiples fuentes"""
         
-        # Agrupar por proximidad geográfica (radio de ~50km)
-        PROXIMITY_THRESHOLD = 0.5  # grados (aprox 50km)
+        # Agrupar por proximidad geográfica (radio de ~50km, distancia haversine)
+        PROXIMITY_THRESHOLD = 50.0  # km
         
         consolidated = []
-        processed_coords = set()
         
         # Combinar todas las fuentes
         all_conflicts = news_conflicts + acled_conflicts + gdelt_conflicts
@@ -372,28 +371,22 @@ class IntegratedGeopoliticalAnalyzer:
         # Ordenar por score de riesgo descendente
         all_conflicts.sort(key=lambda x: x.get('risk_score', 0), reverse=True)
         
-        for conflict in all_conflicts:
-            lat, lng = conflict['latitude'], conflict['longitude']
-            coord_key = f"{lat:.2f},{lng:.2f}"
-            
-            # Buscar zona existente cerca
-            existing_zone = None
-            for zone in consolidated:
-                zone_lat, zone_lng = zone['latitude'], zone['longitude']
-                distance = math.sqrt((lat - zone_lat)**2 + (lng - zone_lng)**2)
-                
-                if distance <= PROXIMITY_THRESHOLD:
-                    existing_zone = zone
-                    break
-            
-            if existing_zone:
-                # Fusionar con zona existente
-                self._merge_conflict_data(existing_zone, conflict)
-            else:
+        # Clustering por rejilla espacial: cada evento se asigna a la primera zona
+        # creada cuyo centro está dentro del radio (solo se examina la vecindad 3×3)
+        labels, leaders = cluster_points(
+            [c['latitude'] for c in all_conflicts],
+            [c['longitude'] for c in all_conflicts],
+            PROXIMITY_THRESHOLD
+        )
+        leader_set = set(leaders.tolist())
+        
+        for i, conflict in enumerate(all_conflicts):
+            if i in leader_set:
                 # Crear nueva zona
-                new_zone = self._create_conflict_zone(conflict, gpr_context)
-                consolidated.append(new_zone)
-                processed_coords.add(coord_key)
+                consolidated.append(self._create_conflict_zone(conflict, gpr_context))
+            else:
+                # Fusionar con zona existente
+                self._merge_conflict_data(consolidated[labels[i]], conflict)
         
         # Calcular scores finales y ordenar
         for zone in consolidated:
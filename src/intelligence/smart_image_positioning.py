@@ -9,22 +9,23 @@ Módulo que implementa lógica avanzada para:
 4. Asignar posiciones optimales según contenido visual
 """
 
-import sqlite3
 import json
 import hashlib
 import requests
-import io
 import os
 import logging
+import threading
 from typing import Dict, List, Tuple, Optional, Union
-from PIL import Image
 import cv2
 import numpy as np
 from dotenv import load_dotenv
 from pathlib import Path
 import imagehash
 from urllib.parse import urlparse
-import time
+
+from ..utils.db_pool import connect as db_connect
+from ..utils.hamming_index import NearPairTracker
+from ..utils.image_store import PHASH_SIZE, get_image_store
 
 # Configurar logging
 logging.basicConfig(level=logging.INFO)
@@ -40,6 +41,21 @@ def get_database_path():
         return database_url.replace('sqlite:///', '')
     return database_url
 
+# Pares de imágenes similares por (base de datos, umbral), compartidos entre
+# instancias: los fingerprints se indexan una vez y se añaden al guardarse
+_fingerprint_pairs: Dict[Tuple[str, float], NearPairTracker] = {}
+_fingerprint_pairs_lock = threading.Lock()
+
+
+def get_fingerprint_pairs(db_path: str, threshold: float) -> NearPairTracker:
+    """Índice persistente de fingerprints para ``db_path`` y ``threshold``."""
+    key = (os.path.abspath(db_path), threshold)
+    with _fingerprint_pairs_lock:
+        tracker = _fingerprint_pairs.get(key)
+        if tracker is None:
+            tracker = _fingerprint_pairs[key] = NearPairTracker(threshold)
+        return tracker
+
 class SmartImagePositioning:
     """
     Sistema inteligente para posicionamiento de imágenes en el mosaico
@@ -112,26 +128,21 @@ class SmartImagePositioning:
                 # Si no tiene extensión obvia, intentar de todas formas
                 pass
             
-            # Intentar descargar y procesar la imagen
-            response = requests.get(image_url, headers=self.headers, timeout=10)
-            response.raise_for_status()
-            
-            # Verificar que la respuesta sea realmente una imagen
-            content_type = response.headers.get('content-type', '').lower()
-            if not content_type.startswith('image/'):
-                logger.debug(f"Contenido no es imagen: {content_type} para {image_url}")
+            # Obtener la imagen del almacén compartido (solo se descarga una vez);
+            # el almacén valida el content-type y calcula pHash y dimensiones
+            stored = get_image_store().fetch(image_url)
+            if stored is None:
+                logger.debug(f"No se pudo obtener la imagen: {image_url}")
                 return None
             
-            # Convertir a imagen PIL
-            img = Image.open(io.BytesIO(response.content))
-            
             # Verificar dimensiones mínimas (evitar imágenes muy pequeñas)
-            if img.width < 50 or img.height < 50:
-                logger.debug(f"Imagen muy pequeña ({img.width}x{img.height}): {image_url}")
+            if stored.width < 50 or stored.height < 50:
+                logger.debug(f"Imagen muy pequeña ({stored.width}x{stored.height}): {image_url}")
                 return None
             
-            # Generar hash perceptual
-            perceptual_hash = imagehash.phash(img, hash_size=self.hash_size)
+            perceptual_hash = stored.phash if self.hash_size == PHASH_SIZE else None
+            if perceptual_hash is None:
+                perceptual_hash = str(imagehash.phash(stored.open(), hash_size=self.hash_size))
             
             logger.debug(f"✅ Fingerprint generado para imagen real: {image_url}")
             return str(perceptual_hash)
@@ -168,7 +179,7 @@ class SmartImagePositioning:
         duplicates = []
         
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with db_connect(self.db_path) as conn:
                 cursor = conn.cursor()
                 
                 # Obtener todas las imágenes REALES con sus hashes (excluir placeholders)
@@ -188,22 +199,18 @@ class SmartImagePositioning:
                 
                 images = cursor.fetchall()
                 
-                # Comparar cada imagen con las demás
-                for i, img1 in enumerate(images):
-                    for j, img2 in enumerate(images[i+1:], i+1):
-                        if img1[3] and img2[3]:  # Si ambas tienen fingerprint
-                            similarity = self.calculate_image_similarity(img1[3], img2[3])
-                            
-                            if similarity >= self.similarity_threshold:
-                                duplicates.append({
-                                    'article1_id': img1[0],
-                                    'article1_title': img1[1],
-                                    'article1_url': img1[2],
-                                    'article2_id': img2[0],
-                                    'article2_title': img2[1], 
-                                    'article2_url': img2[2],
-                                    'similarity': similarity
-                                })
+                duplicates = [
+                    {
+                        'article1_id': img1[0],
+                        'article1_title': img1[1],
+                        'article1_url': img1[2],
+                        'article2_id': img2[0],
+                        'article2_title': img2[1],
+                        'article2_url': img2[2],
+                        'similarity': similarity
+                    }
+                    for img1, img2, similarity in self._find_similar_image_pairs(images)
+                ]
                 
                 logger.info(f"🔍 Detectados {len(duplicates)} pares de imágenes similares")
                 return duplicates
@@ -212,6 +219,20 @@ class SmartImagePositioning:
             logger.error(f"Error verificando duplicados: {e}")
             return []
     
+    def _find_similar_image_pairs(self, images: List[Tuple]) -> List[Tuple[Tuple, Tuple, float]]:
+        """
+        Pares (img1, img2, similitud) con similitud >= similarity_threshold.
+        
+        Usa el índice Hamming persistente de la base de datos: solo se indexan
+        los fingerprints que aún no estaban; el orden de los pares es el mismo
+        que el de la comparación exhaustiva (img1 antes que img2 en ``images``).
+        """
+        tracker = get_fingerprint_pairs(self.db_path, self.similarity_threshold)
+        keys = [(image[0], image[3]) for image in images]
+        tracker.add_many((key, key[1]) for key in keys)
+        return [(images[position1], images[position2], similarity)
+                for position1, position2, similarity in tracker.pairs_among(keys)]
+    
     def resolve_duplicate_images(self, duplicates: List[Dict]) -> Dict:
         """
         Resolver imágenes duplicadas buscando alternativas de mejor calidad
@@ -229,7 +250,7 @@ class SmartImagePositioning:
                 article2_id = duplicate_pair['article2_id']
                 
                 # Obtener calidad de análisis visual de ambas
-                with sqlite3.connect(self.db_path) as conn:
+                with db_connect(self.db_path) as conn:
                     cursor = conn.cursor()
                     
                     cursor.execute("""
@@ -296,7 +317,7 @@ class SmartImagePositioning:
         Calcular la posición óptima en el mosaico basada en análisis CV
         """
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with db_connect(self.db_path) as conn:
                 cursor = conn.cursor()
                 
                 cursor.execute("""
@@ -430,7 +451,7 @@ class SmartImagePositioning:
         }
         
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with db_connect(self.db_path) as conn:
                 cursor = conn.cursor()
                 
                 # Obtener artículos sin fingerprint o que necesiten actualización
@@ -451,6 +472,10 @@ class SmartImagePositioning:
                 """)
                 
                 articles = cursor.fetchall()
+                tracker = get_fingerprint_pairs(self.db_path, self.similarity_threshold)
+                
+                # Descargar en paralelo (con límite por host) antes de procesar
+                get_image_store().fetch_many(image_url for _, image_url in articles)
                 
                 for article_id, image_url in articles:
                     results['processed'] += 1
@@ -465,14 +490,12 @@ class SmartImagePositioning:
                             SET image_fingerprint = ?
                             WHERE id = ?
                         """, (fingerprint, article_id))
+                        tracker.add((article_id, fingerprint), fingerprint)
                         
                         results['updated'] += 1
                         logger.info(f"🔐 Fingerprint actualizado para artículo {article_id}")
                     else:
                         results['failed'] += 1
-                    
-                    # Pequeña pausa para evitar sobrecarga
-                    time.sleep(0.1)
                 
                 conn.commit()
                 
@@ -494,7 +517,7 @@ class SmartImagePositioning:
         }
         
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with db_connect(self.db_path) as conn:
                 cursor = conn.cursor()
                 
                 # Obtener todos los artículos con imágenes
@@ -539,7 +562,7 @@ class SmartImagePositioning:
         stats = {}
         
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with db_connect(self.db_path) as conn:
                 cursor = conn.cursor()
                 
                 # Estadísticas de posiciones
@@ -594,7 +617,7 @@ class SmartImagePositioning:
         }
         
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with db_connect(self.db_path) as conn:
                 cursor = conn.cursor()
                 
                 # Encontrar imágenes de baja calidad
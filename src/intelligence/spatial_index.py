@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Índice espacial por rejilla para consolidar eventos en zonas de conflicto
+========================================================================
+La consolidación es un clustering "líder" voraz: los eventos se recorren por
+prioridad y cada uno se une a la primera zona (en orden de creación) cuyo
+centro está a menos de ``radius_km``; si no hay ninguna, abre una zona nueva.
+
+En lugar de comparar cada evento con todas las zonas (O(eventos × zonas)),
+los centros se guardan en una rejilla lat/lon con celdas del tamaño del radio
+y solo se examina la vecindad 3×3 de la celda del evento. El ancho en
+longitud de cada fila de celdas crece con 1/cos(lat) para que la vecindad
+3×3 siga cubriendo el radio en latitudes altas; las columnas dan la vuelta
+en el antimeridiano. Las distancias son haversine en kilómetros.
+"""
+
+import math
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0088
+# Holgura de las celdas sobre el radio: el redondeo en coma flotante cerca de
+# un borde no puede sacar de la vecindad 3×3 un punto que esté dentro del radio
+CELL_MARGIN = 1.01
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Distancia de gran círculo en km entre dos puntos."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def haversine_km_np(lat1, lon1, lats2: np.ndarray, lons2: np.ndarray) -> np.ndarray:
+    """Distancias haversine (km) de un punto a un array de puntos."""
+    phi1 = np.radians(lat1)
+    phi2 = np.radians(lats2)
+    dphi = phi2 - phi1
+    dlambda = np.radians(lons2 - lon1)
+    a = np.sin(dphi / 2) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.minimum(1.0, np.sqrt(a)))
+
+
+class LatLonGrid:
+    """Geometría de la rejilla: filas de alto fijo, columnas ensanchadas con la latitud."""
+
+    def __init__(self, radius_km: float):
+        self.radius_km = radius_km
+        # Grados de latitud que abarca el radio sobre la misma esfera que haversine_km
+        self.row_height = math.degrees(radius_km / EARTH_RADIUS_KM) * CELL_MARGIN
+        self.n_rows = int(math.ceil(180.0 / self.row_height))
+        self._widths: Dict[int, Tuple[float, int]] = {}
+
+    def row_of(self, lat: float) -> int:
+        return min(self.n_rows - 1, max(0, int((lat + 90.0) // self.row_height)))
+
+    def row_geometry(self, row: int) -> Tuple[float, int]:
+        """(ancho en grados, número de columnas) de una fila."""
+        geometry = self._widths.get(row)
+        if geometry is None:
+            # Latitud más alejada del ecuador que puede consultar esta fila
+            # (su borde exterior más una fila, por las consultas de filas vecinas)
+            south = -90.0 + row * self.row_height
+            far_lat = min(90.0, max(abs(south), abs(south + self.row_height)) + self.row_height)
+            cos_lat = math.cos(math.radians(far_lat))
+            width = 360.0 if cos_lat <= 1e-6 else min(360.0, self.row_height / cos_lat)
+            n_cols = max(1, int(360.0 // width))
+            geometry = self._widths[row] = (360.0 / n_cols, n_cols)
+        return geometry
+
+    def cell_of(self, lat: float, lon: float) -> Tuple[int, int]:
+        row = self.row_of(lat)
+        width, n_cols = self.row_geometry(row)
+        return row, int(((lon + 180.0) % 360.0) // width) % n_cols
+
+    def neighbourhood(self, lat: float, lon: float) -> List[Tuple[int, int]]:
+        """Celdas de la vecindad 3×3 (ajustada al ancho de cada fila vecina)."""
+        row = self.row_of(lat)
+        cells = []
+        for r in (row - 1, row, row + 1):
+            if r < 0 or r >= self.n_rows:
+                continue
+            width, n_cols = self.row_geometry(r)
+            col = int(((lon + 180.0) % 360.0) // width) % n_cols
+            for c in {(col - 1) % n_cols, col, (col + 1) % n_cols}:
+                cells.append((r, c))
+        return cells
+
+    def cells_of_array(self, lats: np.ndarray, lons: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Versión vectorizada de ``cell_of``."""
+        rows = np.clip(((lats + 90.0) // self.row_height).astype(np.int64), 0, self.n_rows - 1)
+        unique_rows = np.unique(rows)
+        widths = np.empty(len(lats))
+        n_cols = np.empty(len(lats), dtype=np.int64)
+        for r in unique_rows:
+            width, count = self.row_geometry(int(r))
+            mask = rows == r
+            widths[mask] = width
+            n_cols[mask] = count
+        cols = (((lons + 180.0) % 360.0) // widths).astype(np.int64) % n_cols
+        return rows, cols
+
+
+class ZoneGridIndex:
+    """Índice incremental de centros de zona para el clustering líder."""
+
+    def __init__(self, radius_km: float):
+        self.radius_km = radius_km
+        self.grid = LatLonGrid(radius_km)
+        self._cells: Dict[Tuple[int, int], List[int]] = {}
+        self._centres: List[Tuple[float, float]] = []
+
+    def __len__(self):
+        return len(self._centres)
+
+    def find(self, lat: float, lon: float) -> Optional[int]:
+        """Primera zona (en orden de creación) a menos de ``radius_km``."""
+        best = None
+        for cell in self.grid.neighbourhood(lat, lon):
+            for zone_id in self._cells.get(cell, ()):
+                if best is not None and zone_id >= best:
+                    continue
+                zone_lat, zone_lon = self._centres[zone_id]
+                if haversine_km(lat, lon, zone_lat, zone_lon) <= self.radius_km:
+                    best = zone_id
+        return best
+
+    def add(self, lat: float, lon: float) -> int:
+        zone_id = len(self._centres)
+        self._centres.append((lat, lon))
+        self._cells.setdefault(self.grid.cell_of(lat, lon), []).append(zone_id)
+        return zone_id
+
+    def assign(self, lat: float, lon: float) -> Tuple[int, bool]:
+        """Devolver (zona, es_nueva) para un evento."""
+        zone_id = self.find(lat, lon)
+        if zone_id is not None:
+            return zone_id, False
+        return self.add(lat, lon), True
+
+
+def cluster_points(lats: Sequence[float], lons: Sequence[float], radius_km: float,
+                   priorities: Optional[Sequence[float]] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Clustering líder vectorizado de un array completo de coordenadas.
+
+    Los puntos se recorren por prioridad descendente (orden estable). Cada
+    punto aún sin asignar se convierte en líder y absorbe de una vez, con
+    una distancia haversine vectorizada sobre su vecindad 3×3, todos los
+    puntos sin asignar dentro del radio. El resultado es idéntico al
+    algoritmo secuencial punto a punto, pero el bucle de Python recorre
+    zonas y no pares evento-zona.
+
+    Returns:
+        (labels, leaders): ``labels[i]`` es el número de zona del punto i
+        (las zonas se numeran en orden de creación) y ``leaders[z]`` el
+        índice del punto que creó la zona z.
+    """
+    lats = np.asarray(lats, dtype=np.float64)
+    lons = np.asarray(lons, dtype=np.float64)
+    n = len(lats)
+    labels = np.full(n, -1, dtype=np.int64)
+    if n == 0:
+        return labels, np.zeros(0, dtype=np.int64)
+
+    order = (np.argsort(-np.asarray(priorities, dtype=np.float64), kind='stable')
+             if priorities is not None else np.arange(n))
+
+    grid = LatLonGrid(radius_km)
+    rows, cols = grid.cells_of_array(lats, lons)
+
+    # Agrupar índices de puntos por celda
+    cell_keys = rows * 1_000_003 + cols
+    sort_idx = np.argsort(cell_keys, kind='stable')
+    sorted_keys = cell_keys[sort_idx]
+    unique_keys, starts, counts = np.unique(sorted_keys, return_index=True, return_counts=True)
+    members = {int(k): sort_idx[s:s + c] for k, s, c in zip(unique_keys, starts, counts)}
+
+    leaders = []
+    zone = 0
+    for idx in order:
+        if labels[idx] != -1:
+            continue
+        lat, lon = lats[idx], lons[idx]
+        candidate_groups = [members[key] for key in
+                            {r * 1_000_003 + c for r, c in grid.neighbourhood(lat, lon)}
+                            if key in members]
+        candidates = np.concatenate(candidate_groups)
+        candidates = candidates[labels[candidates] == -1]
+        within = haversine_km_np(lat, lon, lats[candidates], lons[candidates]) <= radius_km
+        labels[candidates[within]] = zone
+        labels[idx] = zone
+        leaders.append(idx)
+        zone += 1
+
+    return labels, np.asarray(leaders, dtype=np.int64)
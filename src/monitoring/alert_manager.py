@@ -1,15 +1,15 @@
-import sqlite3
 import smtplib
 from email.mime.text import MIMEText
 import requests
 from datetime import datetime, timedelta
 from src.utils.config import config, logger
+from src.utils.db_pool import connect as db_connect
 
 
 def fetch_high_risk_events(window_hours: int = 1):
     """Retrieve articles with risk_level CRITICAL or HIGH in the last window_hours."""
     db_path = config.database.path
-    conn = sqlite3.connect(db_path)
+    conn = db_connect(db_path)
     cursor = conn.cursor()
     since = datetime.utcnow() - timedelta(hours=window_hours)
     cursor.execute(
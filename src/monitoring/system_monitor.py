@@ -6,7 +6,6 @@ Diseñado para análisis geopolítico en tiempo real con datos 100% reales.
 """
 
 import psutil
-import sqlite3
 import requests
 import time
 import threading
@@ -20,6 +19,7 @@ import socket
 
 import os
 from utils.config import config, logger
+from utils.db_pool import connect as db_connect
 
 
 class AdvancedSystemMonitor:
@@ -248,7 +248,7 @@ class AdvancedSystemMonitor:
     def _check_database_health(self) -> Dict[str, Any]:
         """Check database connectivity and integrity."""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = db_connect(self.db_path)
             cursor = conn.cursor()
 
             # Check if main tables exist
@@ -476,7 +476,7 @@ class AdvancedSystemMonitor:
     def get_performance_metrics(self, hours: int = 24) -> Dict[str, Any]:
         """Get system performance metrics for the specified time period."""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = db_connect(self.db_path)
             cursor = conn.cursor()
 
             # Get processing statistics
@@ -6,7 +6,6 @@ Integra las mejores prácticas de la conversación ChatGPT con la arquitectura e
 """
 
 import os
-import sqlite3
 import logging
 import json
 import time
@@ -16,6 +15,8 @@ from typing import Dict, List, Optional, Tuple, Any, Union
 from dataclasses import dataclass
 import threading
 
+from ..utils.db_pool import connect as db_connect
+
 # Configurar logging
 logger = logging.getLogger(__name__)
 
@@ -218,7 +219,7 @@ class AutomatedSatelliteMonitor:
     def _ensure_satellite_tables(self):
         """Crear tablas necesarias para el monitoreo satelital"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with db_connect(self.db_path) as conn:
                 cursor = conn.cursor()
                 
                 # Tabla de zonas de conflicto (adaptada al esquema existente)
@@ -275,7 +276,7 @@ class AutomatedSatelliteMonitor:
             from src.utils.config import get_database_path
             
             db_path = get_database_path()
-            with sqlite3.connect(db_path) as conn:
+            with db_connect(db_path) as conn:
                 cursor = conn.cursor()
                 
                 # Obtener artículos con geolocalización y riesgo alto/medio
@@ -511,7 +512,7 @@ class AutomatedSatelliteMonitor:
             cloud_percent = scene["properties"]["eo:cloud_cover"]
             
             # Verificar si ya tenemos esta imagen o una más nueva
-            with sqlite3.connect(self.db_path) as conn:
+            with db_connect(self.db_path) as conn:
                 cursor = conn.cursor()
                 cursor.execute(
                     "SELECT sensed_date FROM zone_satellite_images WHERE zone_id = ?",
@@ -532,7 +533,7 @@ class AutomatedSatelliteMonitor:
             file_size = Path(local_path).stat().st_size
             
             # Guardar/sobrescribir en BD (lógica de ChatGPT)
-            with sqlite3.connect(self.db_path) as conn:
+            with db_connect(self.db_path) as conn:
                 cursor = conn.cursor()
                 
                 # ON CONFLICT sobrescribe automáticamente
@@ -578,7 +579,7 @@ class AutomatedSatelliteMonitor:
         stats = {'processed': 0, 'updated': 0, 'errors': 0, 'skipped': 0}
         
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with db_connect(self.db_path) as conn:
                 cursor = conn.cursor()
                 
                 # Query adaptado para prioridades
@@ -730,7 +731,7 @@ class AutomatedSatelliteMonitor:
     def get_monitoring_statistics(self) -> Dict:
         """Obtener estadísticas del monitoreo"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with db_connect(self.db_path) as conn:
                 cursor = conn.cursor()
                 
                 # Estadísticas de zonas
@@ -773,7 +774,7 @@ class AutomatedSatelliteMonitor:
         try:
             cutoff_date = datetime.now() - timedelta(days=days_to_keep)
             
-            with sqlite3.connect(self.db_path) as conn:
+            with db_connect(self.db_path) as conn:
                 cursor = conn.cursor()
                 
                 # Obtener imágenes a eliminar
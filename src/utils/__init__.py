@@ -0,0 +1,22 @@
+"""
+Utilidades compartidas del sistema.
+"""
+
+import sys as _sys
+
+
+def share_module(name: str) -> None:
+    """
+    Registra el módulo ``name`` con y sin el prefijo ``src.``.
+
+    ``src/__init__.py`` expone este paquete también como ``utils`` y muchos
+    módulos importan ``ai.*`` con ``src`` en el path, pero Python carga cada
+    submódulo por separado según el nombre con el que se importe. Los módulos
+    con estado global (pools, cachés, índices) llaman a esta función para que
+    ambos nombres (``utils.db_pool`` y ``src.utils.db_pool``, por ejemplo)
+    resuelvan al mismo objeto y sus singletons sean únicos.
+    """
+    module = _sys.modules[name]
+    relative = name[len('src.'):] if name.startswith('src.') else name
+    for alias in (relative, 'src.' + relative):
+        _sys.modules.setdefault(alias, module)
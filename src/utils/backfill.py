@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Backfill incremental por rangos de id para índices derivados de ``articles``.
+
+Al crear un índice derivado (FTS, feed del dashboard) sobre una tabla que ya
+tiene filas, el arranque solo crea el esquema y los triggers y anota el rango
+de ids pendiente en una tabla de estado de una sola fila::
+
+    done_through   último id ya procesado
+    pending_below  primer id que los triggers mantienen desde el principio
+
+Las filas nuevas las mantienen los triggers desde el primer momento; las
+existentes se procesan en lotes cortos (``run_backfill``), cada uno como una
+operación de la cola de escritura, desde la CLI o una tarea en segundo plano.
+Al terminar se borra la fila de estado.
+"""
+
+import sqlite3
+from typing import Optional
+
+BACKFILL_BATCH_SIZE = 2000
+
+
+def create_backfill_state(conn: sqlite3.Connection, state_table: str) -> bool:
+    """
+    Crear la tabla de estado y anotar como pendientes las filas actuales de
+    ``articles``. Devuelve True si hay filas que rellenar.
+    """
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS {state_table} (
+            done_through INTEGER NOT NULL,
+            pending_below INTEGER NOT NULL
+        )
+    """)
+    conn.execute(f"DELETE FROM {state_table}")
+    cursor = conn.execute(f"""
+        INSERT INTO {state_table} (done_through, pending_below)
+        SELECT MIN(id) - 1, MAX(id) + 1 FROM articles HAVING COUNT(*) > 0
+    """)
+    return cursor.rowcount > 0
+
+
+def outside_pending_range(state_table: str, id_expr: str) -> str:
+    """Expresión SQL: ``id_expr`` no está en el rango que falta por rellenar."""
+    return (f"NOT EXISTS (SELECT 1 FROM {state_table} "
+            f"WHERE {id_expr} > done_through AND {id_expr} < pending_below)")
+
+
+def backfill_pending(conn: sqlite3.Connection, state_table: str) -> bool:
+    """Comprobar si queda un backfill a medias."""
+    try:
+        return conn.execute(f"SELECT 1 FROM {state_table}").fetchone() is not None
+    except sqlite3.OperationalError:
+        return False
+
+
+def backfill_batch(conn: sqlite3.Connection, state_table: str, statement: str,
+                   batch_size: int = BACKFILL_BATCH_SIZE) -> Optional[int]:
+    """
+    Procesar el siguiente lote de ids. ``statement`` recibe los límites
+    ``(desde, hasta]`` como parámetros. Devuelve las filas procesadas, o None
+    si no queda nada. No hace commit.
+    """
+    row = conn.execute(f"SELECT done_through, pending_below FROM {state_table}").fetchone()
+    if row is None:
+        return None
+
+    done_through, pending_below = row
+    upper = min(done_through + batch_size, pending_below - 1)
+    processed = conn.execute(statement, (done_through, upper)).rowcount
+    if upper >= pending_below - 1:
+        conn.execute(f"DELETE FROM {state_table}")
+    else:
+        conn.execute(f"UPDATE {state_table} SET done_through = ?", (upper,))
+    return processed
+
+
+def run_backfill(db_path: str, state_table: str, statement: str,
+                 batch_size: int = BACKFILL_BATCH_SIZE) -> int:
+    """
+    Completar el backfill pendiente en ``db_path``. Cada lote es una operación
+    del hilo escritor, así que la ingestión sigue escribiendo entre lotes.
+    """
+    from .db_pool import connect, get_pool
+
+    with connect(db_path) as conn:
+        if not backfill_pending(conn, state_table):
+            return 0
+
+    pool = get_pool(db_path)
+    total = 0
+    while True:
+        processed = pool.submit(
+            lambda conn: backfill_batch(conn, state_table, statement, batch_size)).result()
+        if processed is None:
+            return total
+        total += processed
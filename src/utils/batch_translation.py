@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Traducción por lotes con deduplicación y cache compartido.
+
+Los textos de un lote (títulos y contenidos de un feed, resúmenes de una
+consulta...) se parten en frases y cada frase distinta se traduce una sola
+vez: las agencias repiten mucho texto entre artículos.
+
+- ``TranslationCache``: LRU acotado en memoria delante de una tabla SQLite
+  con clave primaria (hash, idioma origen, idioma destino). Las frases de
+  un lote se buscan con una sola consulta ``IN`` (por bloques de 900).
+- ``BatchTranslator``: solo las frases que no están en cache llegan al
+  backend, agrupadas en peticiones de hasta ``max_chars`` caracteres
+  (una frase por línea). Si el backend no devuelve el mismo número de
+  líneas, esa petición se repite frase a frase.
+- ``get_stats()`` expone aciertos de memoria/disco, fallos, peticiones al
+  backend y tasa de deduplicación.
+"""
+
+import os
+import re
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from . import share_module
+from .db_pool import connect as db_connect, get_pool
+
+share_module(__name__)
+
+logger = logging.getLogger(__name__)
+
+# Anclado a la raíz del proyecto: el cache es el mismo sea cual sea el directorio de arranque
+BASE_DIR = Path(__file__).resolve().parents[2]
+DEFAULT_DB_PATH = os.getenv('TRANSLATION_CACHE_DB', str(BASE_DIR / 'data' / 'translation_cache.db'))
+DEFAULT_MEMORY_ENTRIES = 50000
+
+# Límite de parámetros por consulta de SQLite
+SQL_CHUNK = 900
+
+# Tamaño de cada petición agrupada al backend
+MAX_REQUEST_CHARS = 4500
+MAX_REQUEST_SENTENCES = 60
+
+# Fin de frase seguido de espacio y mayúscula/dígito/comilla, o saltos de línea.
+# El grupo de captura conserva los separadores para reconstruir el texto.
+SENTENCE_SPLIT_RE = re.compile(r'((?<=[.!?…])\s+(?=["\'«“(¿¡]?[A-ZÀ-ÖØ-Þ0-9])|\s*\n\s*)')
+
+# Backend: (texto, idioma origen, idioma destino) -> traducción o None si falla
+TranslateFn = Callable[[str, str, str], Optional[str]]
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def split_sentences(text: str) -> List[str]:
+    """
+    Partir un texto en segmentos alternos [frase, separador, frase, ...];
+    ``''.join(segmentos) == text``.
+    """
+    return SENTENCE_SPLIT_RE.split(text) if text else []
+
+
+def _needs_translation(sentence: str) -> bool:
+    return any(char.isalpha() for char in sentence)
+
+
+class TranslationCache:
+    """LRU en memoria + tabla SQLite indexada por (hash, origen, destino)."""
+
+    def __init__(self, db_path: str = DEFAULT_DB_PATH, memory_entries: int = DEFAULT_MEMORY_ENTRIES):
+        self.db_path = db_path
+        self.memory_entries = memory_entries
+        self._memory: 'OrderedDict[Tuple[str, str, str], str]' = OrderedDict()
+        self._lock = threading.Lock()
+
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        with db_connect(db_path) as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS translation_cache (
+                    text_hash TEXT NOT NULL,
+                    source_lang TEXT NOT NULL,
+                    target_lang TEXT NOT NULL,
+                    translated_text TEXT NOT NULL,
+                    backend TEXT,
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (text_hash, source_lang, target_lang)
+                ) WITHOUT ROWID
+            """)
+
+    def __len__(self):
+        return len(self._memory)
+
+    def _remember(self, key: Tuple[str, str, str], translation: str):
+        self._memory[key] = translation
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def get_many(self, hashes: Iterable[str], source_lang: str,
+                 target_lang: str) -> Tuple[Dict[str, str], int]:
+        """
+        Traducciones en cache para ``hashes``. Devuelve (hash -> traducción,
+        número de aciertos servidos desde memoria).
+        """
+        found: Dict[str, str] = {}
+        missing: List[str] = []
+        with self._lock:
+            for digest in hashes:
+                key = (digest, source_lang, target_lang)
+                translation = self._memory.get(key)
+                if translation is None:
+                    missing.append(digest)
+                else:
+                    self._memory.move_to_end(key)
+                    found[digest] = translation
+        memory_hits = len(found)
+
+        if missing:
+            with db_connect(self.db_path) as conn:
+                for start in range(0, len(missing), SQL_CHUNK):
+                    chunk = missing[start:start + SQL_CHUNK]
+                    placeholders = ','.join('?' * len(chunk))
+                    rows = conn.execute(f"""
+                        SELECT text_hash, translated_text FROM translation_cache
+                        WHERE source_lang = ? AND target_lang = ? AND text_hash IN ({placeholders})
+                    """, (source_lang, target_lang, *chunk)).fetchall()
+                    found.update(rows)
+            with self._lock:
+                for digest in missing:
+                    if digest in found:
+                        self._remember((digest, source_lang, target_lang), found[digest])
+        return found, memory_hits
+
+    def put_many(self, translations: Dict[str, str], source_lang: str, target_lang: str,
+                 backend: Optional[str] = None):
+        """Guardar traducciones (hash -> texto) en memoria y en disco."""
+        if not translations:
+            return
+        with self._lock:
+            for digest, translation in translations.items():
+                self._remember((digest, source_lang, target_lang), translation)
+        now = time.time()
+        get_pool(self.db_path).submit_write("""
+            INSERT OR REPLACE INTO translation_cache
+            (text_hash, source_lang, target_lang, translated_text, backend, created_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, [(digest, source_lang, target_lang, translation, backend, now)
+              for digest, translation in translations.items()], many=True).result()
+
+    def entry_count(self) -> int:
+        with db_connect(self.db_path) as conn:
+            return conn.execute("SELECT COUNT(*) FROM translation_cache").fetchone()[0]
+
+
+class BatchTranslator:
+    """Traducir lotes de textos frase a frase, con cache y peticiones agrupadas."""
+
+    STAT_KEYS = ('texts', 'sentences', 'unique_sentences', 'memory_hits', 'disk_hits', 'misses',
+                 'backend_requests', 'backend_sentences', 'backend_failures', 'split_fallbacks')
+
+    def __init__(self, translate_fn: TranslateFn, cache: Optional[TranslationCache] = None,
+                 backend_name: Optional[str] = None, max_chars: int = MAX_REQUEST_CHARS,
+                 max_sentences: int = MAX_REQUEST_SENTENCES):
+        self.translate_fn = translate_fn
+        self.cache = cache if cache is not None else get_translation_cache()
+        self.backend_name = backend_name
+        self.max_chars = max_chars
+        self.max_sentences = max_sentences
+        self._stats = dict.fromkeys(self.STAT_KEYS, 0)
+        self._lock = threading.Lock()
+
+    def _count(self, **amounts):
+        with self._lock:
+            for key, amount in amounts.items():
+                self._stats[key] += amount
+
+    def translate_batch(self, texts: List[str], source_lang: str, target_lang: str = 'es') -> List[str]:
+        """
+        Traducir ``texts`` de ``source_lang`` a ``target_lang``. Las frases que
+        no se pueden traducir se devuelven sin cambios (y no se cachean).
+        """
+        segmented = [split_sentences(text or '') for text in texts]
+
+        # Frases únicas del lote, en orden de aparición
+        unique: Dict[str, str] = {}
+        total = 0
+        for segments in segmented:
+            for sentence in segments[::2]:
+                sentence = sentence.strip()
+                if sentence and _needs_translation(sentence):
+                    total += 1
+                    unique.setdefault(text_hash(sentence), sentence)
+
+        translations, memory_hits = self.cache.get_many(unique, source_lang, target_lang)
+        misses = {digest: sentence for digest, sentence in unique.items() if digest not in translations}
+        self._count(texts=len(texts), sentences=total, unique_sentences=len(unique),
+                    memory_hits=memory_hits, disk_hits=len(translations) - memory_hits,
+                    misses=len(misses))
+
+        if misses:
+            fresh = self._translate_misses(misses, source_lang, target_lang)
+            self.cache.put_many(fresh, source_lang, target_lang, self.backend_name)
+            translations.update(fresh)
+
+        results = []
+        for text, segments in zip(texts, segmented):
+            if not segments:
+                results.append(text)
+                continue
+            parts = []
+            for position, segment in enumerate(segments):
+                stripped = segment.strip()
+                if position % 2 == 0 and stripped:
+                    translated = translations.get(text_hash(stripped))
+                    if translated is not None:
+                        segment = segment.replace(stripped, translated, 1)
+                parts.append(segment)
+            results.append(''.join(parts))
+        return results
+
+    def _groups(self, sentences: List[Tuple[str, str]]):
+        """Agrupar (hash, frase) en peticiones acotadas en caracteres y frases."""
+        group, size = [], 0
+        for item in sentences:
+            length = len(item[1]) + 1
+            if group and (size + length > self.max_chars or len(group) >= self.max_sentences):
+                yield group
+                group, size = [], 0
+            group.append(item)
+            size += length
+        if group:
+            yield group
+
+    def _call(self, text: str, source_lang: str, target_lang: str) -> Optional[str]:
+        self._count(backend_requests=1)
+        try:
+            return self.translate_fn(text, source_lang, target_lang)
+        except Exception as e:
+            logger.warning(f"⚠️ Error del backend de traducción: {e}")
+            return None
+
+    def _translate_misses(self, misses: Dict[str, str], source_lang: str,
+                          target_lang: str) -> Dict[str, str]:
+        fresh: Dict[str, str] = {}
+        for group in self._groups(list(misses.items())):
+            # Las frases no contienen saltos de línea: una por línea en la petición
+            translated = self._call('\n'.join(sentence for _, sentence in group), source_lang, target_lang)
+            lines = translated.split('\n') if translated else []
+            if len(lines) == len(group):
+                results = lines
+            elif len(group) == 1:
+                results = [translated]
+            else:
+                self._count(split_fallbacks=1)
+                results = [self._call(sentence, source_lang, target_lang) for _, sentence in group]
+
+            for (digest, _), line in zip(group, results):
+                line = line.strip() if line else ''
+                if line:
+                    fresh[digest] = line
+                else:
+                    self._count(backend_failures=1)
+            self._count(backend_sentences=len(group))
+        return fresh
+
+    def get_stats(self) -> Dict:
+        """Contadores acumulados, tasas de acierto y de deduplicación."""
+        with self._lock:
+            stats = dict(self._stats)
+        lookups = stats['unique_sentences']
+        hits = stats['memory_hits'] + stats['disk_hits']
+        stats['hit_rate'] = round(hits / lookups, 4) if lookups else 0.0
+        stats['dedup_ratio'] = round(1 - lookups / stats['sentences'], 4) if stats['sentences'] else 0.0
+        stats['memory_entries'] = len(self.cache)
+        return stats
+
+
+_cache: Optional[TranslationCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_translation_cache() -> TranslationCache:
+    """Cache de traducciones compartido del proceso."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = TranslationCache()
+        return _cache
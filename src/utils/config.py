@@ -15,6 +15,10 @@ import threading
 
 from pydantic import BaseModel, Field, validator, ValidationError
 
+from .fulltext_search import ensure_fts_index
+from .dashboard_feed import ensure_dashboard_feed
+from .db_pool import get_pool
+
 # Cargar variables de entorno desde .env
 load_dotenv()
 
@@ -163,8 +167,12 @@ class DatabaseManager:
         self._setup_database()
 
     def get_connection(self):
-        """Devuelve una conexión SQLite thread-safe."""
-        return sqlite3.connect(self.db_path, check_same_thread=False)
+        """Devuelve una conexión SQLite reutilizada por hilo (WAL + pragmas del pool)."""
+        return get_pool(self.db_path).connect()
+
+    def get_pool_metrics(self) -> Dict[str, Any]:
+        """Métricas del pool: espera de conexión, errores de bloqueo, cola de escritura."""
+        return get_pool(self.db_path).get_metrics()
 
     def _setup_database(self):
         Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
@@ -224,6 +232,14 @@ class DatabaseManager:
                 pass
 
             conn.commit()
+
+            # Índice FTS5 y feed del dashboard: aquí solo esquema y triggers; el
+            # backfill de los artículos existentes va en segundo plano o por CLI
+            try:
+                ensure_fts_index(conn)
+            except sqlite3.OperationalError as e:
+                logger.warning(f"Índice FTS5 no disponible: {e}")
+            ensure_dashboard_feed(conn)
         except Exception as e:
             logger.error(f"Error init DB: {e}")
             conn.rollback()
@@ -5,9 +5,11 @@ Content Classifier for Geopolitical Intelligence System
 
 import re
 import logging
-from typing import Dict, List
+from typing import Dict, List, Optional
 from pathlib import Path
 
+from .keyword_matcher import KeywordMatcher, KeywordScan
+
 logger = logging.getLogger(__name__)
 
 class ContentClassifier:
@@ -192,35 +194,48 @@ class ContentClassifier:
                 'weight': 1.0  # High weight to ensure sports content is identified
             }
         }
+        
+        # Strong sports indicators that should immediately classify as sports
+        self.strong_sports_indicators = [
+            'cricket', 'críquet', 'pcb', 'bcci', 'icc',  # Cricket specific
+            'fifa', 'uefa', 'nba', 'nfl', 'mlb', 'nhl',  # Major sports organizations
+            'olympics', 'olímpicos', 'world cup', 'mundial',  # Major events
+            'championship', 'campeonato', 'tournament', 'torneo',  # Competitions
+            'player', 'jugador', 'coach', 'entrenador',  # Sports roles
+            'stadium', 'estadio', 'match', 'partido',  # Sports venues/events
+            'team', 'equipo', 'league', 'liga',  # Sports organizations
+            'goal', 'gol', 'score', 'marcador', 'victory', 'victoria'  # Sports outcomes
+        ]
+        
+        # All keyword sets compiled once; a single scan yields every count
+        groups = {category: data['keywords'] for category, data in self.categories.items()}
+        groups['_strong_sports'] = self.strong_sports_indicators
+        self.matcher = KeywordMatcher(groups)
+    
+    def scan(self, text: str) -> KeywordScan:
+        """Match every keyword group against the text in one pass."""
+        return self.matcher.scan(text)
+    
+    def _score(self, scan: KeywordScan, category: str) -> float:
+        data = self.categories[category]
+        return (scan.counts[category] / len(data['keywords'])) * data['weight']
     
     def classify(self, text: str) -> str:
         """Classify text into the most relevant geopolitical category."""
         try:
-            text_lower = text.lower()
+            scan = self.scan(text)
             
             # First check if it's sports/entertainment content
-            if self._is_sports_entertainment(text_lower):
+            if self._is_sports_entertainment(text, scan):
                 return 'sports_entertainment'
             
             # Calculate scores for each geopolitical category
-            category_scores = {}
-            
-            for category, data in self.categories.items():
+            category_scores = {
+                category: self._score(scan, category)
+                for category in self.categories
                 # Skip sports_entertainment category in geopolitical classification
-                if category == 'sports_entertainment':
-                    continue
-                    
-                keywords = data['keywords']
-                weight = data['weight']
-                
-                matches = 0
-                for keyword in keywords:
-                    if keyword.lower() in text_lower:
-                        matches += 1
-                
-                # Calculate weighted score
-                score = (matches / len(keywords)) * weight
-                category_scores[category] = score
+                if category != 'sports_entertainment'
+            }
             
             # Find category with highest score
             if category_scores:
@@ -238,53 +253,23 @@ class ContentClassifier:
             logger.error(f"Content classification error: {e}")
             return 'general_news'
     
-    def _is_sports_entertainment(self, text: str) -> bool:
+    def _is_sports_entertainment(self, text: str, scan: Optional[KeywordScan] = None) -> bool:
         """Check if text is primarily about sports or entertainment."""
-        sports_keywords = self.categories['sports_entertainment']['keywords']
-        
-        # Count sports/entertainment keyword matches
-        matches = sum(1 for keyword in sports_keywords if keyword.lower() in text)
-        
-        # Strong sports indicators that should immediately classify as sports
-        strong_sports_indicators = [
-            'cricket', 'críquet', 'pcb', 'bcci', 'icc',  # Cricket specific
-            'fifa', 'uefa', 'nba', 'nfl', 'mlb', 'nhl',  # Major sports organizations
-            'olympics', 'olímpicos', 'world cup', 'mundial',  # Major events
-            'championship', 'campeonato', 'tournament', 'torneo',  # Competitions
-            'player', 'jugador', 'coach', 'entrenador',  # Sports roles
-            'stadium', 'estadio', 'match', 'partido',  # Sports venues/events
-            'team', 'equipo', 'league', 'liga',  # Sports organizations
-            'goal', 'gol', 'score', 'marcador', 'victory', 'victoria'  # Sports outcomes
-        ]
+        if scan is None:
+            scan = self.scan(text)
         
         # Check for strong sports indicators
-        text_lower = text.lower()
-        for indicator in strong_sports_indicators:
-            if indicator.lower() in text_lower:
-                return True
+        if scan.counts['_strong_sports']:
+            return True
         
         # If we have multiple sports keywords, it's likely sports content
-        return matches >= 2
+        return scan.counts['sports_entertainment'] >= 2
     
     def get_category_scores(self, text: str) -> Dict[str, float]:
         """Get scores for all categories."""
         try:
-            text_lower = text.lower()
-            category_scores = {}
-            
-            for category, data in self.categories.items():
-                keywords = data['keywords']
-                weight = data['weight']
-                
-                matches = 0
-                for keyword in keywords:
-                    if keyword.lower() in text_lower:
-                        matches += 1
-                
-                score = (matches / len(keywords)) * weight
-                category_scores[category] = round(score, 3)
-            
-            return category_scores
+            scan = self.scan(text)
+            return {category: round(self._score(scan, category), 3) for category in self.categories}
             
         except Exception as e:
             logger.error(f"Category scoring error: {e}")
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Feed precalculado del dashboard (artículos héroe y mosaico).
+
+El filtro de elegibilidad del dashboard (imagen de una fuente de noticias
+real, artículo en español o traducido, sin temas ajenos a la geopolítica) y
+la prioridad de ordenación se calculan al escribir el artículo, no al leerlo:
+
+- ``dashboard_eligible``: 1 si el artículo puede aparecer en el dashboard
+- ``dashboard_priority``: nivel de riesgo * 1000 + risk_score
+
+Los triggers de ``articles`` recalculan ambas columnas en cada INSERT y en
+cada UPDATE de las columnas de las que dependen (ingestión, enriquecimiento,
+re-evaluación de riesgo), y el índice ``idx_articles_dashboard_feed`` convierte
+la consulta del dashboard en una lectura por rango del índice.
+
+Al crear el feed, los artículos que ya existían quedan con
+``dashboard_eligible = 0`` hasta que ``backfill_dashboard_feed`` los calcula
+en lotes (tarea en segundo plano o CLI, desde ``src/``)::
+
+    python -m utils.dashboard_feed --db ../data/geopolitical_intel.db
+"""
+
+import time
+import sqlite3
+import logging
+from typing import Any, Dict, List, Optional
+
+from .backfill import BACKFILL_BATCH_SIZE, backfill_pending, create_backfill_state, run_backfill
+
+logger = logging.getLogger(__name__)
+
+# Fragmentos de URL de imagen que indican imágenes genéricas o de stock
+EXCLUDED_IMAGE_PATTERNS = [
+    'placeholder', 'default', 'noimage', 'unsplash.com', 'pexels.com',
+    'pixabay.com', 'fallback', 'stock', 'generic',
+]
+
+# Dominios de medios cuyas imágenes se consideran originales
+NEWS_IMAGE_DOMAINS = [
+    'reuters.com', 'bbc.co.uk', 'cnn.com', 'apnews.com', 'france24.com',
+    'aljazeera.com', 'bloomberg.com', 'theguardian.com', 'washingtonpost.com',
+    'nytimes.com', 'ft.com', 'wsj.com', 'elmundo.es', 'elpais.com',
+    'lavanguardia.com', 'abc.es', 'marca.com', 'expansion.com',
+]
+
+# Términos de título que excluyen artículos no geopolíticos
+EXCLUDED_TITLE_TERMS = [
+    'meteor', 'asteroid', 'space', 'sports', 'deporte', 'football', 'soccer',
+    'tennis', 'basketball', 'olympic', 'celebrity', 'entertainment', 'weather',
+    'climate', 'technology', 'tech', 'gadget', 'iphone', 'samsung', 'health',
+    'medical', 'covid', 'vaccine',
+]
+
+RISK_PRIORITY = {'high': 3, 'medium': 2, 'low': 1}
+
+# Columnas de las que depende el feed; un UPDATE de cualquiera lo recalcula
+SOURCE_COLUMNS = [
+    'title', 'image_url', 'language', 'is_translated', 'original_language',
+    'is_excluded', 'risk_level', 'risk_score',
+]
+
+FEED_COLUMNS = """
+    id, title, content, url, source, published_at,
+    country, region, risk_level, conflict_type,
+    sentiment_score, summary, risk_score, image_url
+"""
+
+FEED_ORDER = "dashboard_priority DESC, published_at DESC, id DESC"
+
+FEED_BACKFILL_TABLE = 'dashboard_feed_backfill'
+
+
+def _eligibility_sql(prefix: str) -> str:
+    """Expresión SQL de elegibilidad sobre las columnas de ``prefix`` (new/articles)."""
+    image = f"{prefix}.image_url"
+    clauses = [
+        f"({prefix}.is_excluded IS NULL OR {prefix}.is_excluded != 1)",
+        f"{image} IS NOT NULL AND {image} != ''",
+        f"{image} NOT LIKE 'data:image%'",
+    ]
+    clauses += [f"{image} NOT LIKE '%{p}%'" for p in EXCLUDED_IMAGE_PATTERNS]
+    clauses.append('(' + ' OR '.join(f"{image} LIKE '%{d}%'" for d in NEWS_IMAGE_DOMAINS) + ')')
+    clauses.append(f"({prefix}.language = 'es' OR "
+                   f"({prefix}.is_translated = 1 AND {prefix}.original_language IS NOT NULL))")
+    clauses += [f"{prefix}.title NOT LIKE '%{t}%'" for t in EXCLUDED_TITLE_TERMS]
+    return '(CASE WHEN ' + '\n AND '.join(clauses) + ' THEN 1 ELSE 0 END)'
+
+
+def _priority_sql(prefix: str) -> str:
+    """Expresión SQL de prioridad: nivel de riesgo domina, luego risk_score."""
+    levels = ' '.join(f"WHEN '{level}' THEN {weight}" for level, weight in RISK_PRIORITY.items())
+    return (f"((CASE {prefix}.risk_level {levels} ELSE 0 END) * 1000.0 "
+            f"+ COALESCE({prefix}.risk_score, 0.0))")
+
+
+def _refresh_statement(prefix: str) -> str:
+    return (f"UPDATE articles SET dashboard_eligible = {_eligibility_sql(prefix)}, "
+            f"dashboard_priority = {_priority_sql(prefix)}")
+
+
+def is_dashboard_feed_ready(conn: sqlite3.Connection) -> bool:
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = 'articles_dashboard_feed_ai'"
+    ).fetchone()
+    return row is not None
+
+
+def ensure_dashboard_feed(conn: sqlite3.Connection) -> bool:
+    """
+    Crear columnas, índice y triggers del feed si faltan. Las filas existentes
+    quedan pendientes para ``backfill_dashboard_feed``. Devuelve True si el
+    feed se ha creado ahora.
+    """
+    if is_dashboard_feed_ready(conn):
+        return False
+
+    start_time = time.time()
+    cursor = conn.cursor()
+    cursor.execute("PRAGMA table_info(articles)")
+    existing = {row[1] for row in cursor.fetchall()}
+
+    for name, definition in [
+        ('is_excluded', 'INTEGER DEFAULT 0'),
+        ('is_translated', 'INTEGER DEFAULT 0'),
+        ('original_language', 'TEXT'),
+        ('risk_score', 'REAL'),
+        ('dashboard_eligible', 'INTEGER DEFAULT 0'),
+        ('dashboard_priority', 'REAL DEFAULT 0'),
+    ]:
+        if name not in existing:
+            cursor.execute(f"ALTER TABLE articles ADD COLUMN {name} {definition}")
+
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_articles_dashboard_feed
+        ON articles(dashboard_eligible, dashboard_priority DESC, published_at DESC, id DESC)
+    """)
+
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS articles_dashboard_feed_ai AFTER INSERT ON articles BEGIN
+            {_refresh_statement('new')} WHERE id = new.id;
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS articles_dashboard_feed_au
+        AFTER UPDATE OF {', '.join(SOURCE_COLUMNS)} ON articles BEGIN
+            {_refresh_statement('new')} WHERE id = new.id;
+        END
+    """)
+
+    pending = create_backfill_state(conn, FEED_BACKFILL_TABLE)
+    conn.commit()
+
+    logger.info(f"✅ Feed del dashboard creado en {time.time() - start_time:.2f}s"
+                + (" (backfill pendiente)" if pending else ""))
+    return True
+
+
+def dashboard_feed_backfill_pending(conn: sqlite3.Connection) -> bool:
+    """Comprobar si quedan artículos existentes sin calcular."""
+    return backfill_pending(conn, FEED_BACKFILL_TABLE)
+
+
+def backfill_dashboard_feed(db_path: str, batch_size: int = BACKFILL_BATCH_SIZE) -> Dict[str, Any]:
+    """Calcular en lotes elegibilidad y prioridad de los artículos pendientes."""
+    start_time = time.time()
+    statement = _refresh_statement('articles') + " WHERE id > ? AND id <= ?"
+    refreshed = run_backfill(db_path, FEED_BACKFILL_TABLE, statement, batch_size)
+    elapsed = time.time() - start_time
+    if refreshed:
+        logger.info(f"✅ Backfill del feed del dashboard: {refreshed} artículos en {elapsed:.2f}s")
+    return {'refreshed': refreshed, 'elapsed_time': elapsed}
+
+
+def get_dashboard_articles(conn: sqlite3.Connection, limit: int,
+                           exclude_id: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Leer los ``limit`` artículos de mayor prioridad, una sola vez por imagen.
+
+    La consulta recorre el índice del feed en orden y se detiene en cuanto
+    hay suficientes artículos con imágenes distintas.
+    """
+    sql = f"""
+        SELECT {FEED_COLUMNS}
+        FROM articles INDEXED BY idx_articles_dashboard_feed
+        WHERE dashboard_eligible = 1
+    """
+    params: List[Any] = []
+    if exclude_id is not None:
+        sql += " AND id != ?"
+        params.append(exclude_id)
+    sql += f" ORDER BY {FEED_ORDER}"
+
+    cursor = conn.execute(sql, params)
+    columns = [desc[0] for desc in cursor.description]
+
+    seen_images = set()
+    articles = []
+    for row in cursor:
+        article = dict(zip(columns, row))
+        if article['image_url'] in seen_images:
+            continue
+        seen_images.add(article['image_url'])
+        articles.append(article)
+        if len(articles) >= limit:
+            break
+    cursor.close()
+    return articles
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Backfill del feed precalculado del dashboard")
+    parser.add_argument('--db', default='data/geopolitical_intel.db')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    result = backfill_dashboard_feed(args.db)
+    print(f"Refreshed {result['refreshed']} articles in {result['elapsed_time']:.2f}s")
@@ -0,0 +1,461 @@
+#!/usr/bin/env python3
+"""
+Capa compartida de conexiones SQLite.
+
+- Modo WAL y pragmas ajustados (busy_timeout, synchronous=NORMAL, mmap_size,
+  cache_size, temp_store) aplicados a cada conexión.
+- Conexiones reutilizadas por hilo: ``close()`` devuelve la conexión a la
+  reserva del hilo en lugar de cerrarla, de modo que el código existente
+  (``conn = connect(...)`` / ``conn.close()`` y ``with connect(...) as conn``)
+  funciona sin cambios. A diferencia de ``sqlite3``, salir del bloque ``with``
+  también devuelve la conexión: la conexión y sus cursores dejan de ser
+  utilizables fuera del bloque.
+- ``cache_size`` y ``mmap_size`` son por conexión; se ajustan con
+  ``SQLITE_CACHE_SIZE_KB`` y ``SQLITE_MMAP_SIZE``.
+- Un único hilo escritor por base de datos para escritores en segundo plano
+  (enriquecimiento, traducción, satélite): las escrituras encoladas se agrupan
+  en una sola transacción, con un SAVEPOINT por operación.
+- Métricas: tiempo de espera para obtener conexión, errores ``database is
+  locked``, profundidad y latencia de la cola de escritura.
+
+Uso::
+
+    from utils.db_pool import connect, get_pool
+
+    conn = connect(db_path)                 # sustituto directo de sqlite3.connect
+    get_pool(db_path).submit_write(
+        "UPDATE articles SET risk_level = ? WHERE id = ?", (level, article_id))
+"""
+
+import os
+import time
+import queue
+import atexit
+import sqlite3
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from . import share_module
+
+share_module(__name__)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUSY_TIMEOUT_MS = 30000
+# Cada hilo de Flask mantiene sus propias conexiones: page cache y mmap se
+# multiplican por el número de conexiones abiertas, así que se parte de valores
+# moderados y se pueden ajustar por entorno.
+DEFAULT_CACHE_SIZE_KB = int(os.getenv('SQLITE_CACHE_SIZE_KB', 8192))     # 8 MB por conexión
+DEFAULT_MMAP_SIZE = int(os.getenv('SQLITE_MMAP_SIZE', 67108864))         # 64 MB
+MAX_IDLE_PER_THREAD = 4
+WRITER_BATCH_SIZE = 200
+
+RELEASED_MESSAGE = "Cannot operate on a connection returned to the pool."
+
+
+def _is_lock_error(error: Exception) -> bool:
+    message = str(error).lower()
+    return 'locked' in message or 'busy' in message
+
+
+class PooledCursor(sqlite3.Cursor):
+    """
+    Cursor que contabiliza los errores de bloqueo en las métricas del pool y
+    deja de funcionar cuando el préstamo que lo creó se devuelve al pool.
+    """
+
+    _lease: Optional['PooledConnection'] = None
+
+    def _check_lease(self):
+        if self._lease is not None and self._lease._conn is None:
+            raise sqlite3.ProgrammingError(RELEASED_MESSAGE)
+
+    def execute(self, *args, **kwargs):
+        self._check_lease()
+        try:
+            return super().execute(*args, **kwargs)
+        except sqlite3.OperationalError as e:
+            self.connection._record_error(e)
+            raise
+
+    def executemany(self, *args, **kwargs):
+        self._check_lease()
+        try:
+            return super().executemany(*args, **kwargs)
+        except sqlite3.OperationalError as e:
+            self.connection._record_error(e)
+            raise
+
+    def executescript(self, *args, **kwargs):
+        self._check_lease()
+        try:
+            return super().executescript(*args, **kwargs)
+        except sqlite3.OperationalError as e:
+            self.connection._record_error(e)
+            raise
+
+    def fetchone(self):
+        self._check_lease()
+        return super().fetchone()
+
+    def fetchmany(self, *args, **kwargs):
+        self._check_lease()
+        return super().fetchmany(*args, **kwargs)
+
+    def fetchall(self):
+        self._check_lease()
+        return super().fetchall()
+
+    def __next__(self):
+        self._check_lease()
+        return super().__next__()
+
+
+class _PoolConnection(sqlite3.Connection):
+    """Conexión SQLite real que guarda el pool; nunca sale del módulo sin préstamo."""
+
+    _pool: Optional['SQLitePool'] = None
+
+    def cursor(self, factory=PooledCursor):
+        return super().cursor(factory)
+
+    def execute(self, *args, **kwargs):
+        return self.cursor().execute(*args, **kwargs)
+
+    def executemany(self, *args, **kwargs):
+        return self.cursor().executemany(*args, **kwargs)
+
+    def executescript(self, *args, **kwargs):
+        return self.cursor().executescript(*args, **kwargs)
+
+    def _record_error(self, error: Exception):
+        if self._pool is not None and _is_lock_error(error):
+            self._pool._count('lock_errors')
+
+
+class PooledConnection:
+    """
+    Préstamo de una conexión del pool con la interfaz de ``sqlite3.Connection``.
+
+    ``close()`` (o salir del bloque ``with``) devuelve la conexión a la reserva
+    del hilo; a partir de ese momento el préstamo y sus cursores lanzan
+    ``sqlite3.ProgrammingError`` en lugar de operar sobre una conexión que otro
+    ``connect()`` del mismo hilo puede estar usando.
+    """
+
+    def __init__(self, pool: 'SQLitePool', conn: _PoolConnection):
+        object.__setattr__(self, '_pool', pool)
+        object.__setattr__(self, '_conn', conn)
+
+    def _connection(self) -> _PoolConnection:
+        conn = self._conn
+        if conn is None:
+            raise sqlite3.ProgrammingError(RELEASED_MESSAGE)
+        return conn
+
+    def __getattr__(self, name):
+        return getattr(self._connection(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self._connection(), name, value)
+
+    def cursor(self, factory=PooledCursor):
+        cursor = self._connection().cursor(factory)
+        if isinstance(cursor, PooledCursor):
+            cursor._lease = self
+        return cursor
+
+    def execute(self, *args, **kwargs):
+        return self.cursor().execute(*args, **kwargs)
+
+    def executemany(self, *args, **kwargs):
+        return self.cursor().executemany(*args, **kwargs)
+
+    def executescript(self, *args, **kwargs):
+        return self.cursor().executescript(*args, **kwargs)
+
+    def close(self):
+        conn = self._conn
+        if conn is not None:
+            object.__setattr__(self, '_conn', None)
+            self._pool._release(conn)
+
+    def __enter__(self):
+        self._connection()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if self._conn is None:
+            return False
+        result = self._conn.__exit__(exc_type, exc_value, traceback)
+        self.close()
+        return result
+
+
+class SQLitePool:
+    """Pool de conexiones por hilo y cola de escritura para una base de datos."""
+
+    def __init__(self, db_path: str, busy_timeout_ms: int = DEFAULT_BUSY_TIMEOUT_MS,
+                 cache_size_kb: int = DEFAULT_CACHE_SIZE_KB, mmap_size: int = DEFAULT_MMAP_SIZE,
+                 max_idle_per_thread: int = MAX_IDLE_PER_THREAD):
+        self.db_path = db_path
+        self.busy_timeout_ms = busy_timeout_ms
+        self.cache_size_kb = cache_size_kb
+        self.mmap_size = mmap_size
+        self.max_idle_per_thread = max_idle_per_thread
+
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._wal_checked = False
+
+        self._write_queue: 'queue.Queue' = queue.Queue()
+        self._writer: Optional[threading.Thread] = None
+
+        self.metrics = {
+            'connections_created': 0,
+            'connections_reused': 0,
+            'acquire_wait_ms_total': 0.0,
+            'acquire_wait_ms_max': 0.0,
+            'lock_errors': 0,
+            'writes_queued': 0,
+            'writes_completed': 0,
+            'writes_failed': 0,
+            'write_batches': 0,
+            'write_queue_wait_ms_total': 0.0,
+            'write_queue_wait_ms_max': 0.0,
+        }
+
+    # ------------------------------------------------------------------
+    # Conexiones
+    # ------------------------------------------------------------------
+
+    def _count(self, key: str, amount=1):
+        with self._lock:
+            self.metrics[key] += amount
+
+    def _observe(self, prefix: str, elapsed_ms: float):
+        with self._lock:
+            self.metrics[f'{prefix}_total'] += elapsed_ms
+            if elapsed_ms > self.metrics[f'{prefix}_max']:
+                self.metrics[f'{prefix}_max'] = elapsed_ms
+
+    def _idle(self) -> list:
+        idle = getattr(self._local, 'idle', None)
+        if idle is None:
+            idle = self._local.idle = []
+        return idle
+
+    def _create_connection(self, isolation_level: Optional[str] = '') -> _PoolConnection:
+        directory = os.path.dirname(self.db_path)
+        if directory and self.db_path != ':memory:':
+            os.makedirs(directory, exist_ok=True)
+
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.busy_timeout_ms / 1000.0,
+            check_same_thread=False,
+            isolation_level=isolation_level,
+            factory=_PoolConnection,
+        )
+        conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute(f"PRAGMA cache_size = -{int(self.cache_size_kb)}")
+        conn.execute(f"PRAGMA mmap_size = {int(self.mmap_size)}")
+        conn.execute("PRAGMA temp_store = MEMORY")
+
+        if not self._wal_checked:
+            with self._lock:
+                if not self._wal_checked:
+                    try:
+                        mode = conn.execute("PRAGMA journal_mode = WAL").fetchone()[0]
+                        if str(mode).lower() != 'wal':
+                            logger.warning(f"⚠️ SQLite WAL no disponible para {self.db_path} (modo: {mode})")
+                    except sqlite3.OperationalError as e:
+                        logger.warning(f"⚠️ No se pudo activar WAL en {self.db_path}: {e}")
+                    self._wal_checked = True
+
+        conn._pool = self
+        self._count('connections_created')
+        return conn
+
+    def connect(self, row_factory=None) -> PooledConnection:
+        """Obtener una conexión del hilo actual (reutilizada si hay alguna libre)."""
+        start = time.perf_counter()
+        idle = self._idle()
+        if idle:
+            conn = idle.pop()
+            self._count('connections_reused')
+        else:
+            conn = self._create_connection()
+        conn.row_factory = row_factory
+        self._observe('acquire_wait_ms', (time.perf_counter() - start) * 1000)
+        return PooledConnection(self, conn)
+
+    def _release(self, conn: _PoolConnection):
+        """Devolver una conexión a la reserva del hilo, sin transacción pendiente."""
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+            conn.row_factory = None
+        except sqlite3.ProgrammingError:
+            return
+
+        idle = self._idle()
+        if len(idle) < self.max_idle_per_thread:
+            idle.append(conn)
+        else:
+            conn.close()
+
+    # ------------------------------------------------------------------
+    # Cola de escritura serializada
+    # ------------------------------------------------------------------
+
+    def submit(self, operation: Callable[[sqlite3.Connection], Any]) -> Future:
+        """
+        Encolar ``operation(conn)`` en el hilo escritor. La operación no debe
+        hacer commit: el escritor confirma cada lote de operaciones de una vez.
+        """
+        future: Future = Future()
+        self._ensure_writer()
+        self._write_queue.put((operation, future, time.perf_counter()))
+        self._count('writes_queued')
+        return future
+
+    def submit_write(self, sql: str, params: Iterable = (), many: bool = False) -> Future:
+        """Encolar una sentencia (o ``executemany`` si ``many``) para el hilo escritor."""
+        if many:
+            return self.submit(lambda conn: conn.executemany(sql, params).rowcount)
+        return self.submit(lambda conn: conn.execute(sql, tuple(params)).rowcount)
+
+    def _ensure_writer(self):
+        if self._writer is not None and self._writer.is_alive():
+            return
+        with self._lock:
+            if self._writer is None or not self._writer.is_alive():
+                self._writer = threading.Thread(target=self._writer_loop,
+                                                name=f"sqlite-writer-{os.path.basename(self.db_path)}",
+                                                daemon=True)
+                self._writer.start()
+
+    def _writer_loop(self):
+        conn = self._create_connection(isolation_level=None)
+        while True:
+            item = self._write_queue.get()
+            if item is None:
+                break
+            batch = [item]
+            stop = False
+            while len(batch) < WRITER_BATCH_SIZE:
+                try:
+                    item = self._write_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+
+            self._run_batch(conn, batch)
+            if stop:
+                break
+        conn.close()
+
+    def _run_batch(self, conn: _PoolConnection, batch: list):
+        results = []
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for operation, future, queued_at in batch:
+                self._observe('write_queue_wait_ms', (time.perf_counter() - queued_at) * 1000)
+                conn.execute("SAVEPOINT pooled_write")
+                try:
+                    results.append((future, operation(conn), None))
+                    conn.execute("RELEASE pooled_write")
+                except Exception as e:
+                    conn.execute("ROLLBACK TO pooled_write")
+                    conn.execute("RELEASE pooled_write")
+                    results.append((future, None, e))
+            conn.execute("COMMIT")
+        except Exception as e:
+            if _is_lock_error(e):
+                self._count('lock_errors')
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            logger.error(f"❌ Error en lote de escritura SQLite ({len(batch)} operaciones): {e}")
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            self._count('writes_failed', len(batch))
+            return
+
+        self._count('write_batches')
+        for future, result, error in results:
+            if error is not None:
+                future.set_exception(error)
+                self._count('writes_failed')
+            else:
+                future.set_result(result)
+                self._count('writes_completed')
+
+    def close_writer(self, timeout: float = 10.0):
+        """Vaciar la cola de escritura y detener el hilo escritor."""
+        if self._writer is not None and self._writer.is_alive():
+            self._write_queue.put(None)
+            self._writer.join(timeout)
+
+    # ------------------------------------------------------------------
+    # Métricas
+    # ------------------------------------------------------------------
+
+    def get_metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            metrics = dict(self.metrics)
+        acquisitions = metrics['connections_created'] + metrics['connections_reused']
+        metrics['acquire_wait_ms_avg'] = (metrics['acquire_wait_ms_total'] / acquisitions
+                                          if acquisitions else 0.0)
+        finished = metrics['writes_completed'] + metrics['writes_failed']
+        metrics['write_queue_wait_ms_avg'] = (metrics['write_queue_wait_ms_total'] / finished
+                                              if finished else 0.0)
+        metrics['write_queue_depth'] = self._write_queue.qsize()
+        metrics['db_path'] = self.db_path
+        return metrics
+
+
+_pools: Dict[str, SQLitePool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(db_path: str) -> SQLitePool:
+    """Pool compartido para ``db_path`` (uno por fichero de base de datos)."""
+    key = db_path if db_path == ':memory:' else os.path.abspath(str(db_path))
+    pool = _pools.get(key)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(key)
+            if pool is None:
+                pool = _pools[key] = SQLitePool(str(db_path))
+    return pool
+
+
+def connect(db_path: str, row_factory=None, **kwargs) -> PooledConnection:
+    """
+    Sustituto directo de ``sqlite3.connect``. Los argumentos adicionales
+    (``timeout``, ``check_same_thread``) se ignoran: los fija el pool.
+    """
+    return get_pool(str(db_path)).connect(row_factory=row_factory)
+
+
+def get_all_metrics() -> Dict[str, Dict[str, Any]]:
+    """Métricas de todos los pools abiertos, por ruta de base de datos."""
+    with _pools_lock:
+        pools = list(_pools.values())
+    return {pool.db_path: pool.get_metrics() for pool in pools}
+
+
+@atexit.register
+def _close_writers():
+    with _pools_lock:
+        pools = list(_pools.values())
+    for pool in pools:
+        pool.close_writer()
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Índice de texto completo (SQLite FTS5) para la búsqueda de artículos.
+
+La tabla virtual ``articles_fts`` es de contenido externo sobre
+``articles(title, content, summary)``: no duplica el texto, solo guarda el
+índice invertido. Los triggers la mantienen sincronizada con cualquier
+INSERT/UPDATE/DELETE sobre ``articles``, así que el camino de ingestión no
+necesita cambios.
+
+Al arrancar solo se crean la tabla y los triggers; los artículos que ya
+existían se indexan en lotes en segundo plano (``backfill_fts_index``) y,
+hasta entonces, los triggers los ignoran y la búsqueda no los devuelve.
+
+Backfill pendiente / reconstrucción completa de una base de datos existente
+(desde ``src/``)::
+
+    python -m utils.fulltext_search --db ../data/geopolitical_intel.db --backfill
+    python -m utils.fulltext_search --db ../data/geopolitical_intel.db
+"""
+
+import re
+import time
+import sqlite3
+import logging
+from typing import Any, Dict, List, Optional
+
+from .backfill import (BACKFILL_BATCH_SIZE, backfill_pending, create_backfill_state,
+                       outside_pending_range, run_backfill)
+
+logger = logging.getLogger(__name__)
+
+FTS_TABLE = 'articles_fts'
+FTS_BACKFILL_TABLE = 'articles_fts_backfill'
+INDEXED_COLUMNS = ('id', 'title', 'content', 'summary')
+
+# Pesos BM25 por columna: title, content, summary
+BM25_WEIGHTS = (10.0, 1.0, 3.0)
+RANK_EXPRESSION = f"bm25({FTS_TABLE}, {', '.join(str(w) for w in BM25_WEIGHTS)})"
+
+SNIPPET_START = '<mark>'
+SNIPPET_END = '</mark>'
+SNIPPET_TOKENS = 16
+
+_TOKEN_RE = re.compile(r'\w+\*?', re.UNICODE)
+
+_SCHEMA = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title, content, summary,
+        content='articles', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3'
+    )
+    """,
+    # Las filas que el backfill aún no ha indexado se ignoran: un 'delete' de
+    # una fila que no está en un índice de contenido externo lo corrompe
+    f"""
+    CREATE TRIGGER IF NOT EXISTS articles_fts_ai AFTER INSERT ON articles
+    WHEN {outside_pending_range(FTS_BACKFILL_TABLE, 'new.id')} BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, content, summary)
+        VALUES (new.id, new.title, new.content, new.summary);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS articles_fts_ad AFTER DELETE ON articles
+    WHEN {outside_pending_range(FTS_BACKFILL_TABLE, 'old.id')} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, content, summary)
+        VALUES ('delete', old.id, old.title, old.content, old.summary);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS articles_fts_au AFTER UPDATE OF title, content, summary ON articles BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, content, summary)
+        SELECT 'delete', old.id, old.title, old.content, old.summary
+        WHERE {outside_pending_range(FTS_BACKFILL_TABLE, 'old.id')};
+        INSERT INTO {FTS_TABLE}(rowid, title, content, summary)
+        SELECT new.id, new.title, new.content, new.summary
+        WHERE {outside_pending_range(FTS_BACKFILL_TABLE, 'new.id')};
+    END
+    """,
+]
+
+_BACKFILL_STATEMENT = f"""
+    INSERT INTO {FTS_TABLE}(rowid, title, content, summary)
+    SELECT id, title, content, summary FROM articles WHERE id > ? AND id <= ?
+"""
+
+
+def fts_index_exists(conn: sqlite3.Connection) -> bool:
+    """Comprobar si la tabla FTS ya existe en la base de datos."""
+    row = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (FTS_TABLE,)
+    ).fetchone()
+    return row is not None
+
+
+def missing_fts_columns(conn: sqlite3.Connection) -> List[str]:
+    """Columnas de ``articles`` que el índice necesita y la tabla no tiene."""
+    columns = {row[1] for row in conn.execute("PRAGMA table_info(articles)")}
+    return [column for column in INDEXED_COLUMNS if column not in columns]
+
+
+def ensure_fts_index(conn: sqlite3.Connection) -> bool:
+    """
+    Crear la tabla FTS y sus triggers si faltan.
+
+    No indexa los artículos existentes: anota su rango de ids como pendiente
+    para ``backfill_fts_index`` y los triggers no los tocan hasta entonces.
+    Si ``articles`` no tiene las columnas indexadas no se crea nada (los
+    triggers romperían cualquier INSERT). Devuelve True si el índice se ha
+    creado ahora.
+    """
+    if fts_index_exists(conn):
+        return False
+
+    missing = missing_fts_columns(conn)
+    if missing:
+        logger.warning(f"⚠️ Índice FTS5 no creado: faltan columnas en articles: {', '.join(missing)}")
+        return False
+
+    start_time = time.time()
+    # sqlite3 confirma cada sentencia DDL por separado; el SAVEPOINT agrupa
+    # tablas, estado del backfill y triggers para que un fallo no deje
+    # triggers a medias.
+    conn.execute("SAVEPOINT ensure_fts")
+    try:
+        pending = create_backfill_state(conn, FTS_BACKFILL_TABLE)
+        for statement in _SCHEMA:
+            conn.execute(statement)
+    except sqlite3.Error:
+        conn.execute("ROLLBACK TO ensure_fts")
+        conn.execute("RELEASE ensure_fts")
+        raise
+    conn.execute("RELEASE ensure_fts")
+    conn.commit()
+    logger.info(f"✅ Índice FTS5 creado en {time.time() - start_time:.2f}s"
+                + (" (backfill pendiente)" if pending else ""))
+    return True
+
+
+def fts_backfill_pending(conn: sqlite3.Connection) -> bool:
+    """Comprobar si quedan artículos existentes por indexar."""
+    return backfill_pending(conn, FTS_BACKFILL_TABLE)
+
+
+def backfill_fts_index(db_path: str, batch_size: int = BACKFILL_BATCH_SIZE) -> Dict[str, Any]:
+    """Indexar en lotes los artículos que quedaron pendientes al crear el índice."""
+    start_time = time.time()
+    indexed = run_backfill(db_path, FTS_BACKFILL_TABLE, _BACKFILL_STATEMENT, batch_size)
+    elapsed = time.time() - start_time
+    if indexed:
+        logger.info(f"✅ Backfill FTS5: {indexed} artículos en {elapsed:.2f}s")
+    return {'indexed': indexed, 'elapsed_time': elapsed}
+
+
+def rebuild_fts_index(db_path: str, optimize: bool = True) -> Dict[str, Any]:
+    """Backfill completo del índice FTS (crea tabla y triggers si hace falta)."""
+    start_time = time.time()
+    with sqlite3.connect(db_path) as conn:
+        if not ensure_fts_index(conn):
+            if not fts_index_exists(conn):
+                raise sqlite3.OperationalError(
+                    f"articles no tiene las columnas {', '.join(missing_fts_columns(conn))}")
+        conn.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+        if fts_backfill_pending(conn):
+            conn.execute(f"DELETE FROM {FTS_BACKFILL_TABLE}")
+        if optimize:
+            conn.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')")
+        conn.commit()
+        indexed = conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+    elapsed = time.time() - start_time
+    logger.info(f"✅ Índice FTS5 reconstruido: {indexed} artículos en {elapsed:.2f}s")
+    return {'indexed': indexed, 'elapsed_time': elapsed}
+
+
+def build_match_query(query: str, prefix: bool = True) -> Optional[str]:
+    """
+    Convertir texto libre en una expresión MATCH segura.
+
+    Cada término se entrecomilla (los operadores FTS del usuario no se
+    interpretan). Un ``*`` final pide búsqueda por prefijo; con ``prefix``
+    el último término se trata siempre como prefijo (búsqueda mientras se
+    escribe).
+    """
+    tokens = _TOKEN_RE.findall(query or '')
+    if not tokens:
+        return None
+
+    terms = []
+    for i, token in enumerate(tokens):
+        is_prefix = token.endswith('*') or (prefix and i == len(tokens) - 1)
+        word = token.rstrip('*')
+        if word:
+            terms.append(f'"{word}"*' if is_prefix else f'"{word}"')
+    return ' '.join(terms) or None
+
+
+def search_articles(conn: sqlite3.Connection, query: str, limit: int = 20,
+                    language: Optional[str] = None, risk_level: Optional[str] = None,
+                    prefix: bool = True) -> List[Dict[str, Any]]:
+    """Buscar artículos ordenados por BM25, con fragmento resaltado."""
+    match_query = build_match_query(query, prefix=prefix)
+    if not match_query:
+        return []
+
+    sql = f"""
+        SELECT a.id, a.title, a.url, a.source, a.language, a.risk_level,
+               a.published_at, a.created_at,
+               snippet({FTS_TABLE}, -1, ?, ?, '…', {SNIPPET_TOKENS}) AS snippet,
+               -{RANK_EXPRESSION} AS relevance_score
+        FROM {FTS_TABLE}
+        JOIN articles a ON a.id = {FTS_TABLE}.rowid
+        WHERE {FTS_TABLE} MATCH ?
+    """
+    params: List[Any] = [SNIPPET_START, SNIPPET_END, match_query]
+
+    if language:
+        sql += " AND a.language = ?"
+        params.append(language)
+    if risk_level:
+        sql += " AND a.risk_level = ?"
+        params.append(risk_level)
+
+    sql += f" ORDER BY {RANK_EXPRESSION} LIMIT ?"
+    params.append(limit)
+
+    cursor = conn.execute(sql, params)
+    columns = [desc[0] for desc in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+if __name__ == '__main__':
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Backfill del índice FTS5 de artículos")
+    parser.add_argument('--db', default='data/geopolitical_intel.db')
+    parser.add_argument('--no-optimize', action='store_true')
+    parser.add_argument('--backfill', action='store_true',
+                        help="indexar solo los artículos pendientes, en lotes")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    if args.backfill:
+        result = backfill_fts_index(args.db)
+    else:
+        result = rebuild_fts_index(args.db, optimize=not args.no_optimize)
+    print(f"Indexed {result['indexed']} articles in {result['elapsed_time']:.2f}s")
@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+"""
+Índice de distancia Hamming para hashes perceptuales.
+
+Implementa *multi-index hashing*: cada hash de B bits se divide en m bloques
+contiguos. Si dos hashes están a distancia <= r y m·(s+1) > r, por el
+principio del palomar al menos uno de los bloques difiere en <= s bits. Basta
+entonces con buscar, bloque a bloque, los valores a distancia <= s del bloque
+de la consulta (probes = todas las máscaras de hasta s bits) y verificar los
+candidatos con un popcount entero sobre el hash completo.
+
+Los parámetros (m, s) se eligen con un modelo de coste sencillo a partir de
+B, r y el número esperado de elementos: bloques más largos reducen candidatos
+falsos, radios de bloque más pequeños reducen probes.
+
+- ``HammingIndex.add`` / ``HammingIndex.query``: inserción incremental y
+  búsqueda de un hash con tablas por bloque.
+- ``HammingIndex.near_pairs``: todos los pares a distancia <= r, con los
+  probes de cada bloque vectorizados en NumPy.
+- ``NearPairTracker``: pares similares mantenidos de forma incremental para
+  fingerprints hexadecimales, para no reconstruir el índice en cada consulta.
+"""
+
+import math
+import threading
+from itertools import combinations
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Bloques de hasta 2^22 valores usan tablas densas en near_pairs
+DENSE_BLOCK_BITS = 22
+
+# Radio de bloque máximo que se considera (el número de probes crece rápido)
+MAX_SUB_RADIUS = 4
+
+# Tamaño de lote al verificar candidatos en near_pairs
+VERIFY_BATCH = 1 << 20
+
+_MASK64 = (1 << 64) - 1
+_BYTE_POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+
+def popcount(value: int) -> int:
+    """Número de bits a 1 de un entero no negativo."""
+    return value.bit_count() if hasattr(value, 'bit_count') else bin(value).count('1')
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return popcount(a ^ b)
+
+
+def radius_for_similarity(n_bits: int, threshold: float) -> int:
+    """
+    Mayor distancia d con ``1 - d / n_bits >= threshold`` (la misma fórmula de
+    similitud que usa SmartImagePositioning), o -1 si no hay ninguna.
+    """
+    for distance in range(n_bits, -1, -1):
+        if 1.0 - (distance / n_bits) >= threshold:
+            return distance
+    return -1
+
+
+def choose_blocks(n_bits: int, radius: int, expected_items: int = 50000) -> Tuple[int, int]:
+    """Elegir (número de bloques, radio por bloque) con menor coste estimado."""
+    if radius >= n_bits:
+        raise ValueError(f"radio {radius} demasiado grande para hashes de {n_bits} bits")
+
+    best = None
+    for sub_radius in range(0, min(radius, MAX_SUB_RADIUS) + 1):
+        n_blocks = math.ceil((radius + 1) / (sub_radius + 1))
+        block_bits = n_bits // n_blocks
+        if block_bits == 0 or sub_radius > block_bits:
+            continue
+        probes = sum(math.comb(block_bits, k) for k in range(sub_radius + 1))
+        # Probes por consulta más candidatos esperados (uniformes) por probe
+        cost = n_blocks * probes * (1 + expected_items / 2 ** block_bits)
+        if best is None or cost < best[0]:
+            best = (cost, n_blocks, sub_radius)
+
+    if best is None:
+        raise ValueError(f"radio {radius} demasiado grande para hashes de {n_bits} bits")
+    return best[1], best[2]
+
+
+def flip_masks(bits: int, max_flips: int) -> List[int]:
+    """Todas las máscaras de ``bits`` bits con como mucho ``max_flips`` bits a 1."""
+    masks = []
+    for flips in range(max_flips + 1):
+        for positions in combinations(range(bits), flips):
+            mask = 0
+            for position in positions:
+                mask |= 1 << position
+            masks.append(mask)
+    return masks
+
+
+def popcount_rows(words: np.ndarray) -> np.ndarray:
+    """Popcount por fila de una matriz (n, w) de uint64."""
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(words).sum(axis=1, dtype=np.int64)
+    as_bytes = np.ascontiguousarray(words).view(np.uint8).reshape(len(words), -1)
+    return _BYTE_POPCOUNT[as_bytes].sum(axis=1, dtype=np.int64)
+
+
+class HammingIndex:
+    """
+    Índice multi-bloque de hashes de ``n_bits`` bits para búsquedas a
+    distancia Hamming <= ``radius`` (o cualquier radio menor).
+    """
+
+    def __init__(self, n_bits: int, radius: int, expected_items: int = 50000):
+        self.n_bits = n_bits
+        self.radius = radius
+        self.n_blocks, self.sub_radius = choose_blocks(n_bits, radius, max(1, expected_items))
+
+        # Bloques contiguos de tamaño lo más uniforme posible: (desplazamiento, bits)
+        base, extra = divmod(n_bits, self.n_blocks)
+        self._blocks: List[Tuple[int, int]] = []
+        offset = 0
+        for block in range(self.n_blocks):
+            size = base + (1 if block < extra else 0)
+            self._blocks.append((offset, size))
+            offset += size
+
+        masks_by_size = {size: flip_masks(size, self.sub_radius) for size in {s for _, s in self._blocks}}
+        self._masks = [masks_by_size[size] for _, size in self._blocks]
+        self._tables: List[Dict[int, List[int]]] = [{} for _ in self._blocks]
+        self._keys: List[Any] = []
+        self._hashes: List[int] = []
+
+    def __len__(self):
+        return len(self._hashes)
+
+    def _block_value(self, value: int, block: int) -> int:
+        offset, size = self._blocks[block]
+        return (value >> offset) & ((1 << size) - 1)
+
+    def add(self, key: Any, value: int) -> int:
+        """Insertar un hash (entero de ``n_bits`` bits). Devuelve su posición."""
+        position = len(self._hashes)
+        self._keys.append(key)
+        self._hashes.append(value)
+        for block, table in enumerate(self._tables):
+            table.setdefault(self._block_value(value, block), []).append(position)
+        return position
+
+    def query(self, value: int, radius: Optional[int] = None) -> List[Tuple[Any, int]]:
+        """(clave, distancia) de los hashes a distancia <= radius, en orden de inserción."""
+        radius = self._check_radius(radius)
+        seen = set()
+        matches = []
+        for block, table in enumerate(self._tables):
+            block_value = self._block_value(value, block)
+            for mask in self._masks[block]:
+                for position in table.get(block_value ^ mask, ()):
+                    if position in seen:
+                        continue
+                    seen.add(position)
+                    distance = hamming_distance(value, self._hashes[position])
+                    if distance <= radius:
+                        matches.append((position, distance))
+        matches.sort()
+        return [(self._keys[position], distance) for position, distance in matches]
+
+    def near_pairs(self, radius: Optional[int] = None) -> List[Tuple[Any, Any, int]]:
+        """
+        Todos los pares (clave_a, clave_b, distancia) a distancia <= radius,
+        con ``a`` insertado antes que ``b`` y ordenados por (a, b).
+        """
+        radius = self._check_radius(radius)
+        n = len(self._hashes)
+        if n < 2:
+            return []
+
+        words = self._as_words()
+        matches = []
+        for block in range(self.n_blocks):
+            for left, right in self._block_candidates(block, n):
+                # Verificar con popcount sobre el hash completo, por lotes
+                for start in range(0, len(left), VERIFY_BATCH):
+                    batch_left = left[start:start + VERIFY_BATCH]
+                    batch_right = right[start:start + VERIFY_BATCH]
+                    distances = popcount_rows(words[batch_left] ^ words[batch_right])
+                    keep = distances <= radius
+                    if keep.any():
+                        matches.append(np.stack([batch_left[keep] * n + batch_right[keep], distances[keep]]))
+        if not matches:
+            return []
+
+        # Un par cercano en varios bloques aparece varias veces
+        matches = np.concatenate(matches, axis=1)
+        matches = matches[:, np.argsort(matches[0], kind='stable')]
+        first = np.ones(matches.shape[1], dtype=bool)
+        first[1:] = matches[0, 1:] != matches[0, :-1]
+        codes, distances = matches[0, first], matches[1, first]
+
+        return [(self._keys[code // n], self._keys[code % n], distance)
+                for code, distance in zip(codes.tolist(), distances.tolist())]
+
+    def _check_radius(self, radius: Optional[int]) -> int:
+        if radius is None:
+            return self.radius
+        if radius > self.radius:
+            raise ValueError(f"el índice se construyó para radio <= {self.radius}")
+        return radius
+
+    def _as_words(self) -> np.ndarray:
+        n_words = max(1, math.ceil(self.n_bits / 64))
+        return np.array(
+            [[(value >> (64 * word)) & _MASK64 for word in range(n_words)] for value in self._hashes],
+            dtype=np.uint64,
+        )
+
+    def _block_candidates(self, block: int, n: int):
+        """
+        Generar, por cada máscara del bloque, los pares (i, j) con i < j cuyo
+        bloque difiere exactamente en esa máscara. Dentro de un bloque cada
+        par aparece una sola vez.
+        """
+        _, size = self._blocks[block]
+        values = np.fromiter((self._block_value(value, block) for value in self._hashes),
+                             dtype=np.int64, count=n)
+        order = np.argsort(values, kind='stable')
+        sorted_values = values[order]
+
+        if size <= DENSE_BLOCK_BITS:
+            counts_table = np.bincount(values, minlength=1 << size)
+            starts_table = np.cumsum(counts_table) - counts_table
+
+        positions = np.arange(n, dtype=np.int64)
+        for mask in self._masks[block]:
+            probe = values ^ mask
+            if size <= DENSE_BLOCK_BITS:
+                lo = starts_table[probe]
+                counts = counts_table[probe]
+            else:
+                lo = np.searchsorted(sorted_values, probe, side='left')
+                counts = np.searchsorted(sorted_values, probe, side='right') - lo
+            total = int(counts.sum())
+            if total == 0:
+                continue
+            # Expandir cada rango [lo, lo + count) del array ordenado
+            group_starts = np.cumsum(counts) - counts
+            left = np.repeat(positions, counts)
+            right = order[np.arange(total) + np.repeat(lo - group_starts, counts)]
+            keep = left < right
+            yield left[keep], right[keep]
+
+
+class NearPairTracker:
+    """
+    Pares de fingerprints hexadecimales con similitud >= ``threshold``,
+    mantenidos entre llamadas (un ``HammingIndex`` por longitud de hash).
+
+    Cada fingerprint nuevo cuesta una consulta al índice antes de insertarse;
+    la primera carga de cada longitud usa ``near_pairs`` vectorizado.
+    """
+
+    def __init__(self, threshold: float, expected_items: int = 50000):
+        self.threshold = threshold
+        self.expected_items = expected_items
+        self._lock = threading.Lock()
+        self._indexes: Dict[int, Optional[HammingIndex]] = {}
+        self._seen = set()
+        self._pairs: Dict[Tuple[Any, Any], float] = {}
+
+    def __len__(self):
+        return len(self._seen)
+
+    def __contains__(self, key):
+        return key in self._seen
+
+    def _index(self, n_bits: int) -> Optional[HammingIndex]:
+        if n_bits not in self._indexes:
+            radius = radius_for_similarity(n_bits, self.threshold)
+            self._indexes[n_bits] = (HammingIndex(n_bits, radius, expected_items=self.expected_items)
+                                     if 0 <= radius < n_bits else None)
+        return self._indexes[n_bits]
+
+    def add(self, key: Any, fingerprint: str):
+        """Registrar el fingerprint de ``key`` (una clave ya vista se ignora)."""
+        self.add_many([(key, fingerprint)])
+
+    def add_many(self, items):
+        """Registrar pares (clave, fingerprint); solo se indexan las claves nuevas."""
+        with self._lock:
+            by_length: Dict[int, List[Tuple[Any, int]]] = {}
+            for key, fingerprint in items:
+                if key in self._seen:
+                    continue
+                self._seen.add(key)
+                if not fingerprint:
+                    continue
+                try:
+                    value = int(fingerprint, 16)
+                except ValueError:
+                    continue
+                by_length.setdefault(len(fingerprint) * 4, []).append((key, value))
+
+            for n_bits, members in by_length.items():
+                index = self._index(n_bits)
+                if index is None:
+                    continue
+                if len(index) == 0 and len(members) > 1:
+                    for key, value in members:
+                        index.add(key, value)
+                    for key1, key2, distance in index.near_pairs():
+                        self._pairs[(key1, key2)] = 1.0 - (distance / n_bits)
+                    continue
+                for key, value in members:
+                    for other, distance in index.query(value):
+                        self._pairs[(other, key)] = 1.0 - (distance / n_bits)
+                    index.add(key, value)
+
+    def pairs_among(self, keys: List[Any]) -> List[Tuple[int, int, float]]:
+        """
+        Pares (posición1, posición2, similitud) entre las claves de ``keys``,
+        con posición1 < posición2 y en el orden de una comparación exhaustiva.
+        """
+        positions: Dict[Any, int] = {}
+        for position, key in enumerate(keys):
+            positions.setdefault(key, position)
+        with self._lock:
+            pairs = list(self._pairs.items())
+
+        found = []
+        for (key1, key2), similarity in pairs:
+            position1, position2 = positions.get(key1), positions.get(key2)
+            if position1 is None or position2 is None:
+                continue
+            found.append((min(position1, position2), max(position1, position2), similarity))
+        found.sort()
+        return found
@@ -0,0 +1,409 @@
+#!/usr/bin/env python3
+"""
+Almacén local de imágenes direccionado por contenido.
+
+Cada imagen remota cruza la red una sola vez:
+
+- Las descargas comparten una ``requests.Session`` (pool de conexiones) y un
+  pool de hilos, con un máximo de descargas simultáneas por host. Dos
+  peticiones concurrentes de la misma URL comparten una única descarga.
+- El contenido se guarda en ``objects/<sha[:2]>/<sha256><ext>``; un índice
+  SQLite (``index.db``) mapea URL → sha256 y guarda los metadatos de cada
+  objeto, así que dos URLs con la misma imagen ocupan un solo archivo.
+- El sha256 se calcula mientras llegan los bloques y, con un único
+  decodificado, se obtienen dimensiones, hash perceptual (pHash) y miniatura.
+
+Los consumidores (fingerprinting de SmartImagePositioning, análisis visual,
+imágenes guardadas por el dashboard) leen de aquí con
+``get_image_store().fetch(url)`` o ``fetch_many(urls)``.
+"""
+
+import io
+import os
+import time
+import shutil
+import hashlib
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Union
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from PIL import Image
+
+try:
+    import imagehash
+    IMAGEHASH_AVAILABLE = True
+except ImportError:
+    IMAGEHASH_AVAILABLE = False
+
+from .db_pool import connect as db_connect, get_pool
+
+logger = logging.getLogger(__name__)
+
+# Anclado a la raíz del proyecto: todos los consumidores comparten el almacén
+BASE_DIR = Path(__file__).resolve().parents[2]
+DEFAULT_STORE_DIR = os.getenv('IMAGE_STORE_DIR', str(BASE_DIR / 'data' / 'image_store'))
+
+USER_AGENT = ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+              '(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36')
+
+# Mismo tamaño de pHash que SmartImagePositioning (256 bits)
+PHASH_SIZE = 16
+THUMBNAIL_SIZE = (320, 320)
+
+DOWNLOAD_TIMEOUT = 15
+MAX_IMAGE_BYTES = 25 * 1024 * 1024
+MAX_WORKERS = 16
+PER_HOST_LIMIT = 4
+
+# Una URL que ha fallado no se vuelve a pedir hasta pasado este tiempo
+FAILURE_RETRY_SECONDS = 3600
+
+CONTENT_TYPE_EXTENSIONS = {
+    'image/jpeg': '.jpg',
+    'image/jpg': '.jpg',
+    'image/png': '.png',
+    'image/webp': '.webp',
+    'image/gif': '.gif',
+    'image/bmp': '.bmp',
+}
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS image_objects (
+        sha256 TEXT PRIMARY KEY,
+        extension TEXT NOT NULL,
+        content_type TEXT,
+        size INTEGER,
+        width INTEGER,
+        height INTEGER,
+        phash TEXT,
+        has_thumbnail INTEGER DEFAULT 0,
+        created_at REAL
+    );
+    CREATE TABLE IF NOT EXISTS image_urls (
+        url TEXT PRIMARY KEY,
+        sha256 TEXT,
+        status TEXT NOT NULL,
+        error TEXT,
+        fetched_at REAL
+    );
+    CREATE INDEX IF NOT EXISTS idx_image_urls_sha256 ON image_urls(sha256);
+"""
+
+
+@dataclass
+class StoredImage:
+    """Imagen descargada y sus metadatos."""
+    url: str
+    sha256: str
+    path: Path
+    content_type: str
+    size: int
+    width: Optional[int]
+    height: Optional[int]
+    phash: Optional[str]
+    thumbnail_path: Optional[Path]
+
+    def open(self) -> Image.Image:
+        return Image.open(self.path)
+
+    def read_bytes(self) -> bytes:
+        return self.path.read_bytes()
+
+
+class ImageStore:
+    """Descargas compartidas y almacén sha256 → archivo con índice URL → sha256."""
+
+    def __init__(self, root: Union[str, Path] = DEFAULT_STORE_DIR,
+                 max_workers: int = MAX_WORKERS, per_host_limit: int = PER_HOST_LIMIT):
+        self.root = Path(root)
+        self.objects_dir = self.root / 'objects'
+        self.thumbs_dir = self.root / 'thumbs'
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self.thumbs_dir.mkdir(parents=True, exist_ok=True)
+        self.index_path = str(self.root / 'index.db')
+
+        self.max_workers = max_workers
+        self.per_host_limit = per_host_limit
+
+        self._session = requests.Session()
+        self._session.headers['User-Agent'] = USER_AGENT
+        adapter = HTTPAdapter(pool_connections=32, pool_maxsize=max_workers)
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+
+        self._lock = threading.Lock()
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._inflight: Dict[str, Future] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._stats = {'hits': 0, 'downloads': 0, 'failures': 0,
+                       'shared_content': 0, 'bytes_downloaded': 0}
+
+        with db_connect(self.index_path) as conn:
+            conn.executescript(SCHEMA)
+            conn.commit()
+
+    # ------------------------------------------------------------------
+    # Lectura
+    # ------------------------------------------------------------------
+
+    def object_path(self, sha256: str, extension: str) -> Path:
+        return self.objects_dir / sha256[:2] / f"{sha256}{extension}"
+
+    def thumbnail_path(self, sha256: str) -> Path:
+        return self.thumbs_dir / sha256[:2] / f"{sha256}.jpg"
+
+    def lookup(self, url: str) -> Optional[StoredImage]:
+        """Imagen ya almacenada para ``url`` (sin tocar la red)."""
+        with db_connect(self.index_path) as conn:
+            row = conn.execute("""
+                SELECT o.sha256, o.extension, o.content_type, o.size, o.width, o.height,
+                       o.phash, o.has_thumbnail
+                FROM image_urls u JOIN image_objects o ON o.sha256 = u.sha256
+                WHERE u.url = ? AND u.status = 'ok'
+            """, (url,)).fetchone()
+        if row is None:
+            return None
+
+        sha256, extension, content_type, size, width, height, phash, has_thumbnail = row
+        path = self.object_path(sha256, extension)
+        if not path.exists():
+            return None
+        return StoredImage(
+            url=url, sha256=sha256, path=path, content_type=content_type, size=size,
+            width=width, height=height, phash=phash,
+            thumbnail_path=self.thumbnail_path(sha256) if has_thumbnail else None,
+        )
+
+    def _recently_failed(self, url: str) -> bool:
+        with db_connect(self.index_path) as conn:
+            row = conn.execute(
+                "SELECT fetched_at FROM image_urls WHERE url = ? AND status = 'error'", (url,)
+            ).fetchone()
+        return row is not None and time.time() - (row[0] or 0) < FAILURE_RETRY_SECONDS
+
+    # ------------------------------------------------------------------
+    # Descarga
+    # ------------------------------------------------------------------
+
+    def fetch(self, url: str, refresh: bool = False) -> Optional[StoredImage]:
+        """
+        Devolver la imagen de ``url`` desde el almacén, descargándola solo si
+        no está. Devuelve None si la URL no es una imagen válida.
+        """
+        if not url or not isinstance(url, str) or not url.startswith(('http://', 'https://')):
+            return None
+
+        if not refresh:
+            stored = self.lookup(url)
+            if stored is not None:
+                self._count('hits')
+                return stored
+            if self._recently_failed(url):
+                return None
+
+        with self._lock:
+            future = self._inflight.get(url)
+            owner = future is None
+            if owner:
+                future = self._inflight[url] = Future()
+
+        if not owner:
+            return future.result()
+
+        try:
+            stored = self._download(url)
+        except Exception as e:
+            logger.debug(f"Error descargando imagen {url}: {e}")
+            self._count('failures')
+            self._record_failure(url, str(e))
+            stored = None
+        finally:
+            with self._lock:
+                self._inflight.pop(url, None)
+        future.set_result(stored)
+        return stored
+
+    def fetch_many(self, urls: Iterable[str], refresh: bool = False) -> Dict[str, Optional[StoredImage]]:
+        """Descargar varias URLs en paralelo (respetando el límite por host)."""
+        unique_urls = list(dict.fromkeys(url for url in urls if url))
+        if not unique_urls:
+            return {}
+
+        executor = self._get_executor()
+        futures = {url: executor.submit(self.fetch, url, refresh) for url in unique_urls}
+        return {url: future.result() for url, future in futures.items()}
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                                    thread_name_prefix='image-store')
+            return self._executor
+
+    @contextmanager
+    def _host_slot(self, url: str):
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            slot = self._host_slots.get(host)
+            if slot is None:
+                slot = self._host_slots[host] = threading.BoundedSemaphore(self.per_host_limit)
+        with slot:
+            yield
+
+    def _download(self, url: str) -> StoredImage:
+        hasher = hashlib.sha256()
+        buffer = io.BytesIO()
+
+        with self._host_slot(url):
+            with self._session.get(url, timeout=DOWNLOAD_TIMEOUT, stream=True) as response:
+                response.raise_for_status()
+                # No se filtra por Content-Type: muchos CDN sirven imágenes como
+                # application/octet-stream. _store decide decodificando los bytes.
+                content_type = response.headers.get('Content-Type', '').split(';')[0].strip().lower()
+
+                for block in response.iter_content(chunk_size=64 * 1024):
+                    hasher.update(block)
+                    buffer.write(block)
+                    if buffer.tell() > MAX_IMAGE_BYTES:
+                        raise ValueError(f"imagen mayor de {MAX_IMAGE_BYTES} bytes")
+
+        self._count('downloads')
+        self._count('bytes_downloaded', buffer.tell())
+        return self._store(url, buffer.getvalue(), hasher.hexdigest(), content_type)
+
+    # ------------------------------------------------------------------
+    # Escritura
+    # ------------------------------------------------------------------
+
+    def _store(self, url: str, data: bytes, sha256: str, content_type: str) -> StoredImage:
+        with db_connect(self.index_path) as conn:
+            known = conn.execute("SELECT 1 FROM image_objects WHERE sha256 = ?", (sha256,)).fetchone()
+
+        if known is not None:
+            # Mismo contenido que otra URL ya descargada: solo añadir el mapeo
+            self._count('shared_content')
+            self._write_url(url, sha256)
+            stored = self.lookup(url)
+            if stored is not None:
+                return stored
+
+        # Un único decodificado para dimensiones, pHash y miniatura; si los
+        # bytes no son una imagen, PIL lanza y la URL queda como fallida
+        try:
+            image = Image.open(io.BytesIO(data))
+            image.load()
+        except Exception as e:
+            raise ValueError(f"el contenido no es una imagen ({content_type or 'sin tipo'}): {e}") from e
+        width, height = image.size
+        if not content_type.startswith('image/'):
+            content_type = Image.MIME.get(image.format, content_type)
+        phash = str(imagehash.phash(image, hash_size=PHASH_SIZE)) if IMAGEHASH_AVAILABLE else None
+
+        extension = CONTENT_TYPE_EXTENSIONS.get(content_type, '.jpg')
+        path = self.object_path(sha256, extension)
+        self._write_atomic(path, data)
+
+        thumbnail_path = self.thumbnail_path(sha256)
+        try:
+            thumbnail = image.convert('RGB')
+            thumbnail.thumbnail(THUMBNAIL_SIZE)
+            thumbnail_buffer = io.BytesIO()
+            thumbnail.save(thumbnail_buffer, 'JPEG', quality=80)
+            self._write_atomic(thumbnail_path, thumbnail_buffer.getvalue())
+        except Exception as e:
+            logger.debug(f"No se pudo generar miniatura para {url}: {e}")
+            thumbnail_path = None
+
+        def write(conn):
+            conn.execute("""
+                INSERT OR REPLACE INTO image_objects
+                (sha256, extension, content_type, size, width, height, phash, has_thumbnail, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, (sha256, extension, content_type, len(data), width, height, phash,
+                  1 if thumbnail_path else 0, time.time()))
+            conn.execute("""
+                INSERT OR REPLACE INTO image_urls (url, sha256, status, error, fetched_at)
+                VALUES (?, ?, 'ok', NULL, ?)
+            """, (url, sha256, time.time()))
+        get_pool(self.index_path).submit(write).result()
+
+        return StoredImage(
+            url=url, sha256=sha256, path=path, content_type=content_type, size=len(data),
+            width=width, height=height, phash=phash, thumbnail_path=thumbnail_path,
+        )
+
+    def _write_url(self, url: str, sha256: str):
+        get_pool(self.index_path).submit_write("""
+            INSERT OR REPLACE INTO image_urls (url, sha256, status, error, fetched_at)
+            VALUES (?, ?, 'ok', NULL, ?)
+        """, (url, sha256, time.time())).result()
+
+    def _record_failure(self, url: str, error: str):
+        try:
+            get_pool(self.index_path).submit_write("""
+                INSERT OR REPLACE INTO image_urls (url, sha256, status, error, fetched_at)
+                VALUES (?, NULL, 'error', ?, ?)
+            """, (url, error[:500], time.time())).result()
+        except Exception as e:
+            logger.debug(f"No se pudo registrar el fallo de {url}: {e}")
+
+    @staticmethod
+    def _write_atomic(path: Path, data: bytes):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(f".{path.name}.{threading.get_ident()}.tmp")
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+
+    def link_into(self, stored: StoredImage, directory: Union[str, Path]) -> Path:
+        """
+        Exponer una imagen del almacén en ``directory`` (p. ej. static/) con
+        nombre ``<sha256><ext>``: enlace duro si es posible, copia si no.
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        target = directory / stored.path.name
+        if not target.exists():
+            try:
+                os.link(stored.path, target)
+            except OSError:
+                shutil.copyfile(stored.path, target)
+        return target
+
+    # ------------------------------------------------------------------
+    # Métricas
+    # ------------------------------------------------------------------
+
+    def _count(self, key: str, amount: int = 1):
+        with self._lock:
+            self._stats[key] += amount
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            stats = dict(self._stats)
+        with db_connect(self.index_path) as conn:
+            objects, total_bytes = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM image_objects").fetchone()
+            urls = conn.execute("SELECT COUNT(*) FROM image_urls WHERE status = 'ok'").fetchone()[0]
+        stats.update({'objects': objects, 'stored_bytes': total_bytes, 'urls': urls})
+        return stats
+
+
+_store: Optional[ImageStore] = None
+_store_lock = threading.Lock()
+
+
+def get_image_store() -> ImageStore:
+    """Instancia compartida del almacén de imágenes."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ImageStore()
+        return _store
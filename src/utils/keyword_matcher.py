@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Compiled multi-group keyword matcher.
+
+Classifiers and risk scorers used to test each keyword with
+``keyword in text_lower``, which costs one scan of the text per keyword
+and matches inside other words ('tech' in 'biotech', 'war' in 'software',
+'un' in almost anything).
+
+``KeywordMatcher`` is built once per keyword set. ``scan`` tokenizes the
+text a single time and returns, for every group, the number of keyword
+entries present, the sum of their weights and the keywords that matched:
+
+- single-word keywords are looked up with one set intersection against
+  the text's tokens;
+- multi-word keywords ('trade war', 'ataque aéreo') are checked only when
+  their first word occurs, against the token sequence joined by spaces.
+
+Matching is on whole words. A trailing plural 's'/'es' is accepted so that
+'sanction' still matches 'sanctions' and 'ataque' matches 'ataques'. With
+``inflections`` (the default) common English verb/agent endings are also
+stripped, so stems keep the recall the old substring test gave them:
+'attack' matches 'attacked', 'protest' matches 'protesters' and 'threat'
+matches 'threatened'. Spanish verb forms ('atacado') are not covered; list
+them explicitly. With ``fold_accents`` both keywords and text are compared
+without diacritics.
+"""
+
+import re
+import unicodedata
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Mapping, Set, Tuple, Union
+
+TOKEN_RE = re.compile(r'\w+')
+
+KeywordGroup = Union[Iterable[str], Mapping[str, float]]
+
+PLURAL_SUFFIXES = ('s', 'es')
+# Endings stripped with ``inflections``; the remaining stem must keep at
+# least MIN_STEM characters so short keywords ('un', 'war') stay exact.
+INFLECTION_SUFFIXES = ('ed', 'd', 'ing', 'er', 'ers', 'ens', 'ened', 'ening')
+MIN_STEM = 3
+
+
+def fold_accents(text: str) -> str:
+    """Strip diacritics ('política' -> 'politica')."""
+    decomposed = unicodedata.normalize('NFKD', text)
+    return ''.join(char for char in decomposed if not unicodedata.combining(char))
+
+
+@dataclass
+class KeywordScan:
+    """Per-group results of one scan."""
+    counts: Dict[str, int]
+    weights: Dict[str, float]
+    matched: Dict[str, List[str]]
+
+    def ratio(self, group: str, total: int) -> float:
+        return self.counts[group] / total if total else 0.0
+
+
+class KeywordMatcher:
+    """Match several named keyword groups against a text in one pass."""
+
+    def __init__(self, groups: Mapping[str, KeywordGroup], plurals: bool = True,
+                 fold_accents: bool = False, inflections: bool = True):
+        self.plurals = plurals
+        self.fold_accents = fold_accents
+        self.inflections = inflections
+        self.groups = list(groups)
+        self.sizes: Dict[str, int] = {}
+
+        # Normalized keyword -> [(group, original keyword, weight)]. A keyword
+        # listed twice in a group counts twice, like the old substring loops.
+        self._entries: Dict[str, List[Tuple[str, str, float]]] = {}
+        for group, keywords in groups.items():
+            weighted = keywords.items() if isinstance(keywords, Mapping) else ((k, 1.0) for k in keywords)
+            size = 0
+            for keyword, weight in weighted:
+                size += 1
+                key = ' '.join(self._tokenize(keyword))
+                if key:
+                    self._entries.setdefault(key, []).append((group, keyword, weight))
+            self.sizes[group] = size
+
+        self._words = frozenset(key for key in self._entries if ' ' not in key)
+        self._phrases_by_first: Dict[str, List[str]] = {}
+        for key in self._entries:
+            if ' ' in key:
+                self._phrases_by_first.setdefault(key.split(' ', 1)[0], []).append(key)
+
+    def _normalize(self, text: str) -> str:
+        text = text.lower()
+        return fold_accents(text) if self.fold_accents else text
+
+    def _tokenize(self, text: str) -> List[str]:
+        return TOKEN_RE.findall(self._normalize(text))
+
+    def find(self, text: str) -> Set[str]:
+        """Normalized keywords present in ``text``."""
+        if not text:
+            return set()
+        tokens = self._tokenize(text)
+        candidates = set(tokens)
+        for suffix in self._suffixes:
+            size = len(suffix)
+            min_length = size + (1 if suffix in PLURAL_SUFFIXES else MIN_STEM)
+            candidates.update([token[:-size] for token in tokens
+                               if len(token) >= min_length and token.endswith(suffix)])
+
+        found = candidates & self._words
+
+        first_words = candidates.intersection(self._phrases_by_first)
+        if first_words:
+            joined = f" {' '.join(tokens)} "
+            suffixes = ('',) + self._suffixes
+            for first in first_words:
+                for phrase in self._phrases_by_first[first]:
+                    if any(f" {phrase}{suffix} " in joined for suffix in suffixes):
+                        found.add(phrase)
+        return found
+
+    @property
+    def _suffixes(self) -> Tuple[str, ...]:
+        return ((PLURAL_SUFFIXES if self.plurals else ())
+                + (INFLECTION_SUFFIXES if self.inflections else ()))
+
+    def scan(self, text: str) -> KeywordScan:
+        """Hit counts, summed weights and matched keywords for every group."""
+        counts = dict.fromkeys(self.groups, 0)
+        weights = dict.fromkeys(self.groups, 0.0)
+        matched: Dict[str, List[str]] = {group: [] for group in self.groups}
+
+        for key in self.find(text):
+            for group, keyword, weight in self._entries[key]:
+                counts[group] += 1
+                weights[group] += weight
+                matched[group].append(keyword)
+
+        return KeywordScan(counts=counts, weights=weights, matched=matched)
@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+"""
+Carga diferida de subsistemas y perfilado del arranque.
+
+- ``StartupProfiler``: fases con nombre (importaciones, construcción de
+  servicios) con su duración y el número de módulos que añadieron a
+  ``sys.modules``. Una fase anidada también cuenta dentro de la exterior.
+- ``LazyImport``: grupo de módulos que se importa la primera vez que se
+  necesita. Evaluado como booleano importa el grupo y dice si está
+  disponible, así que sustituye a los flags ``*_AVAILABLE``; ``symbol()``
+  devuelve un proxy de una clase, función u objeto del grupo, con una
+  alternativa opcional para cuando el grupo no se puede importar.
+- ``ServiceRegistry``: servicios construidos una sola vez, en el primer uso
+  o al calentarlos en segundo plano, con estado por servicio
+  (pending / loading / ready / unavailable / failed).
+- ``LazyService``: descriptor que expone un servicio del registro como
+  atributo de instancia (``self.cctv_system``).
+- ``ServiceProxy``: objeto que se puede pasar a código ya registrado (rutas,
+  blueprints) y que construye el servicio cuando se usa por primera vez.
+- ``LazyMounts``: middleware WSGI que envía prefijos de URL a aplicaciones
+  que son servicios del registro. Flask no admite registrar rutas una vez
+  servida la primera petición; así las rutas de subsistemas pesados existen
+  desde el arranque y la aplicación que las sirve se construye al usarse.
+
+Este módulo solo usa la biblioteca estándar para poder importarse antes que
+cualquier dependencia pesada.
+"""
+
+import sys
+import time
+import logging
+import importlib
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, asdict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+class StartupProfiler:
+    """Registro de fases del arranque con duración y módulos importados."""
+
+    def __init__(self, started: Optional[float] = None):
+        self.started = started if started is not None else time.perf_counter()
+        self._records: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def record(self, name: str, kind: str, seconds: float, modules: int = 0,
+               error: Optional[str] = None):
+        with self._lock:
+            self._records.append({
+                'name': name,
+                'kind': kind,
+                'seconds': round(seconds, 4),
+                'modules': modules,
+                'error': error,
+                'thread': threading.current_thread().name,
+            })
+
+    @contextmanager
+    def phase(self, name: str, kind: str = 'import'):
+        modules_before = len(sys.modules)
+        start = time.perf_counter()
+        error = None
+        try:
+            yield
+        except BaseException as e:
+            error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            self.record(name, kind, time.perf_counter() - start,
+                        len(sys.modules) - modules_before, error)
+
+    def records(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self._records)
+
+    def report(self) -> str:
+        """Tabla de fases por tipo, de la más lenta a la más rápida."""
+        lines = []
+        records = self.records()
+        for kind in dict.fromkeys(record['kind'] for record in records):
+            rows = sorted((r for r in records if r['kind'] == kind), key=lambda r: -r['seconds'])
+            lines.append(f"{kind.upper():<8} {'segundos':>9} {'módulos':>8}  fase")
+            for row in rows:
+                status = f"  ❌ {row['error'][:60]}" if row['error'] else ''
+                lines.append(f"{'':<8} {row['seconds']:>9.3f} {row['modules']:>8}  {row['name']}{status}")
+            lines.append('')
+        lines.append(f"Total desde el inicio del proceso: {time.perf_counter() - self.started:.3f}s, "
+                     f"{len(sys.modules)} módulos cargados")
+        return '\n'.join(lines)
+
+
+class LazyImport:
+    """Grupo de módulos importados en su primer uso."""
+
+    def __init__(self, name: str, modules: Sequence[str], requires: Sequence['LazyImport'] = (),
+                 profiler: Optional[StartupProfiler] = None):
+        self.name = name
+        self.module_names = list(modules)
+        self.requires = list(requires)
+        self.profiler = profiler
+        self.error: Optional[str] = None
+        self.seconds: Optional[float] = None
+        self._modules: Dict[str, Any] = {}
+        self._loaded: Optional[bool] = None
+        self._lock = threading.RLock()
+
+    def load(self) -> bool:
+        """Importar el grupo (una sola vez) y devolver si está disponible."""
+        if self._loaded is not None:
+            return self._loaded
+        with self._lock:
+            if self._loaded is not None:
+                return self._loaded
+            for dependency in self.requires:
+                dependency.load()
+
+            start = time.perf_counter()
+            phase = self.profiler.phase(self.name, 'import') if self.profiler else nullcontext()
+            try:
+                with phase:
+                    for module_name in self.module_names:
+                        self._modules[module_name] = importlib.import_module(module_name)
+            except Exception as e:
+                self.error = f"{type(e).__name__}: {e}"
+                self._loaded = False
+                logger.warning(f"⚠️ {self.name} no disponible: {self.error}")
+            else:
+                self._loaded = True
+                logger.info(f"✅ {self.name} cargado ({time.perf_counter() - start:.2f}s)")
+            self.seconds = time.perf_counter() - start
+            return self._loaded
+
+    @property
+    def loaded(self) -> bool:
+        """Si el grupo ya se intentó importar (sin provocar la importación)."""
+        return self._loaded is not None
+
+    def __bool__(self) -> bool:
+        return self.load()
+
+    def module(self, module_name: Optional[str] = None):
+        if not self.load():
+            raise ImportError(f"{self.name} no disponible: {self.error}")
+        return self._modules[module_name or self.module_names[0]]
+
+    def symbol(self, attr: str, module: Optional[str] = None, fallback: Any = None) -> 'LazySymbol':
+        return LazySymbol(self, module or self.module_names[0], attr, fallback)
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            'state': 'pending' if self._loaded is None else ('ready' if self._loaded else 'unavailable'),
+            'modules': self.module_names,
+            'seconds': round(self.seconds, 4) if self.seconds is not None else None,
+            'error': self.error,
+        }
+
+
+class LazySymbol:
+    """Proxy de un atributo de un ``LazyImport`` que se resuelve al usarlo."""
+
+    __slots__ = ('_group', '_module', '_attr', '_fallback')
+
+    def __init__(self, group: LazyImport, module: str, attr: str, fallback: Any = None):
+        object.__setattr__(self, '_group', group)
+        object.__setattr__(self, '_module', module)
+        object.__setattr__(self, '_attr', attr)
+        object.__setattr__(self, '_fallback', fallback)
+
+    def _resolve(self):
+        if self._group.load():
+            return getattr(self._group.module(self._module), self._attr)
+        if self._fallback is not None:
+            return self._fallback
+        raise ImportError(f"{self._attr} no disponible: {self._group.error}")
+
+    def __call__(self, *args, **kwargs):
+        return self._resolve()(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._resolve(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self._resolve(), name, value)
+
+    def __repr__(self):
+        return f"<LazySymbol {self._module}.{self._attr}>"
+
+
+@dataclass
+class ServiceState:
+    state: str = 'pending'
+    seconds: Optional[float] = None
+    error: Optional[str] = None
+    ready_at: Optional[float] = None
+
+
+class ServiceRegistry:
+    """Servicios construidos una vez, bajo demanda o al calentar."""
+
+    def __init__(self, profiler: Optional[StartupProfiler] = None):
+        self.profiler = profiler
+        self._factories: 'OrderedDict[str, Callable[[], Any]]' = OrderedDict()
+        self._warm: Dict[str, bool] = {}
+        self._values: Dict[str, Any] = {}
+        self._states: Dict[str, ServiceState] = {}
+        self._locks: Dict[str, threading.RLock] = {}
+        self._registry_lock = threading.Lock()
+
+    def register(self, name: str, factory: Callable[[], Any], warm: bool = True):
+        """
+        Registrar ``factory``. Si devuelve None el servicio queda como
+        ``unavailable``; si lanza una excepción, como ``failed``.
+        """
+        self._factories[name] = factory
+        self._warm[name] = warm
+        self._states.setdefault(name, ServiceState())
+        self._locks.setdefault(name, threading.RLock())
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._factories
+
+    def get(self, name: str) -> Any:
+        """Valor del servicio, construyéndolo en este hilo si aún no existe."""
+        state = self._states[name]
+        if state.state in ('ready', 'unavailable', 'failed'):
+            return self._values.get(name)
+
+        with self._locks[name]:
+            if state.state in ('ready', 'unavailable', 'failed'):
+                return self._values.get(name)
+            if state.state == 'loading':
+                raise RuntimeError(f"dependencia circular al construir el servicio {name}")
+
+            state.state = 'loading'
+            start = time.perf_counter()
+            phase = self.profiler.phase(name, 'init') if self.profiler else nullcontext()
+            try:
+                with phase:
+                    value = self._factories[name]()
+            except Exception as e:
+                value = None
+                state.state = 'failed'
+                state.error = f"{type(e).__name__}: {e}"
+                logger.error(f"❌ Error inicializando {name}: {e}")
+            else:
+                state.state = 'ready' if value is not None else 'unavailable'
+            state.seconds = time.perf_counter() - start
+            state.ready_at = time.time()
+            self._values[name] = value
+            return value
+
+    def set(self, name: str, value: Any):
+        """
+        Fijar el valor de un servicio desde fuera (p. ej. tras reinicializarlo,
+        o desde la factoría de otro servicio). No toma el lock del servicio
+        para no bloquearse con una factoría que lo esté construyendo.
+        """
+        with self._registry_lock:
+            self._locks.setdefault(name, threading.RLock())
+            state = self._states.setdefault(name, ServiceState())
+            self._values[name] = value
+            state.state = 'ready' if value is not None else 'unavailable'
+            state.ready_at = time.time()
+
+    def peek(self, name: str) -> Any:
+        """Valor del servicio si ya está construido, sin construirlo."""
+        return self._values.get(name)
+
+    def is_ready(self, name: str) -> bool:
+        state = self._states.get(name)
+        return state is not None and state.state == 'ready'
+
+    def warm_up(self, names: Optional[Iterable[str]] = None,
+                stop_event: Optional[threading.Event] = None):
+        """Construir en orden los servicios indicados (por defecto, los marcados ``warm``)."""
+        for name in names if names is not None else [n for n, warm in self._warm.items() if warm]:
+            if stop_event is not None and stop_event.is_set():
+                break
+            self.get(name)
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        result = {}
+        for name, state in self._states.items():
+            entry = asdict(state)
+            if entry['seconds'] is not None:
+                entry['seconds'] = round(entry['seconds'], 4)
+            result[name] = entry
+        return result
+
+
+class LazyService:
+    """Atributo de instancia respaldado por ``instance.services`` (un ServiceRegistry)."""
+
+    def __init__(self, name: Optional[str] = None):
+        self.name = name
+
+    def __set_name__(self, owner, attr_name):
+        if self.name is None:
+            self.name = attr_name
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        if self.name in instance.services:
+            return instance.services.get(self.name)
+        return instance.services.peek(self.name)
+
+    def __set__(self, instance, value):
+        instance.services.set(self.name, value)
+
+
+class ServiceProxy:
+    """Proxy de un servicio del registro que lo construye en su primer uso."""
+
+    __slots__ = ('_registry', '_name')
+
+    def __init__(self, registry: ServiceRegistry, name: str):
+        object.__setattr__(self, '_registry', registry)
+        object.__setattr__(self, '_name', name)
+
+    def _resolve(self):
+        return self._registry.get(self._name)
+
+    def __bool__(self) -> bool:
+        return self._resolve() is not None
+
+    def __call__(self, *args, **kwargs):
+        return self._resolve()(*args, **kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._resolve(), name)
+
+    def __repr__(self):
+        return f"<ServiceProxy {self._name}>"
+
+
+class LazyMounts:
+    """
+    Middleware WSGI: las peticiones bajo un prefijo montado las sirve la
+    aplicación WSGI que devuelve el servicio ``service`` del registro. Si el
+    servicio no está disponible (None) la petición sigue a ``app``, donde
+    pueden estar registradas las rutas alternativas.
+    """
+
+    def __init__(self, app: Callable, registry: ServiceRegistry):
+        self.app = app
+        self.registry = registry
+        self._mounts: List[tuple] = []
+
+    def mount(self, prefix: str, service: str, strip_prefix: bool = True):
+        """
+        Servir ``prefix`` con el servicio ``service``. Con ``strip_prefix`` el
+        prefijo pasa a SCRIPT_NAME (aplicaciones montadas en su propia raíz);
+        sin él la aplicación recibe la ruta completa.
+        """
+        self._mounts.append((prefix.rstrip('/'), service, strip_prefix))
+
+    def __call__(self, environ, start_response):
+        path = environ.get('PATH_INFO', '') or '/'
+        for prefix, service, strip_prefix in self._mounts:
+            if path != prefix and not path.startswith(prefix + '/'):
+                continue
+            app = self.registry.get(service)
+            if app is None:
+                break
+            if strip_prefix:
+                environ['SCRIPT_NAME'] = environ.get('SCRIPT_NAME', '') + prefix
+                environ['PATH_INFO'] = path[len(prefix):]
+            return app(environ, start_response)
+        return self.app(environ, start_response)
@@ -32,50 +32,66 @@ class TranslationService:
     
     def translate(self, text: str, source_lang: str, target_lang: str) -> str:
         """Translate text from source language to target language."""
+        try:
+            # Too short to be worth a request: keep the original
+            if source_lang != target_lang and len(text.strip()) < 10:
+                return text
+            
+            result = self.translate_or_none(text, source_lang, target_lang)
+            if result is not None:
+                return result
+            
+            # Final fallback to simple dictionary translation
+            return self._simple_translate(text, source_lang, target_lang)
+            
+        except Exception as e:
+            logger.error(f"Translation error: {e}")
+            return text
+    
+    def translate_or_none(self, text: str, source_lang: str, target_lang: str) -> Optional[str]:
+        """Translate with the remote providers only; None if every provider fails.
         
+        Used as the backend of ``BatchTranslator``, which caches its results and
+        must not store the word-by-word dictionary fallback nor the original of
+        a text too short to send (both return None here).
+        """
         # If same language, return original
         if source_lang == target_lang:
             return text
         
-        # If text is too short, return original
+        # Too short to translate: not a translation, so nothing to cache
         if len(text.strip()) < 10:
-            return text
+            return None
         
-        try:
-            # Try LibreTranslate first (free and open source)
-            result = self._translate_libretranslate(text, source_lang, target_lang)
+        # Try LibreTranslate first (free and open source)
+        result = self._translate_libretranslate(text, source_lang, target_lang)
+        if result:
+            return result
+        
+        # Try local LibreTranslate instance
+        result = self._translate_libretranslate_local(text, source_lang, target_lang)
+        if result:
+            return result
+        
+        # Try Groq as fallback
+        if self.groq_key:
+            result = self._translate_groq(text, source_lang, target_lang)
             if result:
                 return result
-            
-            # Try local LibreTranslate instance
-            result = self._translate_libretranslate_local(text, source_lang, target_lang)
+        
+        # Try OpenAI as fallback
+        if self.openai_key:
+            result = self._translate_openai(text, source_lang, target_lang)
             if result:
                 return result
-            
-            # Try Groq as fallback
-            if self.groq_key:
-                result = self._translate_groq(text, source_lang, target_lang)
-                if result:
-                    return result
-            
-            # Try OpenAI as fallback
-            if self.openai_key:
-                result = self._translate_openai(text, source_lang, target_lang)
-                if result:
-                    return result
-            
-            # Try DeepSeek as fallback
-            if self.deepseek_key:
-                result = self._translate_deepseek(text, source_lang, target_lang)
-                if result:
-                    return result
-            
-            # Final fallback to simple dictionary translation
-            return self._simple_translate(text, source_lang, target_lang)
-            
-        except Exception as e:
-            logger.error(f"Translation error: {e}")
-            return text
+        
+        # Try DeepSeek as fallback
+        if self.deepseek_key:
+            result = self._translate_deepseek(text, source_lang, target_lang)
+            if result:
+                return result
+        
+        return None
     
     def _translate_libretranslate(self, text: str, source_lang: str, target_lang: str) -> Optional[str]:
         """Translate using LibreTranslate API."""
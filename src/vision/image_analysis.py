@@ -6,15 +6,15 @@ y optimizar su posición en el mosaico de noticias.
 
 import cv2
 import numpy as np
-import requests
 from PIL import Image, ImageEnhance
-import io
 import logging
 from typing import Dict, List, Tuple, Optional
 import json
 from pathlib import Path
 import base64
 
+from ..utils.image_store import get_image_store
+
 logger = logging.getLogger(__name__)
 
 class ImageInterestAnalyzer:
@@ -132,13 +132,13 @@ class ImageInterestAnalyzer:
             
             # Determinar si es URL o ruta local
             if image_url.startswith(('http://', 'https://')):
-                # Es una URL, descargar
-                logger.debug(f"Descargando imagen desde URL: {image_url}")
-                response = requests.get(image_url, timeout=10, headers={
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-                })
-                response.raise_for_status()
-                pil_image = Image.open(io.BytesIO(response.content))
+                # Es una URL, leerla del almacén compartido (descarga solo la primera vez)
+                logger.debug(f"Obteniendo imagen desde URL: {image_url}")
+                stored = get_image_store().fetch(image_url)
+                if stored is None:
+                    logger.warning(f"No se pudo descargar la imagen: {image_url}")
+                    return None
+                pil_image = stored.open()
                 
             else:
                 # Es una ruta local, cargar directamente
@@ -4,7 +4,6 @@ Detecta objetos relacionados con conflictos, manifestaciones, armamento, etc.
 """
 import cv2
 import numpy as np
-import requests
 import logging
 import os
 import sys
@@ -12,7 +11,8 @@ from pathlib import Path
 from typing import Dict, List, Tuple, Optional, Any
 import tempfile
 from urllib.parse import urlparse
-import hashlib
+
+from ..utils.image_store import get_image_store
 
 # Intentar importar YOLO
 try:
@@ -152,33 +152,13 @@ class ImageRiskAnalyzer:
             return self._create_error_result(str(e))
 
     def _download_and_cache_image(self, image_url: str) -> Optional[Path]:
-        """Descarga y cachea una imagen"""
+        """Obtiene la imagen del almacén compartido (descarga solo la primera vez)"""
         try:
-            # Generar hash para el cache
-            url_hash = hashlib.md5(image_url.encode()).hexdigest()
-            cache_path = self.cache_dir / f"{url_hash}.jpg"
-
-            # Si ya está en cache, usar esa versión
-            if cache_path.exists():
-                return cache_path
-
-            # Descargar imagen
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-
-            response = requests.get(
-                image_url,
-                headers=headers,
-                timeout=10,
-                stream=True)
-            response.raise_for_status()
-
-            # Guardar en cache
-            with open(cache_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
-
-            return cache_path
+            stored = get_image_store().fetch(image_url)
+            if stored is None:
+                logger.error(f"Error descargando imagen {image_url}")
+                return None
+            return stored.path
 
         except Exception as e:
             logger.error(f"Error descargando imagen {image_url}: {e}")
@@ -0,0 +1,21 @@
+"""
+Load modules of the cams package for tests without running cams/__init__.py,
+which pulls in the whole web stack (Flask, SocketIO, detector models).
+"""
+
+import importlib
+import sys
+import types
+from pathlib import Path
+
+CAMS_DIR = Path(__file__).parent.parent / 'cams'
+PACKAGE = 'cams_under_test'
+
+
+def load_cams_module(name):
+    """Import ``cams.<name>`` (relative imports inside cams keep working)."""
+    if PACKAGE not in sys.modules:
+        package = types.ModuleType(PACKAGE)
+        package.__path__ = [str(CAMS_DIR)]
+        sys.modules[PACKAGE] = package
+    return importlib.import_module(f'{PACKAGE}.{name}')
@@ -0,0 +1,137 @@
+"""
+Tests for the concurrent feed downloader, using a stub HTTP session.
+"""
+
+import asyncio
+import unittest
+import sys
+import threading
+from pathlib import Path
+
+# Add project root to path (data_ingestion imports through the src package)
+sys.path.append(str(Path(__file__).parent.parent))
+
+import aiohttp
+
+from src.data_ingestion.async_feed_fetcher import AsyncFeedFetcher, FeedRequest
+
+
+class StubResponse:
+    def __init__(self, status, body, headers):
+        self.status = status
+        self.headers = headers
+        self._body = body
+
+    async def read(self):
+        return self._body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class StubSession:
+    """Minimal stand-in for aiohttp.ClientSession serving canned feeds."""
+
+    def __init__(self, routes, delay=0.01):
+        self.routes = routes
+        self.delay = delay
+        self.requests = []
+        self.in_flight = {}
+        self.max_in_flight = {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def get(self, url, headers=None, timeout=None):
+        self.requests.append((url, headers))
+        return self._respond(url)
+
+    def _respond(self, url):
+        session = self
+        host = url.split('/')[2]
+
+        class Pending:
+            async def __aenter__(self):
+                session.in_flight[host] = session.in_flight.get(host, 0) + 1
+                session.max_in_flight[host] = max(session.max_in_flight.get(host, 0),
+                                                  session.in_flight[host])
+                try:
+                    await asyncio.sleep(session.delay)
+                    route = session.routes[url]
+                    if isinstance(route, Exception):
+                        raise route
+                    return StubResponse(*route)
+                finally:
+                    session.in_flight[host] -= 1
+
+            async def __aexit__(self, *exc):
+                return False
+
+        return Pending()
+
+
+class TestAsyncFeedFetcher(unittest.TestCase):
+    """Test ordering, limits and error handling of AsyncFeedFetcher."""
+
+    def run_fetcher(self, routes, handler, **kwargs):
+        session = StubSession(routes)
+        fetcher = AsyncFeedFetcher(session_factory=lambda: session, **kwargs)
+        requests = [FeedRequest(source_id=i, url=url, headers={'If-None-Match': f'"{i}"'})
+                    for i, url in enumerate(routes)]
+        return session, fetcher.run(requests, handler)
+
+    def test_results_in_request_order_and_handled_in_workers(self):
+        routes = {f'http://host{i % 3}.test/feed{i}': (200, f'body{i}'.encode(), {'ETag': f'"{i}"'})
+                  for i in range(12)}
+        threads = set()
+
+        def handler(response):
+            threads.add(threading.current_thread().name)
+            return response.body.decode()
+
+        session, jobs = self.run_fetcher(routes, handler, max_workers=2)
+        self.assertEqual([job.result for job in jobs], [f'body{i}' for i in range(12)])
+        self.assertTrue(all(job.response.ok and job.error is None for job in jobs))
+        self.assertEqual(jobs[0].response.headers, {'ETag': '"0"'})
+        # Conditional headers are forwarded and handlers never run on the event loop thread
+        self.assertEqual(session.requests[0][1], {'If-None-Match': '"0"'})
+        self.assertTrue(all(name.startswith('feed-worker') for name in threads))
+
+    def test_per_host_limit(self):
+        routes = {f'http://same.test/feed{i}': (200, b'x', {}) for i in range(10)}
+        session, jobs = self.run_fetcher(routes, lambda r: None, per_host_limit=2)
+        self.assertEqual(len(jobs), 10)
+        self.assertLessEqual(session.max_in_flight['same.test'], 2)
+
+    def test_errors_do_not_abort_the_run(self):
+        routes = {
+            'http://a.test/ok': (200, b'ok', {}),
+            'http://a.test/missing': (404, b'', {}),
+            'http://b.test/slow': asyncio.TimeoutError(),
+            'http://c.test/down': aiohttp.ClientConnectionError('refused'),
+            'http://d.test/bad': (200, b'bad', {}),
+        }
+
+        def handler(response):
+            if response.body == b'bad':
+                raise ValueError('unparseable')
+            return response.status
+
+        _, jobs = self.run_fetcher(routes, handler)
+        ok, missing, slow, down, bad = jobs
+        self.assertEqual(ok.result, 200)
+        self.assertEqual(missing.response.error, 'HTTP 404')
+        self.assertIn('Timeout', slow.response.error)
+        self.assertIn('ClientConnectionError', down.response.error)
+        self.assertEqual(bad.error, 'unparseable')
+        self.assertIsNone(bad.result)
+
+
+if __name__ == '__main__':
+    unittest.main()
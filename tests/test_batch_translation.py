@@ -0,0 +1,123 @@
+"""
+Tests for sentence-level batch translation with the shared cache.
+"""
+
+import unittest
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / 'src'))
+
+from utils.batch_translation import BatchTranslator, TranslationCache, split_sentences
+from utils.translation import TranslationService
+
+
+class FakeBackend:
+    """Uppercases each line and records every request."""
+
+    def __init__(self, merge_lines=False, fail=()):
+        self.requests = []
+        self.merge_lines = merge_lines
+        self.fail = set(fail)
+
+    def __call__(self, text, source_lang, target_lang):
+        self.requests.append(text)
+        if text in self.fail:
+            return None
+        translated = text.upper()
+        return translated.replace('\n', ' ') if self.merge_lines else translated
+
+
+class TestBatchTranslation(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = str(Path(self.tmp.name) / 'translations.db')
+        self.cache = TranslationCache(self.db_path, memory_entries=100)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_split_keeps_separators(self):
+        text = "Troops moved north. Talks stalled!\n\nU.S. officials said 3 died."
+        segments = split_sentences(text)
+        self.assertEqual(''.join(segments), text)
+        self.assertEqual(segments[::2], ["Troops moved north.", "Talks stalled!", "U.S. officials said 3 died."])
+
+    def test_dedup_and_grouping(self):
+        backend = FakeBackend()
+        translator = BatchTranslator(backend, self.cache)
+        texts = ["Shared wire copy. First story.", "Shared wire copy. Second story.", "", "123."]
+
+        result = translator.translate_batch(texts, 'en', 'es')
+
+        self.assertEqual(result, ["SHARED WIRE COPY. FIRST STORY.", "SHARED WIRE COPY. SECOND STORY.", "", "123."])
+        self.assertEqual(len(backend.requests), 1)
+        self.assertEqual(backend.requests[0].split('\n'), ["Shared wire copy.", "First story.", "Second story."])
+        stats = translator.get_stats()
+        self.assertEqual((stats['sentences'], stats['unique_sentences'], stats['misses']), (4, 3, 3))
+
+    def test_memory_and_disk_hits(self):
+        backend = FakeBackend()
+        BatchTranslator(backend, self.cache).translate_batch(["Ceasefire holds."], 'en', 'es')
+
+        again = BatchTranslator(backend, self.cache)
+        self.assertEqual(again.translate_batch(["Ceasefire holds."], 'en', 'es'), ["CEASEFIRE HOLDS."])
+        self.assertEqual(again.get_stats()['memory_hits'], 1)
+
+        # A new process only has the SQLite table
+        cold = BatchTranslator(backend, TranslationCache(self.db_path))
+        self.assertEqual(cold.translate_batch(["Ceasefire holds."], 'en', 'es'), ["CEASEFIRE HOLDS."])
+        self.assertEqual(cold.get_stats()['disk_hits'], 1)
+        self.assertEqual(cold.get_stats()['hit_rate'], 1.0)
+        self.assertEqual(len(backend.requests), 1)
+
+        # Other language pairs are separate keys
+        cold.translate_batch(["Ceasefire holds."], 'en', 'fr')
+        self.assertEqual(len(backend.requests), 2)
+
+    def test_mismatched_lines_fall_back_per_sentence(self):
+        backend = FakeBackend(merge_lines=True)
+        translator = BatchTranslator(backend, self.cache)
+        result = translator.translate_batch(["One. Two."], 'en', 'es')
+        self.assertEqual(result, ["ONE. TWO."])
+        self.assertEqual(translator.get_stats()['split_fallbacks'], 1)
+        self.assertEqual(len(backend.requests), 3)
+
+    def test_failures_are_not_cached(self):
+        backend = FakeBackend(fail={"Lost."})
+        translator = BatchTranslator(backend, self.cache)
+        self.assertEqual(translator.translate_batch(["Lost."], 'en', 'es'), ["Lost."])
+        self.assertEqual(translator.get_stats()['backend_failures'], 1)
+        self.assertEqual(self.cache.entry_count(), 0)
+
+    def test_short_text_passthrough_is_not_cached(self):
+        service = TranslationService()
+        self.assertIsNone(service.translate_or_none("Kyiv.", 'en', 'es'))
+        self.assertEqual(service.translate("Kyiv.", 'en', 'es'), "Kyiv.")
+        translator = BatchTranslator(service.translate_or_none, self.cache)
+        self.assertEqual(translator.translate_batch(["Kyiv."], 'en', 'es'), ["Kyiv."])
+        self.assertEqual(self.cache.entry_count(), 0)
+
+
+class TestSharedCache(unittest.TestCase):
+    """Test that every import path shares one process-wide cache."""
+
+    def test_module_shared_under_both_names(self):
+        import utils.batch_translation as batch_module
+        self.assertIs(sys.modules['src.utils.batch_translation'], batch_module)
+        self.assertIs(sys.modules['src.utils.batch_translation'].get_translation_cache,
+                      batch_module.get_translation_cache)
+
+    @unittest.skipIf('TRANSLATION_CACHE_DB' in os.environ, 'cache path overridden')
+    def test_default_path_does_not_depend_on_working_directory(self):
+        from utils.batch_translation import DEFAULT_DB_PATH
+        project_root = Path(__file__).resolve().parent.parent
+        self.assertEqual(Path(DEFAULT_DB_PATH), project_root / 'data' / 'translation_cache.db')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+"""
+Tests for batched BERT risk inference.
+"""
+
+import unittest
+import sys
+import threading
+from pathlib import Path
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / 'src'))
+
+from ai.bert_risk_analyzer import BertRiskAnalyzer, RISK_CATEGORIES
+
+
+def fake_sentiment(texts, batch_size=None):
+    """Deterministic stand-in for the sentiment pipeline."""
+    single = isinstance(texts, str)
+    return [{'label': 'negative' if 'attack' in text else 'neutral',
+             'score': min(len(text) / 100.0, 1.0)}
+            for text in ([texts] if single else texts)]
+
+
+def fake_classifier(texts, labels, batch_size=None):
+    """Deterministic stand-in for the zero-shot classification pipeline."""
+    def classify(text):
+        top = 0 if 'attack' in text else len(labels) - 1
+        ordered = [labels[top]] + [label for i, label in enumerate(labels) if i != top]
+        return {'labels': ordered, 'scores': [0.8] + [0.04] * (len(labels) - 1)}
+    if isinstance(texts, str):
+        return classify(texts)
+    return [classify(text) for text in texts]
+
+
+class TestAnalyzeBatch(unittest.TestCase):
+    """Test that batching keeps input order and per-article results."""
+
+    def setUp(self):
+        self.analyzer = BertRiskAnalyzer.__new__(BertRiskAnalyzer)
+        self.analyzer.inference_lock = threading.RLock()
+        self.analyzer.sentiment_analyzer = fake_sentiment
+        self.analyzer.classifier = fake_classifier
+        self.analyzer.models_loaded = True
+        # Lengths deliberately out of order so the length buckets reorder them
+        self.articles = [
+            {'title': 'Missile attack on the border city', 'content': 'Troops and tanks ' * 10,
+             'country': 'Ukraine'},
+            {'title': 'Trade fair opens', 'content': 'Exhibitors arrive'},
+            {'title': 'Coup attempt', 'content': 'Military seizes the capital after protests ' * 3,
+             'country': 'Niger'},
+            {'title': 'Weather', 'content': ''},
+        ]
+
+    @staticmethod
+    def strip_timestamp(result):
+        return {key: value for key, value in result.items() if key != 'analysis_timestamp'}
+
+    def test_matches_per_article_results_in_order(self):
+        batch = self.analyzer.analyze_batch(self.articles, batch_size=2)
+        single = [self.analyzer.analyze_risk_level(a['title'], a['content'], a.get('country'))
+                  for a in self.articles]
+        self.assertEqual([self.strip_timestamp(r) for r in batch],
+                         [self.strip_timestamp(r) for r in single])
+        self.assertEqual(batch[0]['category'], RISK_CATEGORIES[0])
+        self.assertEqual(batch[1]['category'], RISK_CATEGORIES[-1])
+
+    def test_fallback_without_models_keeps_order(self):
+        self.analyzer.models_loaded = False
+        batch = self.analyzer.analyze_batch(self.articles)
+        self.assertEqual(len(batch), len(self.articles))
+        for article, result in zip(self.articles, batch):
+            expected = self.analyzer._fallback_keyword_analysis(article['title'], article['content'])
+            self.assertEqual(self.strip_timestamp(result), self.strip_timestamp(expected))
+
+    def test_empty_batch(self):
+        self.assertEqual(self.analyzer.analyze_batch([]), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+"""
+Tests for the precomputed dashboard feed.
+"""
+
+import unittest
+import sys
+import os
+import sqlite3
+import tempfile
+from pathlib import Path
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / 'src'))
+
+from utils.db_pool import get_pool
+from utils.dashboard_feed import (backfill_dashboard_feed, dashboard_feed_backfill_pending,
+                                  ensure_dashboard_feed, get_dashboard_articles)
+
+
+class TestDashboardFeed(unittest.TestCase):
+    """Test write-time eligibility, priority ordering and image dedup."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmpdir.name, 'test.db')
+        self.conn = self.create_database(self.db_path)
+        # Existing row is picked up by the backfill, not at feed creation
+        self.insert(1, 'Tensión en la frontera', 'https://reuters.com/a.jpg', 'medium')
+        self.assertTrue(ensure_dashboard_feed(self.conn))
+        self.assertFalse(ensure_dashboard_feed(self.conn))
+        self.assertEqual(self.ids(), [])
+        self.assertEqual(backfill_dashboard_feed(self.db_path)['refreshed'], 1)
+        self.assertFalse(dashboard_feed_backfill_pending(self.conn))
+
+    def tearDown(self):
+        get_pool(self.db_path).close_writer()
+        self.conn.close()
+        self.tmpdir.cleanup()
+
+    def create_database(self, db_path):
+        conn = sqlite3.connect(db_path)
+        conn.execute("""
+            CREATE TABLE articles (
+                id INTEGER PRIMARY KEY, title TEXT, content TEXT, url TEXT, source TEXT,
+                published_at TEXT, country TEXT, region TEXT, risk_level TEXT,
+                conflict_type TEXT, sentiment_score REAL, summary TEXT, image_url TEXT,
+                language TEXT
+            )
+        """)
+        return conn
+
+    def insert(self, article_id, title, image_url, risk_level, language='es', published_at='2024-01-01'):
+        self.conn.execute(
+            "INSERT INTO articles (id, title, image_url, risk_level, language, published_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (article_id, title, image_url, risk_level, language, published_at))
+
+    def ids(self, limit=10):
+        return [a['id'] for a in get_dashboard_articles(self.conn, limit)]
+
+    def test_eligibility_filters(self):
+        self.insert(2, 'Sanciones económicas', 'https://bbc.co.uk/b.jpg', 'low')
+        self.insert(3, 'Resultados de football', 'https://bbc.co.uk/c.jpg', 'high')
+        self.insert(4, 'Cumbre diplomática', 'https://images.unsplash.com/d.jpg', 'high')
+        self.insert(5, 'Crisis política', 'https://reuters.com/e.jpg', 'high', language='en')
+        self.assertEqual(self.ids(), [1, 2])
+
+    def test_priority_and_rerisk(self):
+        self.insert(2, 'Ataque con misiles', 'https://bbc.co.uk/b.jpg', 'high')
+        self.insert(3, 'Negociaciones', 'https://cnn.com/c.jpg', 'low', published_at='2024-06-01')
+        self.assertEqual(self.ids(), [2, 1, 3])
+        self.conn.execute("UPDATE articles SET risk_level = 'high', risk_score = 0.9 WHERE id = 3")
+        self.assertEqual(self.ids(), [3, 2, 1])
+
+    def test_duplicate_images_and_exclusion(self):
+        self.insert(2, 'Misma imagen', 'https://reuters.com/a.jpg', 'low')
+        self.insert(3, 'Otra noticia', 'https://cnn.com/c.jpg', 'low')
+        self.assertEqual(self.ids(), [1, 3])
+        self.assertEqual([a['id'] for a in get_dashboard_articles(self.conn, 10, exclude_id=1)], [3, 2])
+        self.assertEqual(self.ids(limit=1), [1])
+
+    def test_backfill_runs_in_batches(self):
+        self.conn.close()
+        get_pool(self.db_path).close_writer()
+        self.db_path = os.path.join(self.tmpdir.name, 'batches.db')
+        self.conn = self.create_database(self.db_path)
+        for article_id in range(1, 6):
+            self.insert(article_id, f'Crisis {article_id}', f'https://bbc.co.uk/{article_id}.jpg', 'low')
+        self.assertTrue(ensure_dashboard_feed(self.conn))
+        # Rows written after creation are kept current by the triggers meanwhile
+        self.insert(6, 'Crisis 6', 'https://bbc.co.uk/6.jpg', 'high')
+        self.conn.commit()
+        self.assertEqual(self.ids(), [6])
+
+        self.assertEqual(backfill_dashboard_feed(self.db_path, batch_size=2)['refreshed'], 5)
+        self.assertEqual(self.ids(), [6, 5, 4, 3, 2, 1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,141 @@
+"""
+Tests for the shared SQLite connection pool.
+"""
+
+import unittest
+import sys
+import sqlite3
+import tempfile
+import threading
+import os
+from pathlib import Path
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / 'src'))
+
+from utils.db_pool import SQLitePool
+
+
+class TestSQLitePool(unittest.TestCase):
+    """Test per-thread reuse, pragmas and the serialized writer."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.pool = SQLitePool(os.path.join(self.tmpdir.name, 'test.db'))
+        conn = self.pool.connect()
+        conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT UNIQUE)")
+        conn.commit()
+        conn.close()
+
+    def tearDown(self):
+        self.pool.close_writer()
+        self.tmpdir.cleanup()
+
+    def test_wal_and_reuse(self):
+        conn = self.pool.connect()
+        self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], 'wal')
+        raw = conn._conn
+        conn.close()
+        self.assertIs(self.pool.connect()._conn, raw)
+        self.assertEqual(self.pool.get_metrics()['connections_created'], 1)
+
+    def test_pragmas_use_configured_sizes(self):
+        pool = SQLitePool(os.path.join(self.tmpdir.name, 'sized.db'),
+                          cache_size_kb=2048, mmap_size=1048576)
+        conn = pool.connect()
+        self.assertEqual(conn.execute("PRAGMA cache_size").fetchone()[0], -2048)
+        self.assertEqual(conn.execute("PRAGMA mmap_size").fetchone()[0], 1048576)
+        conn.close()
+
+    def test_released_connection_is_unusable(self):
+        with self.pool.connect() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1")
+        with self.assertRaises(sqlite3.ProgrammingError):
+            conn.execute("SELECT 1")
+        with self.assertRaises(sqlite3.ProgrammingError):
+            cursor.fetchall()
+
+        # A nested connect reuses the underlying connection, but the stale
+        # lease and its cursor still refuse to touch it
+        inner = self.pool.connect()
+        inner.execute("INSERT INTO items (name) VALUES ('inner')")
+        with self.assertRaises(sqlite3.ProgrammingError):
+            cursor.execute("SELECT 1")
+        with self.assertRaises(sqlite3.ProgrammingError):
+            conn.commit()
+        self.assertTrue(inner.in_transaction)
+        inner.close()
+
+    def test_close_discards_uncommitted_and_resets_row_factory(self):
+        conn = self.pool.connect(row_factory=sqlite3.Row)
+        conn.execute("INSERT INTO items (name) VALUES ('pending')")
+        conn.close()
+        conn = self.pool.connect()
+        self.assertIsNone(conn.row_factory)
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM items").fetchone()[0], 0)
+        conn.close()
+
+    def test_context_manager_commits_and_releases(self):
+        with self.pool.connect() as conn:
+            conn.execute("INSERT INTO items (name) VALUES ('a')")
+        reader = self.pool.connect()
+        self.assertEqual(self.pool.get_metrics()['connections_reused'], 2)
+        self.assertEqual(reader.execute("SELECT COUNT(*) FROM items").fetchone()[0], 1)
+        reader.close()
+
+    def test_nested_connections_are_distinct(self):
+        outer = self.pool.connect()
+        inner = self.pool.connect()
+        self.assertIsNot(outer._conn, inner._conn)
+        inner.close()
+        outer.close()
+
+    def test_connections_are_per_thread(self):
+        main_conn = self.pool.connect()
+        raw = main_conn._conn
+        main_conn.close()
+        seen = []
+        thread = threading.Thread(target=lambda: seen.append(self.pool.connect()))
+        thread.start()
+        thread.join()
+        self.assertIsNot(seen[0]._conn, raw)
+
+    def test_writer_queue_isolates_failures(self):
+        ok = self.pool.submit_write("INSERT INTO items (name) VALUES (?)", ('x',))
+        duplicate = self.pool.submit_write("INSERT INTO items (name) VALUES (?)", ('x',))
+        many = self.pool.submit_write("INSERT INTO items (name) VALUES (?)", [('y',), ('z',)], many=True)
+        self.assertEqual(ok.result(timeout=5), 1)
+        with self.assertRaises(sqlite3.IntegrityError):
+            duplicate.result(timeout=5)
+        self.assertEqual(many.result(timeout=5), 2)
+
+        conn = self.pool.connect()
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM items").fetchone()[0], 3)
+        conn.close()
+        metrics = self.pool.get_metrics()
+        self.assertEqual(metrics['writes_completed'], 2)
+        self.assertEqual(metrics['writes_failed'], 1)
+
+
+class TestPoolRegistry(unittest.TestCase):
+    """Test that every import path shares one pool registry."""
+
+    def test_module_shared_under_both_names(self):
+        import utils.db_pool as pool_module
+        self.assertIs(sys.modules['utils.db_pool'], pool_module)
+        self.assertIs(sys.modules['src.utils.db_pool'], pool_module)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = os.path.join(tmpdir, 'shared.db')
+            pool = sys.modules['src.utils.db_pool'].get_pool(db_path)
+            try:
+                self.assertIs(pool_module.get_pool(db_path), pool)
+                self.assertIn(db_path, pool_module.get_all_metrics())
+            finally:
+                pool.close_writer()
+                pool_module._pools.pop(os.path.abspath(db_path), None)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+"""
+Tests for RiskDetector alert rules on tracked detections.
+"""
+
+import copy
+import unittest
+
+import numpy as np
+
+from cams_loader import load_cams_module
+
+detector_module = load_cams_module('detector')
+tracker_module = load_cams_module('tracker')
+RiskDetector = detector_module.RiskDetector
+
+
+def crowd(count=60):
+    """``count`` person boxes in a grid covering well over min_density of a 1000x1000 frame."""
+    detections = []
+    for i in range(count):
+        x, y = (i % 10) * 100, (i // 10) * 160
+        bbox = [x, y, x + 60, y + 120]
+        detections.append({'class_name': 'person', 'class_id': RiskDetector.RISK_CLASSES['person'],
+                           'confidence': 0.9, 'bbox': bbox, 'area': 60 * 120})
+    return detections
+
+
+class TestManifestationRule(unittest.TestCase):
+    """The crowd rule fires on a single frame unless persistence is requested."""
+
+    def setUp(self):
+        self.detector = RiskDetector.__new__(RiskDetector)
+        self.detector.tracker = tracker_module.IoUTracker(min_hits=1)
+        self.detector.alert_history = []
+        self.detector._loitering_alerted = {}
+        self.detector.ALERT_THRESHOLDS = copy.deepcopy(RiskDetector.ALERT_THRESHOLDS)
+        self.frame = np.zeros((1000, 1000, 3), dtype=np.uint8)
+        self.detections = crowd()
+
+    def track(self, timestamp):
+        boxes = np.array([d['bbox'] for d in self.detections], dtype=np.float32)
+        class_ids = np.array([d['class_id'] for d in self.detections])
+        self.detector.tracker.update('cam', boxes, class_ids, timestamp)
+
+    def manifestation_alerts(self):
+        alerts = self.detector._evaluate_alert_rules(self.detections, self.frame, 'cam')
+        return [a for a in alerts if a['type'] == 'manifestation']
+
+    def test_fresh_tracks_still_alert_by_default(self):
+        self.track(0.0)
+        alerts = self.manifestation_alerts()
+        self.assertEqual(len(alerts), 1)
+        self.assertEqual(alerts[0]['metadata']['persistent_persons'], 0)
+
+    def test_persistence_threshold_is_opt_in(self):
+        self.detector.ALERT_THRESHOLDS['manifestation']['min_persistent_persons'] = 50
+        self.track(0.0)
+        self.assertEqual(self.manifestation_alerts(), [])
+
+        self.track(31.0)
+        self.assertEqual(len(self.manifestation_alerts()), 1)
+
+    def test_small_crowd_does_not_alert(self):
+        self.detections = crowd(20)
+        self.track(0.0)
+        self.assertEqual(self.manifestation_alerts(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
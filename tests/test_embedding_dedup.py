@@ -0,0 +1,176 @@
+"""
+Tests for embedding-based near-duplicate clustering.
+"""
+
+import unittest
+import sys
+import sqlite3
+import tempfile
+import os
+from pathlib import Path
+from datetime import datetime
+
+import numpy as np
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / 'src'))
+
+from ai.embedding_dedup import (ArticleEmbedder, EmbeddingDeduplicator, FlatVectorIndex,
+                                get_embedding_deduplicator)
+
+
+def bag_of_words(texts):
+    """Deterministic toy embedding: hashed word counts."""
+    vectors = np.zeros((len(texts), 64), dtype=np.float32)
+    for i, text in enumerate(texts):
+        for word in text.lower().split():
+            vectors[i, hash(word) % 64] += 1.0
+    return vectors
+
+
+class TestFlatVectorIndex(unittest.TestCase):
+    """Test the incremental flat index."""
+
+    def test_search_returns_nearest(self):
+        index = FlatVectorIndex()
+        vectors = np.eye(4, dtype=np.float32)
+        index.add([10, 11, 12, 13], vectors, [10, 11, 12, 13], [0, 0, 0, 0])
+        positions, sims = index.search(vectors[2:3], k=2)
+        self.assertEqual(index.id_at(positions[0, 0]), 12)
+        self.assertAlmostEqual(float(sims[0, 0]), 1.0, places=5)
+
+    def test_time_filter_and_prune(self):
+        index = FlatVectorIndex()
+        index.add([1, 2], np.eye(2, dtype=np.float32), [1, 2], [100.0, 200.0])
+        positions, _ = index.search(np.eye(2, dtype=np.float32)[:1], k=1, min_timestamp=150.0)
+        self.assertEqual(index.id_at(positions[0, 0]), 2)
+        self.assertEqual(index.prune(150.0), 1)
+        self.assertEqual(len(index), 1)
+
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'index.npz')
+            index = FlatVectorIndex()
+            index.add([5], np.ones((1, 3), dtype=np.float32), [5], [1.0])
+            index.save(path)
+            loaded = FlatVectorIndex.load(path)
+            self.assertEqual(len(loaded), 1)
+            self.assertEqual(loaded.id_at(0), 5)
+
+
+class TestEmbeddingDeduplicator(unittest.TestCase):
+    """Test cluster assignment at ingestion time."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmpdir.name, 'test.db')
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("CREATE TABLE articles (id INTEGER PRIMARY KEY, title TEXT, content TEXT, "
+                     "published_at TEXT, created_at TEXT)")
+        conn.commit()
+        conn.close()
+        self.dedup = EmbeddingDeduplicator(self.db_path, ArticleEmbedder(encode_fn=bag_of_words),
+                                           threshold=0.9)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def insert(self, articles):
+        conn = sqlite3.connect(self.db_path)
+        conn.executemany("INSERT INTO articles (id, title) VALUES (?, ?)",
+                         [(a['id'], a['title']) for a in articles])
+        conn.commit()
+        conn.close()
+
+    def test_duplicates_share_cluster(self):
+        now = datetime.now()
+        articles = [
+            {'id': 1, 'title': 'Missile strike hits port city', 'content': '', 'published': now},
+            {'id': 2, 'title': 'Missile strike hits port city', 'content': '', 'published': now},
+            {'id': 3, 'title': 'Central bank holds interest rates', 'content': '', 'published': now},
+        ]
+        conn = sqlite3.connect(self.db_path)
+        conn.executemany("INSERT INTO articles (id, title) VALUES (?, ?)",
+                         [(a['id'], a['title']) for a in articles])
+        conn.commit()
+        conn.close()
+
+        assignments = self.dedup.assign_articles(articles)
+        self.assertEqual(assignments[1]['cluster_id'], 1)
+        self.assertEqual(assignments[2]['cluster_id'], 1)
+        self.assertTrue(assignments[2]['is_duplicate'])
+        self.assertEqual(assignments[3]['cluster_id'], 3)
+
+        conn = sqlite3.connect(self.db_path)
+        rows = dict(conn.execute("SELECT id, dedup_cluster_id FROM articles").fetchall())
+        conn.close()
+        self.assertEqual(rows, {1: 1, 2: 1, 3: 3})
+
+    def test_assign_pending_backfills_unclustered(self):
+        now = datetime.now().isoformat()
+        conn = sqlite3.connect(self.db_path)
+        conn.executemany("INSERT INTO articles (id, title, content, created_at) VALUES (?, ?, '', ?)",
+                         [(1, 'Border clashes reported overnight', now),
+                          (2, 'Border clashes reported overnight', now),
+                          (3, 'Old story', '2000-01-01T00:00:00')])
+        conn.commit()
+        conn.close()
+
+        self.assertEqual(self.dedup.assign_pending(), 2)
+        conn = sqlite3.connect(self.db_path)
+        rows = dict(conn.execute("SELECT id, dedup_cluster_id FROM articles").fetchall())
+        conn.close()
+        # Outside the time window articles are left alone
+        self.assertEqual(rows, {1: 1, 2: 1, 3: None})
+        self.assertEqual(self.dedup.assign_pending(), 0)
+
+    def test_instances_share_vectors_through_the_database(self):
+        now = datetime.now()
+        first = {'id': 1, 'title': 'Ceasefire talks resume in Doha', 'content': '', 'published': now}
+        second = {'id': 2, 'title': 'Ceasefire talks resume in Doha', 'content': '', 'published': now}
+        self.insert([first, second])
+
+        # A second writer (e.g. the scheduler's fetcher) created before the first assignment
+        other = EmbeddingDeduplicator(self.db_path, ArticleEmbedder(encode_fn=bag_of_words),
+                                      threshold=0.9)
+        self.dedup.assign_articles([first])
+        assignment = other.assign_articles([second])[2]
+        self.assertEqual(assignment['cluster_id'], 1)
+        self.assertTrue(assignment['is_duplicate'])
+
+        # Each writer keeps the other's vectors: nothing is lost to a last-save-wins file
+        conn = sqlite3.connect(self.db_path)
+        stored = [row[0] for row in conn.execute("SELECT article_id FROM dedup_vectors ORDER BY seq")]
+        conn.close()
+        self.assertEqual(stored, [1, 2])
+        reopened = EmbeddingDeduplicator(self.db_path, ArticleEmbedder(encode_fn=bag_of_words))
+        self.assertEqual(len(reopened.index), 2)
+
+    def test_legacy_index_is_imported_once(self):
+        legacy = FlatVectorIndex()
+        vector = bag_of_words(['Refugees cross the border'])
+        legacy.add([7], vector / np.linalg.norm(vector), [7], [datetime.now().timestamp()])
+        legacy_path = os.path.join(self.tmpdir.name, 'dedup_index.npz')
+        legacy.save(legacy_path)
+
+        dedup = EmbeddingDeduplicator(self.db_path, ArticleEmbedder(encode_fn=bag_of_words))
+        self.assertEqual(dedup.index.id_at(0), 7)
+        self.assertFalse(os.path.exists(legacy_path))
+        reopened = EmbeddingDeduplicator(self.db_path, ArticleEmbedder(encode_fn=bag_of_words))
+        self.assertEqual(len(reopened.index), 1)
+
+    def test_getter_returns_one_instance_per_database(self):
+        embedder = ArticleEmbedder(encode_fn=bag_of_words)
+        shared = get_embedding_deduplicator(self.db_path, embedder)
+        self.assertIs(get_embedding_deduplicator(os.path.join(self.tmpdir.name, '.', 'test.db'), embedder),
+                      shared)
+        other_db = os.path.join(self.tmpdir.name, 'other.db')
+        conn = sqlite3.connect(other_db)
+        conn.execute("CREATE TABLE articles (id INTEGER PRIMARY KEY, title TEXT, content TEXT, "
+                     "published_at TEXT, created_at TEXT)")
+        conn.close()
+        self.assertIsNot(get_embedding_deduplicator(other_db, embedder), shared)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+"""
+Tests for the streaming GDELT daily-export import.
+"""
+
+import io
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+import zipfile
+from datetime import date
+from pathlib import Path
+from unittest.mock import patch
+
+# Add project root to path (external_feeds imports through the src package)
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.intelligence import external_feeds
+from src.intelligence.external_feeds import ExternalIntelligenceFeeds, GDELT_COLUMNS
+from src.utils.db_pool import get_pool
+
+
+def gdelt_export(events):
+    """Tab-separated GDELT 1.0 export (no header) for ``(globaleventid, eventrootcode)`` pairs."""
+    lines = []
+    for event_id, root_code in events:
+        row = dict.fromkeys(GDELT_COLUMNS, '')
+        row.update({'globaleventid': str(event_id), 'sqldate': '20240101', 'eventrootcode': root_code,
+                    'eventcode': root_code + '0', 'actiongeo_countrycode': 'UP',
+                    'sourceurl': f'https://news.example/{event_id}'})
+        lines.append('\t'.join(row[column] for column in GDELT_COLUMNS))
+    return ('\n'.join(lines) + '\n').encode('utf-8')
+
+
+class FakeResponse:
+    """Streaming ``requests`` response serving a zipped export."""
+
+    def __init__(self, body):
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, 'w') as archive:
+            archive.writestr('20240101.export.CSV', body)
+        self.content = buffer.getvalue()
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size):
+        for start in range(0, len(self.content), chunk_size):
+            yield self.content[start:start + chunk_size]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class TestGdeltImport(unittest.TestCase):
+    """Conflict filtering, native dedup and failed-chunk reporting."""
+
+    EVENTS = [(1, '14'), (2, '04'), (3, '19'), (1, '14'), (4, '20')]
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmpdir.name, 'feeds.db')
+        self.feeds = ExternalIntelligenceFeeds.__new__(ExternalIntelligenceFeeds)
+        self.feeds.db_path = self.db_path
+        self.feeds.sources = {'gdelt': {'base_url': 'http://gdelt.example/events'}}
+        self.feeds._initialize_database()
+
+    def tearDown(self):
+        get_pool(self.db_path).close_writer()
+        self.tmpdir.cleanup()
+
+    def stored_ids(self):
+        conn = sqlite3.connect(self.db_path)
+        ids = [row[0] for row in conn.execute("SELECT globaleventid FROM gdelt_events ORDER BY 1")]
+        conn.close()
+        return ids
+
+    def test_filters_conflict_codes_and_ignores_duplicates(self):
+        result = self.feeds._import_gdelt_csv(io.BytesIO(gdelt_export(self.EVENTS)))
+        self.assertEqual(result, (5, 3, 1, 0))
+        self.assertEqual(self.stored_ids(), [1, 3, 4])
+
+        # Importing the same day again inserts nothing
+        result = self.feeds._import_gdelt_csv(io.BytesIO(gdelt_export(self.EVENTS)))
+        self.assertEqual(result, (5, 0, 4, 0))
+
+    def test_failed_chunk_is_counted_and_the_rest_imported(self):
+        save = self.feeds._save_gdelt_data
+        calls = []
+
+        def flaky_save(df):
+            calls.append(len(df))
+            if len(calls) == 1:
+                raise sqlite3.OperationalError('database is locked')
+            return save(df)
+
+        with patch.object(external_feeds, 'GDELT_CHUNK_SIZE', 2), \
+                patch.object(self.feeds, '_save_gdelt_data', side_effect=flaky_save):
+            rows_read, inserted, skipped, failed = self.feeds._import_gdelt_csv(
+                io.BytesIO(gdelt_export(self.EVENTS)))
+        self.assertEqual((rows_read, failed), (5, 1))
+        self.assertEqual(len(calls), 3)
+        # Event 2 was lost with the first chunk; event 1 reappears in the second
+        self.assertEqual(self.stored_ids(), [1, 3, 4])
+        self.assertEqual((inserted, skipped), (3, 0))
+
+    def test_partial_import_is_logged_as_failed(self):
+        body = gdelt_export(self.EVENTS)
+        with patch.object(external_feeds.requests, 'get', return_value=FakeResponse(body)), \
+                patch.object(self.feeds, '_save_gdelt_data',
+                             side_effect=sqlite3.OperationalError('disk I/O error')):
+            self.assertFalse(self.feeds.fetch_gdelt_data(date(2024, 1, 1)))
+
+        conn = sqlite3.connect(self.db_path)
+        status, error = conn.execute(
+            "SELECT status, error_message FROM feed_updates WHERE source = 'gdelt'").fetchone()
+        conn.close()
+        self.assertEqual(status, 'error')
+        self.assertIn('1 chunks', error)
+
+    def test_complete_import_is_logged_as_success(self):
+        body = gdelt_export(self.EVENTS)
+        with patch.object(external_feeds.requests, 'get', return_value=FakeResponse(body)):
+            self.assertTrue(self.feeds.fetch_gdelt_data(date(2024, 1, 1)))
+        self.assertEqual(self.stored_ids(), [1, 3, 4])
+
+
+if __name__ == '__main__':
+    unittest.main()
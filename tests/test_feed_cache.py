@@ -0,0 +1,71 @@
+"""
+Tests for the conditional-GET feed validator store.
+"""
+
+import unittest
+import sys
+import tempfile
+import os
+from pathlib import Path
+
+# Add project root to path (data_ingestion imports through the src package)
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.data_ingestion.feed_cache import FeedValidatorStore, entry_guid
+
+
+class TestFeedValidatorStore(unittest.TestCase):
+    """Test validator persistence and entry filtering."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.store = FeedValidatorStore(os.path.join(self.tmpdir.name, 'feeds.db'))
+        self.url = 'https://example.org/rss'
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_no_headers_for_unknown_feed(self):
+        self.assertEqual(self.store.conditional_headers(self.url), {})
+
+    def test_conditional_headers_after_update(self):
+        self.store.update(self.url, {'ETag': '"abc"', 'Last-Modified': 'Mon, 01 Jan 2024 00:00:00 GMT'},
+                          b'<rss/>', [])
+        headers = self.store.conditional_headers(self.url)
+        self.assertEqual(headers['If-None-Match'], '"abc"')
+        self.assertEqual(headers['If-Modified-Since'], 'Mon, 01 Jan 2024 00:00:00 GMT')
+
+    def test_not_modified_on_304_and_identical_body(self):
+        self.assertTrue(self.store.is_not_modified(self.url, 304, None))
+        self.assertFalse(self.store.is_not_modified(self.url, 200, b'<rss>1</rss>'))
+        self.store.update(self.url, {}, b'<rss>1</rss>', [])
+        self.assertTrue(self.store.is_not_modified(self.url, 200, b'<rss>1</rss>'))
+        self.assertFalse(self.store.is_not_modified(self.url, 200, b'<rss>2</rss>'))
+
+    def test_only_unseen_entries_are_returned(self):
+        first = [{'id': 'a'}, {'id': 'b'}]
+        self.store.update(self.url, {}, b'1', first)
+        second = [{'id': 'c'}, {'id': 'a'}, {'id': 'b'}]
+        new_entries = self.store.filter_new_entries(self.url, second)
+        self.assertEqual([entry_guid(e) for e in new_entries], ['c'])
+
+    def test_partial_update_keeps_unhandled_entries(self):
+        entries = [{'id': 'a'}, {'id': 'b'}, {'id': 'c'}]
+        self.store.update(self.url, {'ETag': '"v1"'}, b'<rss>abc</rss>', entries[:2], complete=False)
+        # Unhandled entries stay new and the feed is not answered as unchanged
+        self.assertEqual(self.store.conditional_headers(self.url), {})
+        self.assertFalse(self.store.is_not_modified(self.url, 200, b'<rss>abc</rss>'))
+        new_entries = self.store.filter_new_entries(self.url, entries)
+        self.assertEqual([entry_guid(e) for e in new_entries], ['c'])
+
+        self.store.update(self.url, {'ETag': '"v1"'}, b'<rss>abc</rss>', new_entries)
+        self.assertEqual(self.store.filter_new_entries(self.url, entries), [])
+        self.assertTrue(self.store.is_not_modified(self.url, 200, b'<rss>abc</rss>'))
+
+    def test_entry_guid_fallbacks(self):
+        self.assertEqual(entry_guid({'link': 'https://x/1'}), 'https://x/1')
+        self.assertEqual(entry_guid({'title': 'Hello'}), entry_guid({'title': 'Hello'}))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,200 @@
+"""
+Tests for the shared per-camera frame bus, using fake captures.
+"""
+
+import threading
+import unittest
+import time
+from unittest.mock import patch
+
+import numpy as np
+
+from cams_loader import load_cams_module
+
+frame_bus = load_cams_module('frame_bus')
+FrameBus = frame_bus.FrameBus
+FrameBusManager = frame_bus.FrameBusManager
+
+
+class LiveCapture:
+    """
+    Live source: grab() blocks until the next frame is produced at ``fps``
+    and the stream position advances one frame per grab. ``stall_at``
+    freezes the network once for ``stall_seconds`` before that frame.
+    """
+
+    def __init__(self, fps=50.0, stall_at=None, stall_seconds=0.0):
+        self.interval = 1.0 / fps
+        self.stall_at = stall_at
+        self.stall_seconds = stall_seconds
+        self.grabs = 0
+        self.retrieved = 0
+
+    def isOpened(self):
+        return True
+
+    def set(self, prop, value):
+        return True
+
+    def grab(self):
+        if self.grabs == self.stall_at:
+            time.sleep(self.stall_seconds)
+        time.sleep(self.interval)
+        self.grabs += 1
+        return True
+
+    def retrieve(self):
+        self.retrieved += 1
+        return True, np.full((8, 8, 3), self.grabs % 256, dtype=np.uint8)
+
+    def get(self, prop):
+        return self.grabs * self.interval * 1000.0 if prop == frame_bus.cv2.CAP_PROP_POS_MSEC else 0.0
+
+    def release(self):
+        pass
+
+
+class TestFrameBus(unittest.TestCase):
+    """Decoding follows subscribers and survives stalls of a live source."""
+
+    def start_bus(self, capture):
+        bus = FrameBus('cam1', 'rtsp://fake', history_seconds=1, history_fps=5,
+                       open_capture=lambda url: capture)
+        bus.start()
+        self.addCleanup(bus.stop)
+        return bus
+
+    def consume(self, subscription, seconds):
+        received = 0
+        deadline = time.time() + seconds
+        while time.time() < deadline:
+            if subscription.next(timeout=0.1) is not None:
+                received += 1
+        return received
+
+    def test_decodes_only_what_subscribers_need(self):
+        capture = LiveCapture(fps=50)
+        bus = self.start_bus(capture)
+        subscription = bus.subscribe('detector', fps=5)
+        time.sleep(1.0)
+        self.assertGreater(subscription.next(timeout=1.0).seq, 0)
+        # ~50 grabs per second, but only the 5 fps subscriber and pre-roll decode
+        self.assertGreater(capture.grabs, 35)
+        self.assertLess(capture.retrieved, capture.grabs / 3)
+        self.assertFalse(bus.get_statistics()['catching_up'])
+
+    def test_live_stall_recovers_by_resyncing_the_clock(self):
+        capture = LiveCapture(fps=50, stall_at=20, stall_seconds=0.6)
+        with patch.object(frame_bus, 'MAX_LIVE_LAG', 0.3), \
+                patch.object(frame_bus, 'RESUME_LIVE_LAG', 0.1):
+            bus = self.start_bus(capture)
+            subscription = bus.subscribe('detector')
+            time.sleep(1.5)
+
+            # The bus skipped frames while behind, then decodes live again
+            received = self.consume(subscription, 0.4)
+            stats = bus.get_statistics()
+            self.assertGreater(stats['frames_skipped_lag'], 0)
+            self.assertEqual(stats['clock_resyncs'], 1)
+            self.assertFalse(stats['catching_up'])
+            self.assertLess(stats['lag_seconds'], 0.1)
+            self.assertGreater(received, 10)
+
+    def test_catch_up_is_time_limited(self):
+        capture = LiveCapture(fps=50, stall_at=10, stall_seconds=0.6)
+        # Never accept the grab rate as live: only the time limit ends catch-up
+        with patch.object(frame_bus, 'MAX_LIVE_LAG', 0.3), \
+                patch.object(frame_bus, 'RESUME_LIVE_LAG', 0.1), \
+                patch.object(frame_bus, 'CATCH_UP_REALTIME_GRABS', 10 ** 6), \
+                patch.object(frame_bus, 'MAX_CATCH_UP_SECONDS', 0.4):
+            bus = self.start_bus(capture)
+            bus.subscribe('detector')
+            time.sleep(0.9)
+            self.assertTrue(bus.get_statistics()['catching_up'])
+            time.sleep(0.6)
+            stats = bus.get_statistics()
+            self.assertFalse(stats['catching_up'])
+            self.assertEqual(stats['clock_resyncs'], 1)
+
+
+    def test_slow_subscriber_does_not_block_decoding(self):
+        capture = LiveCapture(fps=50)
+        bus = self.start_bus(capture)
+        fast = bus.subscribe('viewer')
+        slow = bus.subscribe('recorder')
+
+        def read_slowly():
+            for _ in range(3):
+                slow.next(timeout=1.0)
+                time.sleep(0.3)
+
+        slow_thread = threading.Thread(target=read_slowly, daemon=True)
+        slow_thread.start()
+
+        received = self.consume(fast, 1.0)
+        slow_thread.join()
+        # The fast subscriber keeps the live rate while the slow one lags
+        self.assertGreater(received, 30)
+        self.assertGreater(capture.grabs, 40)
+        self.assertEqual(slow.received, 3)
+        self.assertGreater(slow.dropped, 0)
+
+
+class TestFrameSubscription(unittest.TestCase):
+    """Frames a subscriber misses between reads are counted as dropped."""
+
+    def setUp(self):
+        self.bus = FrameBus('cam1', 'rtsp://fake', history_seconds=1, history_fps=5)
+        self.frame = np.zeros((8, 8, 3), dtype=np.uint8)
+
+    def publish(self, count):
+        for _ in range(count):
+            self.bus.publish(self.frame.copy(), timestamp=self.bus.frames_decoded + 1.0)
+
+    def test_missed_frames_are_counted(self):
+        subscription = self.bus.subscribe('slow')
+        self.publish(5)
+        # The first read starts the cursor; nothing counts as dropped yet
+        self.assertEqual(subscription.next(timeout=0).seq, 5)
+        self.assertEqual(subscription.dropped, 0)
+
+        self.publish(3)
+        self.assertEqual(subscription.next(timeout=0).seq, 8)
+        self.assertEqual(subscription.dropped, 2)
+        self.assertIsNone(subscription.next(timeout=0))
+        self.assertEqual(subscription.get_statistics()['received'], 2)
+
+
+class TestFrameBusManager(unittest.TestCase):
+    """The first acquire starts a camera's bus and the last release stops it."""
+
+    def setUp(self):
+        patcher = patch.object(frame_bus.cv2, 'VideoCapture', side_effect=lambda url: LiveCapture())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.manager = FrameBusManager(history_seconds=1, history_fps=5)
+        self.addCleanup(self.manager.cleanup)
+
+    def test_refcounted_start_and_stop(self):
+        bus = self.manager.acquire('cam1', 'rtsp://fake')
+        self.assertIs(self.manager.acquire('cam1', 'rtsp://fake'), bus)
+        self.assertTrue(bus.running)
+
+        self.manager.release('cam1')
+        self.assertTrue(bus.running)
+        self.assertIs(self.manager.get('cam1'), bus)
+
+        self.manager.release('cam1')
+        self.assertFalse(bus.running)
+        self.assertFalse(bus._thread.is_alive())
+        self.assertIsNone(self.manager.get('cam1'))
+
+        # Releasing an unknown camera is a no-op; acquiring again starts a new bus
+        self.manager.release('cam1')
+        again = self.manager.acquire('cam1', 'rtsp://fake')
+        self.assertIsNot(again, bus)
+        self.assertTrue(again.running)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+"""
+Tests for the FTS5 article search index.
+"""
+
+import unittest
+import sys
+import os
+import sqlite3
+import tempfile
+from pathlib import Path
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / 'src'))
+
+from utils.db_pool import get_pool
+from utils.fulltext_search import (FTS_TABLE, backfill_fts_index, build_match_query, ensure_fts_index,
+                                   fts_backfill_pending, fts_index_exists, search_articles)
+
+
+class TestFullTextSearch(unittest.TestCase):
+    """Test trigger sync, ranking and query building."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmpdir.name, 'test.db')
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.execute("CREATE TABLE articles (id INTEGER PRIMARY KEY, title TEXT, content TEXT, "
+                          "summary TEXT, url TEXT, source TEXT, language TEXT, risk_level TEXT, "
+                          "published_at TEXT, created_at TEXT)")
+        # Existing row is picked up by the backfill, not at index creation
+        self.conn.execute("INSERT INTO articles (title, content, language) VALUES "
+                          "('Sanctions on exports', 'New sanctions announced', 'en')")
+        self.assertTrue(ensure_fts_index(self.conn))
+        self.assertFalse(ensure_fts_index(self.conn))
+        self.assertTrue(fts_backfill_pending(self.conn))
+        self.assertEqual(backfill_fts_index(self.db_path)['indexed'], 1)
+        self.assertFalse(fts_backfill_pending(self.conn))
+
+    def tearDown(self):
+        get_pool(self.db_path).close_writer()
+        self.conn.close()
+        self.tmpdir.cleanup()
+
+    def integrity_check(self):
+        self.conn.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('integrity-check')")
+
+    def test_backfill_and_insert_trigger(self):
+        self.conn.execute("INSERT INTO articles (title, content, language) VALUES "
+                          "('Missile strike in the north', 'Military escalation continues', 'en')")
+        self.assertEqual(len(search_articles(self.conn, 'sanctions')), 1)
+        results = search_articles(self.conn, 'missile')
+        self.assertEqual(len(results), 1)
+        self.assertIn('<mark>', results[0]['snippet'])
+
+    def test_update_and_delete_triggers(self):
+        self.conn.execute("UPDATE articles SET title = 'Trade agreement signed' WHERE id = 1")
+        self.assertEqual(search_articles(self.conn, 'exports', prefix=False), [])
+        self.assertEqual(len(search_articles(self.conn, 'agreement')), 1)
+        self.conn.execute("DELETE FROM articles WHERE id = 1")
+        self.assertEqual(search_articles(self.conn, 'agreement'), [])
+        self.integrity_check()
+
+    def test_pending_rows_are_left_to_the_backfill(self):
+        db_path = os.path.join(self.tmpdir.name, 'pending.db')
+        conn = sqlite3.connect(db_path)
+        conn.execute("CREATE TABLE articles (id INTEGER PRIMARY KEY, title TEXT, content TEXT, "
+                     "summary TEXT, url TEXT, source TEXT, language TEXT, risk_level TEXT, "
+                     "published_at TEXT, created_at TEXT)")
+        conn.executemany("INSERT INTO articles (title, content) VALUES (?, ?)",
+                         [(f'Border clash {i}', 'Troops') for i in range(5)])
+        self.assertTrue(ensure_fts_index(conn))
+        self.assertEqual(search_articles(conn, 'border'), [])
+
+        # Writes to rows still pending do not touch the (empty) index
+        conn.execute("UPDATE articles SET title = 'Ceasefire holds' WHERE id = 2")
+        conn.execute("DELETE FROM articles WHERE id = 3")
+        conn.execute("INSERT INTO articles (title, content) VALUES ('Border reopened', 'Trade')")
+        conn.commit()
+        self.assertEqual([r['id'] for r in search_articles(conn, 'border')], [6])
+
+        try:
+            self.assertEqual(backfill_fts_index(db_path, batch_size=2)['indexed'], 4)
+        finally:
+            get_pool(db_path).close_writer()
+        self.assertEqual(sorted(r['id'] for r in search_articles(conn, 'border')), [1, 4, 5, 6])
+        self.assertEqual([r['id'] for r in search_articles(conn, 'ceasefire')], [2])
+        self.assertFalse(fts_backfill_pending(conn))
+        conn.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('integrity-check')")
+        conn.close()
+
+    def test_prefix_and_title_ranking(self):
+        self.conn.execute("INSERT INTO articles (title, content) VALUES "
+                          "('Weather report', 'sanctions mentioned in passing')")
+        results = search_articles(self.conn, 'sanc')
+        self.assertEqual(len(results), 2)
+        self.assertEqual(results[0]['id'], 1)
+
+    def test_match_query_escapes_operators(self):
+        self.assertEqual(build_match_query('war OR "peace"', prefix=False), '"war" "OR" "peace"')
+        self.assertEqual(build_match_query('nuc* talks'), '"nuc"* "talks"*')
+        self.assertIsNone(build_match_query('  -- '))
+
+    def test_missing_column_creates_nothing(self):
+        conn = sqlite3.connect(':memory:')
+        conn.execute("CREATE TABLE articles (id INTEGER PRIMARY KEY, title TEXT, content TEXT)")
+        self.assertFalse(ensure_fts_index(conn))
+        self.assertFalse(fts_index_exists(conn))
+        triggers = conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger'").fetchone()[0]
+        self.assertEqual(triggers, 0)
+        # Inserts keep working without the index
+        conn.execute("INSERT INTO articles (title, content) VALUES ('Ceasefire', 'Talks resume')")
+        conn.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+"""
+Tests for the multi-index Hamming lookup used by image duplicate detection.
+"""
+
+import unittest
+import sys
+import random
+from pathlib import Path
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / 'src'))
+
+from utils.hamming_index import HammingIndex, NearPairTracker, hamming_distance, radius_for_similarity
+
+
+def planted_hashes(n_bits, count, seed):
+    """Random hashes plus near copies of some of them."""
+    rng = random.Random(seed)
+    hashes = [rng.getrandbits(n_bits) for _ in range(count)]
+    for _ in range(count // 3):
+        value = rng.choice(hashes)
+        for _ in range(rng.randint(0, n_bits // 6)):
+            value ^= 1 << rng.randrange(n_bits)
+        hashes.append(value)
+    return hashes
+
+
+def brute_force_pairs(hashes, radius):
+    pairs = []
+    for i in range(len(hashes)):
+        for j in range(i + 1, len(hashes)):
+            distance = hamming_distance(hashes[i], hashes[j])
+            if distance <= radius:
+                pairs.append((i, j, distance))
+    return pairs
+
+
+class TestHammingIndex(unittest.TestCase):
+    """Index results must match an exhaustive pairwise comparison."""
+
+    def test_radius_for_similarity(self):
+        self.assertEqual(radius_for_similarity(256, 0.85), 38)
+        self.assertEqual(radius_for_similarity(64, 0.85), 9)
+        self.assertEqual(radius_for_similarity(64, 1.0), 0)
+
+    def test_near_pairs_matches_brute_force(self):
+        for n_bits in (64, 256):
+            radius = radius_for_similarity(n_bits, 0.85)
+            hashes = planted_hashes(n_bits, 300, seed=n_bits)
+            index = HammingIndex(n_bits, radius, expected_items=len(hashes))
+            for position, value in enumerate(hashes):
+                index.add(position, value)
+            self.assertEqual(index.near_pairs(), brute_force_pairs(hashes, radius))
+
+    def test_incremental_query(self):
+        hashes = planted_hashes(64, 200, seed=3)
+        index = HammingIndex(64, 9)
+        for position, value in enumerate(hashes[:-1]):
+            index.add(position, value)
+        expected = [(i, hamming_distance(value, hashes[-1]))
+                    for i, value in enumerate(hashes[:-1])
+                    if hamming_distance(value, hashes[-1]) <= 9]
+        self.assertEqual(index.query(hashes[-1]), expected)
+
+    def test_smaller_radius_and_limits(self):
+        index = HammingIndex(64, 9)
+        index.add('a', 0)
+        index.add('b', 0b111)
+        self.assertEqual(index.near_pairs(radius=2), [])
+        self.assertEqual(index.near_pairs(), [('a', 'b', 3)])
+        with self.assertRaises(ValueError):
+            index.query(0, radius=10)
+
+
+class TestNearPairTracker(unittest.TestCase):
+    """Incrementally maintained pairs must match a fresh exhaustive comparison."""
+
+    def fingerprints(self, n_bits, count, seed):
+        return [format(value, f'0{n_bits // 4}x') for value in planted_hashes(n_bits, count, seed)]
+
+    def expected(self, fingerprints, threshold):
+        n_bits = len(fingerprints[0]) * 4
+        radius = radius_for_similarity(n_bits, threshold)
+        values = [int(fingerprint, 16) for fingerprint in fingerprints]
+        return [(i, j, 1.0 - distance / n_bits) for i, j, distance in brute_force_pairs(values, radius)]
+
+    def test_incremental_adds_match_bulk(self):
+        fingerprints = self.fingerprints(64, 150, seed=7)
+        keys = [(i, fingerprint) for i, fingerprint in enumerate(fingerprints)]
+        tracker = NearPairTracker(0.85)
+        # Bulk load, then one-by-one additions through queries
+        tracker.add_many((key, key[1]) for key in keys[:100])
+        for key in keys[100:]:
+            tracker.add(key, key[1])
+        self.assertEqual(tracker.pairs_among(keys), self.expected(fingerprints, 0.85))
+
+        # Subsets and reordering only report the requested keys, by position
+        subset = keys[::-1][:80]
+        subset_expected = self.expected([key[1] for key in subset], 0.85)
+        self.assertEqual(tracker.pairs_among(subset), subset_expected)
+
+    def test_repeated_and_invalid_keys(self):
+        tracker = NearPairTracker(0.85)
+        tracker.add_many([('a', '0' * 16), ('b', 'zz'), ('c', None)])
+        tracker.add('a', 'f' * 16)
+        tracker.add('d', '0' * 15 + '1')
+        self.assertEqual(len(tracker), 4)
+        self.assertEqual(tracker.pairs_among(['a', 'b', 'c', 'd']), [(0, 3, 1.0 - 1 / 64)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+"""
+Tests for the content-addressed image store.
+"""
+
+import io
+import os
+import unittest
+import sys
+import shutil
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / 'src'))
+
+from PIL import Image
+
+from utils.image_store import ImageStore
+
+
+def _png_bytes(color):
+    buffer = io.BytesIO()
+    Image.new('RGB', (120, 80), color).save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    routes = {}
+    requests_seen = []
+
+    def do_GET(self):
+        self.requests_seen.append(self.path)
+        content_type, body = self.routes.get(self.path, ('text/plain', b'not found'))
+        self.send_response(200 if self.path in self.routes else 404)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestImageStore(unittest.TestCase):
+    """Each image should cross the network once and be stored once."""
+
+    @classmethod
+    def setUpClass(cls):
+        red = _png_bytes((200, 10, 10))
+        _Handler.routes = {
+            '/red.png': ('image/png', red),
+            '/red-copy.png': ('image/png', red),
+            '/blue.png': ('image/png', _png_bytes((10, 10, 200))),
+            '/page.html': ('text/html', b'<html></html>'),
+            '/cdn/blue': ('application/octet-stream', _png_bytes((10, 10, 200))),
+        }
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_address[1]}"
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.store = ImageStore(Path(self.temp_dir) / 'store')
+        _Handler.requests_seen.clear()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_fetch_once_and_compute_metadata(self):
+        stored = self.store.fetch(f"{self.base_url}/red.png")
+        again = self.store.fetch(f"{self.base_url}/red.png")
+
+        self.assertEqual(_Handler.requests_seen, ['/red.png'])
+        self.assertEqual((stored.width, stored.height), (120, 80))
+        self.assertTrue(stored.path.exists())
+        self.assertTrue(stored.thumbnail_path.exists())
+        self.assertEqual(again.sha256, stored.sha256)
+        self.assertEqual(self.store.get_stats()['hits'], 1)
+
+    def test_same_content_is_stored_once(self):
+        results = self.store.fetch_many([
+            f"{self.base_url}/red.png", f"{self.base_url}/red-copy.png", f"{self.base_url}/blue.png",
+        ])
+        red, copy, blue = results.values()
+
+        self.assertEqual(red.path, copy.path)
+        self.assertNotEqual(red.sha256, blue.sha256)
+        stats = self.store.get_stats()
+        self.assertEqual((stats['objects'], stats['urls']), (2, 3))
+
+    def test_non_image_is_rejected_and_not_retried(self):
+        url = f"{self.base_url}/page.html"
+        self.assertIsNone(self.store.fetch(url))
+        self.assertIsNone(self.store.fetch(url))
+        self.assertEqual(_Handler.requests_seen, ['/page.html'])
+
+    def test_image_served_as_octet_stream_is_sniffed(self):
+        stored = self.store.fetch(f"{self.base_url}/cdn/blue")
+        self.assertIsNotNone(stored)
+        self.assertEqual(stored.content_type, 'image/png')
+        self.assertEqual(stored.path.suffix, '.png')
+
+    def test_link_into_directory(self):
+        stored = self.store.fetch(f"{self.base_url}/blue.png")
+        target = self.store.link_into(stored, Path(self.temp_dir) / 'static')
+        self.assertEqual(target.read_bytes(), stored.read_bytes())
+        self.assertEqual(target.name, f"{stored.sha256}.png")
+
+    @unittest.skipIf('IMAGE_STORE_DIR' in os.environ, 'store path overridden')
+    def test_default_dir_does_not_depend_on_working_directory(self):
+        from utils.image_store import DEFAULT_STORE_DIR
+        project_root = Path(__file__).resolve().parent.parent
+        self.assertEqual(Path(DEFAULT_STORE_DIR), project_root / 'data' / 'image_store')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,122 @@
+"""
+Tests for the cross-camera batched inference scheduler, using a fake model.
+"""
+
+import unittest
+import threading
+
+import numpy as np
+
+from cams_loader import load_cams_module
+
+inference_scheduler = load_cams_module('inference_scheduler')
+BatchInferenceScheduler = inference_scheduler.BatchInferenceScheduler
+
+
+class FakeModel:
+    """
+    Records batch sizes and returns, per image, the bounding box of its
+    non-fill pixels. ``hold`` blocks the first call until released so
+    tests can queue frames behind a running batch.
+    """
+
+    def __init__(self, hold=False):
+        self.batches = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+        if not hold:
+            self.release.set()
+
+    def __call__(self, batch):
+        self.started.set()
+        self.release.wait(5)
+        self.batches.append(len(batch))
+        outputs = []
+        for image in batch:
+            ys, xs = np.nonzero((image != inference_scheduler.LETTERBOX_FILL).any(axis=2))
+            outputs.append(np.array([[xs.min(), ys.min(), xs.max() + 1, ys.max() + 1, 0.9, 0]],
+                                    dtype=np.float32))
+        return outputs
+
+
+def frame(width=320, height=240):
+    return np.zeros((height, width, 3), dtype=np.uint8)
+
+
+class TestBatchInferenceScheduler(unittest.TestCase):
+    """Batching, per-camera replacement, letterbox undo and shutdown."""
+
+    def make(self, model, **kwargs):
+        scheduler = BatchInferenceScheduler(model, input_size=64, **kwargs)
+        self.addCleanup(scheduler.stop)
+        return scheduler
+
+    def test_queued_cameras_share_one_batch(self):
+        model = FakeModel(hold=True)
+        scheduler = self.make(model, max_batch_size=4, max_wait_ms=1)
+        first = scheduler.submit('warmup', frame())
+        self.assertTrue(model.started.wait(5))
+
+        futures = [scheduler.submit(f'cam{i}', frame()) for i in range(6)]
+        model.release.set()
+        self.assertIsNotNone(first.result(5))
+        self.assertTrue(all(f.result(5) is not None for f in futures))
+        # Six waiting cameras are served as a full batch plus the rest
+        self.assertEqual(model.batches, [1, 4, 2])
+        self.assertEqual(scheduler.get_statistics()['frames_inferred'], 7)
+
+    def test_newer_frame_replaces_pending_one_and_keeps_its_turn(self):
+        model = FakeModel(hold=True)
+        scheduler = self.make(model, max_batch_size=2, max_wait_ms=1)
+        scheduler.submit('warmup', frame())
+        self.assertTrue(model.started.wait(5))
+
+        old_a = scheduler.submit('a', frame())
+        b = scheduler.submit('b', frame())
+        c = scheduler.submit('c', frame())
+        new_a = scheduler.submit('a', frame())
+        model.release.set()
+
+        self.assertIsNone(old_a.result(5))
+        for future in (b, c, new_a):
+            self.assertIsNotNone(future.result(5))
+        stats = scheduler.get_statistics()
+        self.assertEqual(stats['dropped_replaced'], 1)
+        self.assertEqual(stats['cameras']['a'], {'submitted': 2, 'inferred': 1, 'dropped': 1})
+        # 'a' kept its place at the head of the queue: a and b share the next batch
+        self.assertEqual(model.batches, [1, 2, 1])
+
+    def test_boxes_return_in_original_frame_coordinates(self):
+        scheduler = self.make(FakeModel())
+        for width, height in ((320, 240), (240, 320), (64, 64)):
+            with self.subTest(size=(width, height)):
+                boxes = scheduler.infer('cam', frame(width, height), timeout=5)
+                np.testing.assert_allclose(boxes[0, :4], [0, 0, width, height], atol=width / 32)
+                self.assertEqual(boxes[0, 4], np.float32(0.9))
+
+    def test_model_errors_reach_every_caller(self):
+        def broken(batch):
+            raise RuntimeError('cuda out of memory')
+
+        scheduler = self.make(broken)
+        with self.assertRaises(RuntimeError):
+            scheduler.infer('cam', frame(), timeout=5)
+        self.assertEqual(scheduler.get_statistics()['errors'], 1)
+
+    def test_stop_resolves_pending_and_later_frames(self):
+        model = FakeModel(hold=True)
+        scheduler = self.make(model, max_batch_size=1)
+        scheduler.submit('warmup', frame())
+        self.assertTrue(model.started.wait(5))
+        pending = scheduler.submit('cam', frame())
+
+        stopper = threading.Thread(target=scheduler.stop)
+        stopper.start()
+        self.assertIsNone(pending.result(5))
+        model.release.set()
+        stopper.join(5)
+        self.assertIsNone(scheduler.submit('cam', frame()).result(1))
+
+
+if __name__ == '__main__':
+    unittest.main()
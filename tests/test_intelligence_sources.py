@@ -0,0 +1,96 @@
+"""
+Tests for IntelligenceCollector feed cache bookkeeping.
+"""
+
+import asyncio
+import threading
+import unittest
+import sys
+import tempfile
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+# Add project root to path (data_ingestion imports through the src package)
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.data_ingestion.feed_cache import FeedValidatorStore
+from src.data_ingestion.intelligence_sources import IntelligenceCollector
+
+FEED = b"""<?xml version="1.0"?>
+<rss version="2.0"><channel><title>Think tank</title>
+<item><guid>saved</guid><link>https://x/saved</link><title>saved</title></item>
+<item><guid>skipped</guid><link>https://x/skipped</link><title>skipped</title></item>
+<item><guid>failed</guid><link>https://x/failed</link><title>failed</title></item>
+</channel></rss>"""
+
+
+class FakeResponse:
+    status = 200
+    headers = {'ETag': '"v1"'}
+
+    async def read(self):
+        return FEED
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeSession:
+    def get(self, url, headers=None):
+        return FakeResponse()
+
+
+class TestIntelligenceFeedCache(unittest.TestCase):
+    """Entries are only marked seen once their article is saved."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.collector = IntelligenceCollector.__new__(IntelligenceCollector)
+        self.collector.feed_cache = FeedValidatorStore(os.path.join(self.tmpdir.name, 'feeds.db'))
+        self.collector._pending_feed_updates = {}
+        self.collector._pending_lock = threading.Lock()
+        self.collector.request_delay = 0
+        self.source = {'name': 'Think tank', 'rss': 'https://x/rss'}
+
+        def process(entry, source):
+            if entry['title'] == 'skipped':
+                return None
+            return {'url': entry['link'], 'title': entry['title']}
+
+        patcher = patch.object(self.collector, '_process_intelligence_entry', side_effect=process)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def fetch(self):
+        return asyncio.run(self.collector._fetch_intelligence_rss_async(FakeSession(), self.source, 10))
+
+    def test_nothing_recorded_before_save(self):
+        articles = self.fetch()
+        self.assertEqual([a['url'] for a in articles], ['https://x/saved', 'https://x/failed'])
+        self.assertIsNone(self.collector.feed_cache.get(self.source['rss']))
+
+    def test_unsaved_entries_are_fetched_again(self):
+        self.fetch()
+        self.collector.confirm_saved_articles(['https://x/saved'])
+        record = self.collector.feed_cache.get(self.source['rss'])
+        self.assertEqual(sorted(record['seen_guids']), ['saved', 'skipped'])
+        # Partial save: validators cleared so the feed is not answered as unchanged
+        self.assertEqual(self.collector.feed_cache.conditional_headers(self.source['rss']), {})
+        self.assertEqual([a['url'] for a in self.fetch()], ['https://x/failed'])
+
+    def test_complete_save_keeps_validators(self):
+        self.fetch()
+        self.collector.confirm_saved_articles(['https://x/saved', 'https://x/failed'])
+        headers = self.collector.feed_cache.conditional_headers(self.source['rss'])
+        self.assertEqual(headers, {'If-None-Match': '"v1"'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+"""
+Tests for the two-tier (memory + SQLite) cache.
+"""
+
+import unittest
+import sys
+import tempfile
+import threading
+import time
+import os
+from pathlib import Path
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / 'src'))
+
+from cache.intelligent_cache import IntelligentCacheSystem, NamespacePolicy, TwoTierCache, memoize
+
+
+class TestTwoTierCache(unittest.TestCase):
+    """Test tiers, per-namespace quotas, TTL and single-flight."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmpdir.name, 'cache.db')
+        self.cache = TwoTierCache(self.db_path, policies={
+            'small': NamespacePolicy(ttl=60, memory_bytes=300, disk_bytes=300),
+            'other': NamespacePolicy(ttl=60, memory_bytes=10000, disk_bytes=10000),
+        })
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_disk_tier_survives_restart(self):
+        self.cache.set('other', 'k', {'value': 1})
+        reopened = TwoTierCache(self.db_path)
+        self.assertEqual(reopened.get('other', 'k'), {'value': 1})
+        self.assertEqual(reopened.get_stats()['namespaces']['other']['disk_hits'], 1)
+
+    def test_quota_eviction_is_per_namespace(self):
+        self.cache.set('other', 'keep', 'x' * 50)
+        for i in range(10):
+            self.cache.set('small', f'k{i}', 'y' * 100)
+        self.assertEqual(self.cache.get('other', 'keep'), 'x' * 50)
+        self.assertIsNone(self.cache.get('small', 'k0'))
+        self.assertIsNotNone(self.cache.get('small', 'k9'))
+        stats = self.cache.get_stats()['namespaces']['small']
+        self.assertGreater(stats['disk_evictions'], 0)
+        self.assertLessEqual(stats['disk_bytes'], 300)
+
+    def test_ttl_expiry(self):
+        self.cache.set('other', 'k', 1, ttl=0)
+        self.assertIsNone(self.cache.get('other', 'k'))
+
+    def test_single_flight(self):
+        calls = []
+        gate = threading.Event()
+
+        def builder():
+            calls.append(1)
+            gate.wait(1)
+            return 'built'
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(
+            self.cache.get_or_compute('other', 'slow', builder))) for _ in range(5)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.1)
+        gate.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, ['built'] * 5)
+        self.assertEqual(len(calls), 1)
+
+    def test_memoize_and_legacy_interface(self):
+        calls = []
+
+        @memoize('other', cache=self.cache)
+        def build(region):
+            calls.append(region)
+            return {'region': region}
+
+        self.assertEqual(build('EU'), build('EU'))
+        self.assertEqual(calls, ['EU'])
+
+        legacy = IntelligentCacheSystem(self.cache)
+        legacy.save_to_cache('geojson', {'bbox': [1, 2]}, [1, 2, 3])
+        self.assertEqual(legacy.get_from_cache('geojson', {'bbox': [1, 2]}), [1, 2, 3])
+        legacy.clear_all_cache()
+        self.assertIsNone(legacy.get_from_cache('geojson', {'bbox': [1, 2]}))
+
+    @unittest.skipIf('INTELLIGENT_CACHE_DB' in os.environ, 'cache path overridden')
+    def test_default_path_does_not_depend_on_working_directory(self):
+        from cache.intelligent_cache import DEFAULT_DB_PATH
+        project_root = Path(__file__).resolve().parent.parent
+        self.assertEqual(Path(DEFAULT_DB_PATH), project_root / 'data' / 'cache' / 'intelligent_cache.db')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+"""
+Tests for the compiled keyword matcher and the classifier built on it.
+"""
+
+import unittest
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / 'src'))
+
+from utils.keyword_matcher import KeywordMatcher
+from utils.content_classifier import ContentClassifier
+
+
+class TestKeywordMatcher(unittest.TestCase):
+    """Whole-word, single-pass matching across several groups."""
+
+    def setUp(self):
+        self.matcher = KeywordMatcher({
+            'conflict': ['war', 'attack', 'trade war', 'ataque aéreo'],
+            'tech': ['tech'],
+            'weighted': {'sanction': 0.8, 'nuclear': 1.0},
+        })
+
+    def test_whole_words_only(self):
+        scan = self.matcher.scan("Biotech software award toward fintech")
+        self.assertEqual(scan.counts, {'conflict': 0, 'tech': 0, 'weighted': 0})
+
+    def test_counts_weights_and_phrases(self):
+        scan = self.matcher.scan("A trade war, new sanctions and a nuclear attack. Tech stocks fell.")
+        self.assertEqual(scan.counts['conflict'], 3)  # war, trade war, attack
+        self.assertEqual(scan.counts['tech'], 1)
+        self.assertAlmostEqual(scan.weights['weighted'], 1.8)
+        self.assertEqual(sorted(scan.matched['weighted']), ['nuclear', 'sanction'])
+
+    def test_multiword_unicode_and_plural(self):
+        scan = self.matcher.scan("Nuevo ATAQUE AÉREO en la frontera")
+        self.assertEqual(scan.matched['conflict'], ['ataque aéreo'])
+        scan = self.matcher.scan("Rising trade wars")
+        self.assertEqual(sorted(scan.matched['conflict']), ['trade war', 'war'])
+
+    def test_duplicate_entries_count_twice(self):
+        matcher = KeywordMatcher({'g': ['invasion', 'invasion', 'guerra']})
+        self.assertEqual(matcher.scan("the invasion began").counts['g'], 2)
+
+    def test_fold_accents(self):
+        matcher = KeywordMatcher({'g': ['politico', 'economia']}, fold_accents=True)
+        self.assertEqual(matcher.scan("El líder político habló de economía").counts['g'], 2)
+
+
+# Real-world style headlines and the stems the old substring test matched in them
+HEADLINES = [
+    ("Rebels attacked a convoy near the border overnight", {'attack', 'border'}),
+    ("Protesters clash with police as crisis deepens", {'protest', 'crisis'}),
+    ("Iran threatened retaliation after the embassy bombing", {'threat', 'bombing'}),
+    ("Militants threatening shipping lanes in the Red Sea", {'threat'}),
+    ("Bombers struck fuel depots, officials said", {'bomb'}),
+    ("Two killed in attacks on aid workers", {'attack'}),
+    ("New sanctions target weapons suppliers", {'sanction', 'weapons'}),
+    ("Government threatens to expel foreign diplomats", {'threat'}),
+]
+
+
+class TestInflections(unittest.TestCase):
+    """Stems keep the recall the old substring test gave them."""
+
+    def setUp(self):
+        self.matcher = KeywordMatcher({'risk': ['attack', 'border', 'protest', 'crisis', 'threat',
+                                                'bombing', 'bomb', 'sanction', 'weapons', 'war', 'un']})
+
+    def test_headline_recall(self):
+        for headline, expected in HEADLINES:
+            with self.subTest(headline=headline):
+                self.assertTrue(expected <= self.matcher.find(headline),
+                                f"missing {expected - self.matcher.find(headline)}")
+
+    def test_short_keywords_stay_exact(self):
+        # Verb endings never reduce a token to 'war' or 'un'
+        self.assertEqual(self.matcher.find("Software award toward united understanding"), set())
+
+    def test_inflections_can_be_disabled(self):
+        matcher = KeywordMatcher({'risk': ['attack']}, inflections=False)
+        self.assertEqual(matcher.find("Rebels attacked"), set())
+        self.assertEqual(matcher.find("Two attacks"), {'attack'})
+
+
+class TestContentClassifier(unittest.TestCase):
+    """Classifier results come from one scan per text."""
+
+    def setUp(self):
+        self.classifier = ContentClassifier()
+
+    def test_sports_detection(self):
+        self.assertEqual(self.classifier.classify("Local football team wins championship match"),
+                         'sports_entertainment')
+
+    def test_substring_false_positive_removed(self):
+        # 'steam' used to match the strong sports indicator 'team'
+        text = "Military forces launch attack and invasion amid war, steam rising over the battle"
+        self.assertEqual(self.classifier.classify(text), 'military_conflict')
+
+    def test_scores_use_keyword_list_size(self):
+        scores = self.classifier.get_category_scores("war war military")
+        expected = 2 / len(self.classifier.categories['military_conflict']['keywords'])
+        self.assertAlmostEqual(scores['military_conflict'], round(expected, 3))
+
+
+if __name__ == '__main__':
+    unittest.main()
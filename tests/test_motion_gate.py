@@ -0,0 +1,90 @@
+"""
+Tests for the motion gate placed in front of YOLO inference.
+"""
+
+import unittest
+
+import numpy as np
+
+from cams_loader import load_cams_module
+
+motion_gate = load_cams_module('motion_gate')
+MotionGate = motion_gate.MotionGate
+
+
+def scene(brightness=100, box=None):
+    """Flat 320x240 scene, optionally with a white 40x40 box at ``box`` (x, y)."""
+    frame = np.full((240, 320, 3), brightness, dtype=np.uint8)
+    if box is not None:
+        x, y = box
+        frame[y:y + 40, x:x + 40] = 255
+    return frame
+
+
+class TestMotionGate(unittest.TestCase):
+    """First, static, motion, forced and resized paths of MotionGate.check."""
+
+    def setUp(self):
+        self.gate = MotionGate(max_interval=10.0)
+
+    def test_first_frame_runs_then_static_frames_skip(self):
+        first = self.gate.check('cam', scene(), now=0.0)
+        self.assertEqual((first.run, first.reason), (True, 'first'))
+        for t in range(1, 5):
+            decision = self.gate.check('cam', scene(), now=float(t))
+            self.assertEqual((decision.run, decision.reason), (False, 'static'))
+            self.assertEqual(decision.motion, 0.0)
+
+        stats = self.gate.get_statistics()
+        self.assertEqual((stats['frames_checked'], stats['frames_passed'], stats['frames_skipped']),
+                         (5, 1, 4))
+
+    def test_slow_lighting_change_is_absorbed(self):
+        self.gate.check('cam', scene(100), now=0.0)
+        # One grey level per frame: the background follows, so 40 levels never trigger
+        for t, brightness in enumerate(range(101, 141), start=1):
+            self.assertFalse(self.gate.check('cam', scene(brightness), now=t / 10).run)
+
+    def test_motion_runs_and_becomes_the_background(self):
+        self.gate.check('cam', scene(), now=0.0)
+        moved = self.gate.check('cam', scene(box=(140, 100)), now=1.0)
+        self.assertEqual((moved.run, moved.reason, moved.regions), (True, 'motion', [0]))
+        self.assertGreater(moved.motion, 0.0)
+        # The inferred frame is the new background: the same frame again is static
+        self.assertFalse(self.gate.check('cam', scene(box=(140, 100)), now=2.0).run)
+
+    def test_regions_limit_where_motion_counts(self):
+        self.gate.set_regions('cam', [(0.0, 0.0, 0.5, 1.0), (0.5, 0.0, 1.0, 1.0)])
+        self.gate.check('cam', scene(), now=0.0)
+        right = self.gate.check('cam', scene(box=(240, 100)), now=1.0)
+        self.assertEqual(right.regions, [1])
+
+        self.gate.set_regions('cam', [(0.0, 0.0, 0.25, 0.25)])
+        outside = self.gate.check('cam', scene(box=(140, 100)), now=2.0)
+        self.assertEqual((outside.run, outside.reason), (False, 'static'))
+
+    def test_forced_after_max_interval(self):
+        self.gate.check('cam', scene(), now=0.0)
+        self.assertFalse(self.gate.check('cam', scene(), now=9.9).run)
+        forced = self.gate.check('cam', scene(), now=10.0)
+        self.assertEqual((forced.run, forced.reason), (True, 'forced'))
+        # The interval restarts from the forced inference
+        self.assertFalse(self.gate.check('cam', scene(), now=15.0).run)
+        self.assertEqual(self.gate.get_statistics()['frames_forced'], 1)
+
+    def test_resized_stream_and_invalidate_run(self):
+        self.gate.check('cam', scene(), now=0.0)
+        resized = self.gate.check('cam', np.full((120, 320, 3), 100, dtype=np.uint8), now=1.0)
+        self.assertEqual((resized.run, resized.reason), (True, 'resized'))
+
+        self.gate.invalidate('cam')
+        self.assertEqual(self.gate.check('cam', scene(), now=2.0).reason, 'first')
+
+    def test_cameras_are_independent(self):
+        self.gate.check('a', scene(), now=0.0)
+        self.assertEqual(self.gate.check('b', scene(), now=0.0).reason, 'first')
+        self.assertFalse(self.gate.check('a', scene(), now=1.0).run)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+"""
+Tests for the per-camera preview streamer and its per-client adaptation.
+"""
+
+import unittest
+import time
+
+import numpy as np
+
+from cams_loader import load_cams_module
+
+preview = load_cams_module('preview')
+frame_bus = load_cams_module('frame_bus')
+PreviewStreamer = preview.PreviewStreamer
+
+
+class IdleSubscription:
+    """Subscription that never delivers frames: tests drive ticks themselves."""
+
+    active = False
+
+    def next(self, timeout=None):
+        time.sleep(min(timeout or 0, 0.01))
+        return None
+
+    def close(self):
+        pass
+
+
+class IdleBus:
+    def subscribe(self, name, fps=None):
+        return IdleSubscription()
+
+
+class TestPreviewStreamer(unittest.TestCase):
+    """Backlog is tracked per client and stale acks stop counting."""
+
+    def setUp(self):
+        self.sent = []
+        self.streamer = PreviewStreamer('cam1', IdleBus(), self.record, viewers=('fast', 'slow'))
+        self.addCleanup(self.streamer.stop)
+        self.packet = frame_bus.FramePacket(1, time.time(), np.zeros((480, 1280, 3), dtype=np.uint8))
+
+    def record(self, cam_id, payload, sids):
+        self.sent.append((payload['seq'], payload['width'], sids))
+
+    def tick(self, ack=('fast', 'slow')):
+        """Run one tick; the listed clients ack the frames they were sent."""
+        self.sent.clear()
+        self.streamer._process(self.packet)
+        for seq, _, sids in self.sent:
+            for sid in ack:
+                if sids is None or sid in sids:
+                    self.streamer.ack(sid, seq)
+        return list(self.sent)
+
+    def test_one_broadcast_while_all_clients_keep_up(self):
+        for _ in range(5):
+            sent = self.tick()
+            self.assertEqual(len(sent), 1)
+            self.assertIsNone(sent[0][2])
+        self.assertEqual(self.streamer.backlog(), 0)
+        self.assertEqual(self.streamer.get_statistics()['frames_sent'], 5)
+
+    def test_slow_client_degrades_alone(self):
+        # 'slow' acks the first frame and then stops
+        self.tick()
+        for _ in range(preview.BACKLOG_DEGRADE + 2):
+            self.tick(ack=('fast',))
+        self.assertEqual(self.streamer.level_of('fast'), preview.DEFAULT_LEVEL)
+        self.assertGreater(self.streamer.level_of('slow'), preview.DEFAULT_LEVEL)
+        self.assertEqual(self.streamer.backlog('fast'), 0)
+
+        sent = self.tick(ack=('fast',))
+        widths = {sid: width for _, width, sids in sent for sid in sids}
+        self.assertEqual(widths['fast'], preview.PREVIEW_LEVELS[preview.DEFAULT_LEVEL][0])
+        self.assertLess(widths['slow'], widths['fast'])
+
+    def test_stalled_client_does_not_freeze_others(self):
+        self.tick()
+        for _ in range(preview.BACKLOG_MAX + 3):
+            sent = self.tick(ack=('fast',))
+            # 'fast' is served every tick whatever 'slow' does
+            self.assertTrue(any(sids is None or 'fast' in sids for _, _, sids in sent))
+        self.assertGreater(self.streamer.get_statistics()['skipped_backlog'], 0)
+
+        # Once its last ack is stale, 'slow' is sent frames again
+        for _ in range(preview.ACK_STALE_TICKS + 1):
+            sent = self.tick(ack=('fast',))
+        self.assertTrue(any(sids is None or 'slow' in sids for _, _, sids in sent))
+        self.assertEqual(self.streamer.backlog('slow'), 0)
+        self.assertGreater(self.streamer.get_statistics()['stale_acks'], 0)
+
+    def test_unknown_or_future_acks_are_ignored(self):
+        self.tick(ack=())
+        self.streamer.ack('ghost', 1)
+        self.streamer.ack('fast', 99)
+        self.assertEqual(self.streamer.backlog('fast'), 0)
+        self.assertIsNone(self.streamer._viewers['fast'].acked)
+
+    def test_removed_viewer_stops_receiving(self):
+        self.streamer.remove_viewer('slow')
+        self.assertEqual(self.streamer.viewer_count, 1)
+        sent = self.tick()
+        self.assertEqual([sids for _, _, sids in sent], [None])
+
+
+if __name__ == '__main__':
+    unittest.main()
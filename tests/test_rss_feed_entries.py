@@ -0,0 +1,191 @@
+"""
+Tests for RSSFetcher.process_feed_entries bookkeeping of handled entries.
+"""
+
+import unittest
+import sys
+import sqlite3
+import tempfile
+import os
+from pathlib import Path
+from datetime import datetime
+from unittest.mock import Mock, patch
+
+# Add project root to path (data_ingestion imports through the src package)
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.data_ingestion.feed_cache import entry_guid
+from src.data_ingestion.rss_fetcher import RSSFetcher
+
+
+class TestProcessFeedEntries(unittest.TestCase):
+    """Only saved, filtered or already stored entries may be marked seen."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        db_path = os.path.join(self.tmpdir.name, 'rss.db')
+        conn = sqlite3.connect(db_path)
+        conn.execute("CREATE TABLE articles (id INTEGER PRIMARY KEY, url TEXT UNIQUE)")
+        conn.execute("INSERT INTO articles (url) VALUES ('https://x/old')")
+        conn.commit()
+        conn.close()
+        self.fetcher = RSSFetcher(db_path)
+        self.entries = [{'id': name, 'link': f'https://x/{name}', 'title': name}
+                        for name in ('old', 'sports', 'saved', 'failed', 'broken')]
+
+        def extract(entry, language, region):
+            if entry['id'] == 'broken':
+                return None
+            return {'url': entry['link'], 'title': entry['title'], 'content': entry['title']}
+
+        patches = [
+            patch.object(self.fetcher, 'extract_article_data', side_effect=extract),
+            patch.object(self.fetcher, 'is_geopolitical_content',
+                         side_effect=lambda title, content, language: title != 'sports'),
+            patch.object(self.fetcher.content_classifier, 'classify', return_value='geopolitical'),
+            patch.object(self.fetcher, 'analyze_articles', side_effect=lambda articles: articles),
+            patch.object(self.fetcher, 'translate_articles', side_effect=lambda articles, *langs: articles),
+        ]
+        for p in patches:
+            p.start()
+            self.addCleanup(p.stop)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def process(self, stored_urls):
+        batch = {'inserted': len(stored_urls), 'ids': [], 'stored_urls': set(stored_urls),
+                 'insert_time': 0.0, 'rows_per_sec': 0.0}
+        with patch.object(self.fetcher, 'save_articles_batch', return_value=batch) as save:
+            result = self.fetcher.process_feed_entries(self.entries, 'es', 'global', 1, 'es')
+        saved = [article['url'] for article in save.call_args[0][0]]
+        return result, saved
+
+    def test_failed_save_is_not_handled(self):
+        result, saved = self.process(['https://x/saved'])
+        self.assertEqual(saved, ['https://x/saved', 'https://x/failed'])
+        self.assertEqual(result['filtered_articles'], 1)
+        self.assertEqual(sorted(entry_guid(e) for e in result['handled_entries']),
+                         ['broken', 'old', 'saved', 'sports'])
+
+    def test_failed_batch_leaves_every_pending_entry(self):
+        result, _ = self.process([])
+        self.assertEqual(sorted(entry_guid(e) for e in result['handled_entries']),
+                         ['broken', 'old', 'sports'])
+
+
+class TestAnalyzeArticles(unittest.TestCase):
+    """The BERT risk model runs once per feed and the save step reuses it."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        db_path = os.path.join(self.tmpdir.name, 'rss.db')
+        conn = sqlite3.connect(db_path)
+        conn.execute("CREATE TABLE articles (id INTEGER PRIMARY KEY, title TEXT, content TEXT, "
+                     "url TEXT UNIQUE, source TEXT, language TEXT, country TEXT, region TEXT, "
+                     "risk_level TEXT, risk_score REAL, image_url TEXT, created_at TEXT)")
+        conn.execute("CREATE TABLE processed_data (id INTEGER PRIMARY KEY, article_id INTEGER, "
+                     "summary TEXT, category TEXT, keywords TEXT, sentiment REAL, entities TEXT, "
+                     "advanced_nlp TEXT)")
+        conn.commit()
+        conn.close()
+        self.fetcher = RSSFetcher(db_path)
+        self.fetcher.embedding_deduplicator = None
+        self.analyzer = Mock()
+        self.analyzer.analyze_batch.side_effect = lambda items: [
+            {'level': 'high' if 'missile' in item['title'] else 'low',
+             'score': 0.9 if 'missile' in item['title'] else 0.1}
+            for item in items
+        ]
+        self.fetcher.risk_analyzer = self.analyzer
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_risk_model_runs_once(self):
+        articles = [{'url': f'https://x/{i}', 'title': title, 'content': title, 'language': 'en',
+                     'region': 'global', 'published': datetime(2025, 1, 1)}
+                    for i, title in enumerate(['missile strike', 'trade talks'])]
+        analyzed = self.fetcher.analyze_articles(articles)
+        self.assertEqual([a['risk_level'] for a in analyzed], ['high', 'low'])
+        self.analyzer.analyze_batch.assert_called_once()
+        self.analyzer.analyze_risk.assert_not_called()
+
+        # Advanced NLP present: the save step must not run BERT again
+        self.fetcher.advanced_nlp_analyzer = Mock()
+        self.fetcher.advanced_nlp_analyzer.analyze_article_comprehensive.side_effect = RuntimeError
+        batch = self.fetcher.save_articles_batch(analyzed, source_id=1)
+        self.assertEqual(batch['inserted'], 2)
+        self.analyzer.analyze_batch.assert_called_once()
+        self.analyzer.analyze_risk.assert_not_called()
+
+
+class TestUrlBatching(unittest.TestCase):
+    """URL lookups are chunked below SQLite's bound-parameter limit."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmpdir.name, 'rss.db')
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("CREATE TABLE articles (id INTEGER PRIMARY KEY, title TEXT, content TEXT, "
+                     "url TEXT UNIQUE, source TEXT, language TEXT, country TEXT, region TEXT, "
+                     "risk_level TEXT, risk_score REAL, image_url TEXT, created_at TEXT)")
+        conn.execute("CREATE TABLE processed_data (id INTEGER PRIMARY KEY, article_id INTEGER, "
+                     "summary TEXT, category TEXT, keywords TEXT, sentiment REAL, entities TEXT, "
+                     "advanced_nlp TEXT)")
+        # Every even URL is already stored, on both sides of the 900-URL chunk boundary
+        conn.executemany("INSERT INTO articles (url) VALUES (?)",
+                         [(self.url(i),) for i in range(0, 2000, 2)])
+        conn.commit()
+        conn.close()
+        self.fetcher = RSSFetcher(self.db_path)
+        self.fetcher.advanced_nlp_analyzer = None
+        self.fetcher.embedding_deduplicator = None
+
+        def connect():
+            # A query with more than 999 parameters fails, as on older SQLite builds
+            conn = sqlite3.connect(self.db_path)
+            conn.row_factory = sqlite3.Row
+            conn.setlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, 999)
+            return conn
+
+        patcher = patch.object(self.fetcher, 'get_db_connection', side_effect=connect)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    @staticmethod
+    def url(i):
+        return f'https://x/{i}'
+
+    def count(self, table):
+        conn = sqlite3.connect(self.db_path)
+        count = conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        conn.close()
+        return count
+
+    def test_existing_urls_across_chunks(self):
+        urls = [self.url(i) for i in range(2000)]
+        found = self.fetcher.existing_urls(urls)
+        self.assertEqual(found, {self.url(i) for i in range(0, 2000, 2)})
+        self.assertTrue({self.url(898), self.url(900), self.url(1800)} <= found)
+        self.assertEqual(self.fetcher.existing_urls([]), set())
+
+    def test_batch_inserts_only_new_urls(self):
+        articles = [{'url': self.url(i), 'title': f'title {i}', 'content': f'content {i}',
+                     'language': 'en', 'region': 'global', 'published': datetime(2025, 1, 1)}
+                    for i in range(1500)]
+        batch = self.fetcher.save_articles_batch(articles, source_id=1)
+
+        self.assertEqual(batch['inserted'], 750)
+        self.assertEqual(len(batch['ids']), 750)
+        self.assertEqual(batch['stored_urls'], {a['url'] for a in articles})
+        self.assertEqual(self.count('articles'), 1000 + 750)
+        # processed_data rows only for the articles this batch inserted
+        self.assertEqual(self.count('processed_data'), 750)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,158 @@
+"""
+Tests for the SQLite recording catalog and the alert clips registered in it.
+"""
+
+import unittest
+import sqlite3
+import tempfile
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+
+from cams_loader import load_cams_module
+
+segment_catalog = load_cams_module('segment_catalog')
+recorder = load_cams_module('recorder')
+SegmentCatalog = segment_catalog.SegmentCatalog
+
+# 2026-01-01 00:00:00 UTC; tests only use offsets from it
+T0 = 1767225600.0
+
+
+class TestSegmentCatalog(unittest.TestCase):
+    """Range queries, alert links and retention over the catalog index."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.catalog = SegmentCatalog(os.path.join(self.tmpdir.name, 'catalog.db'))
+        self.addCleanup(self.tmpdir.cleanup)
+        self.addCleanup(self.catalog.close)
+
+    def add(self, cam_id, start, duration=60, size=100, kind='continuous', finalize=True):
+        path = f'/rec/{cam_id}/{kind}_{int(start)}.mp4'
+        segment_id = self.catalog.add_segment(cam_id, path, T0 + start, kind=kind, fps=15)
+        if finalize:
+            self.catalog.finalize_segment(path, T0 + start + duration, size)
+        return segment_id
+
+    def starts(self, segments):
+        return [segment['start_time'] - T0 for segment in segments]
+
+    def test_find_segments_returns_overlapping_range_newest_first(self):
+        for start in (0, 60, 120, 180):
+            self.add('cam1', start)
+        self.add('cam2', 60)
+
+        segments = self.catalog.find_segments('cam1', start=T0 + 90, end=T0 + 130)
+        self.assertEqual(self.starts(segments), [120, 60])
+        self.assertEqual(self.starts(self.catalog.find_segments('cam1', end=T0 + 59)), [0])
+        self.assertEqual(self.starts(self.catalog.find_segments('cam1', limit=2)), [180, 120])
+        self.assertEqual(self.catalog.find_segments('cam3'), [])
+
+    def test_open_segment_overlaps_until_now(self):
+        self.add('cam1', 0)
+        self.add('cam1', 60, finalize=False)
+        segments = self.catalog.find_segments('cam1', start=T0 + 3600)
+        self.assertEqual(self.starts(segments), [60])
+        self.assertEqual(segments[0]['status'], 'recording')
+
+    def test_kind_filter_and_alert_links(self):
+        self.add('cam1', 0)
+        self.add('cam1', 30, duration=10, kind='alert')
+        linked = self.catalog.link_alert('cam1', 'a1', T0 + 35, alert_type='loitering')
+        self.assertEqual(linked, 2)
+
+        alerts = self.catalog.find_segments('cam1', kind='alert')
+        self.assertEqual(self.starts(alerts), [30])
+        self.assertEqual(alerts[0]['alert_ids'], ['a1'])
+        self.assertEqual(self.starts(self.catalog.segments_for_alert('a1')), [0, 30])
+
+        # Deleting a segment removes its links
+        self.catalog.delete_segments([alerts[0]['id']])
+        self.assertEqual(self.starts(self.catalog.segments_for_alert('a1')), [0])
+
+    def test_duplicate_path_is_rejected_instead_of_replaced(self):
+        first = self.add('cam1', 0, kind='alert')
+        self.catalog.link_alert('cam1', 'a1', T0 + 10)
+        with self.assertRaises(sqlite3.IntegrityError):
+            self.add('cam1', 0, kind='alert')
+        self.assertEqual([s['id'] for s in self.catalog.segments_for_alert('a1')], [first])
+
+    def test_oldest_segments_cover_bytes_to_free(self):
+        for start in (300, 0, 120, 60, 180):
+            self.add('cam1', start, size=100)
+        self.add('cam1', 400, size=100, finalize=False)
+        self.assertEqual(self.catalog.total_size(), 500)
+
+        # Oldest first, stopping once the quota is met; open segments are never selected
+        oldest = self.catalog.oldest_segments(250, batch=2)
+        self.assertEqual([Path(s['path']).stem for s in oldest],
+                         ['continuous_0', 'continuous_60', 'continuous_120'])
+        self.assertEqual(len(self.catalog.oldest_segments(10_000, batch=2)), 5)
+        self.assertEqual(self.catalog.oldest_segments(0), [])
+
+    def test_statistics(self):
+        self.add('cam1', 0, size=100)
+        self.add('cam1', 60, size=50, kind='alert')
+        stats = self.catalog.get_statistics()
+        self.assertEqual(stats['segments'], 2)
+        self.assertEqual(stats['total_bytes'], 150)
+        self.assertEqual(stats['by_kind']['alert'], {'segments': 1, 'bytes': 50})
+
+
+class FakePreroll:
+    shape = (48, 64, 3)
+    mode = 'raw'
+
+    def __len__(self):
+        return 3
+
+
+class FakeBus:
+    preroll = FakePreroll()
+
+    def history(self, seconds=None):
+        for i in range(3):
+            yield T0 + i, np.full(FakePreroll.shape, i * 40, dtype=np.uint8)
+
+
+class FakeBusManager:
+    def get(self, cam_id):
+        return FakeBus()
+
+
+class TestAlertClips(unittest.TestCase):
+    """Alert clips of the same type in the same second get their own file and row."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        root = Path(self.tmpdir.name)
+        with patch.object(recorder, 'get_frame_bus_manager', return_value=FakeBusManager()):
+            self.recorder = recorder.VideoRecorder(str(root / 'rec'), str(root / 'thumbs'))
+        self.addCleanup(setattr, self.recorder, 'running', False)
+        (root / 'rec' / 'cam1').mkdir()
+
+    def test_same_second_alerts_do_not_overwrite(self):
+        info = {'type': 'loitering'}
+        with patch.object(recorder, 'datetime') as fake_datetime:
+            fake_datetime.now.return_value.strftime.return_value = '20260101_000000'
+            fake_datetime.now.return_value.isoformat.return_value = '2026-01-01T00:00:00'
+            paths = [self.recorder.record_alert_clip('cam1', info, duration_after=0, alert_id='a1'),
+                     self.recorder.record_alert_clip('cam1', info, duration_after=0, alert_id='a2'),
+                     self.recorder.record_alert_clip('cam1', info, duration_after=0),
+                     self.recorder.record_alert_clip('cam1', info, duration_after=0)]
+
+        self.assertNotIn(None, paths)
+        self.assertEqual(len(set(paths)), 4)
+        self.assertTrue(all(Path(path).exists() for path in paths))
+        self.assertIn('a1', Path(paths[0]).name)
+        clips = self.recorder.catalog.find_segments('cam1', kind='alert')
+        self.assertEqual(sorted(segment['path'] for segment in clips), sorted(paths))
+        self.assertEqual([s['path'] for s in self.recorder.catalog.segments_for_alert('a2')], [paths[1]])
+
+
+if __name__ == '__main__':
+    unittest.main()
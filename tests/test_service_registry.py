@@ -0,0 +1,222 @@
+"""
+Tests for lazy imports, the service registry and the startup profiler.
+"""
+
+import unittest
+import sys
+import threading
+from pathlib import Path
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / 'src'))
+
+from utils.service_registry import (LazyImport, LazyMounts, LazyService, ServiceProxy, ServiceRegistry,
+                                    StartupProfiler)
+
+
+class Application:
+    """Minimal owner of LazyService attributes, like RiskMapUnifiedApplication."""
+
+    orchestrator = LazyService()
+    scheduler = LazyService()
+
+    def __init__(self):
+        self.services = ServiceRegistry()
+        self.built = []
+        self.services.register('orchestrator', self._create_orchestrator)
+
+    def _create_orchestrator(self):
+        self.built.append('orchestrator')
+        return {'name': 'orchestrator'}
+
+
+class TestLazyImport(unittest.TestCase):
+
+    def test_group_is_imported_on_first_use(self):
+        profiler = StartupProfiler()
+        group = LazyImport('json', ['json'], profiler=profiler)
+        self.assertFalse(group.loaded)
+        self.assertEqual(group.status()['state'], 'pending')
+
+        dumps = group.symbol('dumps')
+        self.assertFalse(group.loaded)
+        self.assertEqual(dumps([1]), '[1]')
+        self.assertTrue(group.loaded)
+        self.assertEqual(group.status()['state'], 'ready')
+        self.assertEqual([record['name'] for record in profiler.records()], ['json'])
+
+    def test_missing_group_is_falsy_and_uses_fallback(self):
+        group = LazyImport('missing', ['module_that_does_not_exist_anywhere'])
+        self.assertFalse(group)
+        self.assertEqual(group.status()['state'], 'unavailable')
+        self.assertIn('ModuleNotFoundError', group.error)
+
+        class Mock:
+            def analyze(self):
+                return {'error': 'not available'}
+
+        analyzer = group.symbol('Analyzer', fallback=Mock)
+        self.assertEqual(analyzer().analyze(), {'error': 'not available'})
+        with self.assertRaises(ImportError):
+            group.symbol('other')()
+
+    def test_requirements_load_first(self):
+        first = LazyImport('first', ['json'])
+        second = LazyImport('second', ['csv'], requires=[first])
+        self.assertTrue(second)
+        self.assertTrue(first.loaded)
+
+
+class TestServiceRegistry(unittest.TestCase):
+
+    def test_service_is_built_once_on_first_access(self):
+        app = Application()
+        self.assertEqual(app.services.status()['orchestrator']['state'], 'pending')
+        self.assertIsNone(app.services.peek('orchestrator'))
+
+        self.assertEqual(app.orchestrator, {'name': 'orchestrator'})
+        self.assertIs(app.orchestrator, app.orchestrator)
+        self.assertEqual(app.built, ['orchestrator'])
+        self.assertTrue(app.services.is_ready('orchestrator'))
+
+    def test_unavailable_and_failed_services(self):
+        registry = ServiceRegistry()
+        registry.register('optional', lambda: None)
+        registry.register('broken', lambda: 1 / 0)
+
+        registry.warm_up()
+        status = registry.status()
+        self.assertEqual(status['optional']['state'], 'unavailable')
+        self.assertEqual(status['broken']['state'], 'failed')
+        self.assertIn('ZeroDivisionError', status['broken']['error'])
+        self.assertIsNone(registry.get('broken'))
+
+    def test_warm_up_respects_order_and_stop_event(self):
+        order = []
+        registry = ServiceRegistry()
+        registry.register('a', lambda: order.append('a') or 'a')
+        registry.register('b', lambda: order.append('b') or 'b')
+        registry.register('lazy_only', lambda: order.append('lazy_only') or 'c', warm=False)
+
+        stop = threading.Event()
+        stop.set()
+        registry.warm_up(stop_event=stop)
+        self.assertEqual(order, [])
+
+        registry.warm_up()
+        self.assertEqual(order, ['a', 'b'])
+        self.assertEqual(registry.status()['lazy_only']['state'], 'pending')
+
+    def test_concurrent_first_use_builds_once(self):
+        calls = []
+        gate = threading.Event()
+        registry = ServiceRegistry()
+
+        def factory():
+            calls.append(1)
+            gate.wait(1)
+            return object()
+
+        registry.register('slow', factory)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(registry.get('slow'))) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        gate.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len({id(result) for result in results}), 1)
+
+    def test_assignment_and_unregistered_attributes(self):
+        app = Application()
+        self.assertIsNone(app.scheduler)
+        app.scheduler = 'scheduler'
+        self.assertEqual(app.scheduler, 'scheduler')
+        app.orchestrator = 'replacement'
+        self.assertEqual(app.orchestrator, 'replacement')
+        self.assertEqual(app.built, [])
+
+    def test_factory_can_set_another_service(self):
+        registry = ServiceRegistry()
+
+        def build_manager():
+            registry.set('monitor', 'monitor')
+            return 'manager'
+
+        registry.register('manager', build_manager)
+        registry.register('monitor', lambda: registry.get('manager') and registry.peek('monitor'))
+        self.assertEqual(registry.get('monitor'), 'monitor')
+        self.assertEqual(registry.get('manager'), 'manager')
+
+
+def wsgi_app(name):
+    """WSGI app answering with its name and the SCRIPT_NAME / PATH_INFO it got."""
+
+    def app(environ, start_response):
+        start_response('200 OK', [('Content-Type', 'text/plain')])
+        return [f"{name} {environ.get('SCRIPT_NAME', '')} {environ['PATH_INFO']}".encode()]
+    return app
+
+
+class TestLazyRouting(unittest.TestCase):
+    """Routes exist from startup; the services behind them are built on first use."""
+
+    def request(self, app, path):
+        return b''.join(app({'PATH_INFO': path, 'SCRIPT_NAME': ''}, lambda status, headers: None)).decode()
+
+    def test_service_proxy_builds_on_first_use(self):
+        registry = ServiceRegistry()
+        built = []
+        registry.register('orchestrator', lambda: built.append(1) or {'status': 'ok'})
+        proxy = ServiceProxy(registry, 'orchestrator')
+        self.assertEqual(built, [])
+        self.assertTrue(proxy)
+        self.assertEqual(proxy.get('status'), 'ok')
+        self.assertEqual(built, [1])
+
+        registry.register('missing', lambda: None)
+        self.assertFalse(ServiceProxy(registry, 'missing'))
+
+    def test_mounts_build_apps_lazily_and_fall_back(self):
+        registry = ServiceRegistry()
+        built = []
+        registry.register('dashboard', lambda: built.append('dashboard') or wsgi_app('dash'))
+        registry.register('cctv', lambda: built.append('cctv') or wsgi_app('cctv'))
+        registry.register('unavailable', lambda: None)
+
+        mounts = LazyMounts(wsgi_app('main'), registry)
+        mounts.mount('/dash/historical/', 'dashboard')
+        mounts.mount('/cams', 'cctv', strip_prefix=False)
+        mounts.mount('/cctv', 'unavailable', strip_prefix=False)
+
+        self.assertEqual(self.request(mounts, '/dash/historicalx'), 'main  /dash/historicalx')
+        self.assertEqual(built, [])
+        self.assertEqual(self.request(mounts, '/dash/historical/_dash-layout'),
+                         'dash /dash/historical /_dash-layout')
+        self.assertEqual(self.request(mounts, '/cams/api/cameras'), 'cctv  /cams/api/cameras')
+        self.assertEqual(self.request(mounts, '/cctv'), 'main  /cctv')
+        self.assertEqual(built, ['dashboard', 'cctv'])
+
+
+class TestStartupProfiler(unittest.TestCase):
+
+    def test_phases_are_recorded_and_reported(self):
+        profiler = StartupProfiler()
+        with profiler.phase('imports'):
+            pass
+        with self.assertRaises(ValueError):
+            with profiler.phase('factory', 'init'):
+                raise ValueError('boom')
+
+        records = profiler.records()
+        self.assertEqual([(r['name'], r['kind']) for r in records], [('imports', 'import'), ('factory', 'init')])
+        self.assertIn('ValueError', records[1]['error'])
+        report = profiler.report()
+        self.assertIn('IMPORT', report)
+        self.assertIn('INIT', report)
+        self.assertIn('factory', report)
+
+
+if __name__ == '__main__':
+    unittest.main()
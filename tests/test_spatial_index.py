@@ -0,0 +1,80 @@
+"""
+Tests for the grid-based conflict-zone clustering.
+"""
+
+import unittest
+import sys
+import math
+import random
+from pathlib import Path
+
+# Add project root to path (intelligence uses package-relative imports)
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.intelligence.spatial_index import EARTH_RADIUS_KM, ZoneGridIndex, cluster_points, haversine_km
+
+
+def brute_force_leaders(points, radius_km):
+    """Reference O(n x zones) greedy leader clustering."""
+    centres, labels = [], []
+    for lat, lon in points:
+        for zone_id, (zlat, zlon) in enumerate(centres):
+            if haversine_km(lat, lon, zlat, zlon) <= radius_km:
+                labels.append(zone_id)
+                break
+        else:
+            labels.append(len(centres))
+            centres.append((lat, lon))
+    return labels
+
+
+class TestSpatialIndex(unittest.TestCase):
+    """Grid index and bulk path must match the brute-force clustering."""
+
+    def setUp(self):
+        rng = random.Random(7)
+        hotspots = [(50.4, 30.5), (31.5, 34.4), (15.0, 115.0), (78.0, 15.0), (-5.0, 179.9), (0.0, 0.0)]
+        self.points = []
+        for _ in range(600):
+            lat, lon = rng.choice(hotspots)
+            lon = (lon + rng.gauss(0, 1.0) + 180.0) % 360.0 - 180.0
+            self.points.append((max(-90.0, min(90.0, lat + rng.gauss(0, 0.8))), lon))
+
+    def test_haversine(self):
+        self.assertAlmostEqual(haversine_km(0, 0, 0, 1), 111.19, delta=0.1)
+        self.assertAlmostEqual(haversine_km(0, 179.9, 0, -179.9), 22.24, delta=0.1)
+
+    def test_incremental_index_matches_brute_force(self):
+        index = ZoneGridIndex(50.0)
+        labels = [index.assign(lat, lon)[0] for lat, lon in self.points]
+        self.assertEqual(labels, brute_force_leaders(self.points, 50.0))
+
+    def test_bulk_path_matches_brute_force(self):
+        lats = [p[0] for p in self.points]
+        lons = [p[1] for p in self.points]
+        labels, leaders = cluster_points(lats, lons, 50.0)
+        self.assertEqual(labels.tolist(), brute_force_leaders(self.points, 50.0))
+        self.assertEqual(len(leaders), labels.max() + 1)
+
+    def test_pairs_just_inside_the_radius_merge_across_cell_borders(self):
+        # 49.99 km steps north-south and east-west, swept so that they straddle every row border
+        step = math.degrees(49.99 / EARTH_RADIUS_KM)
+        for i in range(4000):
+            offset = i * 0.01
+            for a, b in (((offset - 20.0, 10.0), (offset - 20.0 - step, 10.0)),
+                         ((0.0, offset - 20.0), (0.0, offset - 20.0 - step))):
+                self.assertLess(haversine_km(*a, *b), 50.0)
+                index = ZoneGridIndex(50.0)
+                index.add(*a)
+                self.assertEqual(index.find(*b), 0, (a, b))
+                labels, _ = cluster_points([a[0], b[0]], [a[1], b[1]], 50.0)
+                self.assertEqual(labels.tolist(), [0, 0], (a, b))
+
+    def test_bulk_path_respects_priorities(self):
+        labels, leaders = cluster_points([0.0, 0.1], [0.0, 0.1], 50.0, priorities=[0.1, 0.9])
+        self.assertEqual(leaders.tolist(), [1])
+        self.assertEqual(labels.tolist(), [0, 0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+"""
+Tests for the per-camera IoU tracker.
+"""
+
+import unittest
+
+import numpy as np
+
+from cams_loader import load_cams_module
+
+tracker_module = load_cams_module('tracker')
+IoUTracker = tracker_module.IoUTracker
+
+
+def scene(step):
+    """Three well separated boxes drifting right by 2px per frame."""
+    base = np.array([[0, 0, 40, 80], [200, 0, 240, 80], [400, 0, 440, 80]], dtype=np.float32)
+    return base + np.array([2 * step, 0, 2 * step, 0], dtype=np.float32)
+
+
+class TestIoUTracker(unittest.TestCase):
+    """IDs follow objects, not input positions, and track lifetimes are kept apart."""
+
+    def run_tracker(self, use_hungarian):
+        tracker = IoUTracker(min_hits=2, use_hungarian=use_hungarian)
+        rng = np.random.default_rng(7)
+        class_ids = np.array([0, 0, 2])
+        ids_by_object = []
+        for step in range(8):
+            order = rng.permutation(3)
+            ids = tracker.update('cam', scene(step)[order], class_ids[order], timestamp=float(step))
+            # Map back to object index: ids[i] belongs to object order[i]
+            by_object = np.empty(3, dtype=np.int64)
+            by_object[order] = ids
+            ids_by_object.append(by_object)
+        return tracker, ids_by_object
+
+    def test_ids_follow_objects_under_shuffled_detections(self):
+        for use_hungarian in (False, True):
+            with self.subTest(use_hungarian=use_hungarian):
+                _, ids_by_object = self.run_tracker(use_hungarian)
+                # Unconfirmed on the first frame, then stable per object
+                self.assertTrue((ids_by_object[0] == -1).all())
+                confirmed = np.array(ids_by_object[1:])
+                self.assertTrue((confirmed == confirmed[0]).all())
+                self.assertEqual(len(set(confirmed[0].tolist())), 3)
+
+    def test_classes_are_never_swapped(self):
+        tracker = IoUTracker(min_hits=1)
+        first = tracker.update('cam', scene(0)[:1], np.array([0]))
+        # Same box, different class: a new track instead of a match
+        second = tracker.update('cam', scene(0)[:1], np.array([2]))
+        self.assertNotEqual(int(first[0]), int(second[0]))
+
+    def test_missed_tracks_stay_live_but_leave_the_summary(self):
+        tracker, ids_by_object = self.run_tracker(use_hungarian=False)
+        # Object 0 is occluded for a frame
+        tracker.update('cam', scene(8)[1:], np.array([0, 2]), timestamp=8.0)
+        summary = tracker.track_summary('cam')
+        occluded = int(ids_by_object[-1][0])
+        self.assertNotIn(occluded, summary['ids'].tolist())
+        self.assertIn(occluded, tracker.live_ids('cam').tolist())
+        self.assertEqual(summary['dwell'].tolist(), [8.0, 8.0])
+
+        # After max_age misses it is gone for good
+        for step in range(9, 9 + tracker.max_age + 1):
+            tracker.update('cam', scene(step)[1:], np.array([0, 2]), timestamp=float(step))
+        self.assertNotIn(occluded, tracker.live_ids('cam').tolist())
+        self.assertEqual(len(tracker.live_ids('other')), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
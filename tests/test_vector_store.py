@@ -0,0 +1,74 @@
+"""
+Tests for the memory-mapped article vector store.
+"""
+
+import unittest
+import sys
+import tempfile
+import os
+from pathlib import Path
+
+import numpy as np
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent / 'src'))
+
+from ai.vector_store import ArticleVectorStore
+
+
+class TestArticleVectorStore(unittest.TestCase):
+    """Test incremental appends, pre-filters and persistence."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'vector_store')
+        self.store = ArticleVectorStore(self.path, dim=4, model_name='test-model')
+        self.store.append(
+            [1, 2, 3], np.eye(4, dtype=np.float32)[:3],
+            ['en', 'es', 'en'], ['high', 'low', 'medium'],
+            ['2024-01-01', '2024-02-01', '2024-03-01']
+        )
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_nearest_neighbour(self):
+        results = self.store.search(np.array([0, 1, 0, 0]), k=1)
+        self.assertEqual(results[0][0], 2)
+        self.assertAlmostEqual(results[0][1], 1.0, places=5)
+
+    def test_prefilters(self):
+        query = np.array([1, 1, 1, 0])
+        self.assertEqual({i for i, _ in self.store.search(query, k=5, language='en')}, {1, 3})
+        self.assertEqual([i for i, _ in self.store.search(query, k=5, risk_level='low')], [2])
+        self.assertEqual({i for i, _ in self.store.search(query, k=5, since='2024-02-01')}, {2, 3})
+        self.assertEqual(self.store.search(query, k=5, language='fr'), [])
+
+    def test_reappend_replaces_row(self):
+        self.store.append([1], np.array([[0, 0, 0, 1]], dtype=np.float32), ['en'], ['high'], ['2024-01-01'])
+        results = self.store.search(np.array([0, 0, 0, 1]), k=5)
+        self.assertEqual([i for i, _ in results].count(1), 1)
+        self.assertEqual(results[0][0], 1)
+
+    def test_append_recovers_from_partial_write(self):
+        # A previous append wrote the vectors but died before the other columns
+        with open(os.path.join(self.path, 'vectors.f32'), 'ab') as fh:
+            fh.write(np.ones((2, 4), dtype=np.float32).tobytes())
+        self.store.append([4], np.array([[1, 1, 0, 0]], dtype=np.float32), ['en'], ['high'], ['2024-04-01'])
+
+        reopened = ArticleVectorStore(self.path)
+        self.assertEqual(reopened.count, 4)
+        self.assertEqual(os.path.getsize(os.path.join(self.path, 'vectors.f32')), 4 * 4 * 4)
+        self.assertEqual(os.path.getsize(os.path.join(self.path, 'ids.i64')), 4 * 8)
+        self.assertEqual(reopened.search(np.array([1, 1, 0, 0]), k=1)[0][0], 4)
+        self.assertEqual(reopened.search(np.array([0, 0, 1, 0]), k=1)[0][0], 3)
+
+    def test_reopen_from_disk(self):
+        reopened = ArticleVectorStore(self.path)
+        self.assertEqual(reopened.count, 3)
+        self.assertEqual(reopened.model_name, 'test-model')
+        self.assertEqual(reopened.search(np.array([0, 0, 1, 0]), k=1)[0][0], 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
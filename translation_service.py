@@ -8,9 +8,10 @@ tanto durante la ingesta como antes de mostrar en el frontend.
 Características:
 - Detección automática de idioma
 - Traducción a español usando múltiples servicios
-- Almacenamiento en base de datos de traducciones
 - Sistema de fallback para múltiples APIs
-- Cache de traducciones para optimizar rendimiento
+- Traducción por lotes: frases deduplicadas, cache compartido (LRU + SQLite,
+  src/utils/batch_translation.py) y solo los fallos van al traductor, en
+  peticiones agrupadas
 """
 
 import os
@@ -20,7 +21,7 @@ import asyncio
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 import json
-import hashlib
+import threading
 
 # Configuración de logging
 logging.basicConfig(level=logging.INFO)
@@ -83,6 +84,8 @@ try:
 except ImportError:
     LANGDETECT_AVAILABLE = False
 
+from src.utils.batch_translation import BatchTranslator, TranslationCache, text_hash
+
 # Base de datos
 import sqlite3
 import psycopg2
@@ -102,22 +105,24 @@ logger = logging.getLogger(__name__)
 class TranslationService:
     """Servicio principal de traducción."""
     
-    def __init__(self, db_connection=None):
+    def __init__(self, db_connection=None, cache: Optional[TranslationCache] = None):
         """
         Inicializa el servicio de traducción.
         
         Args:
-            db_connection: Conexión a la base de datos (opcional)
+            db_connection: Conexión a la base de datos (opcional, se conserva por
+                compatibilidad; las traducciones se guardan en el cache compartido)
+            cache: Cache de traducciones (por defecto el compartido del proceso)
         """
         self.db = db_connection
-        self.translation_cache = {}
-        self.failed_translations = set()
         
         # Inicializar traductores disponibles
         self.translators = self._initialize_translators()
         
-        # Crear tabla de traducciones si no existe
-        self._ensure_translation_table()
+        # Traducción por frases deduplicadas con cache en memoria + SQLite
+        self.batch_translator = BatchTranslator(self._translate_with_backends, cache,
+                                                backend_name='translation_service')
+        self.cache = self.batch_translator.cache
     
     def _initialize_translators(self) -> List[Dict]:
         """Inicializa todos los traductores disponibles."""
@@ -152,51 +157,9 @@ class TranslationService:
         logger.info(f"Traductores inicializados: {[t['name'] for t in translators]}")
         return translators
     
-    def _ensure_translation_table(self):
-        """Asegura que exista la tabla de traducciones en la base de datos."""
-        if not self.db:
-            return
-            
-        try:
-            cursor = self.db.cursor()
-            
-            # Crear tabla de traducciones
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS translations (
-                    id SERIAL PRIMARY KEY,
-                    original_hash VARCHAR(64) UNIQUE NOT NULL,
-                    original_text TEXT NOT NULL,
-                    original_language VARCHAR(10),
-                    translated_text TEXT NOT NULL,
-                    target_language VARCHAR(10) DEFAULT 'es',
-                    translator_used VARCHAR(50),
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-                )
-            """)
-            
-            # Crear índices para optimizar consultas
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_translations_hash 
-                ON translations(original_hash)
-            """)
-            
-            cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_translations_language 
-                ON translations(original_language)
-            """)
-            
-            self.db.commit()
-            logger.info("Tabla de traducciones creada/verificada correctamente")
-            
-        except Exception as e:
-            logger.error(f"Error creando tabla de traducciones: {e}")
-            if self.db:
-                self.db.rollback()
-    
     def _get_text_hash(self, text: str) -> str:
         """Genera un hash único para el texto."""
-        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+        return text_hash(text)
     
     def detect_language(self, text: str) -> Optional[str]:
         """
@@ -214,7 +177,7 @@ class TranslationService:
         try:
             if LANGDETECT_AVAILABLE:
                 detected = detect(text)
-                logger.info(f"Idioma detectado: {detected}")
+                logger.debug(f"Idioma detectado: {detected}")
                 return detected
         except Exception as e:
             logger.warning(f"Error detectando idioma: {e}")
@@ -233,45 +196,26 @@ class TranslationService:
         
         return 'unknown'
     
-    def get_cached_translation(self, text: str) -> Optional[str]:
+    def get_cached_translation(self, text: str, original_language: str = 'unknown',
+                               target_language: str = 'es') -> Optional[str]:
         """
         Busca una traducción en cache (memoria y base de datos).
         
         Args:
             text: Texto original
+            original_language: Idioma original
+            target_language: Idioma de destino
             
         Returns:
             Traducción si existe, None caso contrario
         """
-        text_hash = self._get_text_hash(text)
-        
-        # Verificar cache en memoria
-        if text_hash in self.translation_cache:
-            return self.translation_cache[text_hash]
-        
-        # Verificar cache en base de datos
-        if self.db:
-            try:
-                cursor = self.db.cursor()
-                cursor.execute(
-                    "SELECT translated_text FROM translations WHERE original_hash = %s",
-                    (text_hash,)
-                )
-                result = cursor.fetchone()
-                
-                if result:
-                    translation = result[0] if isinstance(result, tuple) else result['translated_text']
-                    # Agregar al cache en memoria
-                    self.translation_cache[text_hash] = translation
-                    return translation
-                    
-            except Exception as e:
-                logger.error(f"Error consultando cache de traducciones: {e}")
-        
-        return None
+        text_hash_value = self._get_text_hash(text)
+        found, _ = self.cache.get_many([text_hash_value], original_language, target_language)
+        return found.get(text_hash_value)
     
     def save_translation(self, original_text: str, translated_text: str, 
-                        original_language: str, translator_used: str):
+                        original_language: str, translator_used: str,
+                        target_language: str = 'es'):
         """
         Guarda una traducción en cache y base de datos.
         
@@ -280,85 +224,26 @@ class TranslationService:
             translated_text: Texto traducido
             original_language: Idioma original detectado
             translator_used: Servicio usado para traducir
+            target_language: Idioma de destino
         """
-        text_hash = self._get_text_hash(original_text)
-        
-        # Guardar en cache de memoria
-        self.translation_cache[text_hash] = translated_text
-        
-        # Guardar en base de datos
-        if self.db:
-            try:
-                cursor = self.db.cursor()
-                cursor.execute("""
-                    INSERT INTO translations 
-                    (original_hash, original_text, original_language, 
-                     translated_text, translator_used)
-                    VALUES (%s, %s, %s, %s, %s)
-                    ON CONFLICT (original_hash) 
-                    DO UPDATE SET 
-                        translated_text = EXCLUDED.translated_text,
-                        translator_used = EXCLUDED.translator_used,
-                        updated_at = CURRENT_TIMESTAMP
-                """, (text_hash, original_text, original_language, 
-                     translated_text, translator_used))
-                
-                self.db.commit()
-                logger.info(f"Traducción guardada: {translator_used}")
-                
-            except Exception as e:
-                logger.error(f"Error guardando traducción: {e}")
-                if self.db:
-                    self.db.rollback()
+        try:
+            self.cache.put_many({self._get_text_hash(original_text): translated_text},
+                                original_language or 'unknown', target_language, translator_used)
+        except Exception as e:
+            logger.error(f"Error guardando traducción: {e}")
     
-    async def translate_text(self, text: str, target_language: str = 'es') -> Tuple[str, str]:
+    def _translate_with_backends(self, text: str, source_language: str,
+                                 target_language: str) -> Optional[str]:
         """
-        Traduce texto usando el mejor traductor disponible.
-        
-        Args:
-            text: Texto a traducir
-            target_language: Idioma de destino (por defecto español)
-            
-        Returns:
-            Tupla (texto_traducido, idioma_original)
+        Traduce un texto (una petición agrupada del BatchTranslator) con el
+        primer traductor que responda. Devuelve None si todos fallan.
         """
-        if not text or len(text.strip()) < 3:
-            return text, 'unknown'
-        
-        # Detectar idioma
-        original_language = self.detect_language(text)
-        
-        # Si ya está en español, no traducir
-        if original_language == target_language:
-            return text, original_language
-        
-        # Buscar en cache
-        cached = self.get_cached_translation(text)
-        if cached:
-            return cached, original_language or 'unknown'
-        
-        # Verificar si ya falló antes
-        text_hash = self._get_text_hash(text)
-        if text_hash in self.failed_translations:
-            return text, original_language or 'unknown'
-        
         # PRIORIDAD 1: Intentar con sistema robusto (sin httpcore/httpx)
         if ROBUST_TRANSLATOR_AVAILABLE and robust_service:
             try:
-                logger.info("🔄 Intentando traducción con sistema robusto (sin httpcore)")
-                translated_text, detected_lang = robust_service.translate_text_robust(text, target_language)
-                
+                translated_text, _ = robust_service.translate_text_robust(text, target_language)
                 if translated_text and translated_text != text and len(translated_text.strip()) > 3:
-                    # Guardar traducción exitosa
-                    self.save_translation(
-                        text, translated_text, 
-                        detected_lang or original_language, 
-                        'robust_primary'
-                    )
-                    
-                    logger.info("✅ Traducción exitosa con sistema robusto primario")
-                    return translated_text, detected_lang or original_language
-                    
+                    return translated_text
             except Exception as e:
                 logger.warning(f"Error con sistema robusto primario: {e}")
         
@@ -368,18 +253,13 @@ class TranslationService:
                 translator_name = translator_info['name']
                 translator = translator_info['translator']
                 
-                logger.info(f"Intentando traducir con {translator_name}")
-                
                 if translator_name == 'google_trans':
-                    result = translator.translate(text, dest=target_language)
-                    translated_text = result.text
-                    detected_lang = result.src
+                    translated_text = translator.translate(text, dest=target_language).text
                     
                 elif translator_name in ['deep_google', 'microsoft']:
                     # Actualizar idioma de destino
                     translator.target = target_language
                     translated_text = translator.translate(text)
-                    detected_lang = original_language
                 
                 else:
                     continue
@@ -388,29 +268,17 @@ class TranslationService:
                 if (translated_text and 
                     translated_text != text and 
                     len(translated_text.strip()) > 3):
-                    
-                    # Guardar traducción exitosa
-                    self.save_translation(
-                        text, translated_text, 
-                        detected_lang or original_language, 
-                        translator_name
-                    )
-                    
-                    logger.info(f"Traducción exitosa con {translator_name}")
-                    return translated_text, detected_lang or original_language
+                    return translated_text
                 
             except Exception as e:
                 error_msg = str(e).lower()
                 # Manejo específico para errores de httpcore/httpx y compatibilidad
                 if any(keyword in error_msg for keyword in ["synchttptransport", "httpcore", "httpx", "transport", "async"]):
                     logger.warning(f"❌ Error de compatibilidad httpcore/httpx con {translator_name}: {e}")
-                    continue
                 elif "connection" in error_msg or "timeout" in error_msg:
                     logger.warning(f"Error de conexión con {translator_name}: {e}")
-                    continue
                 elif "rate limit" in error_msg or "quota" in error_msg:
                     logger.warning(f"Límite de rate/quota con {translator_name}: {e}")
-                    continue
                 else:
                     logger.warning(f"Error general con traductor {translator_name}: {e}")
                 continue
@@ -418,28 +286,91 @@ class TranslationService:
         # PRIORIDAD 3: Fallback con traducción robusta antigua (si la nueva falla)
         if ROBUST_TRANSLATION_AVAILABLE:
             try:
-                logger.info("🔄 Usando fallback de traducción robusta")
-                translated_text, detected_lang = get_robust_translation(text, target_language)
-                
+                translated_text, _ = get_robust_translation(text, target_language)
                 if translated_text and translated_text != text:
-                    # Guardar traducción exitosa
-                    self.save_translation(
-                        text, translated_text, 
-                        detected_lang or original_language, 
-                        'robust_fallback'
-                    )
-                    
-                    logger.info("✅ Traducción exitosa con fallback robusto")
-                    return translated_text, detected_lang or original_language
-                    
+                    return translated_text
             except Exception as e:
                 logger.warning(f"Error con fallback robusto: {e}")
         
-        # Si todo falla, marcar como fallido
         logger.error(f"❌ Traducción completamente fallida para: {text[:100]}...")
-        self.failed_translations.add(text_hash)
+        return None
+    
+    def translate_texts(self, texts: List[str], target_language: str = 'es') -> List[Tuple[str, str]]:
+        """
+        Traduce un lote de textos: detecta el idioma de cada uno y traduce
+        cada grupo de idioma con una sola pasada del BatchTranslator (frases
+        deduplicadas, cache y peticiones agrupadas).
         
-        return text, original_language or 'unknown'
+        Args:
+            texts: Textos a traducir
+            target_language: Idioma de destino (por defecto español)
+            
+        Returns:
+            Lista de tuplas (texto_traducido, idioma_original), en el mismo orden
+        """
+        results = []
+        by_language: Dict[str, List[int]] = {}
+        for position, text in enumerate(texts):
+            if not text or len(text.strip()) < 3:
+                results.append((text, 'unknown'))
+                continue
+            original_language = self.detect_language(text) or 'unknown'
+            results.append((text, original_language))
+            # Si ya está en el idioma destino, no traducir
+            if original_language != target_language:
+                by_language.setdefault(original_language, []).append(position)
+        
+        for original_language, positions in by_language.items():
+            translated = self.batch_translator.translate_batch(
+                [texts[position] for position in positions], original_language, target_language)
+            for position, translated_text in zip(positions, translated):
+                results[position] = (translated_text, original_language)
+        
+        return results
+    
+    async def translate_text(self, text: str, target_language: str = 'es') -> Tuple[str, str]:
+        """
+        Traduce texto usando el mejor traductor disponible.
+        
+        Args:
+            text: Texto a traducir
+            target_language: Idioma de destino (por defecto español)
+            
+        Returns:
+            Tupla (texto_traducido, idioma_original)
+        """
+        return self.translate_texts([text], target_language)[0]
+    
+    def translate_articles(self, articles: List[Dict], fields: Optional[List[str]] = None,
+                           target_language: str = 'es') -> List[Dict]:
+        """
+        Traduce los campos de texto de varios artículos con un único lote.
+        
+        Args:
+            articles: Lista de diccionarios de artículos
+            fields: Campos a traducir (por defecto title, content, description, summary)
+            target_language: Idioma de destino
+            
+        Returns:
+            Copias de los artículos con los campos traducidos
+        """
+        fields = fields or ['title', 'content', 'description', 'summary']
+        translated_articles = [article.copy() for article in articles]
+        slots = [(index, field) for index, article in enumerate(articles)
+                 for field in fields if article.get(field)]
+        
+        results = self.translate_texts([articles[index][field] for index, field in slots], target_language)
+        
+        for (index, field), (translated_text, detected_lang) in zip(slots, results):
+            translated_article = translated_articles[index]
+            translated_article[field] = translated_text
+            
+            # Guardar idioma original si no existe
+            if field == 'title' and detected_lang != target_language:
+                translated_article['original_language'] = detected_lang
+                translated_article['is_translated'] = True
+        
+        return translated_articles
     
     async def translate_article_content(self, article: Dict) -> Dict:
         """
@@ -451,25 +382,11 @@ class TranslationService:
         Returns:
             Artículo con contenido traducido
         """
-        translated_article = article.copy()
-        
-        # Campos a traducir
-        fields_to_translate = ['title', 'content', 'description', 'summary']
-        
-        for field in fields_to_translate:
-            if field in article and article[field]:
-                original_text = article[field]
-                translated_text, detected_lang = await self.translate_text(original_text)
-                
-                # Guardar traducción
-                translated_article[field] = translated_text
-                
-                # Guardar idioma original si no existe
-                if field == 'title' and detected_lang != 'es':
-                    translated_article['original_language'] = detected_lang
-                    translated_article['is_translated'] = True
-        
-        return translated_article
+        return self.translate_articles([article])[0]
+    
+    def get_stats(self) -> Dict:
+        """Métricas de aciertos de cache y peticiones al backend."""
+        return self.batch_translator.get_stats()
 
 # Funciones de utilidad para integración con el sistema existente
 
@@ -491,13 +408,23 @@ def get_database_connection():
         # Fallback a SQLite
         try:
             sqlite_path = os.path.join(os.path.dirname(__file__), 'riskmap.db')
-            conn = sqlite3.connect(sqlite_path)
-            conn.row_factory = sqlite3.Row
-            return conn
+            from src.utils.db_pool import connect as db_connect
+            return db_connect(sqlite_path, row_factory=sqlite3.Row)
         except Exception as e2:
             logger.error(f"Error conectando a SQLite: {e2}")
             return None
 
+_translation_service: Optional[TranslationService] = None
+_translation_service_lock = threading.Lock()
+
+def get_translation_service() -> TranslationService:
+    """Servicio de traducción compartido del proceso (traductores y cache se crean una vez)."""
+    global _translation_service
+    with _translation_service_lock:
+        if _translation_service is None:
+            _translation_service = TranslationService()
+        return _translation_service
+
 async def translate_article_for_display(article_data: Dict) -> Dict:
     """
     Traduce un artículo antes de mostrarlo en el frontend.
@@ -508,15 +435,7 @@ async def translate_article_for_display(article_data: Dict) -> Dict:
     Returns:
         Artículo traducido
     """
-    db_conn = get_database_connection()
-    translator = TranslationService(db_conn)
-    
-    try:
-        translated = await translator.translate_article_content(article_data)
-        return translated
-    finally:
-        if db_conn:
-            db_conn.close()
+    return get_translation_service().translate_articles([article_data])[0]
 
 async def translate_during_ingestion(articles: List[Dict]) -> List[Dict]:
     """
@@ -528,30 +447,16 @@ async def translate_during_ingestion(articles: List[Dict]) -> List[Dict]:
     Returns:
         Lista de artículos traducidos
     """
-    db_conn = get_database_connection()
-    translator = TranslationService(db_conn)
-    
     try:
-        translated_articles = []
-        
-        for article in articles:
-            try:
-                translated = await translator.translate_article_content(article)
-                translated_articles.append(translated)
-                
-                # Log del progreso
-                if translated.get('is_translated'):
-                    logger.info(f"Artículo traducido: {translated.get('title', 'Sin título')[:50]}...")
-                
-            except Exception as e:
-                logger.error(f"Error traduciendo artículo: {e}")
-                translated_articles.append(article)  # Agregar original si falla
-        
-        return translated_articles
-        
-    finally:
-        if db_conn:
-            db_conn.close()
+        translated_articles = get_translation_service().translate_articles(articles)
+    except Exception as e:
+        logger.error(f"Error traduciendo artículos: {e}")
+        return articles  # Devolver originales si falla
+    
+    translated_count = sum(1 for article in translated_articles if article.get('is_translated'))
+    if translated_count:
+        logger.info(f"Artículos traducidos: {translated_count}/{len(articles)}")
+    return translated_articles
 
 def install_translation_dependencies():
     """Instala las dependencias necesarias para traducción."""
@@ -579,8 +484,7 @@ if __name__ == "__main__":
         print("🔄 Probando sistema de traducción...")
         
         # Crear servicio de traducción
-        db_conn = get_database_connection()
-        translator = TranslationService(db_conn)
+        translator = get_translation_service()
         
         # Texto de prueba
         test_texts = [
@@ -600,8 +504,7 @@ if __name__ == "__main__":
             except Exception as e:
                 print(f"Error: {e}")
         
-        if db_conn:
-            db_conn.close()
+        print(f"Métricas: {translator.get_stats()}")
     
     # Ejecutar prueba
     asyncio.run(test_translation())